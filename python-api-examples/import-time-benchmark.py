@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Copyright      2025  Xiaomi Corp.
+"""
+This file measures the time to import sherpa_onnx and to access the
+classes typically used by short-lived processes, e.g., batch jobs and
+serverless workers.
+
+Each case runs in a new Python process, --num-runs times, and the median
+wall time of the whole process is reported. The time of an empty Python
+process is reported as a baseline.
+
+Attributes of sherpa_onnx are loaded lazily on first access, so that a
+process pays only for what it uses. The case "all attributes" accesses every
+attribute, which costs the same as importing everything eagerly.
+
+Usage:
+
+python3 ./python-api-examples/import-time-benchmark.py --num-runs 10
+
+Use
+
+python3 -X importtime -c "import sherpa_onnx; sherpa_onnx.OfflineTts"
+
+to see a breakdown per module.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--num-runs",
+        type=int,
+        default=10,
+        help="Number of runs of each case",
+    )
+
+    return parser.parse_args()
+
+
+CASES = [
+    ("python", "pass"),
+    ("import sherpa_onnx", "import sherpa_onnx"),
+    ("OfflineTts", "import sherpa_onnx; sherpa_onnx.OfflineTts"),
+    ("OfflineRecognizer", "import sherpa_onnx; sherpa_onnx.OfflineRecognizer"),
+    ("OnlineRecognizer", "import sherpa_onnx; sherpa_onnx.OnlineRecognizer"),
+    (
+        "all attributes",
+        "import sherpa_onnx\n"
+        "for name in sherpa_onnx.__all__:\n"
+        "    getattr(sherpa_onnx, name)",
+    ),
+]
+
+
+def run(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    args = get_args()
+
+    # Print the startup report of a process that accesses every attribute
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CASES[-1][1] + "\nprint(sherpa_onnx.startup_report())",
+        ],
+        check=True,
+    )
+    print()
+
+    for name, code in CASES:
+        times = [run(code) for _ in range(args.num_runs)]
+        print(
+            f"{name:<20} median {statistics.median(times) * 1000:8.1f} ms, "
+            f"min {min(times) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# Copyright      2025  Xiaomi Corp.
+"""
+A load generator for ./python-api-examples/keyword_spotting_server.py
+
+It simulates many always-on audio feeds. Each feed is a websocket connection
+sending a wave file in a loop in real time. The detection latency of an event
+is the time between sending the last audio sample received by the server
+before the detection (see "audio_time" of the event) and receiving the event.
+
+It increases the number of concurrent feeds step by step and reports the
+largest number of feeds for which the given percentile of the detection
+latency stays below --max-latency-ms. Dividing it by the number of CPU cores
+used by the server gives the streams per core.
+
+Usage:
+
+(1) Start the server
+
+python3 ./python-api-examples/keyword_spotting_server.py \
+  --tokens ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/tokens.txt \
+  --encoder ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/encoder-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --decoder ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/decoder-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --joiner ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/joiner-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --keywords-file ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/test_wavs/test_keywords.txt
+
+(2) Start the load generator
+
+python3 ./python-api-examples/keyword-spotting-load-generator.py \
+  --num-streams 50,100,200,400 \
+  --server-cores 4 \
+  ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/test_wavs/0.wav
+
+The wave file must contain at least one of the keywords and its sample rate
+must be equal to --sample-rate of the server.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import os
+import random
+import time
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+import websockets
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--server-addr",
+        type=str,
+        default="localhost",
+        help="Address of the server",
+    )
+
+    parser.add_argument(
+        "--server-port",
+        type=int,
+        default=6010,
+        help="Port of the server",
+    )
+
+    parser.add_argument(
+        "--num-streams",
+        type=str,
+        default="10,20,50,100,200",
+        help="Comma separated numbers of concurrent streams to test",
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60,
+        help="Duration in seconds of each step",
+    )
+
+    parser.add_argument(
+        "--chunk-ms",
+        type=int,
+        default=100,
+        help="Each message contains audio of this duration in milliseconds",
+    )
+
+    parser.add_argument(
+        "--max-latency-ms",
+        type=float,
+        default=500,
+        help="Max allowed detection latency in milliseconds",
+    )
+
+    parser.add_argument(
+        "--percentile",
+        type=float,
+        default=95,
+        help="Percentile of the detection latency compared with --max-latency-ms",
+    )
+
+    parser.add_argument(
+        "--server-cores",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of CPU cores used by the server",
+    )
+
+    parser.add_argument(
+        "--keyword-set",
+        type=str,
+        default="",
+        help="If not empty, all streams use the keyword set with this id",
+    )
+
+    parser.add_argument(
+        "sound_file",
+        type=str,
+        help="The input sound file. It must be a single channel, 16-bit wave "
+        "file containing at least one of the keywords.",
+    )
+
+    return parser.parse_args()
+
+
+def read_wave(wave_filename: str) -> Tuple[np.ndarray, int]:
+    """
+    Returns:
+      Return a tuple containing:
+       - A 1-D array of dtype np.int16 containing the samples
+       - sample rate of the wave file
+    """
+    with wave.open(wave_filename) as f:
+        assert f.getnchannels() == 1, f.getnchannels()
+        assert f.getsampwidth() == 2, f.getsampwidth()  # it is in bytes
+        num_samples = f.getnframes()
+        samples = f.readframes(num_samples)
+        return np.frombuffer(samples, dtype=np.int16), f.getframerate()
+
+
+class Feed(object):
+    """A simulated audio feed sending a wave file in a loop in real time."""
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        chunk_ms: int,
+        keyword_set: str,
+    ):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.chunk_size = int(sample_rate * chunk_ms / 1000)
+        self.keyword_set = keyword_set
+
+        # send_times[i] is the time when the first sent_samples[i] samples
+        # have been sent
+        self.sent_samples: List[int] = []
+        self.send_times: List[float] = []
+
+        self.latencies: List[float] = []
+        self.num_events = 0
+
+    async def run(self, uri: str, duration: float):
+        async with websockets.connect(uri, max_size=None) as socket:
+            if self.keyword_set:
+                await socket.send(json.dumps({"keyword_set": self.keyword_set}))
+
+            receiver = asyncio.create_task(self.receive(socket))
+            await self.send(socket, duration)
+            await socket.send("Done")
+            await receiver
+
+    async def send(self, socket, duration: float):
+        # Start at a random position so that feeds are not synchronized
+        offset = random.randint(0, self.samples.shape[0] - 1)
+        num_sent = 0
+
+        start = time.monotonic()
+        while time.monotonic() - start < duration:
+            chunk = np.take(
+                self.samples,
+                range(offset, offset + self.chunk_size),
+                mode="wrap",
+            )
+            offset = (offset + self.chunk_size) % self.samples.shape[0]
+
+            await socket.send(chunk.tobytes())
+            num_sent += self.chunk_size
+
+            self.sent_samples.append(num_sent)
+            self.send_times.append(time.monotonic())
+
+            # real time
+            next_time = start + num_sent / self.sample_rate
+            await asyncio.sleep(max(0, next_time - time.monotonic()))
+
+    async def receive(self, socket):
+        async for message in socket:
+            now = time.monotonic()
+            event = json.loads(message)
+            self.num_events += 1
+
+            n = int(round(event["audio_time"] * self.sample_rate))
+            i = bisect.bisect_left(self.sent_samples, n)
+            if i < len(self.send_times):
+                self.latencies.append(now - self.send_times[i])
+
+
+async def run_step(
+    uri: str,
+    num_streams: int,
+    samples: np.ndarray,
+    sample_rate: int,
+    args,
+) -> Optional[float]:
+    feeds = [
+        Feed(
+            samples=samples,
+            sample_rate=sample_rate,
+            chunk_ms=args.chunk_ms,
+            keyword_set=args.keyword_set,
+        )
+        for _ in range(num_streams)
+    ]
+
+    await asyncio.gather(*[f.run(uri, args.duration) for f in feeds])
+
+    latencies = np.array([t for f in feeds for t in f.latencies]) * 1000
+    num_events = sum(f.num_events for f in feeds)
+
+    if latencies.size == 0:
+        logging.info(f"streams: {num_streams}, no keywords detected")
+        return None
+
+    p = np.percentile(latencies, args.percentile)
+    logging.info(
+        f"streams: {num_streams}, events: {num_events}, "
+        f"latency (ms): p50 {np.percentile(latencies, 50):.1f}, "
+        f"p{args.percentile:g} {p:.1f}, max {latencies.max():.1f}"
+    )
+    return p
+
+
+async def run(args):
+    samples, sample_rate = read_wave(args.sound_file)
+    uri = f"ws://{args.server_addr}:{args.server_port}"
+
+    num_streams_list = [int(n) for n in args.num_streams.split(",")]
+
+    max_streams = 0
+    for num_streams in num_streams_list:
+        p = await run_step(uri, num_streams, samples, sample_rate, args)
+        if p is None or p > args.max_latency_ms:
+            break
+        max_streams = num_streams
+
+    if max_streams == 0:
+        logging.info(
+            f"p{args.percentile:g} latency exceeds {args.max_latency_ms} ms "
+            f"with {num_streams_list[0]} streams"
+        )
+        return
+
+    logging.info(
+        f"Max streams with p{args.percentile:g} latency <= "
+        f"{args.max_latency_ms} ms: {max_streams}. "
+        f"Streams per core: {max_streams / args.server_cores:.1f} "
+        f"({args.server_cores} cores)"
+    )
+
+
+def main():
+    args = get_args()
+    logging.info(vars(args))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    formatter = "%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s"
+    logging.basicConfig(format=formatter, level=logging.INFO)
+    main()
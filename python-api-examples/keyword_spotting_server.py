@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+# Copyright      2025  Xiaomi Corp.
+#
+"""
+A websocket server for keyword spotting on many always-on audio streams.
+
+Each client connection is one audio stream. Ready streams of all connections
+are batched and decoded together with a single call of
+``KeywordSpotter.decode_streams()``.
+
+Protocol:
+
+  - (Optional) The first message of a client can be a text message containing
+    a JSON object to select the keywords of the stream:
+
+        {"keyword_set": "kitchen"}
+
+    to use a keyword set loaded with --keyword-sets, or
+
+        {"keywords": "▁HE LL O ▁WORLD/▁HI ▁GOOGLE"}
+
+    to use the given keywords in addition to the ones from --keywords-file.
+    If it is not given, the stream uses --keywords-file.
+
+  - Audio is sent as binary messages containing 16-bit little-endian PCM
+    samples (int16) with sample rate --sample-rate.
+
+  - The text message "Done" ends the stream.
+
+The server sends a text message only when a keyword is detected, e.g.,
+
+    {"keyword": "HELLO WORLD", "tokens": ["▁HE", "LL", "O", "▁WORLD"],
+     "timestamps": [1.2, 1.28, 1.32, 1.48], "audio_time": 1.92}
+
+where "audio_time" is the duration in seconds of the audio received for
+this stream when the keyword was detected.
+
+Usage:
+
+python3 ./python-api-examples/keyword_spotting_server.py \
+  --tokens ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/tokens.txt \
+  --encoder ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/encoder-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --decoder ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/decoder-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --joiner ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/joiner-epoch-12-avg-2-chunk-16-left-64.onnx \
+  --keywords-file ./sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01/test_wavs/test_keywords.txt
+
+The format of the file for --keyword-sets is
+
+    {
+      "kitchen": ["▁LIGHT ▁UP", "▁TURN ▁OFF @TURN OFF"],
+      "garage": ["▁OPEN ▁THE ▁DOOR"]
+    }
+
+Please use ./python-api-examples/keyword-spotting-load-generator.py
+to measure how many streams the server can handle.
+
+Please refer to
+https://k2-fsa.github.io/sherpa/onnx/kws/pretrained_models/index.html
+to download pre-trained models.
+"""
+
+import argparse
+import asyncio
+import http
+import json
+import logging
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import sherpa_onnx
+import websockets
+
+from streaming_server import setup_logger
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--tokens",
+        type=str,
+        required=True,
+        help="Path to tokens.txt",
+    )
+
+    parser.add_argument(
+        "--encoder",
+        type=str,
+        required=True,
+        help="Path to the transducer encoder model",
+    )
+
+    parser.add_argument(
+        "--decoder",
+        type=str,
+        required=True,
+        help="Path to the transducer decoder model",
+    )
+
+    parser.add_argument(
+        "--joiner",
+        type=str,
+        required=True,
+        help="Path to the transducer joiner model",
+    )
+
+    parser.add_argument(
+        "--keywords-file",
+        type=str,
+        required=True,
+        help="""
+        The file containing the default keywords, one keyword per line, and for
+        each keyword the bpe/cjkchar/pinyin are separated by a space.
+        """,
+    )
+
+    parser.add_argument(
+        "--keyword-sets",
+        type=str,
+        default="",
+        help="""
+        Optional. A JSON file mapping keyword set ids to lists of keywords.
+        Clients can select one of them by id.
+        """,
+    )
+
+    parser.add_argument(
+        "--keywords-score",
+        type=float,
+        default=1.0,
+        help="""
+        The boosting score of each token for keywords. The larger the easier to
+        survive beam search.
+        """,
+    )
+
+    parser.add_argument(
+        "--keywords-threshold",
+        type=float,
+        default=0.25,
+        help="""
+        The trigger threshold (i.e., probability) of the keyword. The larger the
+        harder to trigger.
+        """,
+    )
+
+    parser.add_argument(
+        "--num-trailing-blanks",
+        type=int,
+        default=1,
+        help="The number of trailing blanks a keyword should be followed.",
+    )
+
+    parser.add_argument(
+        "--max-active-paths",
+        type=int,
+        default=4,
+        help="The maximum number of active paths during beam search.",
+    )
+
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=16000,
+        help="Sample rate of the audio sent by clients",
+    )
+
+    parser.add_argument(
+        "--feat-dim",
+        type=int,
+        default=80,
+        help="Feature dimension of the model",
+    )
+
+    parser.add_argument(
+        "--provider",
+        type=str,
+        default="cpu",
+        help="Valid values: cpu, cuda, coreml",
+    )
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=1,
+        help="Number of threads to run the neural network model",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=6010,
+        help="The server will listen on this port",
+    )
+
+    parser.add_argument(
+        "--nn-pool-size",
+        type=int,
+        default=1,
+        help="Number of threads for NN computation and decoding.",
+    )
+
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Max number of streams decoded in a batch.",
+    )
+
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=20,
+        help="""Max time in milliseconds a ready stream waits in the queue.
+        A batch is sent for computation once it contains --max-batch-size
+        streams or its oldest stream has waited for this time, whichever
+        comes first.
+        """,
+    )
+
+    parser.add_argument(
+        "--max-message-size",
+        type=int,
+        default=(1 << 20),
+        help="Max message size in bytes.",
+    )
+
+    parser.add_argument(
+        "--max-queue-size",
+        type=int,
+        default=32,
+        help="Max number of messages in the queue for each connection.",
+    )
+
+    parser.add_argument(
+        "--max-active-connections",
+        type=int,
+        default=1000,
+        help="""Maximum number of active connections. The server will refuse
+        to accept new connections once the current number of active connections
+        equals to this limit.
+        """,
+    )
+
+    parser.add_argument(
+        "--certificate",
+        type=str,
+        help="""Path to the X.509 certificate. You need it only if you want to
+        use a secure websocket connection, i.e., use wss:// instead of ws://.
+        """,
+    )
+
+    return parser.parse_args()
+
+
+def create_keyword_spotter(args) -> sherpa_onnx.KeywordSpotter:
+    kws = sherpa_onnx.KeywordSpotter(
+        tokens=args.tokens,
+        encoder=args.encoder,
+        decoder=args.decoder,
+        joiner=args.joiner,
+        keywords_file=args.keywords_file,
+        num_threads=args.num_threads,
+        sample_rate=args.sample_rate,
+        feature_dim=args.feat_dim,
+        max_active_paths=args.max_active_paths,
+        keywords_score=args.keywords_score,
+        keywords_threshold=args.keywords_threshold,
+        num_trailing_blanks=args.num_trailing_blanks,
+        provider=args.provider,
+    )
+
+    if args.keyword_sets:
+        with open(args.keyword_sets, encoding="utf-8") as f:
+            keyword_sets = json.load(f)
+
+        for set_id, keywords in keyword_sets.items():
+            kws.add_keyword_set(set_id, keywords)
+            logging.info(f"Added keyword set {set_id}: {keywords}")
+
+    return kws
+
+
+class KeywordSpottingServer(object):
+    def __init__(
+        self,
+        keyword_spotter: sherpa_onnx.KeywordSpotter,
+        sample_rate: int,
+        nn_pool_size: int,
+        max_wait_ms: float,
+        max_batch_size: int,
+        max_message_size: int,
+        max_queue_size: int,
+        max_active_connections: int,
+        certificate: Optional[str] = None,
+    ):
+        """
+        Args:
+          keyword_spotter:
+            An instance of the keyword spotter.
+          sample_rate:
+            Sample rate of the audio sent by clients.
+          nn_pool_size:
+            Number of threads for the thread pool that is responsible for
+            neural network computation and decoding.
+          max_wait_ms:
+            Max time in milliseconds a ready stream waits before its batch
+            is sent for computation.
+          max_batch_size:
+            Max batch size for inference.
+          max_message_size:
+            Max size in bytes per message.
+          max_queue_size:
+            Max number of messages in the queue for each connection.
+          max_active_connections:
+            Max number of active connections. Once number of active client
+            equals to this limit, the server refuses to accept new connections.
+          certificate:
+            Optional. If not None, it will use secure websocket.
+        """
+        self.keyword_spotter = keyword_spotter
+        self.sample_rate = sample_rate
+
+        self.certificate = certificate
+
+        self.nn_pool_size = nn_pool_size
+        self.nn_pool = ThreadPoolExecutor(
+            max_workers=nn_pool_size,
+            thread_name_prefix="nn",
+        )
+
+        self.stream_queue = asyncio.Queue()
+
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.max_message_size = max_message_size
+        self.max_queue_size = max_queue_size
+        self.max_active_connections = max_active_connections
+
+        self.current_active_connections = 0
+
+    async def stream_consumer_task(self):
+        """This function extracts streams from the queue, batches them up, sends
+        them to the neural network model for computation and decoding.
+
+        The first stream of a batch sets the deadline of the batch. The batch
+        is sent for computation once it is full or the deadline is reached.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.stream_queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.stream_queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    item = await asyncio.wait_for(self.stream_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+
+            stream_list = [b[0] for b in batch]
+            future_list = [b[1] for b in batch]
+
+            await loop.run_in_executor(
+                self.nn_pool,
+                self.keyword_spotter.decode_streams,
+                stream_list,
+            )
+
+            for f in future_list:
+                self.stream_queue.task_done()
+                f.set_result(None)
+
+    async def compute_and_decode(
+        self,
+        stream: sherpa_onnx.OnlineStream,
+    ) -> None:
+        """Put the stream into the queue and wait it to be processed by the
+        consumer task.
+
+        Args:
+          stream:
+            The stream to be processed. Note: It is changed in-place.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self.stream_queue.put((stream, future))
+        await future
+
+    async def process_request(
+        self,
+        path: str,
+        request_headers: websockets.Headers,
+    ) -> Optional[Tuple[http.HTTPStatus, websockets.Headers, bytes]]:
+        if self.current_active_connections < self.max_active_connections:
+            self.current_active_connections += 1
+            return None
+
+        # Refuse new connections
+        status = http.HTTPStatus.SERVICE_UNAVAILABLE  # 503
+        header = {"Hint": "The server is overloaded. Please retry later."}
+        response = b"The server is busy. Please retry later."
+
+        return status, header, response
+
+    async def run(self, port: int):
+        tasks = []
+        for i in range(self.nn_pool_size):
+            tasks.append(asyncio.create_task(self.stream_consumer_task()))
+
+        if self.certificate:
+            logging.info(f"Using certificate: {self.certificate}")
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(self.certificate)
+        else:
+            ssl_context = None
+            logging.info("No certificate provided")
+
+        async with websockets.serve(
+            self.handle_connection,
+            host="",
+            port=port,
+            max_size=self.max_message_size,
+            max_queue=self.max_queue_size,
+            process_request=self.process_request,
+            ssl=ssl_context,
+        ):
+            logging.info(f"Listening on port {port}")
+            await asyncio.Future()  # run forever
+
+        await asyncio.gather(*tasks)  # not reachable
+
+    async def handle_connection(
+        self,
+        socket: websockets.WebSocketServerProtocol,
+    ):
+        """Receive audio samples from the client, process it, and send
+        detected keywords back to the client.
+
+        Args:
+          socket:
+            The socket for communicating with the client.
+        """
+        try:
+            await self.handle_connection_impl(socket)
+        except websockets.exceptions.ConnectionClosedError:
+            logging.info(f"{socket.remote_address} disconnected")
+        except ValueError as e:
+            logging.info(f"{socket.remote_address}: {e}")
+            await socket.close(code=1008, reason=str(e)[:100])
+        finally:
+            # Decrement so that it can accept new connections
+            self.current_active_connections -= 1
+
+            logging.info(
+                f"Disconnected: {socket.remote_address}. "
+                f"Number of connections: {self.current_active_connections}/{self.max_active_connections}"  # noqa
+            )
+
+    async def handle_connection_impl(
+        self,
+        socket: websockets.WebSocketServerProtocol,
+    ):
+        logging.info(
+            f"Connected: {socket.remote_address}. "
+            f"Number of connections: {self.current_active_connections}/{self.max_active_connections}"  # noqa
+        )
+
+        message = await socket.recv()
+        if isinstance(message, str) and message != "Done":
+            stream = self.create_stream(json.loads(message))
+            message = None
+        else:
+            stream = self.keyword_spotter.create_stream()
+
+        num_samples = 0
+
+        while True:
+            if message is None:
+                message = await socket.recv()
+
+            if message == "Done":
+                break
+
+            if isinstance(message, str):
+                raise ValueError(f"Unexpected message: {message[:100]}")
+
+            # int16 samples are passed to the stream without conversion or
+            # copy in Python
+            samples = np.frombuffer(message, dtype=np.int16)
+            message = None
+
+            stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
+            num_samples += samples.shape[0]
+
+            await self.decode_and_send_events(socket, stream, num_samples)
+
+        tail_padding = np.zeros(int(self.sample_rate * 0.3), dtype=np.float32)
+        stream.accept_waveform(sample_rate=self.sample_rate, waveform=tail_padding)
+        stream.input_finished()
+
+        await self.decode_and_send_events(socket, stream, num_samples)
+
+    def create_stream(self, config: dict) -> sherpa_onnx.OnlineStream:
+        if "keyword_set" in config:
+            return self.keyword_spotter.create_stream(
+                keyword_set=config["keyword_set"]
+            )
+
+        if "keywords" in config:
+            s = self.keyword_spotter.create_stream(config["keywords"])
+            if s is None:
+                raise ValueError(f"Invalid keywords: {config['keywords']}")
+            return s
+
+        return self.keyword_spotter.create_stream()
+
+    async def decode_and_send_events(
+        self,
+        socket: websockets.WebSocketServerProtocol,
+        stream: sherpa_onnx.OnlineStream,
+        num_samples: int,
+    ):
+        while self.keyword_spotter.is_ready(stream):
+            await self.compute_and_decode(stream)
+
+            # Note: Only the first call of get_result() after a detection
+            # returns the keyword
+            result = self.keyword_spotter.keyword_spotter.get_result(stream)
+            keyword = result.keyword.strip()
+            if not keyword:
+                continue
+
+            self.keyword_spotter.reset_stream(stream)
+
+            message = {
+                "keyword": keyword,
+                "tokens": result.tokens,
+                "timestamps": ["{:.3f}".format(t) for t in result.timestamps],
+                "audio_time": round(num_samples / self.sample_rate, 3),
+            }
+            await socket.send(json.dumps(message, ensure_ascii=False))
+
+
+def check_args(args):
+    for f in [args.tokens, args.encoder, args.decoder, args.joiner]:
+        assert Path(f).is_file(), f"{f} does not exist"
+
+    assert Path(args.keywords_file).is_file(), f"{args.keywords_file} does not exist"
+
+    if args.keyword_sets:
+        assert Path(args.keyword_sets).is_file(), f"{args.keyword_sets} does not exist"
+
+    if args.certificate:
+        assert Path(args.certificate).is_file(), f"{args.certificate} does not exist"
+
+    assert args.max_batch_size > 0, args.max_batch_size
+    assert args.max_wait_ms >= 0, args.max_wait_ms
+
+
+def main():
+    args = get_args()
+    logging.info(vars(args))
+    check_args(args)
+
+    keyword_spotter = create_keyword_spotter(args)
+
+    server = KeywordSpottingServer(
+        keyword_spotter=keyword_spotter,
+        sample_rate=args.sample_rate,
+        nn_pool_size=args.nn_pool_size,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_message_size=args.max_message_size,
+        max_queue_size=args.max_queue_size,
+        max_active_connections=args.max_active_connections,
+        certificate=args.certificate,
+    )
+    asyncio.run(server.run(args.port))
+
+
+if __name__ == "__main__":
+    log_filename = "log/log-keyword-spotting-server"
+    setup_logger(log_filename)
+    main()
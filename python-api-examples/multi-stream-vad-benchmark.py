@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+"""
+This file compares sherpa_onnx.MultiStreamVoiceActivityDetector, which
+runs one batched model invocation for all streams, with one
+sherpa_onnx.VoiceActivityDetector per stream.
+
+For each number of streams, every stream receives the same input file
+in chunks of --chunk-ms milliseconds, as a server receiving audio from
+many connections would. It reports the CPU time of both approaches and the
+number of real-time streams a single CPU core can handle, i.e., the
+streams per core.
+
+The numbers of segments of the two approaches may differ slightly since
+VoiceActivityDetector combines the decisions of all windows of a chunk,
+while MultiStreamVoiceActivityDetector processes windows one by one.
+
+Usage
+
+python3 ./multi-stream-vad-benchmark.py \
+        --silero-vad-model silero_vad.onnx \
+        --num-streams 1,10,100,500 \
+        input.wav
+
+Please visit
+https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx
+to download silero_vad.onnx
+
+For instance,
+wget https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def assert_file_exists(filename: str):
+    assert Path(filename).is_file(), (
+        f"{filename} does not exist!\n"
+        "Please refer to "
+        "https://k2-fsa.github.io/sherpa/onnx/pretrained_models/index.html to download it"
+    )
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--silero-vad-model",
+        type=str,
+        required=True,
+        help="Path to silero_vad.onnx",
+    )
+
+    parser.add_argument(
+        "--num-streams",
+        type=str,
+        default="1,10,100",
+        help="Comma separated numbers of streams to test",
+    )
+
+    parser.add_argument(
+        "--chunk-ms",
+        type=int,
+        default=100,
+        help="Each stream receives audio of this duration in milliseconds "
+        "at a time",
+    )
+
+    parser.add_argument(
+        "--skip-per-stream",
+        action="store_true",
+        help="If true, do not benchmark one VoiceActivityDetector per stream",
+    )
+
+    parser.add_argument(
+        "input",
+        type=str,
+        help="Path to input.wav. Its sample rate must be 16000",
+    )
+
+    return parser.parse_args()
+
+
+def load_audio(filename: str) -> Tuple[np.ndarray, int]:
+    data, sample_rate = sf.read(
+        filename,
+        always_2d=True,
+        dtype="float32",
+    )
+    data = data[:, 0]  # use only the first channel
+    samples = np.ascontiguousarray(data)
+    return samples, sample_rate
+
+
+def create_config(args) -> sherpa_onnx.VadModelConfig:
+    config = sherpa_onnx.VadModelConfig()
+    config.silero_vad.model = args.silero_vad_model
+    config.sample_rate = 16000
+    config.num_threads = 1
+    return config
+
+
+def run_per_stream(
+    config: sherpa_onnx.VadModelConfig,
+    num_streams: int,
+    chunks,
+) -> Tuple[float, int]:
+    """Returns the CPU time in seconds and the number of segments."""
+    vads = [sherpa_onnx.VoiceActivityDetector(config) for _ in range(num_streams)]
+
+    num_segments = 0
+
+    start = time.process_time()
+    for chunk in chunks:
+        for vad in vads:
+            vad.accept_waveform(chunk)
+            while not vad.empty():
+                num_segments += 1
+                vad.pop()
+
+    for vad in vads:
+        vad.flush()
+        while not vad.empty():
+            num_segments += 1
+            vad.pop()
+    elapsed = time.process_time() - start
+
+    return elapsed, num_segments
+
+
+def run_multi_stream(
+    config: sherpa_onnx.VadModelConfig,
+    num_streams: int,
+    chunks,
+) -> Tuple[float, int]:
+    """Returns the CPU time in seconds and the number of segments."""
+    vad = sherpa_onnx.MultiStreamVoiceActivityDetector(config)
+    streams = [vad.create_stream() for _ in range(num_streams)]
+
+    num_segments = 0
+
+    start = time.process_time()
+    for chunk in chunks:
+        for s in streams:
+            vad.accept_waveform(s, chunk)
+
+        num_segments += sum(not e.is_start for e in vad.compute())
+
+    for s in streams:
+        vad.flush(s)
+    num_segments += sum(not e.is_start for e in vad.compute())
+    elapsed = time.process_time() - start
+
+    return elapsed, num_segments
+
+
+def main():
+    args = get_args()
+    assert_file_exists(args.silero_vad_model)
+    assert_file_exists(args.input)
+
+    samples, sample_rate = load_audio(args.input)
+    assert sample_rate == 16000, sample_rate
+
+    duration = samples.shape[0] / sample_rate
+
+    chunk_size = int(sample_rate * args.chunk_ms / 1000)
+    chunks = [
+        samples[i : i + chunk_size].tolist()
+        for i in range(0, samples.shape[0], chunk_size)
+    ]
+
+    config = create_config(args)
+
+    print(f"Audio duration: {duration:.3f} s. Chunk: {args.chunk_ms} ms")
+
+    for num_streams in [int(n) for n in args.num_streams.split(",")]:
+        print(f"---{num_streams} stream(s)---")
+        total = duration * num_streams
+
+        elapsed, num_segments = run_multi_stream(config, num_streams, chunks)
+        print(
+            f"MultiStreamVoiceActivityDetector: CPU time {elapsed:.3f} s, "
+            f"segments {num_segments}, "
+            f"streams per core {total / elapsed:.1f}"
+        )
+
+        if args.skip_per_stream:
+            continue
+
+        elapsed, num_segments = run_per_stream(config, num_streams, chunks)
+        print(
+            f"VoiceActivityDetector per stream: CPU time {elapsed:.3f} s, "
+            f"segments {num_segments}, "
+            f"streams per core {total / elapsed:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -423,6 +423,7 @@ def add_decoding_args(parser: argparse.ArgumentParser):
         help="""Decoding method to use. Current supported methods are:
         - greedy_search
         - modified_beam_search  (for transducer models only)
+        - beam_search  (for whisper models only)
         """,
     )
 
@@ -434,8 +435,9 @@ def add_modified_beam_search_args(parser: argparse.ArgumentParser):
         "--max-active-paths",
         type=int,
         default=4,
-        help="""Used only when --decoding-method is modified_beam_search.
-        It specifies number of active paths to keep during decoding.
+        help="""Used only when --decoding-method is modified_beam_search
+        or beam_search. It specifies number of active paths to keep during
+        decoding.
         """,
     )
 
@@ -1106,6 +1108,7 @@ def create_recognizer(args) -> sherpa_onnx.OfflineRecognizer:
             tokens=args.tokens,
             num_threads=args.num_threads,
             decoding_method=args.decoding_method,
+            max_active_paths=args.max_active_paths,
             language=args.whisper_language,
             task=args.whisper_task,
             tail_paddings=args.whisper_tail_paddings,
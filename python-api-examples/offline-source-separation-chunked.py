@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# Copyright (c)  2025  Xiaomi Corporation
+
+"""
+This file shows how to separate long recordings chunk by chunk.
+
+The input file is read block by block and the separated stems are written
+to disk as soon as they are ready, so memory usage stays constant no matter
+how long the recording is. It works with both spleeter and UVR models.
+
+Please first download a model from
+
+https://github.com/k2-fsa/sherpa-onnx/releases/tag/source-separation-models
+
+Usage:
+
+(1) spleeter
+
+    wget https://github.com/k2-fsa/sherpa-onnx/releases/download/source-separation-models/sherpa-onnx-spleeter-2stems-fp16.tar.bz2
+    tar xvf sherpa-onnx-spleeter-2stems-fp16.tar.bz2
+
+    python3 ./python-api-examples/offline-source-separation-chunked.py \\
+      --spleeter-vocals ./sherpa-onnx-spleeter-2stems-fp16/vocals.fp16.onnx \\
+      --spleeter-accompaniment ./sherpa-onnx-spleeter-2stems-fp16/accompaniment.fp16.onnx \\
+      --chunk-duration 30 \\
+      --crossfade-duration 1 \\
+      --num-parallel-chunks 2 \\
+      ./qi-feng-le-zh.wav
+
+(2) UVR
+
+    wget https://github.com/k2-fsa/sherpa-onnx/releases/download/source-separation-models/UVR_MDXNET_9482.onnx
+
+    python3 ./python-api-examples/offline-source-separation-chunked.py \\
+      --uvr-model ./UVR_MDXNET_9482.onnx \\
+      ./qi-feng-le-zh.wav
+
+The test wav file can be downloaded from
+
+    wget https://github.com/k2-fsa/sherpa-onnx/releases/download/source-separation-models/qi-feng-le-zh.wav
+"""
+
+import argparse
+import time
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument("--spleeter-vocals", type=str, default="")
+    parser.add_argument("--spleeter-accompaniment", type=str, default="")
+    parser.add_argument("--uvr-model", type=str, default="")
+    parser.add_argument("--num-threads", type=int, default=1)
+
+    parser.add_argument(
+        "--chunk-duration",
+        type=float,
+        default=30,
+        help="Length in seconds of each chunk, including the crossfade region",
+    )
+
+    parser.add_argument(
+        "--crossfade-duration",
+        type=float,
+        default=1,
+        help="Length in seconds of the region shared by two adjacent chunks",
+    )
+
+    parser.add_argument(
+        "--num-parallel-chunks",
+        type=int,
+        default=1,
+        help="Number of chunks to process in parallel",
+    )
+
+    parser.add_argument(
+        "--block-duration",
+        type=float,
+        default=10,
+        help="Length in seconds of each block read from the input file",
+    )
+
+    parser.add_argument("--output-vocals", type=str, default="./vocals.wav")
+    parser.add_argument(
+        "--output-non-vocals", type=str, default="./non-vocals.wav"
+    )
+
+    parser.add_argument("input", type=str, help="Path to the input wave file")
+
+    return parser.parse_args()
+
+
+def create_offline_source_separation(args):
+    config = sherpa_onnx.OfflineSourceSeparationConfig(
+        model=sherpa_onnx.OfflineSourceSeparationModelConfig(
+            spleeter=sherpa_onnx.OfflineSourceSeparationSpleeterModelConfig(
+                vocals=args.spleeter_vocals,
+                accompaniment=args.spleeter_accompaniment,
+            ),
+            uvr=sherpa_onnx.OfflineSourceSeparationUvrModelConfig(
+                model=args.uvr_model,
+            ),
+            num_threads=args.num_threads,
+            debug=False,
+            provider="cpu",
+        )
+    )
+    if not config.validate():
+        raise ValueError("Please check your config.")
+
+    return sherpa_onnx.OfflineSourceSeparation(config)
+
+
+def write_output(output, vocals_file, non_vocals_file):
+    if len(output.stems) == 0:
+        return
+
+    vocals = output.stems[0].data
+    non_vocals = output.stems[1].data
+    if vocals is None:
+        # no samples are ready yet
+        return
+
+    # (num_channels, num_samples) -> (num_samples, num_channels)
+    vocals_file.write(np.transpose(vocals))
+    non_vocals_file.write(np.transpose(non_vocals))
+
+
+def main():
+    args = get_args()
+
+    chunk_config = sherpa_onnx.OfflineSourceSeparationChunkConfig(
+        chunk_duration=args.chunk_duration,
+        crossfade_duration=args.crossfade_duration,
+        num_parallel_chunks=args.num_parallel_chunks,
+    )
+    if not chunk_config.validate():
+        raise ValueError(f"Please check your chunk config: {chunk_config}")
+
+    sp = create_offline_source_separation(args)
+    chunker = sherpa_onnx.OfflineSourceSeparationChunker(sp, chunk_config)
+
+    info = sf.info(args.input)
+    block_size = int(args.block_duration * info.samplerate)
+
+    # spleeter and UVR models output 2 channels
+    kwargs = dict(mode="w", samplerate=sp.sample_rate, channels=2)
+
+    start = time.time()
+    with sf.SoundFile(args.output_vocals, **kwargs) as vocals_file, sf.SoundFile(
+        args.output_non_vocals, **kwargs
+    ) as non_vocals_file:
+        for block in sf.blocks(
+            args.input, blocksize=block_size, dtype="float32", always_2d=True
+        ):
+            # (num_samples, num_channels) -> (num_channels, num_samples)
+            samples = np.ascontiguousarray(np.transpose(block))
+            output = chunker.accept_waveform(
+                sample_rate=info.samplerate, samples=samples
+            )
+            write_output(output, vocals_file, non_vocals_file)
+
+        write_output(chunker.flush(), vocals_file, non_vocals_file)
+    end = time.time()
+
+    elapsed_seconds = end - start
+    audio_duration = info.frames / info.samplerate
+    real_time_factor = elapsed_seconds / audio_duration
+
+    print(f"Saved to {args.output_vocals} and {args.output_non_vocals}")
+    print(f"Elapsed seconds: {elapsed_seconds:.3f}")
+    print(f"Audio duration in seconds: {audio_duration:.3f}")
+    print(f"RTF: {elapsed_seconds:.3f}/{audio_duration:.3f} = {real_time_factor:.3f}")
+
+
+if __name__ == "__main__":
+    main()
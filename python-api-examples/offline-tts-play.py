@@ -240,6 +240,15 @@ def add_matcha_args(parser):
         --matcha-lexicon and --matcha-tokens are ignored""",
     )
 
+    parser.add_argument(
+        "--matcha-vocoder-chunk-size",
+        type=int,
+        default=0,
+        help="""If positive, run the vocoder on chunks of this many mel frames
+        so that playback starts before the whole sentence is vocoded.
+        0 to run the vocoder on the whole mel""",
+    )
+
 
 def add_kokoro_args(parser):
     parser.add_argument(
@@ -512,6 +521,7 @@ def main():
                 lexicon=args.matcha_lexicon,
                 tokens=args.matcha_tokens,
                 data_dir=args.matcha_data_dir,
+                vocoder_chunk_size=args.matcha_vocoder_chunk_size,
             ),
             kokoro=sherpa_onnx.OfflineTtsKokoroModelConfig(
                 model=args.kokoro_model,
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# Copyright      2025  Xiaomi Corp.
+"""
+This file measures the throughput of a non-streaming whisper model
+when decoding several streams at once with recognizer.decode_streams().
+
+For each batch size, it decodes --num-utterances utterances in batches of
+that size and reports the real time factor (RTF) and the number of seconds
+of audio decoded per second.
+
+The encoder runs once for each batch and the decoder runs greedy search for
+all streams of a batch in lockstep, so a larger batch size usually gives a
+higher throughput at the cost of a higher latency.
+
+With --decoding-method beam_search, all hypotheses of all streams of a batch
+are expanded with one decoder run per step.
+
+Usage:
+
+wget https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/sherpa-onnx-whisper-tiny.en.tar.bz2
+tar xvf sherpa-onnx-whisper-tiny.en.tar.bz2
+rm sherpa-onnx-whisper-tiny.en.tar.bz2
+
+python3 ./python-api-examples/offline-whisper-batch-benchmark.py \
+  --encoder ./sherpa-onnx-whisper-tiny.en/tiny.en-encoder.int8.onnx \
+  --decoder ./sherpa-onnx-whisper-tiny.en/tiny.en-decoder.int8.onnx \
+  --tokens ./sherpa-onnx-whisper-tiny.en/tiny.en-tokens.txt \
+  --batch-sizes 1,2,4,8,16 \
+  ./sherpa-onnx-whisper-tiny.en/test_wavs/0.wav \
+  ./sherpa-onnx-whisper-tiny.en/test_wavs/1.wav \
+  ./sherpa-onnx-whisper-tiny.en/test_wavs/8k.wav
+
+The input files are used in a round-robin way to get --num-utterances
+utterances.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--encoder",
+        type=str,
+        required=True,
+        help="Path to the whisper encoder model",
+    )
+
+    parser.add_argument(
+        "--decoder",
+        type=str,
+        required=True,
+        help="Path to the whisper decoder model",
+    )
+
+    parser.add_argument(
+        "--tokens",
+        type=str,
+        required=True,
+        help="Path to tokens.txt",
+    )
+
+    parser.add_argument(
+        "--language",
+        type=str,
+        default="",
+        help="""The spoken language in the input files. Leave it empty to
+        detect it for each utterance. Used only for multilingual models""",
+    )
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=2,
+        help="Number of threads for neural network computation",
+    )
+
+    parser.add_argument(
+        "--provider",
+        type=str,
+        default="cpu",
+        help="Valid values: cpu, cuda, coreml",
+    )
+
+    parser.add_argument(
+        "--decoding-method",
+        type=str,
+        default="greedy_search",
+        help="Valid values: greedy_search, beam_search",
+    )
+
+    parser.add_argument(
+        "--max-active-paths",
+        type=int,
+        default=4,
+        help="The beam size. Used only when --decoding-method is beam_search",
+    )
+
+    parser.add_argument(
+        "--batch-sizes",
+        type=str,
+        default="1,2,4,8,16",
+        help="Comma separated batch sizes to test",
+    )
+
+    parser.add_argument(
+        "--num-utterances",
+        type=int,
+        default=32,
+        help="Number of utterances to decode for each batch size",
+    )
+
+    parser.add_argument(
+        "sound_files",
+        type=str,
+        nargs="+",
+        help="The input sound files",
+    )
+
+    return parser.parse_args()
+
+
+def assert_file_exists(filename: str):
+    assert Path(filename).is_file(), (
+        f"{filename} does not exist!\n"
+        "Please refer to "
+        "https://k2-fsa.github.io/sherpa/onnx/pretrained_models/whisper/index.html to download it"
+    )
+
+
+def read_wave(filename: str) -> Tuple[np.ndarray, int]:
+    audio, sample_rate = sf.read(filename, dtype="float32", always_2d=True)
+    audio = audio[:, 0]  # only use the first channel
+    return np.ascontiguousarray(audio), sample_rate
+
+
+def run(
+    recognizer: sherpa_onnx.OfflineRecognizer,
+    waves: List[Tuple[np.ndarray, int]],
+    batch_size: int,
+) -> float:
+    """Return the elapsed seconds to decode all waves."""
+    elapsed = 0
+    for i in range(0, len(waves), batch_size):
+        streams = []
+        for samples, sample_rate in waves[i : i + batch_size]:
+            s = recognizer.create_stream()
+            s.accept_waveform(sample_rate, samples)
+            streams.append(s)
+
+        # Count only the time of the neural network computation
+        start = time.perf_counter()
+        recognizer.decode_streams(streams)
+        elapsed += time.perf_counter() - start
+
+    return elapsed
+
+
+def main():
+    args = get_args()
+    assert_file_exists(args.encoder)
+    assert_file_exists(args.decoder)
+    assert_file_exists(args.tokens)
+
+    recognizer = sherpa_onnx.OfflineRecognizer.from_whisper(
+        encoder=args.encoder,
+        decoder=args.decoder,
+        tokens=args.tokens,
+        num_threads=args.num_threads,
+        language=args.language,
+        provider=args.provider,
+        decoding_method=args.decoding_method,
+        max_active_paths=args.max_active_paths,
+    )
+
+    sound_files = [read_wave(f) for f in args.sound_files]
+    waves = [
+        sound_files[i % len(sound_files)] for i in range(args.num_utterances)
+    ]
+
+    duration = sum(samples.shape[0] / sample_rate for samples, sample_rate in waves)
+    print(f"Number of utterances: {len(waves)}. Total duration: {duration:.3f} s")
+
+    # Warm up so that the first batch size is not penalized
+    run(recognizer, waves[:1], batch_size=1)
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        elapsed = run(recognizer, waves, batch_size)
+        print(
+            f"batch size {batch_size:3d}: elapsed {elapsed:.3f} s, "
+            f"RTF {elapsed / duration:.4f}, "
+            f"throughput {duration / elapsed:.2f} s audio / s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,10 @@ python3 ./python-api-examples/offline-zeroshot-tts.py \
   --num-threads 4 \
   --prompt-text "周日被我射熄火了，所以今天是周一。" \
   "我是中国人民的儿子，我爱我的祖国。我得祖国是一个伟大的国家，拥有五千年的文明史。"
+
+The prompt is converted to a voice before generating audio. You can pass
+--save-voice ./voice.bin to save it and then use --voice ./voice.bin instead of
+--prompt-text and --prompt-audio later to skip processing the prompt again.
 """
 
 import argparse
@@ -205,17 +209,32 @@ def get_args():
     parser.add_argument(
         "--prompt-text",
         type=str,
-        required=True,
+        default="",
         help="The transcription of prompt audio (Zipvoice)",
     )
 
     parser.add_argument(
         "--prompt-audio",
         type=str,
-        required=True,
+        default="",
         help="The path to prompt audio (Zipvoice).",
     )
 
+    parser.add_argument(
+        "--voice",
+        type=str,
+        default="",
+        help="""Path to a voice saved by --save-voice. If given,
+        --prompt-text and --prompt-audio are ignored.""",
+    )
+
+    parser.add_argument(
+        "--save-voice",
+        type=str,
+        default="",
+        help="If not empty, save the voice created from the prompt to it",
+    )
+
     parser.add_argument(
         "text",
         type=str,
@@ -255,15 +274,45 @@ def main():
 
     tts = sherpa_onnx.OfflineTts(tts_config)
 
+    if args.voice:
+        voice = sherpa_onnx.OfflineTtsVoice.load(args.voice)
+    else:
+        if not args.prompt_text or not args.prompt_audio:
+            raise ValueError(
+                "Please provide --prompt-text and --prompt-audio, or --voice"
+            )
+
+        prompt_samples, sample_rate = read_wave(args.prompt_audio)
+        voice = tts.create_voice(args.prompt_text, prompt_samples, sample_rate)
+        if voice.empty:
+            print("Failed to create a voice. Please read previous error messages.")
+            return
+
+        if args.save_voice:
+            voice.save(args.save_voice)
+            print(f"Saved the voice to {args.save_voice}")
+
+    first_chunk_time = None
+
+    # It is called whenever --max-num-sentences sentences are generated.
+    # You can play or stream the samples here before the whole text is done.
+    def generated_audio_callback(samples: np.ndarray, progress: float) -> int:
+        nonlocal first_chunk_time
+        if first_chunk_time is None:
+            first_chunk_time = time.time()
+        print(f"Progress {progress * 100:.1f}%, {samples.shape[0]} samples")
+
+        # 1 means to keep generating
+        # 0 means to stop generating
+        return 1
+
     start = time.time()
-    prompt_samples, sample_rate = read_wave(args.prompt_audio)
     audio = tts.generate(
         args.text,
-        args.prompt_text,
-        prompt_samples,
-        sample_rate,
+        voice,
         speed=args.speed,
         num_steps=args.zipvoice_num_steps,
+        callback=generated_audio_callback,
     )
     end = time.time()
 
@@ -286,6 +335,7 @@ def main():
     print(f"Saved to {args.output_filename}")
     print(f"The text is '{args.text}'")
     print(f"Elapsed seconds: {elapsed_seconds:.3f}")
+    print(f"Time to first audio in seconds: {first_chunk_time - start:.3f}")
     print(f"Audio duration in seconds: {audio_duration:.3f}")
     print(
         f"RTF: {elapsed_seconds:.3f}/{audio_duration:.3f} = {real_time_factor:.3f}"
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Copyright (c)  2025  Xiaomi Corporation
+
+"""
+This file shows how to use sherpa-onnx Python API for
+online/streaming speaker diarization.
+
+It reads a wave file in small pieces to simulate a live stream. Segments
+are printed as soon as they become final. Provisional segments may still
+change and are replaced on each call.
+
+Please see ./offline-speaker-diarization.py for how to download the models
+and the test wave file used below. Then run it:
+
+    python3 ./python-api-examples/online-speaker-diarization.py
+
+"""
+from pathlib import Path
+
+import sherpa_onnx
+import soundfile as sf
+
+
+def init_speaker_diarization(num_speakers: int = -1, cluster_threshold: float = 0.5):
+    """
+    Args:
+      num_speakers:
+        If you know the maximum number of speakers, then please
+        specify it. Otherwise, leave it to -1
+      cluster_threshold:
+        A smaller cluster_threshold leads to more clusters, i.e., more speakers.
+        A larger cluster_threshold leads to fewer clusters, i.e., fewer speakers.
+    """
+    segmentation_model = "./sherpa-onnx-pyannote-segmentation-3-0/model.onnx"
+    embedding_extractor_model = (
+        "./3dspeaker_speech_eres2net_base_sv_zh-cn_3dspeaker_16k.onnx"
+    )
+
+    config = sherpa_onnx.OnlineSpeakerDiarizationConfig(
+        segmentation=sherpa_onnx.OfflineSpeakerSegmentationModelConfig(
+            pyannote=sherpa_onnx.OfflineSpeakerSegmentationPyannoteModelConfig(
+                model=segmentation_model
+            ),
+        ),
+        embedding=sherpa_onnx.SpeakerEmbeddingExtractorConfig(
+            model=embedding_extractor_model
+        ),
+        clustering=sherpa_onnx.FastClusteringConfig(
+            num_clusters=num_speakers, threshold=cluster_threshold
+        ),
+        min_duration_on=0.3,
+        min_duration_off=0.5,
+    )
+    if not config.validate():
+        raise RuntimeError(
+            "Please check your config and make sure all required files exist"
+        )
+
+    return sherpa_onnx.OnlineSpeakerDiarization(config)
+
+
+def main():
+    wave_filename = "./0-four-speakers-zh.wav"
+    if not Path(wave_filename).is_file():
+        raise RuntimeError(f"{wave_filename} does not exist")
+
+    sd = init_speaker_diarization()
+
+    audio, sample_rate = sf.read(wave_filename, dtype="float32", always_2d=True)
+    audio = audio[:, 0]  # only use the first channel
+
+    if sample_rate != sd.sample_rate:
+        raise RuntimeError(
+            f"Expected samples rate: {sd.sample_rate}, given: {sample_rate}"
+        )
+
+    chunk_size = int(0.5 * sample_rate)  # 0.5 seconds
+    for start in range(0, audio.shape[0], chunk_size):
+        result = sd.accept_waveform(audio[start : start + chunk_size])
+        for r in result.finalized:
+            print(f"{r.start:.3f} -- {r.end:.3f} speaker_{r.speaker:02}")
+
+        if result.provisional:
+            last = result.provisional[-1]
+            print(
+                f"  (provisional) {last.start:.3f} -- {last.end:.3f} "
+                f"speaker_{last.speaker:02}"
+            )
+
+    result = sd.flush()
+    for r in result.finalized:
+        print(f"{r.start:.3f} -- {r.end:.3f} speaker_{r.speaker:02}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,15 @@ python3 ./python-api-examples/spoken-language-identification.py
   --whisper-decoder=sherpa-onnx-whisper-tiny/tiny-decoder.int8.onnx \
   --num-threads=1 \
   ./de-german.wav
+
+You can pass several wave files. They are processed in a single batch:
+
+python3 ./python-api-examples/spoken-language-identification.py
+  --whisper-encoder=sherpa-onnx-whisper-tiny/tiny-encoder.int8.onnx \
+  --whisper-decoder=sherpa-onnx-whisper-tiny/tiny-decoder.int8.onnx \
+  --top-k=3 \
+  ./de-german.wav \
+  ./en-english.wav
 """
 
 import argparse
@@ -82,9 +91,17 @@ def get_args():
     )
 
     parser.add_argument(
-        "sound_file",
+        "--top-k",
+        type=int,
+        default=1,
+        help="Number of most likely languages to show for each file",
+    )
+
+    parser.add_argument(
+        "sound_files",
         type=str,
-        help="The input sound file to identify. It must be of WAVE"
+        nargs="+",
+        help="The input sound files to identify. They must be of WAVE"
         "format with a single channel, and each sample has 16-bit, "
         "i.e., int16_t. "
         "The sample rate of the file can be arbitrary and does not need to "
@@ -143,20 +160,29 @@ def main():
     )
     slid = sherpa_onnx.SpokenLanguageIdentification(config)
 
-    samples, sample_rate = read_wave(args.sound_file)
-
     start_time = time.time()
-    stream = slid.create_stream()
-    stream.accept_waveform(sample_rate=sample_rate, waveform=samples)
-    lang = slid.compute(stream)
+    streams = []
+    audio_duration = 0
+    for sound_file in args.sound_files:
+        samples, sample_rate = read_wave(sound_file)
+        audio_duration += len(samples) / sample_rate
+
+        stream = slid.create_stream()
+        stream.accept_waveform(sample_rate=sample_rate, waveform=samples)
+        streams.append(stream)
+
+    results = slid.compute_batch(streams, top_k=args.top_k)
     end_time = time.time()
 
     elapsed_seconds = end_time - start_time
-    audio_duration = len(samples) / sample_rate
     real_time_factor = elapsed_seconds / audio_duration
 
-    logging.info(f"File: {args.sound_file}")
-    logging.info(f"Detected language: {lang}")
+    for sound_file, result in zip(args.sound_files, results):
+        logging.info(f"File: {sound_file}")
+        logging.info(f"Detected language: {result.lang}")
+        for lang, prob in zip(result.langs, result.probs):
+            logging.info(f"  {lang}: {prob:.3f}")
+
     logging.info(f"Elapsed seconds: {elapsed_seconds:.3f}")
     logging.info(f"Audio duration in seconds: {audio_duration:.3f}")
     logging.info(
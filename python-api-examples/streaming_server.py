@@ -51,6 +51,27 @@ To use a WeNet streaming Conformer CTC model, please use
 python3 ./python-api-examples/streaming_server.py \
   --tokens=./sherpa-onnx-zh-wenet-wenetspeech/tokens.txt \
   --wenet-ctc=./sherpa-onnx-zh-wenet-wenetspeech/model-streaming.onnx
+
+To skip silence with a VAD, add
+
+  --silero-vad-model=./silero_vad.onnx
+
+or
+
+  --ten-vad-model=./ten-vad.onnx
+
+Only speech detected by the VAD, plus --vad-pre-roll seconds of audio before
+it, is sent to the recognizer. The end of each speech segment is treated
+as an endpoint. Messages then contain "start_time", the time in seconds of
+the segment from the beginning of the connection, including skipped silence.
+
+Please download VAD models from
+https://github.com/k2-fsa/sherpa-onnx/releases/tag/asr-models
+
+On disconnection, the server logs the total duration of received audio,
+how much of it was sent to the recognizer, and the CPU time of the server
+process per second of received audio. Run the same clients against the
+server with and without a VAD model to measure the CPU savings.
 """
 
 import argparse
@@ -60,6 +81,7 @@ import json
 import logging
 import socket
 import ssl
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
@@ -309,6 +331,64 @@ def add_endpointing_args(parser: argparse.ArgumentParser):
     )
 
 
+def add_vad_args(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--silero-vad-model",
+        type=str,
+        default="",
+        help="""Optional. Path to silero_vad.onnx. If given, silence is
+        not sent to the recognizer.""",
+    )
+
+    parser.add_argument(
+        "--ten-vad-model",
+        type=str,
+        default="",
+        help="""Optional. Path to ten-vad.onnx. If given, silence is
+        not sent to the recognizer.""",
+    )
+
+    parser.add_argument(
+        "--vad-threshold",
+        type=float,
+        default=0.5,
+        help="Used only when a VAD model is given. Speech probability threshold",
+    )
+
+    parser.add_argument(
+        "--vad-min-silence-duration",
+        type=float,
+        default=0.5,
+        help="""Used only when a VAD model is given. Speech segments end
+        after this number of seconds of silence.""",
+    )
+
+    parser.add_argument(
+        "--vad-min-speech-duration",
+        type=float,
+        default=0.25,
+        help="""Used only when a VAD model is given. Speech shorter than this
+        number of seconds is ignored.""",
+    )
+
+    parser.add_argument(
+        "--vad-pre-roll",
+        type=float,
+        default=0.5,
+        help="""Used only when a VAD model is given. Number of seconds of audio
+        before the detected start of speech that is also sent to the
+        recognizer. It should be larger than --vad-min-speech-duration
+        since the VAD detects speech only after that duration.""",
+    )
+
+    parser.add_argument(
+        "--vad-pool-size",
+        type=int,
+        default=1,
+        help="Used only when a VAD model is given. Number of threads for VAD.",
+    )
+
+
 def get_args():
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -319,6 +399,7 @@ def get_args():
     add_endpointing_args(parser)
     add_hotwords_args(parser)
     add_blank_penalty_args(parser)
+    add_vad_args(parser)
 
     parser.add_argument(
         "--port",
@@ -483,10 +564,116 @@ def create_recognizer(args) -> sherpa_onnx.OnlineRecognizer:
     return recognizer
 
 
+def create_vad_config(args) -> Optional[sherpa_onnx.VadModelConfig]:
+    if not args.silero_vad_model and not args.ten_vad_model:
+        return None
+
+    config = sherpa_onnx.VadModelConfig()
+    if args.silero_vad_model:
+        vad = config.silero_vad
+        vad.model = args.silero_vad_model
+    else:
+        vad = config.ten_vad
+        vad.model = args.ten_vad_model
+
+    vad.threshold = args.vad_threshold
+    vad.min_silence_duration = args.vad_min_silence_duration
+    vad.min_speech_duration = args.vad_min_speech_duration
+    vad.max_speech_duration = args.rule3_min_utterance_length
+
+    config.sample_rate = args.sample_rate
+    config.num_threads = 1
+    config.provider = "cpu"
+
+    return config
+
+
 def format_timestamps(timestamps: List[float]) -> List[str]:
     return ["{:.3f}".format(t) for t in timestamps]
 
 
+class VadGate(object):
+    """Select the samples of a connection that are sent to the recognizer.
+
+    Samples are passed through while the VAD detects speech. While there is no
+    speech, only the last ``pre_roll`` samples are kept so that the beginning
+    of the next speech segment is not lost.
+    """
+
+    def __init__(
+        self,
+        config: sherpa_onnx.VadModelConfig,
+        pre_roll: float,
+    ):
+        """
+        Args:
+          config:
+            Config of the VAD model.
+          pre_roll:
+            Number of seconds of audio before the detected start of speech
+            that is also passed through.
+        """
+        self.vad = sherpa_onnx.VoiceActivityDetector(
+            config, buffer_size_in_seconds=30
+        )
+        self.sample_rate = config.sample_rate
+        self.pre_roll = int(pre_roll * self.sample_rate)
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.in_speech = False
+
+        self.num_received = 0
+        self.num_passed = 0
+
+        # Number of samples skipped before the current speech segment
+        self.num_skipped = 0
+
+    @property
+    def time_offset(self) -> float:
+        """Add it to the times of the recognizer to get times from the beginning
+        of the connection."""
+        return self.num_skipped / self.sample_rate
+
+    def process(self, samples: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """
+        Args:
+          samples:
+            1-D float32 array of received samples.
+        Returns:
+          Return a tuple containing:
+            - Samples to be sent to the recognizer. It may be empty.
+            - True if a speech segment ends with these samples.
+        """
+        self.num_received += samples.shape[0]
+
+        self.vad.accept_waveform(samples)
+
+        # We only need the state of the VAD, not its segments
+        while not self.vad.empty():
+            self.vad.pop()
+
+        if self.vad.is_speech_detected():
+            if not self.in_speech:
+                samples = np.concatenate([self.buffer, samples])
+                self.buffer = np.zeros(0, dtype=np.float32)
+                self.in_speech = True
+                self.num_skipped = (
+                    self.num_received - samples.shape[0] - self.num_passed
+                )
+            self.num_passed += samples.shape[0]
+            return samples, False
+
+        if self.in_speech:
+            # The trailing silence detected by the VAD is also passed
+            self.in_speech = False
+            self.num_passed += samples.shape[0]
+            return samples, True
+
+        if self.pre_roll > 0:
+            self.buffer = np.concatenate([self.buffer, samples])[-self.pre_roll :]
+
+        return np.zeros(0, dtype=np.float32), False
+
+
 class StreamingServer(object):
     def __init__(
         self,
@@ -499,6 +686,9 @@ class StreamingServer(object):
         max_active_connections: int,
         doc_root: str,
         certificate: Optional[str] = None,
+        vad_config: Optional[sherpa_onnx.VadModelConfig] = None,
+        vad_pre_roll: float = 0.5,
+        vad_pool_size: int = 1,
     ):
         """
         Args:
@@ -530,9 +720,29 @@ class StreamingServer(object):
             Optional. If not None, it will use secure websocket.
             You can use ./web/generate-certificate.py to generate
             it (the default generated filename is `cert.pem`).
+          vad_config:
+            Optional. If not None, each connection uses a VAD with this config
+            and only speech is sent to the recognizer.
+          vad_pre_roll:
+            Number of seconds of audio before the detected start of speech
+            that is also sent to the recognizer.
+          vad_pool_size:
+            Number of threads for running the VAD.
         """
         self.recognizer = recognizer
 
+        self.vad_config = vad_config
+        self.vad_pre_roll = vad_pre_roll
+        if vad_config is not None:
+            self.vad_pool = ThreadPoolExecutor(
+                max_workers=vad_pool_size,
+                thread_name_prefix="vad",
+            )
+
+        # Statistics for all connections, in samples
+        self.num_received_samples = 0
+        self.num_recognized_samples = 0
+
         self.certificate = certificate
         self.http_server = HttpServer(doc_root)
 
@@ -719,6 +929,23 @@ Go back to <a href="/streaming_record.html">/streaming_record.html</a>
                 f"Disconnected: {socket.remote_address}. "
                 f"Number of connections: {self.current_active_connections}/{self.max_active_connections}"  # noqa
             )
+            self.log_statistics()
+
+    def log_statistics(self):
+        if self.num_received_samples == 0:
+            return
+
+        received = self.num_received_samples / self.sample_rate
+        recognized = self.num_recognized_samples / self.sample_rate
+        cpu_time = time.process_time()
+
+        logging.info(
+            f"Audio received: {received:.1f} s, "
+            f"sent to the recognizer: {recognized:.1f} s "
+            f"({recognized / received * 100:.1f}%), "
+            f"CPU time: {cpu_time:.1f} s "
+            f"({cpu_time / received:.4f} s per second of audio)"
+        )
 
     async def handle_connection_impl(
         self,
@@ -739,43 +966,78 @@ Go back to <a href="/streaming_record.html">/streaming_record.html</a>
         stream = self.recognizer.create_stream()
         segment = 0
 
+        gate = None
+        if self.vad_config is not None:
+            gate = VadGate(self.vad_config, self.vad_pre_roll)
+
+        loop = asyncio.get_running_loop()
+
         while True:
             samples = await self.recv_audio_samples(socket)
             if samples is None:
                 break
 
+            self.num_received_samples += samples.shape[0]
+
+            speech_ended = False
+            if gate is not None:
+                samples, speech_ended = await loop.run_in_executor(
+                    self.vad_pool, gate.process, samples
+                )
+                if samples.shape[0] == 0:
+                    continue
+
+            self.num_recognized_samples += samples.shape[0]
+
             # TODO(fangjun): At present, we assume the sampling rate
             # of the received audio samples equal to --sample-rate
             stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
 
             while self.recognizer.is_ready(stream):
                 await self.compute_and_decode(stream)
-                result = self.recognizer.get_result(stream)
+                message = self.get_message(stream, segment, gate)
 
-                message = {
-                    "text": result,
-                    "segment": segment,
-                }
                 if self.recognizer.is_endpoint(stream):
                     self.recognizer.reset(stream)
                     segment += 1
 
                 await socket.send(json.dumps(message))
 
+            if speech_ended:
+                # The VAD detects the endpoint
+                message = self.get_message(stream, segment, gate)
+                self.recognizer.reset(stream)
+                if message["text"]:
+                    await socket.send(json.dumps(message))
+                    segment += 1
+
         tail_padding = np.zeros(int(self.sample_rate * 0.3)).astype(np.float32)
         stream.accept_waveform(sample_rate=self.sample_rate, waveform=tail_padding)
         stream.input_finished()
         while self.recognizer.is_ready(stream):
             await self.compute_and_decode(stream)
 
-        result = self.recognizer.get_result(stream)
+        message = self.get_message(stream, segment, gate)
+
+        await socket.send(json.dumps(message))
 
+    def get_message(
+        self,
+        stream: sherpa_onnx.OnlineStream,
+        segment: int,
+        gate: Optional[VadGate],
+    ) -> dict:
         message = {
-            "text": result,
+            "text": self.recognizer.get_result(stream),
             "segment": segment,
         }
 
-        await socket.send(json.dumps(message))
+        if gate is not None:
+            # The recognizer does not see skipped silence
+            start_time = self.recognizer.start_time(stream) + gate.time_offset
+            message["start_time"] = round(start_time, 3)
+
+        return message
 
     async def recv_audio_samples(
         self,
@@ -841,6 +1103,13 @@ def check_args(args):
     if args.decoding_method == "modified_beam_search":
         assert args.num_active_paths > 0, args.num_active_paths
 
+    if args.silero_vad_model and args.ten_vad_model:
+        raise ValueError("Please use only one of --silero-vad-model and --ten-vad-model")
+
+    for f in [args.silero_vad_model, args.ten_vad_model]:
+        if f and not Path(f).is_file():
+            raise ValueError(f"{f} does not exist")
+
 
 def main():
     args = get_args()
@@ -875,6 +1144,9 @@ def main():
         max_active_connections=max_active_connections,
         certificate=certificate,
         doc_root=doc_root,
+        vad_config=create_vad_config(args),
+        vad_pre_roll=args.vad_pre_roll,
+        vad_pool_size=args.vad_pool_size,
     )
     asyncio.run(server.run(port))
 
@@ -0,0 +1,53 @@
+// sherpa-onnx/csrc/context-graph-cache.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/context-graph-cache.h"
+
+#include <string>
+#include <utility>
+
+namespace sherpa_onnx {
+
+ContextGraphPtr ContextGraphCache::Get(const std::string &key) {
+  std::lock_guard<std::mutex> lock(mutex_);
+
+  auto it = index_.find(key);
+  if (it == index_.end()) {
+    return nullptr;
+  }
+
+  items_.splice(items_.begin(), items_, it->second);
+
+  return it->second->second;
+}
+
+void ContextGraphCache::Put(const std::string &key, ContextGraphPtr graph) {
+  if (capacity_ <= 0) {
+    return;
+  }
+
+  std::lock_guard<std::mutex> lock(mutex_);
+
+  auto it = index_.find(key);
+  if (it != index_.end()) {
+    it->second->second = std::move(graph);
+    items_.splice(items_.begin(), items_, it->second);
+    return;
+  }
+
+  if (static_cast<int32_t>(items_.size()) >= capacity_) {
+    index_.erase(items_.back().first);
+    items_.pop_back();
+  }
+
+  items_.emplace_front(key, std::move(graph));
+  index_[key] = items_.begin();
+}
+
+int32_t ContextGraphCache::Size() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return items_.size();
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,49 @@
+// sherpa-onnx/csrc/context-graph-cache.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_CONTEXT_GRAPH_CACHE_H_
+#define SHERPA_ONNX_CSRC_CONTEXT_GRAPH_CACHE_H_
+
+#include <cstdint>
+#include <list>
+#include <mutex>  // NOLINT
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+#include "sherpa-onnx/csrc/context-graph.h"
+
+namespace sherpa_onnx {
+
+// A thread-safe LRU cache of compiled context graphs, keyed by the
+// hotwords/keywords string given to CreateStream(), so that streams
+// with the same phrases share one graph. Do not put layered graphs
+// into it, since they cannot be shared between streams.
+class ContextGraphCache {
+ public:
+  explicit ContextGraphCache(int32_t capacity = 64) : capacity_(capacity) {}
+
+  // Return nullptr if key is not in the cache
+  ContextGraphPtr Get(const std::string &key);
+
+  // If the cache is full, the least recently used graph is removed
+  void Put(const std::string &key, ContextGraphPtr graph);
+
+  int32_t Size() const;
+
+ private:
+  using Item = std::pair<std::string, ContextGraphPtr>;
+
+  int32_t capacity_;
+
+  // Most recently used items are at the front
+  std::list<Item> items_;
+  std::unordered_map<std::string, std::list<Item>::iterator> index_;
+
+  mutable std::mutex mutex_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_CONTEXT_GRAPH_CACHE_H_
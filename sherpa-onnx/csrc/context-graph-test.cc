@@ -7,11 +7,13 @@
 #include <chrono>  // NOLINT
 #include <cmath>
 #include <map>
+#include <memory>
 #include <random>
 #include <string>
 #include <vector>
 
 #include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/context-graph-cache.h"
 #include "sherpa-onnx/csrc/macros.h"
 
 namespace sherpa_onnx {
@@ -74,6 +76,157 @@ TEST(ContextGraph, TestCustomizeNonStrict) {
   TestHelper(queries, 5, false);
 }
 
+static float Score(const ContextGraph &context_graph, const std::string &text,
+                   bool strict_mode) {
+  float total_scores = 0;
+  auto state = context_graph.Root();
+  for (auto q : text) {
+    auto res = context_graph.ForwardOneStep(state, q, strict_mode);
+    total_scores += std::get<0>(res);
+    state = std::get<1>(res);
+  }
+  auto res = context_graph.Finalize(state);
+  EXPECT_EQ(res.second->token, -1);
+  total_scores += res.first;
+  return total_scores;
+}
+
+// If all tokens have the same score, the layered graph should give the same
+// scores as a single graph containing the phrases of both layers
+static void TestLayeredHelper(const std::vector<std::string> &overlay_str,
+                              const std::vector<std::string> &base_str,
+                              const std::map<std::string, float> &queries,
+                              bool strict_mode) {
+  std::vector<std::vector<int32_t>> overlay_contexts;
+  for (const auto &s : overlay_str) {
+    overlay_contexts.emplace_back(s.begin(), s.end());
+  }
+
+  std::vector<std::vector<int32_t>> base_contexts;
+  for (const auto &s : base_str) {
+    base_contexts.emplace_back(s.begin(), s.end());
+  }
+
+  std::vector<std::vector<int32_t>> all_contexts = overlay_contexts;
+  all_contexts.insert(all_contexts.end(), base_contexts.begin(),
+                      base_contexts.end());
+
+  auto overlay = std::make_shared<ContextGraph>(overlay_contexts, 1);
+  auto base = std::make_shared<ContextGraph>(base_contexts, 1);
+  ContextGraph context_graph(overlay, base);
+  ContextGraph merged(all_contexts, 1);
+
+  for (const auto &iter : queries) {
+    EXPECT_EQ(Score(context_graph, iter.first, strict_mode), iter.second)
+        << iter.first;
+    EXPECT_EQ(Score(merged, iter.first, strict_mode), iter.second)
+        << iter.first;
+  }
+}
+
+static void TestLayeredHelper(const std::map<std::string, float> &queries,
+                              bool strict_mode) {
+  TestLayeredHelper({"S", "HE", "SHE", "SHELL"},
+                    {"HIS", "HERS", "HELLO", "THIS", "THEM"}, queries,
+                    strict_mode);
+}
+
+TEST(ContextGraph, TestLayered) {
+  auto queries = std::map<std::string, float>{
+      {"HEHERSHE", 14}, {"HERSHE", 12}, {"HISHE", 9},
+      {"SHED", 6},      {"SHELF", 6},   {"HELL", 2},
+      {"HELLO", 7},     {"DHRHISQ", 4}, {"THEN", 2}};
+  TestLayeredHelper(queries, true);
+}
+
+TEST(ContextGraph, TestLayeredNonStrict) {
+  auto queries = std::map<std::string, float>{
+      {"HEHERSHE", 7}, {"HERSHE", 5}, {"HISHE", 5},   {"SHED", 3}, {"SHELF", 3},
+      {"HELL", 2},     {"HELLO", 2},  {"DHRHISQ", 3}, {"THEN", 2}};
+  TestLayeredHelper(queries, false);
+}
+
+// A phrase of both layers is a suffix of longer phrases of either layer
+TEST(ContextGraph, TestLayeredOverlapping) {
+  std::vector<std::string> overlay_str({"BC", "ABC"});
+  std::vector<std::string> base_str({"BC", "XBC"});
+
+  auto queries = std::map<std::string, float>{
+      {"ABC", 5}, {"XBC", 5}, {"BC", 2}, {"ABCXBC", 10}, {"AXBC", 5}};
+  TestLayeredHelper(overlay_str, base_str, queries, true);
+
+  queries = std::map<std::string, float>{
+      {"ABC", 3}, {"XBC", 3}, {"BC", 2}, {"ABCXBC", 6}, {"AXBC", 3}};
+  TestLayeredHelper(overlay_str, base_str, queries, false);
+}
+
+// Streams own their layered graphs and share the two layers
+TEST(ContextGraph, TestLayeredPerStream) {
+  std::vector<std::string> overlay_str({"S", "HE", "SHE", "SHELL"});
+  std::vector<std::string> base_str({"HIS", "HERS", "HELLO", "THIS", "THEM"});
+
+  std::vector<std::vector<int32_t>> overlay_contexts;
+  for (const auto &s : overlay_str) {
+    overlay_contexts.emplace_back(s.begin(), s.end());
+  }
+
+  std::vector<std::vector<int32_t>> base_contexts;
+  for (const auto &s : base_str) {
+    base_contexts.emplace_back(s.begin(), s.end());
+  }
+
+  auto overlay = std::make_shared<ContextGraph>(overlay_contexts, 1);
+  auto base = std::make_shared<ContextGraph>(base_contexts, 1);
+
+  ContextGraph a(overlay, base);
+  ContextGraph b(overlay, base);
+
+  std::string text = "HEHERSHESHELLOTHISHISTHEMSHEHE";
+  const ContextState *sa = a.Root();
+  const ContextState *sb = b.Root();
+  float score_a = 0;
+  float score_b = 0;
+  for (auto c : text) {
+    auto ra = a.ForwardOneStep(sa, c);
+    score_a += std::get<0>(ra);
+    sa = std::get<1>(ra);
+
+    auto rb = b.ForwardOneStep(sb, c);
+    score_b += std::get<0>(rb);
+    sb = std::get<1>(rb);
+  }
+
+  EXPECT_EQ(score_a, score_b);
+  EXPECT_EQ(a.NumStates(), b.NumStates());
+  EXPECT_LE(a.NumStates(), overlay->NumStates() + base->NumStates());
+
+  // Decoding the same text again does not create new states
+  int32_t num_states = a.NumStates();
+  sa = a.Root();
+  for (auto c : text) {
+    sa = std::get<1>(a.ForwardOneStep(sa, c));
+  }
+  EXPECT_EQ(a.NumStates(), num_states);
+}
+
+TEST(ContextGraph, TestCache) {
+  ContextGraphCache cache(2);
+  auto a = std::make_shared<ContextGraph>();
+  auto b = std::make_shared<ContextGraph>();
+  auto c = std::make_shared<ContextGraph>();
+
+  cache.Put("a", a);
+  cache.Put("b", b);
+  EXPECT_EQ(cache.Get("a"), a);
+
+  // b is the least recently used one
+  cache.Put("c", c);
+  EXPECT_EQ(cache.Size(), 2);
+  EXPECT_EQ(cache.Get("b"), nullptr);
+  EXPECT_EQ(cache.Get("a"), a);
+  EXPECT_EQ(cache.Get("c"), c);
+}
+
 TEST(ContextGraph, Benchmark) {
   std::random_device rd;
   std::mt19937 mt(rd());
@@ -96,7 +249,75 @@ TEST(ContextGraph, Benchmark) {
         std::chrono::duration_cast<std::chrono::microseconds>(stop - start);
     SHERPA_ONNX_LOGE("Construct context graph for %d item takes %d us.", num,
                      static_cast<int32_t>(duration.count()));
+
+    // 10 per-stream phrases on top of the graph above
+    auto base = std::make_shared<ContextGraph>(contexts, 1);
+    std::vector<std::vector<int32_t>> overlay_contexts(contexts.begin(),
+                                                       contexts.begin() + 10);
+    start = std::chrono::high_resolution_clock::now();
+    auto layered = ContextGraph(
+        std::make_shared<ContextGraph>(overlay_contexts, 1), base);
+    stop = std::chrono::high_resolution_clock::now();
+    duration =
+        std::chrono::duration_cast<std::chrono::microseconds>(stop - start);
+    SHERPA_ONNX_LOGE(
+        "Construct layered context graph for 10 + %d item takes %d us.", num,
+        static_cast<int32_t>(duration.count()));
   }
 }
 
+// It simulates the context graph traversal of modified_beam_search, where
+// ForwardOneStep() is called for every (hypothesis, token) pair of each frame
+TEST(ContextGraph, BenchmarkForwardOneStep) {
+  std::mt19937 mt(20250101);
+  std::uniform_int_distribution<int32_t> token_dist(1, 500);
+  std::uniform_int_distribution<int32_t> len_dist(3, 8);
+
+  std::vector<std::vector<int32_t>> contexts;
+  for (int32_t i = 0; i < 10000; ++i) {
+    std::vector<int32_t> tmp;
+    int32_t word_len = len_dist(mt);
+    for (int32_t j = 0; j < word_len; ++j) {
+      tmp.push_back(token_dist(mt));
+    }
+    contexts.push_back(std::move(tmp));
+  }
+
+  ContextGraph context_graph(contexts, 1);
+
+  int32_t num_frames = 10000;
+  int32_t num_active_paths = 4;
+
+  std::vector<const ContextState *> states(num_active_paths,
+                                           context_graph.Root());
+  std::uniform_int_distribution<int32_t> hyp_dist(0, num_active_paths - 1);
+
+  float total_score = 0;
+  auto start = std::chrono::high_resolution_clock::now();
+  for (int32_t t = 0; t != num_frames; ++t) {
+    std::vector<const ContextState *> next_states;
+    next_states.reserve(num_active_paths * num_active_paths);
+    for (int32_t h = 0; h != num_active_paths; ++h) {
+      for (int32_t k = 0; k != num_active_paths; ++k) {
+        auto res = context_graph.ForwardOneStep(states[h], token_dist(mt));
+        total_score += std::get<0>(res);
+        next_states.push_back(std::get<1>(res));
+      }
+    }
+
+    for (int32_t h = 0; h != num_active_paths; ++h) {
+      states[h] = next_states[hyp_dist(mt) * num_active_paths + h];
+    }
+  }
+  auto stop = std::chrono::high_resolution_clock::now();
+  auto duration =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start);
+
+  SHERPA_ONNX_LOGE(
+      "%d frames x %d hyps x %d tokens over %d states takes %d us. Score: %.3f",
+      num_frames, num_active_paths, num_active_paths,
+      context_graph.NumStates(), static_cast<int32_t>(duration.count()),
+      total_score);
+}
+
 }  // namespace sherpa_onnx
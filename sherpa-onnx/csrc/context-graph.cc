@@ -6,7 +6,8 @@
 
 #include <algorithm>
 #include <cassert>
-#include <queue>
+#include <map>
+#include <memory>
 #include <string>
 #include <tuple>
 #include <utility>
@@ -14,10 +15,23 @@
 #include "sherpa-onnx/csrc/macros.h"
 
 namespace sherpa_onnx {
+namespace {
+
+// A trie node used only during construction. The trie is converted to
+// the flat node array of ContextGraph afterwards.
+struct TrieNode {
+  ContextState state;
+  std::map<int32_t, std::unique_ptr<TrieNode>> next;
+
+  explicit TrieNode(const ContextState &state) : state(state) {}
+};
+
+}  // namespace
+
 void ContextGraph::Build(const std::vector<std::vector<int32_t>> &token_ids,
                          const std::vector<float> &scores,
                          const std::vector<std::string> &phrases,
-                         const std::vector<float> &ac_thresholds) const {
+                         const std::vector<float> &ac_thresholds) {
   if (!scores.empty()) {
     SHERPA_ONNX_CHECK_EQ(token_ids.size(), scores.size());
   }
@@ -27,8 +41,12 @@ void ContextGraph::Build(const std::vector<std::vector<int32_t>> &token_ids,
   if (!ac_thresholds.empty()) {
     SHERPA_ONNX_CHECK_EQ(token_ids.size(), ac_thresholds.size());
   }
+
+  TrieNode root(ContextState(-1, 0, 0, 0));
+  int32_t num_nodes = 1;
+
   for (int32_t i = 0; i < static_cast<int32_t>(token_ids.size()); ++i) {
-    auto node = root_.get();
+    auto node = &root;
     float score = scores.empty() ? 0.0f : scores[i];
     score = score == 0.0f ? context_score_ : score;
     float ac_threshold = ac_thresholds.empty() ? 0.0f : ac_thresholds[i];
@@ -39,47 +57,112 @@ void ContextGraph::Build(const std::vector<std::vector<int32_t>> &token_ids,
       int32_t token = token_ids[i][j];
       if (0 == node->next.count(token)) {
         bool is_end = j == (static_cast<int32_t>(token_ids[i].size()) - 1);
-        node->next[token] = std::make_unique<ContextState>(
-            token, score, node->node_score + score,
-            is_end ? node->node_score + score : 0, j + 1,
+        node->next[token] = std::make_unique<TrieNode>(ContextState(
+            token, score, node->state.node_score + score,
+            is_end ? node->state.node_score + score : 0, j + 1,
             is_end ? ac_threshold : 0.0f, is_end,
-            is_end ? phrase : std::string());
+            is_end ? phrase : std::string()));
+        ++num_nodes;
       } else {
-        float token_score = std::max(score, node->next[token]->token_score);
-        node->next[token]->token_score = token_score;
-        float node_score = node->node_score + token_score;
-        node->next[token]->node_score = node_score;
-        bool is_end = (j == static_cast<int32_t>(token_ids[i].size()) - 1) ||
-                      node->next[token]->is_end;
-        node->next[token]->output_score = is_end ? node_score : 0.0f;
-        node->next[token]->is_end = is_end;
+        auto &next = node->next[token]->state;
+        float token_score = std::max(score, next.token_score);
+        next.token_score = token_score;
+        float node_score = node->state.node_score + token_score;
+        next.node_score = node_score;
+        bool is_end =
+            (j == static_cast<int32_t>(token_ids[i].size()) - 1) || next.is_end;
+        next.output_score = is_end ? node_score : 0.0f;
+        next.is_end = is_end;
         if (j == static_cast<int32_t>(token_ids[i].size()) - 1) {
-          node->next[token]->phrase = phrase;
-          node->next[token]->ac_threshold = ac_threshold;
+          next.phrase = phrase;
+          next.ac_threshold = ac_threshold;
         }
       }
       node = node->next[token].get();
     }
   }
+
+  // Convert the trie to a flat array in breadth-first order, so that
+  // children of a state are contiguous and sorted by token
+  nodes_.reserve(num_nodes);
+  std::vector<const TrieNode *> trie_nodes;
+  trie_nodes.reserve(num_nodes);
+
+  nodes_.push_back(std::move(root.state));
+  trie_nodes.push_back(&root);
+
+  for (int32_t i = 0; i < static_cast<int32_t>(trie_nodes.size()); ++i) {
+    const TrieNode *node = trie_nodes[i];
+    nodes_[i].first_child = nodes_.size();
+    nodes_[i].num_children = node->next.size();
+
+    for (const auto &kv : node->next) {
+      nodes_.push_back(std::move(kv.second->state));
+      trie_nodes.push_back(kv.second.get());
+    }
+  }
+
+  tokens_.reserve(nodes_.size());
+  for (const auto &s : nodes_) {
+    tokens_.push_back(s.token);
+  }
+
+  if (!root.next.empty()) {
+    root_children_.resize(root.next.rbegin()->first + 1, 0);
+    for (int32_t i = 0; i != nodes_[0].num_children; ++i) {
+      int32_t k = nodes_[0].first_child + i;
+      root_children_[tokens_[k]] = k;
+    }
+  }
+
   FillFailOutput();
 }
 
+ContextGraph::ContextGraph(ContextGraphPtr overlay, ContextGraphPtr base)
+    : overlay_(std::move(overlay)), base_(std::move(base)) {
+  layered_root_ = GetLayeredState(overlay_->Root(), base_->Root());
+}
+
+const ContextState *ContextGraph::GetChild(const ContextState *state,
+                                           int32_t token) const {
+  const ContextState *root = nodes_.data();
+  if (state == root) {
+    if (token < 0 || token >= static_cast<int32_t>(root_children_.size()) ||
+        root_children_[token] == 0) {
+      return nullptr;
+    }
+    return root + root_children_[token];
+  }
+
+  const int32_t *begin = tokens_.data() + state->first_child;
+  const int32_t *end = begin + state->num_children;
+  const int32_t *it = std::lower_bound(begin, end, token);
+
+  return (it != end && *it == token) ? root + (it - tokens_.data())
+                                     : nullptr;
+}
+
 std::tuple<float, const ContextState *, const ContextState *>
 ContextGraph::ForwardOneStep(const ContextState *state, int32_t token,
                              bool strict_mode /*= true*/) const {
-  const ContextState *node = nullptr;
+  if (base_) {
+    return LayeredForwardOneStep(state, token, strict_mode);
+  }
+
+  const ContextState *node = GetChild(state, token);
   float score = 0;
-  if (1 == state->next.count(token)) {
-    node = state->next.at(token).get();
+  if (node) {
     score = node->token_score;
   } else {
     node = state->fail;
-    while (0 == node->next.count(token)) {
+    const ContextState *next = GetChild(node, token);
+    while (!next) {
       node = node->fail;
+      next = GetChild(node, token);
       if (-1 == node->token) break;  // root
     }
-    if (1 == node->next.count(token)) {
-      node = node->next.at(token).get();
+    if (next) {
+      node = next;
     }
     score = node->node_score - state->node_score;
   }
@@ -98,16 +181,122 @@ ContextGraph::ForwardOneStep(const ContextState *state, int32_t token,
         node->is_end ? node->node_score
                      : (node->output != nullptr ? node->output->node_score
                                                 : node->node_score);
-    return std::make_tuple(score + output_score - node->node_score, root_.get(),
+    return std::make_tuple(score + output_score - node->node_score, Root(),
+                           matched_node);
+  }
+  return std::make_tuple(score + node->output_score, node, matched_node);
+}
+
+std::tuple<float, const ContextState *, const ContextState *>
+ContextGraph::LayeredForwardOneStep(const ContextState *state, int32_t token,
+                                    bool strict_mode) const {
+  auto s = static_cast<const LayeredContextState *>(state);
+
+  // Each layer moves in strict mode. The non-strict mode is applied to
+  // the merged state below.
+  auto overlay_state =
+      std::get<1>(overlay_->ForwardOneStep(s->overlay_state, token));
+  auto base_state = std::get<1>(base_->ForwardOneStep(s->base_state, token));
+
+  const LayeredContextState *node =
+      GetLayeredState(overlay_state, base_state);
+
+  float score = node->node_score - state->node_score;
+
+  const ContextState *matched_node =
+      node->is_end ? node : (node->output != nullptr ? node->output : nullptr);
+
+  if (!strict_mode && node->output_score != 0) {
+    SHERPA_ONNX_CHECK(nullptr != matched_node);
+    float output_score =
+        node->is_end ? node->node_score
+                     : (node->output != nullptr ? node->output->node_score
+                                                : node->node_score);
+    return std::make_tuple(score + output_score - node->node_score, Root(),
                            matched_node);
   }
   return std::make_tuple(score + node->output_score, node, matched_node);
 }
 
+const LayeredContextState *ContextGraph::GetLayeredState(
+    const ContextState *o, const ContextState *b) const {
+  auto &ans = layered_states_[{o, b}];
+  if (ans) {
+    return ans.get();
+  }
+
+  ans = std::make_unique<LayeredContextState>();
+  ans->overlay_state = o;
+  ans->base_state = b;
+
+  // Both states are suffixes of the decoded tokens, so the merged state is
+  // the longer one of the two
+  const ContextState *deeper = o->level >= b->level ? o : b;
+  bool same_level = o->level == b->level;
+
+  ans->token = deeper->token;
+  ans->token_score = deeper->token_score;
+  ans->level = deeper->level;
+  ans->node_score =
+      same_level ? std::max(o->node_score, b->node_score) : deeper->node_score;
+
+  const ContextState *end = nullptr;
+  if (o->level == ans->level && o->is_end) {
+    end = o;
+  } else if (b->level == ans->level && b->is_end) {
+    end = b;
+  }
+
+  if (end) {
+    ans->is_end = true;
+    ans->phrase = end->phrase;
+    ans->ac_threshold = end->ac_threshold;
+  }
+
+  // The output of the merged state is the longest matched phrase that is
+  // shorter than the merged state
+  for (const ContextState *p : {o, b}) {
+    const ContextState *output =
+        (p->level < ans->level && p->is_end) ? p : p->output;
+    if (output && (!ans->output || output->level > ans->output->level)) {
+      ans->output = output;
+    }
+  }
+
+  // The output score is the sum of the scores of all phrases that are
+  // suffixes of the merged state. Merge the output chains of the two layers
+  // by level. A phrase in both layers is at the same level in both chains
+  // and is counted only once.
+  ans->output_score = ans->is_end ? ans->node_score : 0;
+  const ContextState *p = o->is_end ? o : o->output;
+  const ContextState *q = b->is_end ? b : b->output;
+  while (p || q) {
+    const ContextState *s = nullptr;
+    if (p && q && p->level == q->level) {
+      s = p->node_score >= q->node_score ? p : q;
+      p = p->output;
+      q = q->output;
+    } else if (!q || (p && p->level > q->level)) {
+      s = p;
+      p = p->output;
+    } else {
+      s = q;
+      q = q->output;
+    }
+
+    // The phrase ending at the merged state itself is counted above
+    if (s->level < ans->level) {
+      ans->output_score += s->node_score;
+    }
+  }
+
+  return ans.get();
+}
+
 std::pair<float, const ContextState *> ContextGraph::Finalize(
     const ContextState *state) const {
   float score = -state->node_score;
-  return std::make_pair(score, root_.get());
+  return std::make_pair(score, Root());
 }
 
 std::pair<bool, const ContextState *> ContextGraph::IsMatched(
@@ -126,29 +315,37 @@ std::pair<bool, const ContextState *> ContextGraph::IsMatched(
   return std::make_pair(status, node);
 }
 
-void ContextGraph::FillFailOutput() const {
-  std::queue<const ContextState *> node_queue;
-  for (auto &kv : root_->next) {
-    kv.second->fail = root_.get();
-    node_queue.push(kv.second.get());
-  }
-  while (!node_queue.empty()) {
-    auto current_node = node_queue.front();
-    node_queue.pop();
-    for (auto &kv : current_node->next) {
-      auto fail = current_node->fail;
-      if (1 == fail->next.count(kv.first)) {
-        fail = fail->next.at(kv.first).get();
+void ContextGraph::FillFailOutput() {
+  ContextState *root = nodes_.data();
+  root->fail = root;
+
+  // nodes_ is in breadth-first order, so the fail and output links of
+  // states with a smaller level are always computed first
+  for (int32_t i = 0; i < static_cast<int32_t>(nodes_.size()); ++i) {
+    const ContextState *current_node = &nodes_[i];
+    for (int32_t k = 0; k != current_node->num_children; ++k) {
+      ContextState *child = &nodes_[current_node->first_child + k];
+      if (current_node == root) {
+        child->fail = root;
+        continue;
+      }
+
+      int32_t token = child->token;
+      const ContextState *fail = current_node->fail;
+      const ContextState *next = GetChild(fail, token);
+      if (next) {
+        fail = next;
       } else {
         fail = fail->fail;
-        while (0 == fail->next.count(kv.first)) {
+        next = GetChild(fail, token);
+        while (!next) {
           fail = fail->fail;
+          next = GetChild(fail, token);
           if (-1 == fail->token) break;
         }
-        if (1 == fail->next.count(kv.first))
-          fail = fail->next.at(kv.first).get();
+        if (next) fail = next;
       }
-      kv.second->fail = fail;
+      child->fail = fail;
       // fill the output arc
       auto output = fail;
       while (!output->is_end) {
@@ -158,9 +355,8 @@ void ContextGraph::FillFailOutput() const {
           break;
         }
       }
-      kv.second->output = output;
-      kv.second->output_score += output == nullptr ? 0 : output->output_score;
-      node_queue.push(kv.second.get());
+      child->output = output;
+      child->output_score += output == nullptr ? 0 : output->output_score;
     }
   }
 }
@@ -28,10 +28,14 @@ struct ContextState {
   float ac_threshold;
   bool is_end;
   std::string phrase;
-  std::unordered_map<int32_t, std::unique_ptr<ContextState>> next;
   const ContextState *fail = nullptr;
   const ContextState *output = nullptr;
 
+  // Children of this state are stored contiguously in the node array of
+  // the graph, sorted by token. first_child is the index of the first one.
+  int32_t first_child = 0;
+  int32_t num_children = 0;
+
   ContextState() = default;
   ContextState(int32_t token, float token_score, float node_score,
                float output_score, int32_t level = 0, float ac_threshold = 0.0f,
@@ -46,6 +50,13 @@ struct ContextState {
         phrase(phrase) {}
 };
 
+// A state of a layered ContextGraph. It is a pair of states, one from each
+// layer.
+struct LayeredContextState : public ContextState {
+  const ContextState *overlay_state = nullptr;
+  const ContextState *base_state = nullptr;
+};
+
 class ContextGraph {
  public:
   ContextGraph() = default;
@@ -55,8 +66,6 @@ class ContextGraph {
                const std::vector<std::string> &phrases = {},
                const std::vector<float> &ac_thresholds = {})
       : context_score_(context_score), ac_threshold_(ac_threshold) {
-    root_ = std::make_unique<ContextState>(-1, 0, 0, 0);
-    root_->fail = root_.get();
     Build(token_ids, scores, phrases, ac_thresholds);
   }
 
@@ -65,6 +74,23 @@ class ContextGraph {
       : ContextGraph(token_ids, context_score, 0.0f, scores,
                      std::vector<std::string>(), std::vector<float>()) {}
 
+  /* Create a graph that contains the phrases of both graphs without copying
+   * them. It is intended for per-stream phrases (overlay) on top of a shared
+   * default graph (base), so that the cost of creating it depends only on
+   * the size of overlay.
+   *
+   * States of the resulting graph are pairs of states of the two graphs and
+   * are created on demand during decoding. If a prefix exists in both graphs,
+   * the larger score of the two is used.
+   *
+   * Since ForwardOneStep() may create states, a layered graph must not be
+   * shared between streams. Create one for each stream instead; the two
+   * graphs it refers to can be shared. The number of states it creates is
+   * at most NumStates() of overlay plus NumStates() of base, since one of
+   * the two states of a pair always determines the other one.
+   */
+  ContextGraph(ContextGraphPtr overlay, ContextGraphPtr base);
+
   std::tuple<float, const ContextState *, const ContextState *> ForwardOneStep(
       const ContextState *state, int32_t token_id,
       bool strict_mode = true) const;
@@ -75,17 +101,75 @@ class ContextGraph {
   std::pair<float, const ContextState *> Finalize(
       const ContextState *state) const;
 
-  const ContextState *Root() const { return root_.get(); }
+  const ContextState *Root() const {
+    if (base_) {
+      return layered_root_;
+    }
+    return nodes_.empty() ? nullptr : nodes_.data();
+  }
+
+  // Number of states. For a layered graph, it is the number of states
+  // created so far.
+  int32_t NumStates() const {
+    return base_ ? layered_states_.size() : nodes_.size();
+  }
 
  private:
-  float context_score_;
-  float ac_threshold_;
-  std::unique_ptr<ContextState> root_;
+  struct StatePairHash {
+    std::size_t operator()(
+        const std::pair<const ContextState *, const ContextState *> &p) const {
+      std::size_t h = std::hash<const ContextState *>()(p.first);
+      return h ^ (std::hash<const ContextState *>()(p.second) + 0x9e3779b9 +
+                  (h << 6) + (h >> 2));
+    }
+  };
+
+  // Return the state of a layered graph for the given pair of states.
+  // It is created if it does not exist. It is not thread-safe.
+  const LayeredContextState *GetLayeredState(const ContextState *overlay_state,
+                                             const ContextState *base_state)
+      const;
+
+  std::tuple<float, const ContextState *, const ContextState *>
+  LayeredForwardOneStep(const ContextState *state, int32_t token_id,
+                        bool strict_mode) const;
+
+  // Return nullptr if state has no child with the given token
+  const ContextState *GetChild(const ContextState *state,
+                               int32_t token) const;
+
   void Build(const std::vector<std::vector<int32_t>> &token_ids,
              const std::vector<float> &scores,
              const std::vector<std::string> &phrases,
-             const std::vector<float> &ac_thresholds) const;
-  void FillFailOutput() const;
+             const std::vector<float> &ac_thresholds);
+
+  void FillFailOutput();
+
+  float context_score_ = 0;
+  float ac_threshold_ = 0;
+
+  // All states in breadth-first order. nodes_[0] is the root.
+  // It is not changed after construction, so pointers to its elements
+  // are valid during the lifetime of the graph.
+  std::vector<ContextState> nodes_;
+
+  // tokens_[i] is nodes_[i].token. Children are searched in it so that
+  // a lookup only touches a small contiguous block of memory.
+  std::vector<int32_t> tokens_;
+
+  // Index into nodes_ of the child of the root for each token, or 0 if
+  // there is no such child. Every failure chain ends at the root, so
+  // children of the root are looked up most often.
+  std::vector<int32_t> root_children_;
+
+  // For layered graphs only
+  ContextGraphPtr overlay_;
+  ContextGraphPtr base_;
+  const ContextState *layered_root_ = nullptr;
+  mutable std::unordered_map<
+      std::pair<const ContextState *, const ContextState *>,
+      std::unique_ptr<LayeredContextState>, StatePairHash>
+      layered_states_;
 };
 
 }  // namespace sherpa_onnx
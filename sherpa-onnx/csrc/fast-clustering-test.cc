@@ -66,4 +66,35 @@ TEST(FastClustering, TestClusteringWithThreshold) {
   }
 }
 
+TEST(FastClustering, TestClusterIncrementally) {
+  std::vector<float> features = {
+      0.2,  0.3,   // cluster 0
+      0.3,  -0.4,  // cluster 1
+      -0.1, -0.2,  // cluster 2
+      -0.3, -0.5,  // cluster 2
+      0.1,  -0.2,  // cluster 1
+      0.1,  0.2,   // cluster 0
+      -0.8, 1.9,   // cluster 3
+      -0.4, -0.6,  // cluster 2
+      -0.7, 0.9,   // cluster 3
+  };
+
+  FastClusteringConfig config;
+  config.threshold = 0.2;
+
+  FastClustering clustering(config);
+
+  // Process the features in two windows
+  auto labels = clustering.ClusterIncrementally(features.data(), 5, 2);
+  EXPECT_EQ(labels, (std::vector<int32_t>{0, 1, 2, 2, 1}));
+  EXPECT_EQ(clustering.NumClusters(), 3);
+
+  labels = clustering.ClusterIncrementally(features.data() + 10, 4, 2);
+  EXPECT_EQ(labels, (std::vector<int32_t>{0, 3, 2, 3}));
+  EXPECT_EQ(clustering.NumClusters(), 4);
+
+  clustering.Reset();
+  EXPECT_EQ(clustering.NumClusters(), 0);
+}
+
 }  // namespace sherpa_onnx
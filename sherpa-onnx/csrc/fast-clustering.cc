@@ -4,13 +4,22 @@
 
 #include "sherpa-onnx/csrc/fast-clustering.h"
 
+#include <algorithm>
 #include <vector>
 
 #include "Eigen/Dense"
 #include "fastcluster-all-in-one.h"  // NOLINT
+#include "sherpa-onnx/csrc/macros.h"
 
 namespace sherpa_onnx {
 
+using RowMajorMatrix =
+    Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+// Number of rows/columns of a block of the similarity matrix
+// that is computed with a single matrix multiplication
+static constexpr int32_t kBlockSize = 256;
+
 class FastClustering::Impl {
  public:
   explicit Impl(const FastClusteringConfig &config) : config_(config) {}
@@ -21,33 +30,96 @@ class FastClustering::Impl {
       return {};
     }
 
-    if (num_rows == 1) {
-      return {0};
+    Eigen::Map<RowMajorMatrix> m(features, num_rows, num_cols);
+    m.rowwise().normalize();
+
+    return ClusterNormalized(m, config_.num_clusters);
+  }
+
+  std::vector<int32_t> ClusterIncrementally(float *features, int32_t num_rows,
+                                            int32_t num_cols) {
+    if (num_rows <= 0) {
+      return {};
     }
 
-    Eigen::Map<
-        Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>>
-        m(features, num_rows, num_cols);
+    if (!centroids_.empty() && centroids_[0].size() != num_cols) {
+      SHERPA_ONNX_LOGE(
+          "Feature dimension changed from %d to %d. Please call Reset() "
+          "first",
+          static_cast<int32_t>(centroids_[0].size()), num_cols);
+      return {};
+    }
+
+    Eigen::Map<RowMajorMatrix> m(features, num_rows, num_cols);
     m.rowwise().normalize();
 
-    std::vector<double> distance((num_rows * (num_rows - 1)) / 2);
+    // The number of speakers in a window is usually smaller than
+    // config_.num_clusters, so we always use the threshold inside a window.
+    // config_.num_clusters limits only the total number of clusters.
+    std::vector<int32_t> local_labels = ClusterNormalized(m, -1);
+
+    int32_t num_local_clusters =
+        *std::max_element(local_labels.begin(), local_labels.end()) + 1;
 
-    int32_t k = 0;
+    std::vector<Eigen::VectorXf> local_sums(num_local_clusters,
+                                            Eigen::VectorXf::Zero(num_cols));
     for (int32_t i = 0; i != num_rows; ++i) {
-      auto v = m.row(i);
-      for (int32_t j = i + 1; j != num_rows; ++j) {
-        double cosine_similarity = v.dot(m.row(j));
-        double consine_dissimilarity = 1 - cosine_similarity;
+      local_sums[local_labels[i]] += m.row(i).transpose();
+    }
 
-        if (consine_dissimilarity < 0) {
-          consine_dissimilarity = 0;
+    std::vector<int32_t> local_to_global(num_local_clusters);
+    for (int32_t c = 0; c != num_local_clusters; ++c) {
+      Eigen::VectorXf v = local_sums[c].normalized();
+
+      int32_t best = -1;
+      float best_distance = 0;
+      for (int32_t k = 0; k != static_cast<int32_t>(centroids_.size()); ++k) {
+        float d = 1 - v.dot(centroids_[k].normalized());
+        if (best == -1 || d < best_distance) {
+          best = k;
+          best_distance = d;
         }
+      }
 
-        distance[k] = consine_dissimilarity;
-        ++k;
+      bool is_full = config_.num_clusters > 0 &&
+                     static_cast<int32_t>(centroids_.size()) >=
+                         config_.num_clusters;
+
+      if (best == -1 || (best_distance >= config_.threshold && !is_full)) {
+        best = centroids_.size();
+        centroids_.push_back(Eigen::VectorXf::Zero(num_cols));
       }
+
+      centroids_[best] += local_sums[c];
+      local_to_global[c] = best;
+    }
+
+    std::vector<int32_t> labels(num_rows);
+    for (int32_t i = 0; i != num_rows; ++i) {
+      labels[i] = local_to_global[local_labels[i]];
+    }
+
+    return labels;
+  }
+
+  void Reset() {
+    centroids_.clear();
+  }
+
+  int32_t NumClusters() const { return centroids_.size(); }
+
+ private:
+  // Each row of m has been normalized
+  std::vector<int32_t> ClusterNormalized(const Eigen::Map<RowMajorMatrix> &m,
+                                         int32_t num_clusters) const {
+    int32_t num_rows = m.rows();
+
+    if (num_rows == 1) {
+      return {0};
     }
 
+    std::vector<double> distance = ComputeDistance(m);
+
     std::vector<int32_t> merge(2 * (num_rows - 1));
     std::vector<double> height(num_rows - 1);
 
@@ -56,8 +128,9 @@ class FastClustering::Impl {
                                 merge.data(), height.data());
 
     std::vector<int32_t> labels(num_rows);
-    if (config_.num_clusters > 0) {
-      fastclustercpp::cutree_k(num_rows, merge.data(), config_.num_clusters,
+    if (num_clusters > 0) {
+      fastclustercpp::cutree_k(num_rows, merge.data(),
+                               std::min(num_clusters, num_rows),
                                labels.data());
     } else {
       fastclustercpp::cutree_cdist(num_rows, merge.data(), height.data(),
@@ -67,8 +140,58 @@ class FastClustering::Impl {
     return labels;
   }
 
+  // Return the condensed cosine dissimilarity matrix, i.e., the upper
+  // triangular part of it in row major, as required by hclust_fast().
+  //
+  // The similarity matrix is computed block by block with matrix
+  // multiplications so that the extra memory is independent of the
+  // number of rows.
+  static std::vector<double> ComputeDistance(
+      const Eigen::Map<RowMajorMatrix> &m) {
+    int64_t num_rows = m.rows();
+
+    std::vector<double> distance((num_rows * (num_rows - 1)) / 2);
+
+    Eigen::MatrixXf similarity;
+    for (int64_t r = 0; r < num_rows; r += kBlockSize) {
+      int64_t nr = std::min<int64_t>(kBlockSize, num_rows - r);
+
+      for (int64_t c = r; c < num_rows; c += kBlockSize) {
+        int64_t nc = std::min<int64_t>(kBlockSize, num_rows - c);
+
+        similarity.noalias() =
+            m.middleRows(r, nr) * m.middleRows(c, nc).transpose();
+
+        for (int64_t i = 0; i != nr; ++i) {
+          int64_t row = r + i;
+          int64_t start = std::max<int64_t>(0, row + 1 - c);
+
+          // index of the pair (row, c + start) in the condensed matrix
+          int64_t k = row * num_rows - row * (row + 1) / 2 +
+                      (c + start - row - 1);
+
+          for (int64_t j = start; j < nc; ++j, ++k) {
+            double cosine_dissimilarity = 1 - similarity(i, j);
+
+            if (cosine_dissimilarity < 0) {
+              cosine_dissimilarity = 0;
+            }
+
+            distance[k] = cosine_dissimilarity;
+          }
+        }
+      }
+    }
+
+    return distance;
+  }
+
  private:
   FastClusteringConfig config_;
+
+  // For ClusterIncrementally().
+  // centroids_[k] is the sum of the normalized features of cluster k
+  std::vector<Eigen::VectorXf> centroids_;
 };
 
 FastClustering::FastClustering(const FastClusteringConfig &config)
@@ -80,4 +203,15 @@ std::vector<int32_t> FastClustering::Cluster(float *features, int32_t num_rows,
                                              int32_t num_cols) const {
   return impl_->Cluster(features, num_rows, num_cols);
 }
+
+std::vector<int32_t> FastClustering::ClusterIncrementally(float *features,
+                                                          int32_t num_rows,
+                                                          int32_t num_cols) {
+  return impl_->ClusterIncrementally(features, num_rows, num_cols);
+}
+
+void FastClustering::Reset() { impl_->Reset(); }
+
+int32_t FastClustering::NumClusters() const { return impl_->NumClusters(); }
+
 }  // namespace sherpa_onnx
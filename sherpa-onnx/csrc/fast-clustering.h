@@ -34,6 +34,33 @@ class FastClustering {
   std::vector<int32_t> Cluster(float *features, int32_t num_rows,
                                int32_t num_cols) const;
 
+  /**
+   * Incremental version of Cluster() for processing long recordings in
+   * windows.
+   *
+   * The features of each call are clustered with the threshold and the
+   * resulting clusters are merged into the clusters of previous calls
+   * whose centroids are within the threshold; otherwise, new clusters are
+   * created. If num_clusters in the config is greater than 0, it is the
+   * maximum number of clusters; after that, each cluster is assigned to
+   * the nearest existing one.
+   *
+   * Only one centroid per cluster is kept across calls, so the cost of
+   * each call depends only on num_rows. Labels are consistent across calls.
+   *
+   * The arguments have the same meaning as the ones for Cluster().
+   *
+   * Note: It is not thread-safe.
+   */
+  std::vector<int32_t> ClusterIncrementally(float *features, int32_t num_rows,
+                                            int32_t num_cols);
+
+  // Forget clusters from previous calls of ClusterIncrementally()
+  void Reset();
+
+  // Number of clusters found so far by ClusterIncrementally()
+  int32_t NumClusters() const;
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
@@ -55,6 +55,17 @@ std::string FeatureExtractorConfig::ToString() const {
   return os.str();
 }
 
+std::vector<float> Int16ToFloat(const int16_t *samples, int32_t n,
+                                bool normalize_samples) {
+  float scale = normalize_samples ? 1.0f / 32768 : 1.0f;
+
+  std::vector<float> ans(n);
+  for (int32_t i = 0; i != n; ++i) {
+    ans[i] = samples[i] * scale;
+  }
+  return ans;
+}
+
 class FeatureExtractor::Impl {
  public:
   explicit Impl(const FeatureExtractorConfig &config) : config_(config) {
@@ -81,6 +92,13 @@ class FeatureExtractor::Impl {
     }
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    std::vector<float> buf =
+        Int16ToFloat(waveform, n, config_.normalize_samples);
+    AcceptWaveformImpl(sampling_rate, buf.data(), n);
+  }
+
   void AcceptWaveformImpl(int32_t sampling_rate, const float *waveform,
                           int32_t n) {
     std::lock_guard<std::mutex> lock(mutex_);
@@ -373,6 +391,12 @@ void FeatureExtractor::AcceptWaveform(int32_t sampling_rate,
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void FeatureExtractor::AcceptWaveform(int32_t sampling_rate,
+                                      const int16_t *waveform,
+                                      int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 void FeatureExtractor::InputFinished() const { impl_->InputFinished(); }
 
 int32_t FeatureExtractor::NumFramesReady() const {
@@ -90,6 +90,18 @@ struct FeatureExtractorConfig {
   void Register(ParseOptions *po);
 };
 
+/** Convert 16-bit samples to float.
+
+    @param samples Pointer to a 1-D array of size n.
+    @param n Number of entries in samples.
+    @param normalize_samples If true, the samples are scaled by 1/32768 to
+                             the range [-1, 1). Otherwise, they keep the
+                             int16 range, see
+                             FeatureExtractorConfig::normalize_samples.
+ */
+std::vector<float> Int16ToFloat(const int16_t *samples, int32_t n,
+                                bool normalize_samples);
+
 class FeatureExtractor {
  public:
   explicit FeatureExtractor(const FeatureExtractorConfig &config = {});
@@ -106,6 +118,15 @@ class FeatureExtractor {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that samples are 16-bit integers in the
+     range [-32768, 32767], e.g., read from a 16-bit wave file or received
+     from a socket. They are converted to float in a single pass with the
+     scale expected by the feature extractor.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /**
    * InputFinished() tells the class you won't be providing any
    * more waveform.  This will help flush out the last frame or two
@@ -4,7 +4,12 @@
 
 #include "sherpa-onnx/csrc/keyword-spotter-impl.h"
 
+#include <memory>
+#include <string>
+#include <vector>
+
 #include "sherpa-onnx/csrc/keyword-spotter-transducer-impl.h"
+#include "sherpa-onnx/csrc/macros.h"
 
 #if SHERPA_ONNX_ENABLE_RKNN
 #include "sherpa-onnx/csrc/rknn/keyword-spotter-transducer-rknn-impl.h"
@@ -70,6 +75,26 @@ std::unique_ptr<KeywordSpotterImpl> KeywordSpotterImpl::Create(
   exit(-1);
 }
 
+bool KeywordSpotterImpl::AddKeywordSet(const std::string & /*id*/,
+                                       const std::string & /*keywords*/) {
+  SHERPA_ONNX_LOGE("Keyword sets are not supported by this model");
+  return false;
+}
+
+bool KeywordSpotterImpl::RemoveKeywordSet(const std::string & /*id*/) {
+  return false;
+}
+
+std::vector<std::string> KeywordSpotterImpl::GetKeywordSetIds() const {
+  return {};
+}
+
+std::unique_ptr<OnlineStream> KeywordSpotterImpl::CreateStreamWithKeywordSet(
+    const std::string & /*id*/) const {
+  SHERPA_ONNX_LOGE("Keyword sets are not supported by this model");
+  return nullptr;
+}
+
 #if __ANDROID_API__ >= 9
 template std::unique_ptr<KeywordSpotterImpl> KeywordSpotterImpl::Create(
     AAssetManager *mgr, const KeywordSpotterConfig &config);
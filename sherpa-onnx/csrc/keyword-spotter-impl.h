@@ -30,6 +30,16 @@ class KeywordSpotterImpl {
   virtual std::unique_ptr<OnlineStream> CreateStream(
       const std::string &keywords) const = 0;
 
+  virtual bool AddKeywordSet(const std::string &id,
+                             const std::string &keywords);
+
+  virtual bool RemoveKeywordSet(const std::string &id);
+
+  virtual std::vector<std::string> GetKeywordSetIds() const;
+
+  virtual std::unique_ptr<OnlineStream> CreateStreamWithKeywordSet(
+      const std::string &id) const;
+
   virtual bool IsReady(OnlineStream *s) const = 0;
 
   virtual void Reset(OnlineStream *s) const = 0;
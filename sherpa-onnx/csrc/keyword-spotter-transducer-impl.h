@@ -7,12 +7,15 @@
 
 #include <algorithm>
 #include <memory>
+#include <mutex>  // NOLINT
 #include <regex>  // NOLINT
 #include <string>
 #include <strstream>
+#include <unordered_map>
 #include <utility>
 #include <vector>
 
+#include "sherpa-onnx/csrc/context-graph-cache.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/keyword-spotter-impl.h"
 #include "sherpa-onnx/csrc/keyword-spotter.h"
@@ -111,78 +114,74 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
 
   std::unique_ptr<OnlineStream> CreateStream(
       const std::string &keywords) const override {
-    auto kws = std::regex_replace(keywords, std::regex("/"), "\n");
-    std::istringstream is(kws);
+    ContextGraphPtr keywords_graph = keywords_graph_cache_.Get(keywords);
+    if (!keywords_graph) {
+      keywords_graph = CompileKeywords(keywords);
+      if (!keywords_graph) {
+        return nullptr;
+      }
+      keywords_graph_cache_.Put(keywords, keywords_graph);
+    }
 
-    std::vector<std::vector<int32_t>> current_ids;
-    std::vector<std::string> current_kws;
-    std::vector<float> current_scores;
-    std::vector<float> current_thresholds;
+    auto stream = std::make_unique<OnlineStream>(
+        config_.feat_config, BuildKeywordsGraph(std::move(keywords_graph)));
+    InitOnlineStream(stream.get());
+    return stream;
+  }
 
-    if (!EncodeKeywords(is, sym_, &current_ids, &current_kws, &current_scores,
-                        &current_thresholds)) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE("Encode keywords '%{public}s' failed.",
-                       keywords.c_str());
-#else
-      SHERPA_ONNX_LOGE("Encode keywords '%s' failed.", keywords.c_str());
-#endif
-      return nullptr;
+  bool AddKeywordSet(const std::string &id,
+                     const std::string &keywords) override {
+    ContextGraphPtr keywords_graph = CompileKeywords(keywords);
+    if (!keywords_graph) {
+      return false;
     }
 
-    int32_t num_kws = current_ids.size();
-    int32_t num_default_kws = keywords_id_.size();
+    std::lock_guard<std::mutex> lock(keyword_sets_mutex_);
+    keyword_sets_[id] = std::move(keywords_graph);
+    return true;
+  }
 
-    current_ids.insert(current_ids.end(), keywords_id_.begin(),
-                       keywords_id_.end());
+  bool RemoveKeywordSet(const std::string &id) override {
+    std::lock_guard<std::mutex> lock(keyword_sets_mutex_);
+    return keyword_sets_.erase(id) > 0;
+  }
 
-    if (!current_kws.empty() && !keywords_.empty()) {
-      current_kws.insert(current_kws.end(), keywords_.begin(), keywords_.end());
-    } else if (!current_kws.empty() && keywords_.empty()) {
-      current_kws.insert(current_kws.end(), num_default_kws, std::string());
-    } else if (current_kws.empty() && !keywords_.empty()) {
-      current_kws.insert(current_kws.end(), num_kws, std::string());
-      current_kws.insert(current_kws.end(), keywords_.begin(), keywords_.end());
-    } else {
-      // Do nothing.
+  std::vector<std::string> GetKeywordSetIds() const override {
+    std::vector<std::string> ans;
+    {
+      std::lock_guard<std::mutex> lock(keyword_sets_mutex_);
+      ans.reserve(keyword_sets_.size());
+      for (const auto &p : keyword_sets_) {
+        ans.push_back(p.first);
+      }
     }
+    std::sort(ans.begin(), ans.end());
+    return ans;
+  }
 
-    if (!current_scores.empty() && !boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), boost_scores_.begin(),
-                            boost_scores_.end());
-    } else if (!current_scores.empty() && boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), num_default_kws,
-                            config_.keywords_score);
-    } else if (current_scores.empty() && !boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), num_kws,
-                            config_.keywords_score);
-      current_scores.insert(current_scores.end(), boost_scores_.begin(),
-                            boost_scores_.end());
-    } else {
-      // Do nothing.
+  std::unique_ptr<OnlineStream> CreateStreamWithKeywordSet(
+      const std::string &id) const override {
+    ContextGraphPtr keywords_graph;
+    {
+      std::lock_guard<std::mutex> lock(keyword_sets_mutex_);
+      auto it = keyword_sets_.find(id);
+      if (it != keyword_sets_.end()) {
+        keywords_graph = it->second;
+      }
     }
 
-    if (!current_thresholds.empty() && !thresholds_.empty()) {
-      current_thresholds.insert(current_thresholds.end(), thresholds_.begin(),
-                                thresholds_.end());
-    } else if (!current_thresholds.empty() && thresholds_.empty()) {
-      current_thresholds.insert(current_thresholds.end(), num_default_kws,
-                                config_.keywords_threshold);
-    } else if (current_thresholds.empty() && !thresholds_.empty()) {
-      current_thresholds.insert(current_thresholds.end(), num_kws,
-                                config_.keywords_threshold);
-      current_thresholds.insert(current_thresholds.end(), thresholds_.begin(),
-                                thresholds_.end());
-    } else {
-      // Do nothing.
+    if (!keywords_graph) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Unknown keyword set '%{public}s'", id.c_str());
+#else
+      SHERPA_ONNX_LOGE("Unknown keyword set '%s'", id.c_str());
+#endif
+      return nullptr;
     }
 
-    auto keywords_graph = std::make_shared<ContextGraph>(
-        current_ids, config_.keywords_score, config_.keywords_threshold,
-        current_scores, current_kws, current_thresholds);
-
     auto stream =
         std::make_unique<OnlineStream>(config_.feat_config, keywords_graph);
+    stream->SetKeywordSetId(id);
     InitOnlineStream(stream.get());
     return stream;
   }
@@ -194,6 +193,8 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
   void Reset(OnlineStream *s) const override { InitOnlineStream(s); }
 
   void DecodeStreams(OnlineStream **ss, int32_t n) const override {
+    UpdateKeywordSets(ss, n);
+
     for (int32_t i = 0; i < n; ++i) {
       auto s = ss[i];
       auto r = s->GetKeywordResult(true);
@@ -291,6 +292,71 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
         boost_scores_, keywords_, thresholds_);
   }
 
+  // Return a graph containing only the given keywords, or nullptr if they
+  // cannot be encoded
+  ContextGraphPtr CompileKeywords(const std::string &keywords) const {
+    auto kws = std::regex_replace(keywords, std::regex("/"), "\n");
+    std::istringstream is(kws);
+
+    std::vector<std::vector<int32_t>> current_ids;
+    std::vector<std::string> current_kws;
+    std::vector<float> current_scores;
+    std::vector<float> current_thresholds;
+
+    if (!EncodeKeywords(is, sym_, &current_ids, &current_kws, &current_scores,
+                        &current_thresholds)) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Encode keywords '%{public}s' failed.",
+                       keywords.c_str());
+#else
+      SHERPA_ONNX_LOGE("Encode keywords '%s' failed.", keywords.c_str());
+#endif
+      return nullptr;
+    }
+
+    return std::make_shared<ContextGraph>(
+        current_ids, config_.keywords_score, config_.keywords_threshold,
+        current_scores, current_kws, current_thresholds);
+  }
+
+  // The graph contains the given keywords and the default ones. The default
+  // graph is shared instead of being copied.
+  //
+  // A layered graph creates its states during decoding, so a new one is
+  // created for each stream. It is cheap since the layers are shared.
+  ContextGraphPtr BuildKeywordsGraph(ContextGraphPtr keywords_graph) const {
+    return std::make_shared<ContextGraph>(std::move(keywords_graph),
+                                          keywords_graph_);
+  }
+
+  // Switch streams whose keyword set has been replaced to the new graph
+  void UpdateKeywordSets(OnlineStream **ss, int32_t n) const {
+    std::lock_guard<std::mutex> lock(keyword_sets_mutex_);
+    if (keyword_sets_.empty()) {
+      return;
+    }
+
+    for (int32_t i = 0; i != n; ++i) {
+      const auto &id = ss[i]->GetKeywordSetId();
+      if (id.empty()) {
+        continue;
+      }
+
+      auto it = keyword_sets_.find(id);
+      if (it == keyword_sets_.end() ||
+          it->second == ss[i]->GetContextGraph()) {
+        continue;
+      }
+
+      ss[i]->SetContextGraph(it->second);
+
+      // Hypotheses refer to states of the previous graph
+      int32_t frame_offset = ss[i]->GetKeywordResult().frame_offset;
+      ResetKeywordResult(ss[i]);
+      ss[i]->GetKeywordResult().frame_offset = frame_offset;
+    }
+  }
+
   void InitKeywords() {
 #ifdef SHERPA_ONNX_ENABLE_WASM_KWS
     // Due to the limitations of the wasm file system,
@@ -343,6 +409,11 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
   }
 
   void InitOnlineStream(OnlineStream *stream) const {
+    ResetKeywordResult(stream);
+    stream->SetStates(model_->GetEncoderInitStates());
+  }
+
+  void ResetKeywordResult(OnlineStream *stream) const {
     auto r = decoder_->GetEmptyResult();
     SHERPA_ONNX_CHECK_EQ(r.hyps.Size(), 1);
 
@@ -350,7 +421,6 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
     r.hyps.begin()->second.context_state = stream->GetContextGraph()->Root();
 
     stream->SetKeywordResult(r);
-    stream->SetStates(model_->GetEncoderInitStates());
   }
 
  private:
@@ -360,6 +430,14 @@ class KeywordSpotterTransducerImpl : public KeywordSpotterImpl {
   std::vector<float> thresholds_;
   std::vector<std::string> keywords_;
   ContextGraphPtr keywords_graph_;
+
+  // graphs for CreateStream(keywords)
+  mutable ContextGraphCache keywords_graph_cache_;
+
+  // id -> graph of the keyword set
+  std::unordered_map<std::string, ContextGraphPtr> keyword_sets_;
+  mutable std::mutex keyword_sets_mutex_;
+
   std::unique_ptr<OnlineTransducerModel> model_;
   std::unique_ptr<TransducerKeywordDecoder> decoder_;
   SymbolTable sym_;
@@ -160,6 +160,24 @@ std::unique_ptr<OnlineStream> KeywordSpotter::CreateStream(
   return impl_->CreateStream(keywords);
 }
 
+bool KeywordSpotter::AddKeywordSet(const std::string &id,
+                                   const std::string &keywords) {
+  return impl_->AddKeywordSet(id, keywords);
+}
+
+bool KeywordSpotter::RemoveKeywordSet(const std::string &id) {
+  return impl_->RemoveKeywordSet(id);
+}
+
+std::vector<std::string> KeywordSpotter::GetKeywordSetIds() const {
+  return impl_->GetKeywordSetIds();
+}
+
+std::unique_ptr<OnlineStream> KeywordSpotter::CreateStreamWithKeywordSet(
+    const std::string &id) const {
+  return impl_->CreateStreamWithKeywordSet(id);
+}
+
 bool KeywordSpotter::IsReady(OnlineStream *s) const {
   return impl_->IsReady(s);
 }
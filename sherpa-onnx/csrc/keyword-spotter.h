@@ -117,6 +117,49 @@ class KeywordSpotter {
    */
   std::unique_ptr<OnlineStream> CreateStream(const std::string &keywords) const;
 
+  /** Add a named keyword set or replace an existing one with the same id.
+   *
+   *  The keywords are encoded and compiled only once and the resulting
+   *  graph is shared by all streams using this set. Unlike
+   *  CreateStream(keywords), the default keywords from the config are not
+   *  included.
+   *
+   *  Streams created from a replaced set switch to the new keywords before
+   *  their next decoding step. A keyword that is partially matched at that
+   *  moment is discarded.
+   *
+   *  It is safe to call it from any thread while streams are being decoded.
+   *
+   *  @param id  Name of the keyword set.
+   *  @param keywords  Keywords in the same format as for
+   *                   CreateStream(keywords).
+   *
+   *  @return Return false if the keywords cannot be encoded. An existing set
+   *          with the same id is kept unchanged in that case.
+   */
+  bool AddKeywordSet(const std::string &id, const std::string &keywords);
+
+  /** Remove a keyword set.
+   *
+   *  Streams still using it keep the last version of its keywords.
+   *
+   *  @return Return false if there is no keyword set with the given id.
+   */
+  bool RemoveKeywordSet(const std::string &id);
+
+  /** Return ids of all keyword sets. */
+  std::vector<std::string> GetKeywordSetIds() const;
+
+  /** Create a stream that uses the keyword set with the given id.
+   *
+   *  Streams using different keyword sets can be decoded together in
+   *  a single call of DecodeStreams().
+   *
+   *  @return Return nullptr if there is no keyword set with the given id.
+   */
+  std::unique_ptr<OnlineStream> CreateStreamWithKeywordSet(
+      const std::string &id) const;
+
   /**
    * Return true if the given stream has enough frames for decoding.
    * Return false otherwise
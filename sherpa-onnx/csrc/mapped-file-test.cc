@@ -0,0 +1,69 @@
+// sherpa-onnx/csrc/mapped-file-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/mapped-file.h"
+
+#include <cstdio>
+#include <fstream>
+#include <string>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(MappedFile, Open) {
+  std::string filename = "mapped-file-test.bin";
+  std::vector<float> data = {1.5, -2, 3.25, 0};
+  {
+    std::ofstream os(filename, std::ios::binary);
+    os.write(reinterpret_cast<const char *>(data.data()),
+             data.size() * sizeof(float));
+  }
+
+  auto f = MappedFile::Open(filename);
+  ASSERT_NE(f, nullptr);
+  ASSERT_EQ(f->Size(), data.size() * sizeof(float));
+
+  const float *p = reinterpret_cast<const float *>(f->Data());
+  EXPECT_EQ(std::vector<float>(p, p + data.size()), data);
+
+#if !defined(_WIN32)
+  EXPECT_TRUE(f->IsMapped());
+#endif
+
+  // The view is shared while it is alive
+  EXPECT_EQ(MappedFile::Open(filename), f);
+
+  f.reset();
+  f = MappedFile::Open(filename);
+  ASSERT_NE(f, nullptr);
+  EXPECT_EQ(f->Size(), data.size() * sizeof(float));
+  f.reset();
+
+  std::remove(filename.c_str());
+}
+
+TEST(MappedFile, EmptyAndMissingFiles) {
+  std::string filename = "mapped-file-test-empty.bin";
+  std::ofstream(filename).close();
+
+  auto f = MappedFile::Open(filename);
+  ASSERT_NE(f, nullptr);
+  EXPECT_EQ(f->Size(), 0);
+  EXPECT_FALSE(f->IsMapped());
+  f.reset();
+
+  std::remove(filename.c_str());
+
+  EXPECT_EQ(MappedFile::Open("mapped-file-test-missing.bin"), nullptr);
+}
+
+TEST(MappedFile, Buffer) {
+  MappedFile f(std::vector<char>{'a', 'b', 'c'});
+  EXPECT_EQ(std::string(f.Data(), f.Size()), "abc");
+  EXPECT_FALSE(f.IsMapped());
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,162 @@
+// sherpa-onnx/csrc/mapped-file.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/mapped-file.h"
+
+#if defined(_WIN32)
+#include <Windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#include <mutex>  // NOLINT
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/macros.h"
+
+namespace sherpa_onnx {
+
+std::shared_ptr<const MappedFile> MappedFile::Open(
+    const std::string &filename) {
+  static std::mutex mutex;
+  static std::unordered_map<std::string, std::weak_ptr<const MappedFile>>
+      files;
+
+  std::lock_guard<std::mutex> lock(mutex);
+
+  auto it = files.find(filename);
+  if (it != files.end()) {
+    if (auto f = it->second.lock()) {
+      return f;
+    }
+  }
+
+  std::shared_ptr<MappedFile> f(new MappedFile);
+  if (!f->Map(filename)) {
+    if (!FileExists(filename)) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Failed to open '%{public}s'", filename.c_str());
+#else
+      SHERPA_ONNX_LOGE("Failed to open '%s'", filename.c_str());
+#endif
+      return nullptr;
+    }
+
+    // e.g., an empty file or a file system without mmap support
+    f = std::make_shared<MappedFile>(ReadFile(filename));
+  }
+
+  // Remove views that are no longer used
+  for (auto i = files.begin(); i != files.end();) {
+    if (i->second.expired()) {
+      i = files.erase(i);
+    } else {
+      ++i;
+    }
+  }
+
+  files[filename] = f;
+
+  return f;
+}
+
+MappedFile::MappedFile(std::vector<char> buffer)
+    : buffer_(std::move(buffer)) {
+  data_ = buffer_.data();
+  size_ = buffer_.size();
+}
+
+#if defined(_WIN32)
+
+bool MappedFile::Map(const std::string &filename) {
+  HANDLE file = CreateFileA(filename.c_str(), GENERIC_READ, FILE_SHARE_READ,
+                            nullptr, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL,
+                            nullptr);
+  if (file == INVALID_HANDLE_VALUE) {
+    return false;
+  }
+
+  LARGE_INTEGER size;
+  if (!GetFileSizeEx(file, &size) || size.QuadPart == 0) {
+    CloseHandle(file);
+    return false;
+  }
+
+  HANDLE mapping =
+      CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+
+  // The mapping keeps a reference to the file
+  CloseHandle(file);
+
+  if (!mapping) {
+    return false;
+  }
+
+  void *p = MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+  if (!p) {
+    CloseHandle(mapping);
+    return false;
+  }
+
+  mapping_ = mapping;
+  data_ = static_cast<const char *>(p);
+  size_ = static_cast<size_t>(size.QuadPart);
+  mapped_ = true;
+
+  return true;
+}
+
+MappedFile::~MappedFile() {
+  if (mapped_) {
+    UnmapViewOfFile(data_);
+    CloseHandle(mapping_);
+  }
+}
+
+#else
+
+bool MappedFile::Map(const std::string &filename) {
+  int fd = open(filename.c_str(), O_RDONLY);
+  if (fd < 0) {
+    return false;
+  }
+
+  struct stat st;
+  if (fstat(fd, &st) != 0 || st.st_size == 0) {
+    close(fd);
+    return false;
+  }
+
+  void *p = mmap(nullptr, st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+
+  // The mapping keeps a reference to the file
+  close(fd);
+
+  if (p == MAP_FAILED) {
+    return false;
+  }
+
+  data_ = static_cast<const char *>(p);
+  size_ = static_cast<size_t>(st.st_size);
+  mapped_ = true;
+
+  return true;
+}
+
+MappedFile::~MappedFile() {
+  if (mapped_) {
+    munmap(const_cast<char *>(data_), size_);
+  }
+}
+
+#endif
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,63 @@
+// sherpa-onnx/csrc/mapped-file.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_MAPPED_FILE_H_
+#define SHERPA_ONNX_CSRC_MAPPED_FILE_H_
+
+#include <cstddef>
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace sherpa_onnx {
+
+// A read-only view of the content of a file.
+//
+// Regular files are memory-mapped, so their pages are loaded on demand and
+// shared with other processes mapping the same file. Files that cannot be
+// mapped, e.g., files from an asset manager, are kept in a buffer.
+class MappedFile {
+ public:
+  // Return a view of the given file. If a view of the same file is still
+  // alive in this process, it is returned instead of mapping the file again.
+  //
+  // Return nullptr if the file cannot be opened.
+  static std::shared_ptr<const MappedFile> Open(const std::string &filename);
+
+  // Take the ownership of the given buffer
+  explicit MappedFile(std::vector<char> buffer);
+
+  ~MappedFile();
+
+  MappedFile(const MappedFile &) = delete;
+  MappedFile &operator=(const MappedFile &) = delete;
+
+  const char *Data() const { return data_; }
+
+  size_t Size() const { return size_; }
+
+  // Return true if the file is memory-mapped
+  bool IsMapped() const { return mapped_; }
+
+ private:
+  MappedFile() = default;
+
+  bool Map(const std::string &filename);
+
+ private:
+  const char *data_ = nullptr;
+  size_t size_ = 0;
+  bool mapped_ = false;
+
+  // Used only if the file is not memory-mapped
+  std::vector<char> buffer_;
+
+#if defined(_WIN32)
+  void *mapping_ = nullptr;  // HANDLE of the file mapping object
+#endif
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_MAPPED_FILE_H_
@@ -0,0 +1,164 @@
+// sherpa-onnx/csrc/melo-tts-lexicon-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/melo-tts-lexicon.h"
+
+#include <chrono>  // NOLINT
+#include <cstdio>
+#include <fstream>
+#include <random>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/macros.h"
+
+namespace sherpa_onnx {
+
+static void WriteFile(const std::string &filename, const std::string &s) {
+  std::ofstream os(filename);
+  os << s;
+}
+
+class MeloTtsLexiconTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    WriteFile(tokens_,
+              "_ 0\n, 1\n. 2\n! 3\n? 4\nn 5\ni 6\nh 7\nao 8\nsh 9\nj 10\n"
+              "ie 11\nt 12\ns 13\n");
+    WriteFile(lexicon_,
+              "你好 n i h ao 3 3 3 3\n"
+              "世界 sh i j ie 4 4 4 4\n"
+              "t t 0\n"
+              "s s 0\n");
+  }
+
+  void TearDown() override {
+    std::remove(tokens_.c_str());
+    std::remove(lexicon_.c_str());
+  }
+
+  std::string tokens_ = "melo-tts-lexicon-test-tokens.txt";
+  std::string lexicon_ = "melo-tts-lexicon-test-lexicon.txt";
+};
+
+TEST_F(MeloTtsLexiconTest, ConvertTextToTokenIds) {
+  MeloTtsLexicon lexicon(lexicon_, tokens_, {}, false);
+
+  auto ans = lexicon.ConvertTextToTokenIds("你好，世界。TTS");
+  ASSERT_EQ(ans.size(), 3);
+
+  EXPECT_EQ(ans[0].tokens, (std::vector<int64_t>{5, 6, 7, 8, 1}));
+  EXPECT_EQ(ans[0].tones, (std::vector<int64_t>{3, 3, 3, 3, 0}));
+
+  EXPECT_EQ(ans[1].tokens, (std::vector<int64_t>{9, 6, 10, 11, 2}));
+
+  // tts is not in the lexicon, so it is split into characters. The second
+  // time, the result is taken from the cache.
+  EXPECT_EQ(ans[2].tokens, (std::vector<int64_t>{12, 12, 13}));
+  EXPECT_EQ(lexicon.ConvertTextToTokenIds("tts")[0].tokens, ans[2].tokens);
+
+  // ： is replaced with ,
+  ans = lexicon.ConvertTextToTokenIds("你好：世界");
+  ASSERT_EQ(ans.size(), 2);
+  EXPECT_EQ(ans[0].tokens, (std::vector<int64_t>{5, 6, 7, 8, 1}));
+}
+
+TEST_F(MeloTtsLexiconTest, ConvertTextsToTokenIds) {
+  MeloTtsLexicon lexicon(lexicon_, tokens_, {}, false);
+
+  std::vector<std::string> texts = {"你好。", "世界", "你好世界！"};
+  auto ans = lexicon.ConvertTextsToTokenIds(texts);
+  ASSERT_EQ(ans.size(), texts.size());
+
+  for (int32_t i = 0; i != static_cast<int32_t>(texts.size()); ++i) {
+    auto expected = lexicon.ConvertTextToTokenIds(texts[i]);
+    ASSERT_EQ(ans[i].size(), expected.size());
+    for (int32_t k = 0; k != static_cast<int32_t>(expected.size()); ++k) {
+      EXPECT_EQ(ans[i][k].tokens, expected[k].tokens);
+      EXPECT_EQ(ans[i][k].tones, expected[k].tones);
+    }
+  }
+}
+
+// Measure the time to convert short Chinese sentences to token IDs with
+// a lexicon of 100k words
+TEST_F(MeloTtsLexiconTest, Benchmark) {
+  std::mt19937 mt(20250101);
+
+  std::vector<std::string> chars;
+  for (char32_t c = 0x4e00; c != 0x4e00 + 2000; ++c) {
+    std::string s;
+    s.push_back(static_cast<char>(0xe0 | (c >> 12)));
+    s.push_back(static_cast<char>(0x80 | ((c >> 6) & 0x3f)));
+    s.push_back(static_cast<char>(0x80 | (c & 0x3f)));
+    chars.push_back(std::move(s));
+  }
+
+  std::uniform_int_distribution<int32_t> char_dist(0, chars.size() - 1);
+  std::uniform_int_distribution<int32_t> len_dist(2, 4);
+
+  std::unordered_set<std::string> words(chars.begin(), chars.end());
+  while (words.size() < 100000) {
+    std::string w;
+    int32_t len = len_dist(mt);
+    for (int32_t k = 0; k != len; ++k) {
+      w += chars[char_dist(mt)];
+    }
+    words.insert(std::move(w));
+  }
+
+  {
+    std::ofstream os(lexicon_);
+    os << "t t 0\n";
+    os << "s s 0\n";
+    os << "母 n i 1 1\n";  // 呣 is mapped to it
+    for (const auto &w : words) {
+      // Each character has 2 phones, e.g., n i
+      int32_t num_phones = w.size() / 3 * 2;
+      os << w;
+      for (int32_t i = 0; i != num_phones; ++i) {
+        os << (i % 2 ? " i" : " n");
+      }
+      for (int32_t i = 0; i != num_phones; ++i) {
+        os << " 1";
+      }
+      os << "\n";
+    }
+  }
+
+  auto start = std::chrono::steady_clock::now();
+  MeloTtsLexicon lexicon(lexicon_, tokens_, {}, false);
+  auto stop = std::chrono::steady_clock::now();
+  int32_t init_ms =
+      std::chrono::duration_cast<std::chrono::milliseconds>(stop - start)
+          .count();
+
+  std::vector<std::string> sentences(1000);
+  for (auto &s : sentences) {
+    for (int32_t i = 0; i != 20; ++i) {
+      s += chars[char_dist(mt)];
+    }
+    s += "，tts。";
+  }
+
+  start = std::chrono::steady_clock::now();
+  auto ans = lexicon.ConvertTextsToTokenIds(sentences);
+  stop = std::chrono::steady_clock::now();
+  int32_t us =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start)
+          .count();
+
+  EXPECT_EQ(ans.size(), sentences.size());
+
+  SHERPA_ONNX_LOGE(
+      "Lexicon with %d words loaded in %d ms. Converted %d sentences in %d us "
+      "(%.1f us per sentence)",
+      static_cast<int32_t>(words.size()), init_ms,
+      static_cast<int32_t>(sentences.size()), us,
+      us / static_cast<float>(sentences.size()));
+}
+
+}  // namespace sherpa_onnx
@@ -4,13 +4,14 @@
 
 #include "sherpa-onnx/csrc/melo-tts-lexicon.h"
 
+#include <array>
 #include <fstream>
-#include <regex>  // NOLINT
+#include <memory>
+#include <mutex>  // NOLINT
 #include <sstream>
 #include <string>
 #include <strstream>
 #include <unordered_map>
-#include <unordered_set>
 #include <utility>
 #include <vector>
 #if __ANDROID_API__ >= 9
@@ -67,21 +68,9 @@ class MeloTtsLexicon::Impl {
 
   std::vector<TokenIDs> ConvertTextToTokenIds(const std::string &_text) const {
     std::string text = ToLowerCase(_text);
-    // see
-    // https://github.com/Plachtaa/VITS-fast-fine-tuning/blob/main/text/mandarin.py#L244
-    std::regex punct_re{"：|、|；"};
-    std::string s = std::regex_replace(text, punct_re, ",");
+    std::string s = ReplacePunctuations(text);
 
-    std::regex punct_re2("。");
-    s = std::regex_replace(s, punct_re2, ".");
-
-    std::regex punct_re3("？");
-    s = std::regex_replace(s, punct_re3, "?");
-
-    std::regex punct_re4("！");
-    s = std::regex_replace(s, punct_re4, "!");
-
-    std::vector<std::string> words = SplitUtf8(text);
+    std::vector<std::string> words = SplitUtf8(s);
 
     if (debug_) {
 #if __OHOS__
@@ -110,7 +99,7 @@ class MeloTtsLexicon::Impl {
     std::vector<TokenIDs> ans;
     TokenIDs this_sentence;
 
-    PhraseMatcher matcher(&all_words_, words, debug_);
+    PhraseMatcher matcher(trie_.get(), words, debug_);
 
     for (const std::string &w : matcher) {
       auto ids = ConvertWordToIds(w);
@@ -161,13 +150,63 @@ class MeloTtsLexicon::Impl {
   }
 
  private:
+  // Replace ：、；with , and 。？！with . ? ! in a single pass. See
+  // https://github.com/Plachtaa/VITS-fast-fine-tuning/blob/main/text/mandarin.py#L244
+  static std::string ReplacePunctuations(const std::string &text) {
+    // All of them are 3 bytes in UTF-8
+    static const std::array<std::pair<std::string, char>, 6> kPuncts = {{
+        {"：", ','},
+        {"、", ','},
+        {"；", ','},
+        {"。", '.'},
+        {"？", '?'},
+        {"！", '!'},
+    }};
+
+    std::string ans;
+    ans.reserve(text.size());
+
+    int32_t n = static_cast<int32_t>(text.size());
+    for (int32_t i = 0; i < n;) {
+      char replacement = 0;
+      if (static_cast<uint8_t>(text[i]) >= 0x80 && i + 3 <= n) {
+        for (const auto &p : kPuncts) {
+          if (text.compare(i, 3, p.first) == 0) {
+            replacement = p.second;
+            break;
+          }
+        }
+      }
+
+      if (replacement) {
+        ans.push_back(replacement);
+        i += 3;
+      } else {
+        ans.push_back(text[i]);
+        i += 1;
+      }
+    }
+
+    return ans;
+  }
+
   TokenIDs ConvertWordToIds(const std::string &w) const {
-    if (word2ids_.count(w)) {
-      return word2ids_.at(w);
+    auto it = word2ids_.find(w);
+    if (it != word2ids_.end()) {
+      return it->second;
+    }
+
+    auto token_it = token2id_.find(w);
+    if (token_it != token2id_.end()) {
+      return {{token_it->second}, {0}};
     }
 
-    if (token2id_.count(w)) {
-      return {{token2id_.at(w)}, {0}};
+    {
+      std::lock_guard<std::mutex> lock(oov_mutex_);
+      auto oov_it = oov_cache_.find(w);
+      if (oov_it != oov_cache_.end()) {
+        return oov_it->second;
+      }
     }
 
     TokenIDs ans;
@@ -198,6 +237,15 @@ class MeloTtsLexicon::Impl {
       }
     }
 
+    {
+      // Keep the memory bounded for inputs with many distinct OOV words
+      std::lock_guard<std::mutex> lock(oov_mutex_);
+      if (static_cast<int32_t>(oov_cache_.size()) >= kMaxOovCacheSize) {
+        oov_cache_.clear();
+      }
+      oov_cache_.emplace(w, ans);
+    }
+
     return ans;
   }
 
@@ -301,15 +349,26 @@ class MeloTtsLexicon::Impl {
     word2ids_["呣"] = word2ids_["母"];
     word2ids_["嗯"] = word2ids_["恩"];
 
+    std::vector<std::string> all_words;
+    all_words.reserve(word2ids_.size());
     for (const auto &[key, _] : word2ids_) {
-      all_words_.insert(key);
+      all_words.push_back(key);
     }
+
+    trie_ = std::make_unique<PhraseTrie>(std::move(all_words));
   }
 
  private:
   // lexicon.txt is saved in word2ids_
   std::unordered_map<std::string, TokenIDs> word2ids_;
-  std::unordered_set<std::string> all_words_;
+
+  // Trie of the words in word2ids_
+  std::unique_ptr<PhraseTrie> trie_;
+
+  // Token IDs of recently seen words that are not in the lexicon
+  static constexpr int32_t kMaxOovCacheSize = 10000;
+  mutable std::unordered_map<std::string, TokenIDs> oov_cache_;
+  mutable std::mutex oov_mutex_;
 
   // tokens.txt is saved in token2id_
   std::unordered_map<std::string, int32_t> token2id_;
@@ -0,0 +1,155 @@
+// sherpa-onnx/csrc/multi-stream-voice-activity-detector-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/multi-stream-voice-activity-detector.h"
+
+#include <algorithm>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/voice-activity-detector.h"
+#include "sherpa-onnx/csrc/wave-reader.h"
+
+namespace sherpa_onnx {
+
+namespace {
+
+// Feed samples to a VoiceActivityDetector one window at a time
+std::vector<SpeechSegment> RunVad(const VadModelConfig &config,
+                                  const std::vector<float> &samples) {
+  VoiceActivityDetector vad(config);
+  int32_t window_size = config.silero_vad.window_size;
+  int32_t n = samples.size();
+
+  std::vector<SpeechSegment> ans;
+  for (int32_t i = 0; i < n; i += window_size) {
+    vad.AcceptWaveform(samples.data() + i, std::min(window_size, n - i));
+    while (!vad.Empty()) {
+      ans.push_back(vad.Front());
+      vad.Pop();
+    }
+  }
+
+  vad.Flush();
+  while (!vad.Empty()) {
+    ans.push_back(vad.Front());
+    vad.Pop();
+  }
+
+  return ans;
+}
+
+// Stream i processes the wave starting at sample i * 3200, so that the
+// streams have different content and length. If remove_first_stream is
+// true, the first slot of the model states is freed before any audio is
+// processed so that the states are gathered into a batch and scattered
+// back after each model invocation.
+void TestMultiStream(const VadModelConfig &config,
+                     const std::vector<float> &wave,
+                     bool remove_first_stream) {
+  int32_t num_streams = 4;
+  int32_t chunk_size = 1600;
+
+  MultiStreamVoiceActivityDetector detector(config);
+
+  int32_t removed = -1;
+  if (remove_first_stream) {
+    removed = detector.CreateStream();
+  }
+
+  std::vector<int32_t> ids;
+  std::vector<std::vector<float>> inputs;
+  for (int32_t i = 0; i != num_streams; ++i) {
+    ids.push_back(detector.CreateStream());
+    inputs.emplace_back(wave.begin() + i * 3200, wave.end());
+  }
+
+  if (removed != -1) {
+    detector.RemoveStream(removed);
+  }
+
+  EXPECT_EQ(detector.NumStreams(), num_streams);
+
+  std::map<int32_t, std::vector<SpeechSegment>> segments;
+  std::map<int32_t, int32_t> num_starts;
+
+  auto collect = [&](const std::vector<VadEvent> &events) {
+    for (const auto &e : events) {
+      if (e.is_start) {
+        num_starts[e.stream_id] += 1;
+      } else {
+        segments[e.stream_id].push_back(e.segment);
+      }
+    }
+  };
+
+  int32_t max_len = inputs[0].size();
+  for (int32_t start = 0; start < max_len; start += chunk_size) {
+    for (int32_t i = 0; i != num_streams; ++i) {
+      int32_t n = inputs[i].size();
+      if (start >= n) {
+        continue;
+      }
+
+      int32_t end = std::min(start + chunk_size, n);
+      detector.AcceptWaveform(ids[i], inputs[i].data() + start, end - start);
+      if (end == n) {
+        detector.Flush(ids[i]);
+      }
+    }
+
+    collect(detector.Compute());
+  }
+
+  for (int32_t i = 0; i != num_streams; ++i) {
+    std::vector<SpeechSegment> expected = RunVad(config, inputs[i]);
+    const std::vector<SpeechSegment> &actual = segments[ids[i]];
+
+    EXPECT_FALSE(expected.empty()) << "stream " << i;
+    EXPECT_EQ(num_starts[ids[i]], actual.size()) << "stream " << i;
+
+    ASSERT_EQ(actual.size(), expected.size()) << "stream " << i;
+    for (int32_t k = 0; k != static_cast<int32_t>(actual.size()); ++k) {
+      EXPECT_EQ(actual[k].start, expected[k].start)
+          << "stream " << i << ", segment " << k;
+      EXPECT_EQ(actual[k].samples, expected[k].samples)
+          << "stream " << i << ", segment " << k;
+    }
+  }
+}
+
+}  // namespace
+
+TEST(MultiStreamVoiceActivityDetector, SameAsVoiceActivityDetector) {
+  std::string model = "./silero_vad.onnx";
+  if (!FileExists(model)) {
+    SHERPA_ONNX_LOGE("%s does not exist. Skipping test", model.c_str());
+    return;
+  }
+
+  std::string wave_filename = "./lei-jun-test.wav";
+  if (!FileExists(wave_filename)) {
+    SHERPA_ONNX_LOGE("%s does not exist. Skipping test",
+                     wave_filename.c_str());
+    return;
+  }
+
+  VadModelConfig config;
+  config.silero_vad.model = model;
+
+  int32_t sample_rate = 0;
+  bool is_ok = false;
+  std::vector<float> wave = ReadWave(wave_filename, &sample_rate, &is_ok);
+  ASSERT_TRUE(is_ok);
+  ASSERT_EQ(sample_rate, config.sample_rate);
+
+  TestMultiStream(config, wave, false);
+  TestMultiStream(config, wave, true);
+}
+
+}  // namespace sherpa_onnx
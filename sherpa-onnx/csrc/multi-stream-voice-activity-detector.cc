@@ -0,0 +1,561 @@
+// sherpa-onnx/csrc/multi-stream-voice-activity-detector.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/multi-stream-voice-activity-detector.h"
+
+#include <algorithm>
+#include <functional>
+#include <map>
+#include <utility>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "sherpa-onnx/csrc/circular-buffer.h"
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/vad-model.h"
+
+namespace sherpa_onnx {
+
+class MultiStreamVoiceActivityDetector::Impl {
+ public:
+  explicit Impl(const VadModelConfig &config, float buffer_size_in_seconds)
+      : config_(config),
+        buffer_size_(buffer_size_in_seconds * config.sample_rate),
+        create_model_([config]() { return VadModel::Create(config); }) {
+    Init();
+  }
+
+  template <typename Manager>
+  Impl(Manager *mgr, const VadModelConfig &config,
+       float buffer_size_in_seconds)
+      : config_(config),
+        buffer_size_(buffer_size_in_seconds * config.sample_rate),
+        create_model_(
+            [mgr, config]() { return VadModel::Create(mgr, config); }) {
+    Init();
+  }
+
+  int32_t CreateStream() {
+    int32_t id = next_stream_id_++;
+
+    auto s = std::make_unique<Stream>(buffer_size_);
+    if (state_dim_ > 0) {
+      s->slot = AllocateSlot();
+    } else if (model_) {
+      // reuse the model created by Init() instead of creating a new one
+      s->model = std::move(model_);
+    } else {
+      s->model = create_model_();
+    }
+
+    streams_.emplace(id, std::move(s));
+
+    return id;
+  }
+
+  void RemoveStream(int32_t stream_id) {
+    auto it = streams_.find(stream_id);
+    if (it == streams_.end()) {
+      SHERPA_ONNX_LOGE("Unknown stream id: %d", stream_id);
+      return;
+    }
+
+    if (it->second->slot != -1) {
+      free_slots_.push_back(it->second->slot);
+    }
+
+    streams_.erase(it);
+  }
+
+  void AcceptWaveform(int32_t stream_id, const float *samples, int32_t n) {
+    Stream *s = GetStream(stream_id);
+    s->last.insert(s->last.end(), samples, samples + n);
+  }
+
+  void Flush(int32_t stream_id) { GetStream(stream_id)->flush = true; }
+
+  void Reset(int32_t stream_id) {
+    Stream *s = GetStream(stream_id);
+
+    s->buffer.Reset();
+    s->last.clear();
+    s->offset = 0;
+    s->flush = false;
+    s->start = -1;
+
+    s->triggered = false;
+    s->current_sample = 0;
+    s->temp_start = 0;
+    s->temp_end = 0;
+
+    if (s->model) {
+      s->model->Reset();
+    } else {
+      std::fill(states_.begin() + s->slot * state_dim_,
+                states_.begin() + (s->slot + 1) * state_dim_, 0);
+    }
+  }
+
+  std::vector<VadEvent> Compute() {
+    std::vector<VadEvent> events;
+
+    std::vector<std::pair<int32_t, Stream *>> ready;
+    ready.reserve(streams_.size());
+
+    while (true) {
+      ready.clear();
+      for (auto &p : streams_) {
+        Stream *s = p.second.get();
+        if (static_cast<int32_t>(s->last.size()) - s->offset >= window_size_) {
+          ready.emplace_back(p.first, s);
+        }
+      }
+
+      if (ready.empty()) {
+        break;
+      }
+
+      std::vector<float> probs = ComputeProbs(ready);
+
+      for (int32_t i = 0; i != static_cast<int32_t>(ready.size()); ++i) {
+        ProcessWindow(ready[i].first, ready[i].second, probs[i], &events);
+      }
+    }
+
+    for (auto &p : streams_) {
+      Stream *s = p.second.get();
+      s->last.erase(s->last.begin(), s->last.begin() + s->offset);
+      s->offset = 0;
+
+      if (s->flush) {
+        FlushStream(p.first, s, &events);
+        s->flush = false;
+      }
+    }
+
+    return events;
+  }
+
+  bool IsSpeechDetected(int32_t stream_id) const {
+    auto it = streams_.find(stream_id);
+    if (it == streams_.end()) {
+      SHERPA_ONNX_LOGE("Unknown stream id: %d", stream_id);
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    return it->second->start != -1;
+  }
+
+  int32_t NumStreams() const { return streams_.size(); }
+
+  const VadModelConfig &GetConfig() const { return config_; }
+
+ private:
+  struct Stream {
+    explicit Stream(int32_t buffer_size) : buffer(buffer_size) {}
+
+    CircularBuffer buffer;
+
+    // samples not processed yet, starting from last[offset]
+    std::vector<float> last;
+    int32_t offset = 0;
+
+    bool flush = false;
+
+    // start of the current speech segment. -1 if there is no speech
+    int32_t start = -1;
+
+    // Row of the states in states_. -1 if model is used.
+    int32_t slot = -1;
+
+    // Only used for models that do not support batched computation
+    std::unique_ptr<VadModel> model;
+
+    // The following states are the same as the ones in SileroVadModel
+    bool triggered = false;
+    int32_t current_sample = 0;
+    int32_t temp_start = 0;
+    int32_t temp_end = 0;
+  };
+
+  void Init() {
+    float threshold = 0;
+    float min_silence_duration = 0;
+    float min_speech_duration = 0;
+    float max_speech_duration = 0;
+
+    if (!config_.silero_vad.model.empty()) {
+      threshold = config_.silero_vad.threshold;
+      min_silence_duration = config_.silero_vad.min_silence_duration;
+      min_speech_duration = config_.silero_vad.min_speech_duration;
+      max_speech_duration = config_.silero_vad.max_speech_duration;
+    } else if (!config_.ten_vad.model.empty()) {
+      threshold = config_.ten_vad.threshold;
+      min_silence_duration = config_.ten_vad.min_silence_duration;
+      min_speech_duration = config_.ten_vad.min_speech_duration;
+      max_speech_duration = config_.ten_vad.max_speech_duration;
+    } else {
+      SHERPA_ONNX_LOGE("Unsupported VAD model");
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    int32_t sample_rate = config_.sample_rate;
+
+    threshold_ = threshold;
+    min_silence_samples_ = sample_rate * min_silence_duration;
+    min_speech_samples_ = sample_rate * min_speech_duration;
+    max_utterance_length_ = sample_rate * max_speech_duration;
+    new_min_silence_samples_ = sample_rate * new_min_silence_duration_s_;
+
+    model_ = create_model_();
+    window_size_ = model_->WindowSize();
+    window_shift_ = model_->WindowShift();
+    state_dim_ = model_->StateDim();
+
+    if (state_dim_ == 0) {
+      SHERPA_ONNX_LOGE(
+          "The vad model does not support batched computation. Each stream "
+          "uses its own model instance.");
+    }
+  }
+
+  Stream *GetStream(int32_t stream_id) {
+    auto it = streams_.find(stream_id);
+    if (it == streams_.end()) {
+      SHERPA_ONNX_LOGE("Unknown stream id: %d", stream_id);
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    return it->second.get();
+  }
+
+  // Return the row in states_ for a new stream. The row is filled with 0.
+  int32_t AllocateSlot() {
+    if (free_slots_.empty()) {
+      int32_t slot = states_.size() / state_dim_;
+      states_.resize(states_.size() + state_dim_, 0);
+      return slot;
+    }
+
+    // use the smallest free slot so that the rows of the streams stay
+    // contiguous, see ComputeProbs()
+    auto it = std::min_element(free_slots_.begin(), free_slots_.end());
+    int32_t slot = *it;
+    free_slots_.erase(it);
+
+    std::fill(states_.begin() + slot * state_dim_,
+              states_.begin() + (slot + 1) * state_dim_, 0);
+
+    return slot;
+  }
+
+  // Run the model on the next window of each given stream
+  std::vector<float> ComputeProbs(
+      const std::vector<std::pair<int32_t, Stream *>> &ready) {
+    int32_t batch_size = ready.size();
+    std::vector<float> probs(batch_size);
+
+    if (state_dim_ == 0) {
+      for (int32_t i = 0; i != batch_size; ++i) {
+        Stream *s = ready[i].second;
+        probs[i] = s->model->Compute(s->last.data() + s->offset, window_size_);
+      }
+      return probs;
+    }
+
+    samples_.resize(batch_size * window_size_);
+    float *p = samples_.data();
+
+    // If the i-th stream uses the i-th row, states_ can be used directly
+    bool contiguous = true;
+
+    for (int32_t i = 0; i != batch_size; ++i, p += window_size_) {
+      const Stream *s = ready[i].second;
+      const float *src = s->last.data() + s->offset;
+      std::copy(src, src + window_size_, p);
+
+      contiguous = contiguous && (s->slot == i);
+    }
+
+    if (contiguous) {
+      model_->ComputeBatch(samples_.data(), batch_size, states_.data(),
+                           probs.data());
+      return probs;
+    }
+
+    batch_states_.resize(batch_size * state_dim_);
+    for (int32_t i = 0; i != batch_size; ++i) {
+      auto src = states_.begin() + ready[i].second->slot * state_dim_;
+      std::copy(src, src + state_dim_, batch_states_.begin() + i * state_dim_);
+    }
+
+    model_->ComputeBatch(samples_.data(), batch_size, batch_states_.data(),
+                         probs.data());
+
+    for (int32_t i = 0; i != batch_size; ++i) {
+      auto src = batch_states_.begin() + i * state_dim_;
+      std::copy(src, src + state_dim_,
+                states_.begin() + ready[i].second->slot * state_dim_);
+    }
+
+    return probs;
+  }
+
+  // It is the same as SileroVadModel::IsSpeech() except that the speech
+  // probability is given.
+  bool IsSpeech(Stream *s, float prob, float threshold,
+                int32_t min_silence_samples) const {
+    s->current_sample += window_shift_;
+
+    if (prob > threshold && s->temp_end != 0) {
+      s->temp_end = 0;
+    }
+
+    if (prob > threshold && s->temp_start == 0) {
+      // start speaking, but we require that it must satisfy
+      // min_speech_duration
+      s->temp_start = s->current_sample;
+      return false;
+    }
+
+    if (prob > threshold && s->temp_start != 0 && !s->triggered) {
+      if (s->current_sample - s->temp_start < min_speech_samples_) {
+        return false;
+      }
+
+      s->triggered = true;
+
+      return true;
+    }
+
+    if ((prob < threshold) && !s->triggered) {
+      // silence
+      s->temp_start = 0;
+      s->temp_end = 0;
+      return false;
+    }
+
+    if ((prob > threshold - 0.15) && s->triggered) {
+      // speaking
+      return true;
+    }
+
+    if ((prob > threshold) && !s->triggered) {
+      // start speaking
+      s->triggered = true;
+
+      return true;
+    }
+
+    if ((prob < threshold) && s->triggered) {
+      // stop to speak
+      if (s->temp_end == 0) {
+        s->temp_end = s->current_sample;
+      }
+
+      if (s->current_sample - s->temp_end < min_silence_samples) {
+        // continue speaking
+        return true;
+      }
+      // stopped speaking
+      s->temp_start = 0;
+      s->temp_end = 0;
+      s->triggered = false;
+      return false;
+    }
+
+    return false;
+  }
+
+  // It is the same as VoiceActivityDetector::AcceptWaveform() with a single
+  // window
+  void ProcessWindow(int32_t stream_id, Stream *s, float prob,
+                     std::vector<VadEvent> *events) {
+    float threshold = threshold_;
+    int32_t min_silence_samples = min_silence_samples_;
+
+    if (s->buffer.Size() > max_utterance_length_) {
+      threshold = new_threshold_;
+      min_silence_samples = new_min_silence_samples_;
+    }
+
+    s->buffer.Push(s->last.data() + s->offset, window_shift_);
+    s->offset += window_shift_;
+
+    bool is_speech = IsSpeech(s, prob, threshold, min_silence_samples);
+
+    CircularBuffer &buffer = s->buffer;
+
+    if (is_speech) {
+      if (s->start == -1) {
+        // beginning of speech
+        s->start = std::max(
+            buffer.Tail() - 2 * window_size_ - min_speech_samples_,
+            buffer.Head());
+
+        VadEvent e;
+        e.stream_id = stream_id;
+        e.is_start = true;
+        e.segment.start = s->start;
+        events->push_back(std::move(e));
+      }
+      return;
+    }
+
+    if (s->start != -1 && buffer.Size()) {
+      // end of speech, save the speech segment
+      int32_t end = buffer.Tail() - min_silence_samples;
+
+      VadEvent e;
+      e.stream_id = stream_id;
+      e.is_start = false;
+      e.segment.start = s->start;
+      if (end > s->start) {
+        e.segment.samples = buffer.Get(s->start, end - s->start);
+      }
+      events->push_back(std::move(e));
+
+      buffer.Pop(std::max(0, end - buffer.Head()));
+    } else {
+      int32_t end =
+          buffer.Tail() - 2 * window_size_ - min_speech_samples_;
+      int32_t n = std::max(0, end - buffer.Head());
+      if (n > 0) {
+        buffer.Pop(n);
+      }
+    }
+
+    s->start = -1;
+  }
+
+  // It is the same as VoiceActivityDetector::Flush()
+  void FlushStream(int32_t stream_id, Stream *s,
+                   std::vector<VadEvent> *events) const {
+    if (s->start == -1 || s->buffer.Size() == 0) {
+      return;
+    }
+
+    int32_t end = s->buffer.Tail();
+    if (end <= s->start) {
+      return;
+    }
+
+    VadEvent e;
+    e.stream_id = stream_id;
+    e.is_start = false;
+    e.segment.start = s->start;
+    e.segment.samples = s->buffer.Get(s->start, end - s->start);
+    events->push_back(std::move(e));
+
+    s->buffer.Pop(end - s->buffer.Head());
+    s->start = -1;
+  }
+
+ private:
+  VadModelConfig config_;
+  int32_t buffer_size_;  // in samples
+  std::function<std::unique_ptr<VadModel>()> create_model_;
+
+  // Shared by all streams if state_dim_ > 0. Otherwise, it is moved to the
+  // first stream.
+  std::unique_ptr<VadModel> model_;
+
+  int32_t window_size_ = 0;
+  int32_t window_shift_ = 0;
+  int32_t state_dim_ = 0;
+
+  float threshold_ = 0.5;
+  int32_t min_silence_samples_ = 0;
+  int32_t min_speech_samples_ = 0;
+
+  int32_t max_utterance_length_ = -1;  // in samples
+  float new_min_silence_duration_s_ = 0.1;
+  int32_t new_min_silence_samples_ = 0;
+  float new_threshold_ = 0.90;
+
+  std::map<int32_t, std::unique_ptr<Stream>> streams_;
+  int32_t next_stream_id_ = 0;
+
+  // (num_slots, state_dim_). Row i contains the model states of the stream
+  // whose slot is i.
+  std::vector<float> states_;
+  std::vector<int32_t> free_slots_;
+
+  // buffers for ComputeProbs()
+  std::vector<float> samples_;
+  std::vector<float> batch_states_;
+};
+
+MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    const VadModelConfig &config, float buffer_size_in_seconds /*= 30*/)
+    : impl_(std::make_unique<Impl>(config, buffer_size_in_seconds)) {}
+
+template <typename Manager>
+MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    Manager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds /*= 30*/)
+    : impl_(std::make_unique<Impl>(mgr, config, buffer_size_in_seconds)) {}
+
+MultiStreamVoiceActivityDetector::~MultiStreamVoiceActivityDetector() =
+    default;
+
+int32_t MultiStreamVoiceActivityDetector::CreateStream() {
+  return impl_->CreateStream();
+}
+
+void MultiStreamVoiceActivityDetector::RemoveStream(int32_t stream_id) {
+  impl_->RemoveStream(stream_id);
+}
+
+void MultiStreamVoiceActivityDetector::AcceptWaveform(int32_t stream_id,
+                                                      const float *samples,
+                                                      int32_t n) {
+  impl_->AcceptWaveform(stream_id, samples, n);
+}
+
+void MultiStreamVoiceActivityDetector::Flush(int32_t stream_id) {
+  impl_->Flush(stream_id);
+}
+
+void MultiStreamVoiceActivityDetector::Reset(int32_t stream_id) {
+  impl_->Reset(stream_id);
+}
+
+std::vector<VadEvent> MultiStreamVoiceActivityDetector::Compute() {
+  return impl_->Compute();
+}
+
+bool MultiStreamVoiceActivityDetector::IsSpeechDetected(
+    int32_t stream_id) const {
+  return impl_->IsSpeechDetected(stream_id);
+}
+
+int32_t MultiStreamVoiceActivityDetector::NumStreams() const {
+  return impl_->NumStreams();
+}
+
+const VadModelConfig &MultiStreamVoiceActivityDetector::GetConfig() const {
+  return impl_->GetConfig();
+}
+
+#if __ANDROID_API__ >= 9
+template MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    AAssetManager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds);
+#endif
+
+#if __OHOS__
+template MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    NativeResourceManager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds);
+#endif
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,88 @@
+// sherpa-onnx/csrc/multi-stream-voice-activity-detector.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+#define SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+
+#include <memory>
+#include <vector>
+
+#include "sherpa-onnx/csrc/vad-model-config.h"
+#include "sherpa-onnx/csrc/voice-activity-detector.h"
+
+namespace sherpa_onnx {
+
+struct VadEvent {
+  int32_t stream_id = -1;
+
+  // true for the beginning of a speech segment.
+  // false for the end of a speech segment.
+  bool is_start = false;
+
+  // For the beginning of a speech segment, only segment.start is set.
+  // For the end of a speech segment, it contains the whole segment.
+  SpeechSegment segment;
+};
+
+// Voice activity detection for many audio streams with a single model.
+//
+// The model states of all streams are kept in a contiguous array and
+// Compute() runs one model invocation for all streams that have a complete
+// window, so the cost per window is shared by the streams instead of paying
+// one model invocation per stream as with one VoiceActivityDetector per
+// stream.
+//
+// Each stream gives the same segments as a VoiceActivityDetector that is fed
+// one window at a time.
+//
+// Batched invocation is supported for silero-vad. For other models, each
+// stream uses its own model instance and there is no batching.
+//
+// This class is not thread-safe.
+class MultiStreamVoiceActivityDetector {
+ public:
+  // @param buffer_size_in_seconds Initial buffer size of each stream.
+  //                               It grows if needed.
+  explicit MultiStreamVoiceActivityDetector(const VadModelConfig &config,
+                                            float buffer_size_in_seconds = 30);
+
+  template <typename Manager>
+  MultiStreamVoiceActivityDetector(Manager *mgr, const VadModelConfig &config,
+                                   float buffer_size_in_seconds = 30);
+
+  ~MultiStreamVoiceActivityDetector();
+
+  // Return the id of the new stream
+  int32_t CreateStream();
+
+  void RemoveStream(int32_t stream_id);
+
+  // Samples are buffered until the next call to Compute().
+  void AcceptWaveform(int32_t stream_id, const float *samples, int32_t n);
+
+  // Call it at the end of the input of a stream. The next call to Compute()
+  // ends the current speech segment of the stream, if any, after processing
+  // its buffered samples.
+  void Flush(int32_t stream_id);
+
+  // Discard all buffered samples and states of a stream
+  void Reset(int32_t stream_id);
+
+  // Process all complete windows of all streams and return the start and end
+  // events of speech segments. Events of the same stream are in time order.
+  std::vector<VadEvent> Compute();
+
+  bool IsSpeechDetected(int32_t stream_id) const;
+
+  int32_t NumStreams() const;
+
+  const VadModelConfig &GetConfig() const;
+
+ private:
+  class Impl;
+  std::unique_ptr<Impl> impl_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
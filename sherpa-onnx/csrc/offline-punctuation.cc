@@ -4,6 +4,9 @@
 
 #include "sherpa-onnx/csrc/offline-punctuation.h"
 
+#include <string>
+#include <vector>
+
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
 #include "android/asset_manager_jni.h"
@@ -46,6 +49,20 @@ OfflinePunctuation::OfflinePunctuation(AAssetManager *mgr,
 
 OfflinePunctuation::~OfflinePunctuation() = default;
 
+void OfflinePunctuation::Warmup(
+    const std::vector<int32_t> &lengths /*= {10, 50}*/) const {
+  for (int32_t n : lengths) {
+    std::string text;
+    for (int32_t i = 0; i < n; ++i) {
+      text += i == 0 ? "hello" : " hello";
+    }
+
+    if (!text.empty()) {
+      AddPunctuation(text);
+    }
+  }
+}
+
 std::string OfflinePunctuation::AddPunctuation(const std::string &text) const {
   return impl_->AddPunctuation(text);
 }
@@ -48,6 +48,12 @@ class OfflinePunctuation {
   // Add punctuation to the input text and return it.
   std::string AddPunctuation(const std::string &text) const;
 
+  // Add punctuation to dummy texts so that onnxruntime allocates memory and
+  // selects kernels before the first request.
+  //
+  // @param lengths Number of words of each dummy text.
+  void Warmup(const std::vector<int32_t> &lengths = {10, 50}) const;
+
  private:
   std::unique_ptr<OfflinePunctuationImpl> impl_;
 };
@@ -119,6 +119,7 @@ class OfflineRecognizerCanaryImpl : public OfflineRecognizerImpl {
   OfflineRecognitionResult Convert(const std::vector<int32_t> &tokens) const {
     OfflineRecognitionResult r;
     r.tokens.reserve(tokens.size());
+    r.token_ids.reserve(tokens.size());
 
     std::string text;
     for (auto i : tokens) {
@@ -129,6 +130,7 @@ class OfflineRecognizerCanaryImpl : public OfflineRecognizerImpl {
       const auto &s = symbol_table_[i];
       text += s;
       r.tokens.push_back(s);
+      r.token_ids.push_back(i);
     }
 
     r.text = std::move(text);
@@ -28,6 +28,7 @@ static OfflineRecognitionResult Convert(const OfflineCtcDecoderResult &src,
                                         int32_t subsampling_factor) {
   OfflineRecognitionResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
   r.timestamps.reserve(src.timestamps.size());
 
   std::string text;
@@ -51,6 +52,7 @@ static OfflineRecognitionResult Convert(const OfflineCtcDecoderResult &src,
     }
 
     r.tokens.push_back(std::move(sym));
+    r.token_ids.push_back(src.tokens[i]);
   }
 
   if (sym_table.IsByteBpe()) {
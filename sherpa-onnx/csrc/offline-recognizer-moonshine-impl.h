@@ -27,6 +27,7 @@ static OfflineRecognitionResult Convert(
     const OfflineMoonshineDecoderResult &src, const SymbolTable &sym_table) {
   OfflineRecognitionResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
 
   std::string text;
   for (auto i : src.tokens) {
@@ -37,6 +38,7 @@ static OfflineRecognitionResult Convert(
     const auto &s = sym_table[i];
     text += s;
     r.tokens.push_back(s);
+    r.token_ids.push_back(i);
   }
 
   r.text = text;
@@ -27,6 +27,7 @@ OfflineRecognitionResult ConvertSenseVoiceResult(
     int32_t frame_shift_ms, int32_t subsampling_factor) {
   OfflineRecognitionResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
   r.timestamps.reserve(src.timestamps.size());
 
   std::string text;
@@ -36,6 +37,7 @@ OfflineRecognitionResult ConvertSenseVoiceResult(
     text.append(sym);
 
     r.tokens.push_back(std::move(sym));
+    r.token_ids.push_back(src.tokens[i]);
   }
   r.text = std::move(text);
 
@@ -35,6 +35,7 @@ static OfflineRecognitionResult Convert(
     int32_t frame_shift_ms, int32_t subsampling_factor) {
   OfflineRecognitionResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
   r.timestamps.reserve(src.timestamps.size());
   r.durations.reserve(src.durations.size());
 
@@ -54,6 +55,7 @@ static OfflineRecognitionResult Convert(
     }
 
     r.tokens.push_back(std::move(sym));
+    r.token_ids.push_back(i);
   }
   if (sym_table.IsByteBpe()) {
     text = sym_table.DecodeByteBpe(text);
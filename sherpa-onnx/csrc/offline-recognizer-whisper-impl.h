@@ -15,6 +15,7 @@
 #include "sherpa-onnx/csrc/offline-model-config.h"
 #include "sherpa-onnx/csrc/offline-recognizer-impl.h"
 #include "sherpa-onnx/csrc/offline-recognizer.h"
+#include "sherpa-onnx/csrc/offline-whisper-beam-search-decoder.h"
 #include "sherpa-onnx/csrc/offline-whisper-decoder.h"
 #include "sherpa-onnx/csrc/offline-whisper-greedy-search-decoder.h"
 #include "sherpa-onnx/csrc/offline-whisper-model.h"
@@ -51,9 +52,20 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
     if (config_.decoding_method == "greedy_search") {
       decoder_ = std::make_unique<OfflineWhisperGreedySearchDecoder>(
           config_.model_config.whisper, model_.get());
+    } else if (config_.decoding_method == "beam_search") {
+      if (config_.max_active_paths <= 0) {
+        SHERPA_ONNX_LOGE("max_active_paths should be positive. Given %d",
+                         config_.max_active_paths);
+        exit(-1);
+      }
+
+      decoder_ = std::make_unique<OfflineWhisperBeamSearchDecoder>(
+          config_.model_config.whisper, model_.get(),
+          config_.max_active_paths);
     } else {
       SHERPA_ONNX_LOGE(
-          "Only greedy_search is supported at present for whisper. Given %s",
+          "Only greedy_search and beam_search are supported at present for "
+          "whisper. Given %s",
           config_.decoding_method.c_str());
       exit(-1);
     }
@@ -66,9 +78,67 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
   }
 
   void DecodeStreams(OfflineStream **ss, int32_t n) const override {
-    // batch decoding is not implemented yet
+    if (n == 0) {
+      return;
+    }
+
+    if (n == 1) {
+      DecodeStream(ss[0]);
+      return;
+    }
+
+    decoder_->SetConfig(config_.model_config.whisper);
+
+    int32_t feat_dim = model_->FeatureDim();
+
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
+
+    int32_t actual_frames = 0;
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = ss[i]->GetFrames();
+      num_frames[i] = Normalize(&features[i], feat_dim);
+
+      actual_frames = std::max(actual_frames, PaddedNumFrames(num_frames[i]));
+    }
+
+    // All utterances are padded to the same number of frames so that the
+    // encoder and the decoder run only once for the whole batch.
+    std::array<int64_t, 3> shape{n, actual_frames, feat_dim};
+
+    Ort::Value mel = Ort::Value::CreateTensor<float>(
+        model_->Allocator(), shape.data(), shape.size());
+
+    float *p_mel = mel.GetTensorMutableData<float>();
+    std::fill_n(p_mel, n * actual_frames * feat_dim, 0);
+
     for (int32_t i = 0; i != n; ++i) {
-      DecodeStream(ss[i]);
+      std::copy(features[i].begin(),
+                features[i].begin() + num_frames[i] * feat_dim,
+                p_mel + i * actual_frames * feat_dim);
+    }
+
+    mel = Transpose12(model_->Allocator(), &mel);
+
+    try {
+      auto cross_kv = model_->ForwardEncoder(std::move(mel));
+
+      auto results = decoder_->Decode(std::move(cross_kv.first),
+                                      std::move(cross_kv.second), num_frames);
+
+      for (int32_t i = 0; i != n; ++i) {
+        auto r = Convert(results[i], symbol_table_);
+        ss[i]->SetResult(r);
+      }
+    } catch (const Ort::Exception &ex) {
+      SHERPA_ONNX_LOGE(
+          "\n\nCaught exception:\n\n%s\n\nwhen decoding a batch of %d "
+          "utterances. Decode them one by one",
+          ex.what(), n);
+
+      for (int32_t i = 0; i != n; ++i) {
+        DecodeStream(ss[i]);
+      }
     }
   }
 
@@ -79,16 +149,11 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
   OfflineRecognizerConfig GetConfig() const override { return config_; }
 
  private:
-  void DecodeStream(OfflineStream *s) const {
-    decoder_->SetConfig(config_.model_config.whisper);
-
+  // Normalize the features in-place and return the number of frames
+  // to use. Frames after the first 30 seconds are discarded.
+  int32_t Normalize(std::vector<float> *f, int32_t feat_dim) const {
     int32_t max_num_frames = 3000;
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    int32_t feat_dim = s->FeatureDim();
-    std::vector<float> f = s->GetFrames();
-    int32_t num_frames = f.size() / feat_dim;
+    int32_t num_frames = f->size() / feat_dim;
 
     // we use 50 here so that there will be some zero tail paddings
     if (num_frames >= max_num_frames - 50) {
@@ -98,7 +163,14 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
       num_frames = max_num_frames - 50;
     }
 
-    model_->NormalizeFeatures(f.data(), num_frames, feat_dim);
+    model_->NormalizeFeatures(f->data(), num_frames, feat_dim);
+
+    return num_frames;
+  }
+
+  // Return the number of frames after adding tail paddings
+  int32_t PaddedNumFrames(int32_t num_frames) const {
+    int32_t max_num_frames = 3000;
 
     // note that 1000 is an experience-value.
     // You can replace 1000 by other values, say, 100.
@@ -111,8 +183,17 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
       tail_padding_frames = config_.model_config.whisper.tail_paddings;
     }
 
-    int32_t actual_frames =
-        std::min(num_frames + tail_padding_frames, max_num_frames);
+    return std::min(num_frames + tail_padding_frames, max_num_frames);
+  }
+
+  void DecodeStream(OfflineStream *s) const {
+    decoder_->SetConfig(config_.model_config.whisper);
+
+    int32_t feat_dim = s->FeatureDim();
+    std::vector<float> f = s->GetFrames();
+    int32_t num_frames = Normalize(&f, feat_dim);
+
+    int32_t actual_frames = PaddedNumFrames(num_frames);
 
     std::array<int64_t, 3> shape{1, actual_frames, feat_dim};
 
@@ -131,7 +212,7 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
       auto cross_kv = model_->ForwardEncoder(std::move(mel));
 
       auto results = decoder_->Decode(std::move(cross_kv.first),
-                                      std::move(cross_kv.second), num_frames);
+                                      std::move(cross_kv.second), {num_frames});
 
       auto r = Convert(results[0], symbol_table_);
       s->SetResult(r);
@@ -141,7 +222,7 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
           "input frames: %d, Current tail "
           "paddings: %d. If you see a lot of such exceptions, please consider "
           "using a larger --whisper-tail-paddings",
-          ex.what(), num_frames, tail_padding_frames);
+          ex.what(), num_frames, actual_frames - num_frames);
       return;
     }
   }
@@ -151,6 +232,7 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
                                    const SymbolTable &sym_table) const {
     OfflineRecognitionResult r;
     r.tokens.reserve(src.tokens.size());
+    r.token_ids.reserve(src.tokens.size());
 
     std::string text;
     for (auto i : src.tokens) {
@@ -164,6 +246,7 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
 
       text += s;
       r.tokens.push_back(s);
+      r.token_ids.push_back(i);
     }
 
     r.text = text;
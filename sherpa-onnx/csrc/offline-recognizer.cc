@@ -5,6 +5,8 @@
 #include "sherpa-onnx/csrc/offline-recognizer.h"
 
 #include <memory>
+#include <random>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -33,11 +35,13 @@ void OfflineRecognizerConfig::Register(ParseOptions *po) {
   po->Register(
       "decoding-method", &decoding_method,
       "decoding method,"
-      "Valid values: greedy_search, modified_beam_search. "
-      "modified_beam_search is applicable only for transducer models.");
+      "Valid values: greedy_search, modified_beam_search, beam_search. "
+      "modified_beam_search is applicable only for transducer models. "
+      "beam_search is applicable only for whisper models.");
 
   po->Register("max-active-paths", &max_active_paths,
-               "Used only when decoding_method is modified_beam_search");
+               "Used only when decoding_method is modified_beam_search or "
+               "beam_search. For beam_search, it is the beam size.");
 
   po->Register("blank-penalty", &blank_penalty,
                "The penalty applied on blank symbol during decoding. "
@@ -179,6 +183,47 @@ OfflineRecognizerConfig OfflineRecognizer::GetConfig() const {
   return impl_->GetConfig();
 }
 
+void OfflineRecognizer::Warmup(
+    const std::vector<int32_t> &batch_sizes /*= {1}*/,
+    const std::vector<float> &lengths /*= {1.0, 5.0}*/) const {
+  int32_t sample_rate = impl_->GetConfig().feat_config.sampling_rate;
+
+  // Low-level noise, so the features are not all the same
+  std::minstd_rand rng(20250101);
+  std::uniform_real_distribution<float> dist(-0.01, 0.01);
+
+  for (float length : lengths) {
+    std::vector<float> samples(static_cast<int32_t>(length * sample_rate));
+    if (samples.empty()) {
+      continue;
+    }
+
+    for (auto &s : samples) {
+      s = dist(rng);
+    }
+
+    for (int32_t batch_size : batch_sizes) {
+      if (batch_size <= 0) {
+        continue;
+      }
+
+      std::vector<std::unique_ptr<OfflineStream>> streams;
+      std::vector<OfflineStream *> ss;
+      streams.reserve(batch_size);
+      ss.reserve(batch_size);
+
+      for (int32_t i = 0; i != batch_size; ++i) {
+        streams.push_back(CreateStream());
+        streams.back()->AcceptWaveform(sample_rate, samples.data(),
+                                       samples.size());
+        ss.push_back(streams.back().get());
+      }
+
+      DecodeStreams(ss.data(), batch_size);
+    }
+  }
+}
+
 #if __ANDROID_API__ >= 9
 template OfflineRecognizer::OfflineRecognizer(
     AAssetManager *mgr, const OfflineRecognizerConfig &config);
@@ -125,6 +125,20 @@ class OfflineRecognizer {
 
   OfflineRecognizerConfig GetConfig() const;
 
+  /** The first call to DecodeStreams() is much slower than later calls
+   * since onnxruntime allocates memory and selects kernels lazily. This
+   * method decodes batches of dummy audio so that the cost is paid before
+   * the first request.
+   *
+   * @param batch_sizes Number of streams to decode together.
+   * @param lengths Duration in seconds of the audio of each stream.
+   *
+   * Each pair of batch size and length is decoded once. They should cover
+   * the typical inputs.
+   */
+  void Warmup(const std::vector<int32_t> &batch_sizes = {1},
+              const std::vector<float> &lengths = {1.0, 5.0}) const;
+
  private:
   std::unique_ptr<OfflineRecognizerImpl> impl_;
 };
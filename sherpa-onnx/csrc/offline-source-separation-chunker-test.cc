@@ -0,0 +1,108 @@
+// sherpa-onnx/csrc/offline-source-separation-chunker-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-source-separation-chunker.h"
+
+#include <algorithm>
+#include <memory>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/offline-source-separation-impl.h"
+
+namespace sherpa_onnx {
+
+namespace {
+
+// Stem i is the input multiplied by i + 1. It fails the test if the input
+// is shorter than GetMinNumSamples(), like the STFT of spleeter.
+class FakeSeparationImpl : public OfflineSourceSeparationImpl {
+ public:
+  OfflineSourceSeparationOutput Process(
+      const OfflineSourceSeparationInput &input) const override {
+    OfflineSourceSeparationOutput ans;
+    ans.sample_rate = input.sample_rate;
+    ans.stems.resize(GetNumberOfStems());
+
+    for (int32_t i = 0; i != GetNumberOfStems(); ++i) {
+      for (const auto &c : input.samples.data) {
+        EXPECT_GE(static_cast<int32_t>(c.size()), GetMinNumSamples());
+
+        std::vector<float> samples = c;
+        for (auto &s : samples) {
+          s *= i + 1;
+        }
+        ans.stems[i].data.push_back(std::move(samples));
+      }
+    }
+
+    return ans;
+  }
+
+  int32_t GetOutputSampleRate() const override { return 100; }
+
+  int32_t GetNumberOfStems() const override { return 2; }
+
+  int32_t GetMinNumSamples() const override { return 16; }
+};
+
+void TestChunker(float crossfade_duration, int32_t num_samples,
+                 int32_t block_size) {
+  OfflineSourceSeparation separation(std::make_unique<FakeSeparationImpl>());
+
+  OfflineSourceSeparationChunkConfig config;
+  config.chunk_duration = 1;
+  config.crossfade_duration = crossfade_duration;
+  config.num_parallel_chunks = 2;
+  ASSERT_TRUE(config.Validate());
+
+  OfflineSourceSeparationChunker chunker(&separation, config);
+
+  std::vector<float> samples(num_samples);
+  for (int32_t i = 0; i != num_samples; ++i) {
+    samples[i] = (i % 37) / 37.0f - 0.5f;
+  }
+
+  std::vector<std::vector<float>> stems(2);
+  auto append = [&stems](const OfflineSourceSeparationOutput &out) {
+    for (int32_t i = 0; i != static_cast<int32_t>(out.stems.size()); ++i) {
+      ASSERT_EQ(out.stems[i].data.size(), 1);
+      const auto &c = out.stems[i].data[0];
+      stems[i].insert(stems[i].end(), c.begin(), c.end());
+    }
+  };
+
+  for (int32_t start = 0; start < num_samples; start += block_size) {
+    int32_t end = std::min(start + block_size, num_samples);
+
+    OfflineSourceSeparationInput input;
+    input.sample_rate = 100;
+    input.samples.data.emplace_back(samples.begin() + start,
+                                    samples.begin() + end);
+    append(chunker.AcceptWaveform(input));
+  }
+  append(chunker.Flush());
+
+  for (int32_t i = 0; i != 2; ++i) {
+    ASSERT_EQ(static_cast<int32_t>(stems[i].size()), num_samples);
+    for (int32_t k = 0; k != num_samples; ++k) {
+      EXPECT_NEAR(stems[i][k], samples[k] * (i + 1), 1e-5) << i << " " << k;
+    }
+  }
+}
+
+}  // namespace
+
+// Only 5 samples are left after the last full chunk
+TEST(OfflineSourceSeparationChunker, NoCrossfade) {
+  TestChunker(0, 305, 64);
+  TestChunker(0, 5, 64);
+}
+
+TEST(OfflineSourceSeparationChunker, Crossfade) {
+  TestChunker(0.2, 305, 64);
+  TestChunker(0.2, 1000, 1000);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,297 @@
+// sherpa-onnx/csrc/offline-source-separation-chunker.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-source-separation-chunker.h"
+
+#include <algorithm>
+#include <memory>
+#include <sstream>
+#include <string>
+#include <thread>  // NOLINT
+#include <utility>
+#include <vector>
+
+#include "sherpa-onnx/csrc/macros.h"
+
+namespace sherpa_onnx {
+
+void OfflineSourceSeparationChunkConfig::Register(ParseOptions *po) {
+  po->Register("source-separation-chunk-duration", &chunk_duration,
+               "Length in seconds of each chunk, including the crossfade "
+               "region.");
+
+  po->Register("source-separation-crossfade-duration", &crossfade_duration,
+               "Length in seconds of the region shared by two adjacent "
+               "chunks. It should be less than the chunk duration.");
+
+  po->Register("source-separation-num-parallel-chunks", &num_parallel_chunks,
+               "Number of chunks to process in parallel.");
+}
+
+bool OfflineSourceSeparationChunkConfig::Validate() const {
+  if (chunk_duration <= 0) {
+    SHERPA_ONNX_LOGE("chunk_duration should be positive. Given: %.3f",
+                     chunk_duration);
+    return false;
+  }
+
+  if (crossfade_duration < 0 || crossfade_duration >= chunk_duration) {
+    SHERPA_ONNX_LOGE(
+        "crossfade_duration should be in the range [0, %.3f). Given: %.3f",
+        chunk_duration, crossfade_duration);
+    return false;
+  }
+
+  if (num_parallel_chunks < 1) {
+    SHERPA_ONNX_LOGE("num_parallel_chunks should be at least 1. Given: %d",
+                     num_parallel_chunks);
+    return false;
+  }
+
+  return true;
+}
+
+std::string OfflineSourceSeparationChunkConfig::ToString() const {
+  std::ostringstream os;
+
+  os << "OfflineSourceSeparationChunkConfig(";
+  os << "chunk_duration=" << chunk_duration << ", ";
+  os << "crossfade_duration=" << crossfade_duration << ", ";
+  os << "num_parallel_chunks=" << num_parallel_chunks << ")";
+
+  return os.str();
+}
+
+OfflineSourceSeparationChunker::OfflineSourceSeparationChunker(
+    const OfflineSourceSeparation *separation,
+    const OfflineSourceSeparationChunkConfig &config)
+    : separation_(separation),
+      config_(config),
+      sample_rate_(separation->GetOutputSampleRate()),
+      min_num_samples_(separation->GetMinNumSamples()) {
+  chunk_size_ = std::max<int32_t>(1, config_.chunk_duration * sample_rate_);
+  overlap_ = config_.crossfade_duration * sample_rate_;
+  overlap_ = std::min<int32_t>(overlap_, chunk_size_ - 1);
+}
+
+OfflineSourceSeparationOutput OfflineSourceSeparationChunker::AcceptWaveform(
+    const OfflineSourceSeparationInput &input) {
+  int32_t num_channels = input.samples.data.size();
+
+  if (buffer_.empty()) {
+    buffer_.resize(num_channels);
+    input_sample_rate_ = input.sample_rate;
+  }
+
+  if (num_channels != static_cast<int32_t>(buffer_.size())) {
+    SHERPA_ONNX_LOGE("Number of channels changed from %d to %d",
+                     static_cast<int32_t>(buffer_.size()), num_channels);
+    SHERPA_ONNX_EXIT(-1);
+  }
+
+  if (input.sample_rate != input_sample_rate_) {
+    SHERPA_ONNX_LOGE("Sample rate changed from %d to %d", input_sample_rate_,
+                     input.sample_rate);
+    SHERPA_ONNX_EXIT(-1);
+  }
+
+  if (input_sample_rate_ != sample_rate_ && resamplers_.empty()) {
+    SHERPA_ONNX_LOGE(
+        "Creating a resampler:\n"
+        "   in_sample_rate: %d\n"
+        "   output_sample_rate: %d\n",
+        input_sample_rate_, sample_rate_);
+
+    float min_freq = std::min<int32_t>(input_sample_rate_, sample_rate_);
+    float lowpass_cutoff = 0.99 * 0.5 * min_freq;
+
+    int32_t lowpass_filter_width = 6;
+    for (int32_t i = 0; i != num_channels; ++i) {
+      resamplers_.push_back(std::make_unique<LinearResample>(
+          input_sample_rate_, sample_rate_, lowpass_cutoff,
+          lowpass_filter_width));
+    }
+  }
+
+  for (int32_t i = 0; i != num_channels; ++i) {
+    const auto &s = input.samples.data[i];
+    if (resamplers_.empty()) {
+      buffer_[i].insert(buffer_[i].end(), s.begin(), s.end());
+    } else {
+      std::vector<float> tmp;
+      resamplers_[i]->Resample(s.data(), s.size(), false, &tmp);
+      buffer_[i].insert(buffer_[i].end(), tmp.begin(), tmp.end());
+    }
+  }
+
+  OfflineSourceSeparationOutput ans;
+  ans.sample_rate = sample_rate_;
+
+  ProcessFullChunks(&ans);
+
+  return ans;
+}
+
+OfflineSourceSeparationOutput OfflineSourceSeparationChunker::Flush() {
+  OfflineSourceSeparationOutput ans;
+  ans.sample_rate = sample_rate_;
+
+  if (buffer_.empty()) {
+    return ans;
+  }
+
+  for (int32_t i = 0; i != static_cast<int32_t>(resamplers_.size()); ++i) {
+    std::vector<float> tmp;
+    resamplers_[i]->Resample(nullptr, 0, true, &tmp);
+    buffer_[i].insert(buffer_[i].end(), tmp.begin(), tmp.end());
+  }
+
+  ProcessFullChunks(&ans);
+
+  int32_t num_samples = buffer_[0].size();
+
+  if (has_tail_ && num_samples <= overlap_) {
+    // The remaining samples have been processed with the previous chunk
+    auto tail = std::move(tail_);
+    has_tail_ = false;
+    Append(std::move(tail), true, &ans);
+  } else if (num_samples > 0) {
+    Append(ProcessChunk(0, num_samples), true, &ans);
+  }
+
+  Reset();
+
+  return ans;
+}
+
+void OfflineSourceSeparationChunker::Reset() {
+  input_sample_rate_ = 0;
+  resamplers_.clear();
+  buffer_.clear();
+  tail_ = {};
+  has_tail_ = false;
+}
+
+void OfflineSourceSeparationChunker::ProcessFullChunks(
+    OfflineSourceSeparationOutput *ans) {
+  int32_t hop = chunk_size_ - overlap_;
+  int32_t num_samples = buffer_[0].size();
+
+  int32_t start = 0;
+  while (start + chunk_size_ <= num_samples) {
+    std::vector<int32_t> starts;
+    for (int32_t s = start;
+         s + chunk_size_ <= num_samples &&
+         static_cast<int32_t>(starts.size()) < config_.num_parallel_chunks;
+         s += hop) {
+      starts.push_back(s);
+    }
+
+    std::vector<OfflineSourceSeparationOutput> outputs(starts.size());
+    if (starts.size() == 1) {
+      outputs[0] = ProcessChunk(starts[0], chunk_size_);
+    } else {
+      std::vector<std::thread> threads;
+      threads.reserve(starts.size());
+      for (int32_t i = 0; i != static_cast<int32_t>(starts.size()); ++i) {
+        threads.emplace_back([this, &outputs, &starts, i]() {
+          outputs[i] = ProcessChunk(starts[i], chunk_size_);
+        });
+      }
+
+      for (auto &t : threads) {
+        t.join();
+      }
+    }
+
+    for (auto &o : outputs) {
+      Append(std::move(o), false, ans);
+    }
+
+    start = starts.back() + hop;
+  }
+
+  if (start > 0) {
+    for (auto &b : buffer_) {
+      b.erase(b.begin(), b.begin() + start);
+    }
+  }
+}
+
+OfflineSourceSeparationOutput OfflineSourceSeparationChunker::ProcessChunk(
+    int32_t start, int32_t num_samples) const {
+  OfflineSourceSeparationInput input;
+  input.sample_rate = sample_rate_;
+  input.samples.data.reserve(buffer_.size());
+  for (const auto &b : buffer_) {
+    input.samples.data.emplace_back(b.begin() + start,
+                                    b.begin() + start + num_samples);
+
+    // The last chunk may be too short for the model, e.g., only a few
+    // samples are left after the last full chunk if there is no crossfade.
+    // Pad it with zeros. The output is cropped below.
+    if (num_samples < min_num_samples_) {
+      input.samples.data.back().resize(min_num_samples_, 0);
+    }
+  }
+
+  auto ans = separation_->Process(input);
+
+  // Some models, e.g., spleeter, may drop a few samples at the end.
+  // We pad them so that the chunks can be aligned. Outputs of padded
+  // inputs are cropped.
+  for (auto &stem : ans.stems) {
+    for (auto &c : stem.data) {
+      c.resize(num_samples);
+    }
+  }
+
+  return ans;
+}
+
+void OfflineSourceSeparationChunker::Append(
+    OfflineSourceSeparationOutput chunk, bool is_last,
+    OfflineSourceSeparationOutput *ans) {
+  if (ans->stems.empty()) {
+    ans->stems.resize(chunk.stems.size());
+    for (int32_t i = 0; i != static_cast<int32_t>(chunk.stems.size()); ++i) {
+      ans->stems[i].data.resize(chunk.stems[i].data.size());
+    }
+  }
+
+  for (int32_t i = 0; i != static_cast<int32_t>(chunk.stems.size()); ++i) {
+    for (int32_t c = 0; c != static_cast<int32_t>(chunk.stems[i].data.size());
+         ++c) {
+      auto &samples = chunk.stems[i].data[c];
+      int32_t n = samples.size();
+
+      if (has_tail_) {
+        const auto &prev = tail_.stems[i].data[c];
+        int32_t m = std::min<int32_t>(prev.size(), n);
+        for (int32_t k = 0; k != m; ++k) {
+          float w = (k + 0.5f) / m;
+          samples[k] = prev[k] * (1 - w) + samples[k] * w;
+        }
+      }
+
+      int32_t end = is_last ? n : std::max<int32_t>(n - overlap_, 0);
+
+      auto &out = ans->stems[i].data[c];
+      out.insert(out.end(), samples.begin(), samples.begin() + end);
+
+      if (!is_last) {
+        samples.erase(samples.begin(), samples.begin() + end);
+      }
+    }
+  }
+
+  if (is_last) {
+    has_tail_ = false;
+  } else {
+    tail_ = std::move(chunk);
+    has_tail_ = true;
+  }
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,115 @@
+// sherpa-onnx/csrc/offline-source-separation-chunker.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_OFFLINE_SOURCE_SEPARATION_CHUNKER_H_
+#define SHERPA_ONNX_CSRC_OFFLINE_SOURCE_SEPARATION_CHUNKER_H_
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "sherpa-onnx/csrc/offline-source-separation.h"
+#include "sherpa-onnx/csrc/parse-options.h"
+#include "sherpa-onnx/csrc/resample.h"
+
+namespace sherpa_onnx {
+
+struct OfflineSourceSeparationChunkConfig {
+  // Length of each chunk in seconds, including the crossfade region
+  float chunk_duration = 30;
+
+  // Length in seconds of the region shared by two adjacent chunks.
+  // Outputs of the two chunks are linearly crossfaded in this region.
+  float crossfade_duration = 1;
+
+  // Number of chunks to process in parallel. Memory usage grows
+  // linearly with it.
+  int32_t num_parallel_chunks = 1;
+
+  OfflineSourceSeparationChunkConfig() = default;
+
+  OfflineSourceSeparationChunkConfig(float chunk_duration,
+                                     float crossfade_duration,
+                                     int32_t num_parallel_chunks)
+      : chunk_duration(chunk_duration),
+        crossfade_duration(crossfade_duration),
+        num_parallel_chunks(num_parallel_chunks) {}
+
+  void Register(ParseOptions *po);
+
+  bool Validate() const;
+
+  std::string ToString() const;
+};
+
+// It splits a long recording into overlapping chunks, runs the separation
+// model on each chunk and joins the outputs with overlap-add. Input can be
+// given piece by piece and the output is returned as soon as it is final,
+// so memory usage does not depend on the duration of the recording.
+//
+// It works with all models supported by OfflineSourceSeparation.
+class OfflineSourceSeparationChunker {
+ public:
+  // @param separation It is not owned by this object and must outlive it.
+  OfflineSourceSeparationChunker(
+      const OfflineSourceSeparation *separation,
+      const OfflineSourceSeparationChunkConfig &config);
+
+  /* Accept a piece of the input.
+   *
+   * @param input All calls must use the same number of channels and
+   *              the same sample rate until Flush() is called.
+   *
+   * @return Return separated samples that are ready. The number of samples
+   *         may be 0.
+   */
+  OfflineSourceSeparationOutput AcceptWaveform(
+      const OfflineSourceSeparationInput &input);
+
+  /* Process all remaining samples and return their outputs.
+   *
+   * The object is reset afterwards and can be used for a new recording.
+   */
+  OfflineSourceSeparationOutput Flush();
+
+  void Reset();
+
+ private:
+  // Process as many full chunks as possible from buffer_ and append
+  // the results to ans
+  void ProcessFullChunks(OfflineSourceSeparationOutput *ans);
+
+  OfflineSourceSeparationOutput ProcessChunk(int32_t start,
+                                             int32_t num_samples) const;
+
+  // Crossfade the beginning of chunk with tail_ and append the final
+  // samples to ans.
+  void Append(OfflineSourceSeparationOutput chunk, bool is_last,
+              OfflineSourceSeparationOutput *ans);
+
+ private:
+  const OfflineSourceSeparation *separation_;
+  OfflineSourceSeparationChunkConfig config_;
+
+  int32_t sample_rate_;
+  int32_t chunk_size_;
+  int32_t overlap_;
+
+  // Shorter chunks are padded with zeros before they are processed
+  int32_t min_num_samples_;
+
+  int32_t input_sample_rate_ = 0;
+  std::vector<std::unique_ptr<LinearResample>> resamplers_;
+
+  // buffer_[c] contains unprocessed samples of channel c
+  std::vector<std::vector<float>> buffer_;
+
+  // Output of the last overlap_ samples of the previous chunk
+  OfflineSourceSeparationOutput tail_;
+  bool has_tail_ = false;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_OFFLINE_SOURCE_SEPARATION_CHUNKER_H_
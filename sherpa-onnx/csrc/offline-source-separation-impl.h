@@ -30,6 +30,9 @@ class OfflineSourceSeparationImpl {
 
   virtual int32_t GetNumberOfStems() const = 0;
 
+  // Inputs with fewer samples per channel than this cannot be processed
+  virtual int32_t GetMinNumSamples() const { return 1; }
+
   OfflineSourceSeparationInput Resample(
       const OfflineSourceSeparationInput &input, bool debug = false) const;
 };
@@ -143,6 +143,10 @@ class OfflineSourceSeparationSpleeterImpl : public OfflineSourceSeparationImpl {
     return model_.GetMetaData().num_stems;
   }
 
+  int32_t GetMinNumSamples() const override {
+    return model_.GetMetaData().n_fft;
+  }
+
  private:
   // spec is of shape (2, num_chunks, 512, 1024)
   std::vector<float> ProcessSpec(const Eigen::VectorXf &spec,
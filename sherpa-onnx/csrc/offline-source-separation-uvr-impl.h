@@ -113,6 +113,10 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
     return model_.GetMetaData().num_stems;
   }
 
+  int32_t GetMinNumSamples() const override {
+    return model_.GetMetaData().n_fft;
+  }
+
  private:
   std::pair<std::vector<float>, std::vector<float>> ProcessChunk(
       const std::vector<float> &chunk_ch0, const std::vector<float> &chunk_ch1,
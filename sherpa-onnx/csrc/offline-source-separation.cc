@@ -5,6 +5,7 @@
 #include "sherpa-onnx/csrc/offline-source-separation.h"
 
 #include <memory>
+#include <utility>
 
 #include "sherpa-onnx/csrc/offline-source-separation-impl.h"
 
@@ -45,6 +46,10 @@ OfflineSourceSeparation::OfflineSourceSeparation(
     const OfflineSourceSeparationConfig &config)
     : impl_(OfflineSourceSeparationImpl::Create(config)) {}
 
+OfflineSourceSeparation::OfflineSourceSeparation(
+    std::unique_ptr<OfflineSourceSeparationImpl> impl)
+    : impl_(std::move(impl)) {}
+
 OfflineSourceSeparation::~OfflineSourceSeparation() = default;
 
 OfflineSourceSeparationOutput OfflineSourceSeparation::Process(
@@ -61,6 +66,10 @@ int32_t OfflineSourceSeparation::GetNumberOfStems() const {
   return impl_->GetNumberOfStems();
 }
 
+int32_t OfflineSourceSeparation::GetMinNumSamples() const {
+  return impl_->GetMinNumSamples();
+}
+
 #if __ANDROID_API__ >= 9
 template OfflineSourceSeparation::OfflineSourceSeparation(
     AAssetManager *mgr, const OfflineSourceSeparationConfig &config);
@@ -57,6 +57,9 @@ class OfflineSourceSeparation {
 
   explicit OfflineSourceSeparation(const OfflineSourceSeparationConfig &config);
 
+  explicit OfflineSourceSeparation(
+      std::unique_ptr<OfflineSourceSeparationImpl> impl);
+
   template <typename Manager>
   OfflineSourceSeparation(Manager *mgr,
                           const OfflineSourceSeparationConfig &config);
@@ -69,6 +72,10 @@ class OfflineSourceSeparation {
   // e.g., it is 2 for 2stems from spleeter
   int32_t GetNumberOfStems() const;
 
+  // Inputs with fewer samples per channel than this cannot be processed,
+  // e.g., it is n_fft for spleeter
+  int32_t GetMinNumSamples() const;
+
  private:
   std::unique_ptr<OfflineSourceSeparationImpl> impl_;
 };
@@ -154,6 +154,13 @@ class OfflineStream::Impl {
     }
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    std::vector<float> buf =
+        Int16ToFloat(waveform, n, config_.normalize_samples);
+    AcceptWaveformImpl(sampling_rate, buf.data(), n);
+  }
+
   void AcceptWaveformImpl(int32_t sampling_rate, const float *waveform,
                           int32_t n) {
     if (sampling_rate != config_.sampling_rate) {
@@ -346,6 +353,11 @@ void OfflineStream::AcceptWaveform(int32_t sampling_rate, const float *waveform,
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void OfflineStream::AcceptWaveform(int32_t sampling_rate,
+                                   const int16_t *waveform, int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 int32_t OfflineStream::FeatureDim() const { return impl_->FeatureDim(); }
 
 std::vector<float> OfflineStream::GetFrames() const {
@@ -26,6 +26,9 @@ struct OfflineRecognitionResult {
   // For instance, for BPE-based models it consists of a list of BPE tokens.
   std::vector<std::string> tokens;
 
+  /// token_ids[i] is the ID of tokens[i] in tokens.txt.
+  std::vector<int32_t> token_ids;
+
   std::string lang;
 
   // emotion target of the audio.
@@ -81,6 +84,15 @@ class OfflineStream {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that samples are 16-bit integers in the
+     range [-32768, 32767], e.g., read from a 16-bit wave file or received
+     from a socket. They are converted to float in a single pass with the
+     scale expected by the feature extractor.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /// Return feature dim of this extractor.
   ///
   /// Note: if it is Moonshine, then it returns the number of audio samples
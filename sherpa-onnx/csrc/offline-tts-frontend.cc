@@ -6,6 +6,7 @@
 
 #include <sstream>
 #include <string>
+#include <vector>
 
 namespace sherpa_onnx {
 
@@ -31,4 +32,16 @@ std::string TokenIDs::ToString() const {
   return os.str();
 }
 
+std::vector<std::vector<TokenIDs>> OfflineTtsFrontend::ConvertTextsToTokenIds(
+    const std::vector<std::string> &texts, const std::string &voice) const {
+  std::vector<std::vector<TokenIDs>> ans;
+  ans.reserve(texts.size());
+
+  for (const auto &text : texts) {
+    ans.push_back(ConvertTextToTokenIds(text, voice));
+  }
+
+  return ans;
+}
+
 }  // namespace sherpa_onnx
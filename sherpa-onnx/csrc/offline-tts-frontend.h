@@ -53,6 +53,18 @@ class OfflineTtsFrontend {
    */
   virtual std::vector<TokenIDs> ConvertTextToTokenIds(
       const std::string &text, const std::string &voice = "") const = 0;
+
+  /** Convert several texts, e.g., sentences, to token IDs.
+   *
+   * @param texts The input texts.
+   * @param voice Optional. It is for espeak-ng.
+   *
+   * @return Return a vector of the same size as texts. ans[i] is the result
+   *         of ConvertTextToTokenIds(texts[i], voice).
+   */
+  virtual std::vector<std::vector<TokenIDs>> ConvertTextsToTokenIds(
+      const std::vector<std::string> &texts,
+      const std::string &voice = "") const;
 };
 
 // implementation is in ./piper-phonemize-lexicon.cc
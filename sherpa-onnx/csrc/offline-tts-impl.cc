@@ -36,6 +36,16 @@ std::vector<int64_t> OfflineTtsImpl::AddBlank(const std::vector<int64_t> &x,
   return buffer;
 }
 
+std::vector<int64_t> OfflineTtsImpl::WarmupTokens(int32_t n) {
+  // Token 0 is usually a padding or a blank, so it is not used.
+  // All models have more than 8 tokens.
+  std::vector<int64_t> ans(n);
+  for (int32_t i = 0; i != n; ++i) {
+    ans[i] = 1 + i % 8;
+  }
+  return ans;
+}
+
 std::unique_ptr<OfflineTtsImpl> OfflineTtsImpl::Create(
     const OfflineTtsConfig &config) {
   if (!config.model.vits.model.empty()) {
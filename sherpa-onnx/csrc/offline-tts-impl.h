@@ -41,6 +41,20 @@ class OfflineTtsImpl {
         "OfflineTtsImpl backend does not support zero-shot Generate()");
   }
 
+  virtual OfflineTtsVoice CreateVoice(const std::string &prompt_text,
+                                      const float *prompt_samples, int32_t n,
+                                      int32_t sample_rate) const {
+    throw std::runtime_error(
+        "OfflineTtsImpl backend does not support CreateVoice()");
+  }
+
+  virtual GeneratedAudio Generate(
+      const std::string &text, const OfflineTtsVoice &voice, float speed = 1.0,
+      int32_t num_step = 4, GeneratedAudioCallback callback = nullptr) const {
+    throw std::runtime_error(
+        "OfflineTtsImpl backend does not support zero-shot Generate()");
+  }
+
   // Return the sample rate of the generated audio
   virtual int32_t SampleRate() const = 0;
 
@@ -51,8 +65,15 @@ class OfflineTtsImpl {
         "Zero-shot OfflineTts does not support NumSpeakers()");
   }
 
+  // Run the model on dummy inputs with the given numbers of tokens.
+  // See OfflineTts::Warmup()
+  virtual void Warmup(const std::vector<int32_t> &lengths) const {}
+
   std::vector<int64_t> AddBlank(const std::vector<int64_t> &x,
                                 int32_t blank_id = 0) const;
+
+  // Return n dummy token IDs for Warmup()
+  static std::vector<int64_t> WarmupTokens(int32_t n);
 };
 
 }  // namespace sherpa_onnx
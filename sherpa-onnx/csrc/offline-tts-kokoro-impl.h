@@ -4,23 +4,22 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_KOKORO_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_KOKORO_IMPL_H_
 
+#include <algorithm>
+#include <chrono>  // NOLINT
 #include <iomanip>
 #include <ios>
 #include <memory>
 #include <string>
-#include <strstream>
 #include <utility>
 #include <vector>
 
-#include "fst/extensions/far/far.h"
-#include "kaldifst/csrc/kaldi-fst-io.h"
-#include "kaldifst/csrc/text-normalizer.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/kokoro-multi-lang-lexicon.h"
 #include "sherpa-onnx/csrc/lexicon.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-tts-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts-impl.h"
+#include "sherpa-onnx/csrc/offline-tts-text-normalizer.h"
 #include "sherpa-onnx/csrc/offline-tts-kokoro-model.h"
 #include "sherpa-onnx/csrc/piper-phonemize-lexicon.h"
 #include "sherpa-onnx/csrc/text-utils.h"
@@ -34,54 +33,8 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
         model_(std::make_unique<OfflineTtsKokoroModel>(config.model)) {
     InitFrontend();
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(f));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("Loading FST archives");
-      }
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(f));
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }
-      }
-
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("FST archives loaded!");
-      }
-    }
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   template <typename Manager>
@@ -90,55 +43,8 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
         model_(std::make_unique<OfflineTtsKokoroModel>(mgr, config.model)) {
     InitFrontend(mgr);
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        auto buf = ReadFile(mgr, f);
-        std::istrstream is(buf.data(), buf.size());
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(is));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-
-        auto buf = ReadFile(mgr, f);
-
-        std::unique_ptr<std::istream> s(
-            new std::istrstream(buf.data(), buf.size()));
-
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(std::move(s)));
-
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }  // for (; !reader->Done(); reader->Next())
-      }    // for (const auto &f : files)
-    }      // if (!config.rule_fars.empty())
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        mgr, config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   int32_t SampleRate() const override {
@@ -149,6 +55,24 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
     return model_->GetMetaData().num_speakers;
   }
 
+  void Warmup(const std::vector<int32_t> &lengths) const override {
+    // There is a 0 at the front and end of the tokens
+    int32_t max_len = model_->GetMetaData().max_token_len - 1;
+
+    for (int32_t n : lengths) {
+      n = std::min(n, max_len);
+      if (n <= 0) {
+        continue;
+      }
+
+      std::vector<int64_t> x = WarmupTokens(n);
+      x.insert(x.begin(), 0);
+      x.push_back(0);
+
+      Process({x}, 0, 1.0);
+    }
+  }
+
   GeneratedAudio Generate(
       const std::string &_text, int64_t sid = 0, float speed = 1.0,
       GeneratedAudioCallback callback = nullptr) const override {
@@ -207,16 +131,16 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
 #endif
     }
 
-    if (!tn_list_.empty()) {
-      for (const auto &tn : tn_list_) {
-        text = tn->Normalize(text);
-        if (config_.model.debug) {
+    const auto frontend_begin = std::chrono::steady_clock::now();
+
+    if (!tn_->Empty()) {
+      text = tn_->Normalize(text);
+      if (config_.model.debug) {
 #if __OHOS__
-          SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
 #else
-          SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
 #endif
-        }
       }
     }
 
@@ -224,6 +148,18 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
         text, config_.model.kokoro.lang.empty() ? meta_data.voice
                                                 : config_.model.kokoro.lang);
 
+    float frontend_seconds = std::chrono::duration<float>(
+                                 std::chrono::steady_clock::now() -
+                                 frontend_begin)
+                                 .count();
+    if (config_.model.debug) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Frontend time: %{public}.3f s", frontend_seconds);
+#else
+      SHERPA_ONNX_LOGE("Frontend time: %.3f s", frontend_seconds);
+#endif
+    }
+
     if (token_ids.empty() ||
         (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
 #if __OHOS__
@@ -325,6 +261,7 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
       }
     }
 
+    ans.frontend_seconds = frontend_seconds;
     return ans;
   }
 
@@ -429,7 +366,7 @@ class OfflineTtsKokoroImpl : public OfflineTtsImpl {
  private:
   OfflineTtsConfig config_;
   std::unique_ptr<OfflineTtsKokoroModel> model_;
-  std::vector<std::unique_ptr<kaldifst::TextNormalizer>> tn_list_;
+  std::unique_ptr<OfflineTtsTextNormalizer> tn_;
   std::unique_ptr<OfflineTtsFrontend> frontend_;
 };
 
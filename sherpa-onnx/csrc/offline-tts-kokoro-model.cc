@@ -5,6 +5,8 @@
 #include "sherpa-onnx/csrc/offline-tts-kokoro-model.h"
 
 #include <algorithm>
+#include <array>
+#include <memory>
 #include <string>
 #include <utility>
 #include <vector>
@@ -20,6 +22,7 @@
 
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/mapped-file.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 #include "sherpa-onnx/csrc/session.h"
 #include "sherpa-onnx/csrc/text-utils.h"
@@ -34,9 +37,17 @@ class OfflineTtsKokoroModel::Impl {
         sess_opts_(GetSessionOptions(config)),
         allocator_{} {
     auto model_buf = ReadFile(config.kokoro.model);
-    auto voices_buf = ReadFile(config.kokoro.voices);
-    Init(model_buf.data(), model_buf.size(), voices_buf.data(),
-         voices_buf.size());
+
+    // voices.bin is shared by all models in this process using it and its
+    // pages are shared with other processes
+    voices_ = MappedFile::Open(config.kokoro.voices);
+    if (!voices_) {
+      SHERPA_ONNX_LOGE("Failed to read --kokoro-voices '%s'",
+                       config.kokoro.voices.c_str());
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    Init(model_buf.data(), model_buf.size());
   }
 
   template <typename Manager>
@@ -46,19 +57,15 @@ class OfflineTtsKokoroModel::Impl {
         sess_opts_(GetSessionOptions(config)),
         allocator_{} {
     auto model_buf = ReadFile(mgr, config.kokoro.model);
-    auto voices_buf = ReadFile(mgr, config.kokoro.voices);
-    Init(model_buf.data(), model_buf.size(), voices_buf.data(),
-         voices_buf.size());
+    voices_ = std::make_shared<MappedFile>(ReadFile(mgr, config.kokoro.voices));
+    Init(model_buf.data(), model_buf.size());
   }
 
   const OfflineTtsKokoroModelMetaData &GetMetaData() const {
     return meta_data_;
   }
 
-  Ort::Value Run(Ort::Value x, int32_t sid, float speed) {
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
+  Ort::Value Run(Ort::Value x, int32_t sid, float speed) const {
     std::vector<int64_t> x_shape = x.GetTensorTypeAndShapeInfo().GetShape();
     if (x_shape[0] != 1) {
       SHERPA_ONNX_LOGE("Support only batch_size == 1. Given: %d",
@@ -68,6 +75,17 @@ class OfflineTtsKokoroModel::Impl {
 
     // there is a 0 at the front and end of x
     int32_t len = static_cast<int32_t>(x_shape[1]) - 2;
+
+    return RunWithStyle(std::move(x), Style(sid, len), speed);
+  }
+
+ private:
+  // Return the style embedding for the given speaker and number of tokens.
+  // It is a row of voices.bin of shape (1, style_dim_[2])
+  Ort::Value Style(int32_t sid, int32_t len) const {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
     int32_t num_speakers = meta_data_.num_speakers;
     int32_t dim0 = style_dim_[0];
     int32_t dim1 = style_dim_[2];
@@ -76,12 +94,25 @@ class OfflineTtsKokoroModel::Impl {
       SHERPA_ONNX_EXIT(-1);
     }
 
-    /*const*/ float *p = styles_.data() + sid * dim0 * dim1 + len * dim1;
+    if (sid < 0 || sid >= num_speakers) {
+      SHERPA_ONNX_LOGE("Invalid speaker ID %d. Number of speakers: %d", sid,
+                       num_speakers);
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    // The session only reads its inputs
+    float *p = const_cast<float *>(styles_) + sid * dim0 * dim1 + len * dim1;
 
     std::array<int64_t, 2> style_embedding_shape = {1, dim1};
-    Ort::Value style_embedding = Ort::Value::CreateTensor(
-        memory_info, p, dim1, style_embedding_shape.data(),
-        style_embedding_shape.size());
+    return Ort::Value::CreateTensor(memory_info, p, dim1,
+                                    style_embedding_shape.data(),
+                                    style_embedding_shape.size());
+  }
+
+  Ort::Value RunWithStyle(Ort::Value x, Ort::Value style_embedding,
+                          float speed) const {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
     int64_t speed_shape = 1;
     if (config_.kokoro.length_scale != 1 && speed == 1) {
@@ -101,9 +132,7 @@ class OfflineTtsKokoroModel::Impl {
     return std::move(out[0]);
   }
 
- private:
-  void Init(void *model_data, size_t model_data_length, const char *voices_data,
-            size_t voices_data_length) {
+  void Init(void *model_data, size_t model_data_length) {
     sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
                                            sess_opts_);
 
@@ -174,7 +203,7 @@ class OfflineTtsKokoroModel::Impl {
       SHERPA_ONNX_EXIT(-1);
     }
 
-    int32_t actual_num_floats = voices_data_length / sizeof(float);
+    int32_t actual_num_floats = voices_->Size() / sizeof(float);
     int32_t expected_num_floats =
         style_dim_[0] * style_dim_[2] * meta_data_.num_speakers;
 
@@ -195,9 +224,7 @@ class OfflineTtsKokoroModel::Impl {
       SHERPA_ONNX_EXIT(-1);
     }
 
-    styles_ = std::vector<float>(
-        reinterpret_cast<const float *>(voices_data),
-        reinterpret_cast<const float *>(voices_data) + expected_num_floats);
+    styles_ = reinterpret_cast<const float *>(voices_->Data());
 
     meta_data_.max_token_len = style_dim_[0];
   }
@@ -219,8 +246,11 @@ class OfflineTtsKokoroModel::Impl {
   OfflineTtsKokoroModelMetaData meta_data_;
   std::vector<int32_t> style_dim_;
 
+  std::shared_ptr<const MappedFile> voices_;
+
+  // Points into voices_.
   // (num_speakers, style_dim_[0], style_dim_[2])
-  std::vector<float> styles_;
+  const float *styles_ = nullptr;
 };
 
 OfflineTtsKokoroModel::OfflineTtsKokoroModel(
@@ -25,6 +25,9 @@ class OfflineTtsKokoroModel {
 
   // Return a float32 tensor containing the samples
   // of shape (batch_size, num_samples)
+  //
+  // The exported models expand durations assuming a single utterance, so
+  // batch_size must be 1 and all rows of a request share one speaker.
   Ort::Value Run(Ort::Value x, int64_t sid = 0, float speed = 1.0) const;
 
   const OfflineTtsKokoroModelMetaData &GetMetaData() const;
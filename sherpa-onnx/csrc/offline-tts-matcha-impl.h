@@ -4,15 +4,12 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_MATCHA_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_MATCHA_IMPL_H_
 
+#include <chrono>  // NOLINT
 #include <memory>
 #include <string>
-#include <strstream>
 #include <utility>
 #include <vector>
 
-#include "fst/extensions/far/far.h"
-#include "kaldifst/csrc/kaldi-fst-io.h"
-#include "kaldifst/csrc/text-normalizer.h"
 #include "sherpa-onnx/csrc/character-lexicon.h"
 #include "sherpa-onnx/csrc/lexicon.h"
 #include "sherpa-onnx/csrc/macros.h"
@@ -20,6 +17,7 @@
 #include "sherpa-onnx/csrc/offline-tts-character-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts-impl.h"
+#include "sherpa-onnx/csrc/offline-tts-text-normalizer.h"
 #include "sherpa-onnx/csrc/offline-tts-matcha-model.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 #include "sherpa-onnx/csrc/piper-phonemize-lexicon.h"
@@ -36,54 +34,8 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
         vocoder_(Vocoder::Create(config.model)) {
     InitFrontend();
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(f));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("Loading FST archives");
-      }
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(f));
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }
-      }
-
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("FST archives loaded!");
-      }
-    }
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   template <typename Manager>
@@ -93,55 +45,8 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
         vocoder_(Vocoder::Create(mgr, config.model)) {
     InitFrontend(mgr);
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        auto buf = ReadFile(mgr, f);
-        std::istrstream is(buf.data(), buf.size());
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(is));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-
-        auto buf = ReadFile(mgr, f);
-
-        std::unique_ptr<std::istream> s(
-            new std::istrstream(buf.data(), buf.size()));
-
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(std::move(s)));
-
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }  // for (; !reader->Done(); reader->Next())
-      }  // for (const auto &f : files)
-    }  // if (!config.rule_fars.empty())
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        mgr, config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   int32_t SampleRate() const override {
@@ -152,6 +57,16 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
     return model_->GetMetaData().num_speakers;
   }
 
+  void Warmup(const std::vector<int32_t> &lengths) const override {
+    for (int32_t n : lengths) {
+      if (n <= 0) {
+        continue;
+      }
+
+      Process({WarmupTokens(n)}, 0, 1.0);
+    }
+  }
+
   GeneratedAudio Generate(
       const std::string &_text, int64_t sid = 0, float speed = 1.0,
       GeneratedAudioCallback callback = nullptr) const override {
@@ -196,22 +111,34 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
 #endif
     }
 
-    if (!tn_list_.empty()) {
-      for (const auto &tn : tn_list_) {
-        text = tn->Normalize(text);
-        if (config_.model.debug) {
+    const auto frontend_begin = std::chrono::steady_clock::now();
+
+    if (!tn_->Empty()) {
+      text = tn_->Normalize(text);
+      if (config_.model.debug) {
 #if __OHOS__
-          SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
 #else
-          SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
 #endif
-        }
       }
     }
 
     std::vector<TokenIDs> token_ids =
         frontend_->ConvertTextToTokenIds(text, meta_data.voice);
 
+    float frontend_seconds = std::chrono::duration<float>(
+                                 std::chrono::steady_clock::now() -
+                                 frontend_begin)
+                                 .count();
+    if (config_.model.debug) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Frontend time: %{public}.3f s", frontend_seconds);
+#else
+      SHERPA_ONNX_LOGE("Frontend time: %.3f s", frontend_seconds);
+#endif
+    }
+
     if (token_ids.empty() ||
         (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
 #if __OHOS__
@@ -239,11 +166,22 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
 
     int32_t x_size = static_cast<int32_t>(x.size());
 
+    // If true, audio is passed to the callback chunk by chunk while
+    // the vocoder is running
+    bool stream = callback && config_.model.matcha.vocoder_chunk_size > 0;
+
     if (config_.max_num_sentences <= 0 || x_size <= config_.max_num_sentences) {
+      if (stream) {
+        auto ans = Process(x, sid, speed, callback);
+        ans.frontend_seconds = frontend_seconds;
+        return ans;
+      }
+
       auto ans = Process(x, sid, speed);
       if (callback) {
         callback(ans.samples.data(), ans.samples.size(), 1.0);
       }
+      ans.frontend_seconds = frontend_seconds;
       return ans;
     }
 
@@ -275,17 +213,28 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
 
     int32_t k = 0;
 
-    for (int32_t b = 0; b != num_batches && should_continue; ++b) {
+    // Used only when stream is true
+    int32_t b = 0;
+    int32_t total_batches = (x_size + batch_size - 1) / batch_size;
+    GeneratedAudioCallback chunk_callback =
+        [&](const float *samples, int32_t n, float progress) {
+          should_continue =
+              callback(samples, n, (b + progress) / total_batches);
+          return should_continue;
+        };
+
+    for (; b != num_batches && should_continue; ++b) {
       batch_x.clear();
       for (int32_t i = 0; i != batch_size; ++i, ++k) {
         batch_x.push_back(std::move(x[k]));
       }
 
-      auto audio = Process(batch_x, sid, speed);
+      auto audio = Process(batch_x, sid, speed,
+                           stream ? chunk_callback : nullptr);
       ans.sample_rate = audio.sample_rate;
       ans.samples.insert(ans.samples.end(), audio.samples.begin(),
                          audio.samples.end());
-      if (callback) {
+      if (callback && !stream) {
         should_continue = callback(audio.samples.data(), audio.samples.size(),
                                    (b + 1) * 1.0 / num_batches);
         // Caution(fangjun): audio is freed when the callback returns, so users
@@ -302,11 +251,12 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
     }
 
     if (!batch_x.empty()) {
-      auto audio = Process(batch_x, sid, speed);
+      auto audio = Process(batch_x, sid, speed,
+                           stream ? chunk_callback : nullptr);
       ans.sample_rate = audio.sample_rate;
       ans.samples.insert(ans.samples.end(), audio.samples.begin(),
                          audio.samples.end());
-      if (callback) {
+      if (callback && !stream) {
         callback(audio.samples.data(), audio.samples.size(), 1.0);
         // Caution(fangjun): audio is freed when the callback returns, so users
         // should copy the data if they want to access the data after
@@ -314,6 +264,7 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
       }
     }
 
+    ans.frontend_seconds = frontend_seconds;
     return ans;
   }
 
@@ -356,8 +307,11 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
     }
   }
 
-  GeneratedAudio Process(const std::vector<std::vector<int64_t>> &tokens,
-                         int32_t sid, float speed) const {
+  // If callback is not empty, the vocoder runs in chunks and the audio of
+  // each chunk is passed to the callback as soon as it is ready.
+  GeneratedAudio Process(
+      const std::vector<std::vector<int64_t>> &tokens, int32_t sid,
+      float speed, const GeneratedAudioCallback &callback = nullptr) const {
     int32_t num_tokens = 0;
     for (const auto &k : tokens) {
       num_tokens += k.size();
@@ -379,11 +333,36 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
     Ort::Value mel = model_->Run(std::move(x_tensor), sid, speed);
 
     GeneratedAudio ans;
-
-    ans.samples = vocoder_->Run(std::move(mel));
     ans.sample_rate = model_->GetMetaData().sample_rate;
 
     float silence_scale = config_.silence_scale;
+
+    if (callback) {
+      // Silence is scaled chunk by chunk, so a pause across a chunk
+      // boundary is scaled as two pauses.
+      auto wrapper = [&](const float *samples, int32_t n, float progress) {
+        GeneratedAudio chunk;
+        chunk.samples = {samples, samples + n};
+        chunk.sample_rate = ans.sample_rate;
+        if (silence_scale != 1) {
+          chunk = chunk.ScaleSilence(silence_scale);
+        }
+
+        ans.samples.insert(ans.samples.end(), chunk.samples.begin(),
+                           chunk.samples.end());
+
+        return callback(chunk.samples.data(), chunk.samples.size(), progress);
+      };
+
+      vocoder_->RunInChunks(std::move(mel),
+                            config_.model.matcha.vocoder_chunk_size,
+                            config_.model.matcha.vocoder_chunk_overlap,
+                            wrapper);
+      return ans;
+    }
+
+    ans.samples = vocoder_->Run(std::move(mel));
+
     if (silence_scale != 1) {
       ans = ans.ScaleSilence(silence_scale);
     }
@@ -395,7 +374,7 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
   OfflineTtsConfig config_;
   std::unique_ptr<OfflineTtsMatchaModel> model_;
   std::unique_ptr<Vocoder> vocoder_;
-  std::vector<std::unique_ptr<kaldifst::TextNormalizer>> tn_list_;
+  std::unique_ptr<OfflineTtsTextNormalizer> tn_;
   std::unique_ptr<OfflineTtsFrontend> frontend_;
 };
 
@@ -28,6 +28,13 @@ void OfflineTtsMatchaModelConfig::Register(ParseOptions *po) {
                "noise_scale for Matcha models");
   po->Register("matcha-length-scale", &length_scale,
                "Speech speed. Larger->Slower; Smaller->faster.");
+  po->Register("matcha-vocoder-chunk-size", &vocoder_chunk_size,
+               "If positive, run the vocoder on chunks of this many mel frames "
+               "so that audio is available before the whole mel is vocoded. "
+               "0 to run the vocoder on the whole mel.");
+  po->Register("matcha-vocoder-chunk-overlap", &vocoder_chunk_overlap,
+               "Number of context mel frames on each side of a chunk. Used "
+               "only when --matcha-vocoder-chunk-size is positive.");
 }
 
 bool OfflineTtsMatchaModelConfig::Validate() const {
@@ -103,6 +110,12 @@ bool OfflineTtsMatchaModelConfig::Validate() const {
         "this model. Ignore it");
   }
 
+  if (vocoder_chunk_size > 0 && vocoder_chunk_overlap < 1) {
+    SHERPA_ONNX_LOGE("--matcha-vocoder-chunk-overlap should be >= 1. Given: %d",
+                     vocoder_chunk_overlap);
+    return false;
+  }
+
   return true;
 }
 
@@ -116,7 +129,9 @@ std::string OfflineTtsMatchaModelConfig::ToString() const {
   os << "tokens=\"" << tokens << "\", ";
   os << "data_dir=\"" << data_dir << "\", ";
   os << "noise_scale=" << noise_scale << ", ";
-  os << "length_scale=" << length_scale << ")";
+  os << "length_scale=" << length_scale << ", ";
+  os << "vocoder_chunk_size=" << vocoder_chunk_size << ", ";
+  os << "vocoder_chunk_overlap=" << vocoder_chunk_overlap << ")";
 
   return os.str();
 }
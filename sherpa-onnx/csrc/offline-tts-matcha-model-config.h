@@ -27,6 +27,16 @@ struct OfflineTtsMatchaModelConfig {
   float noise_scale = 1;
   float length_scale = 1;
 
+  // If positive, the vocoder processes the mel in chunks of this many frames
+  // and each chunk of audio is passed to the callback as soon as it is
+  // ready. If 0, the whole mel is processed at once.
+  int32_t vocoder_chunk_size = 0;
+
+  // Number of mel frames on each side of a chunk that are also given to the
+  // vocoder as context. The audio of the context frames is discarded.
+  // It must be at least 1 if vocoder_chunk_size is positive.
+  int32_t vocoder_chunk_overlap = 24;
+
   OfflineTtsMatchaModelConfig() = default;
 
   OfflineTtsMatchaModelConfig(const std::string &acoustic_model,
@@ -35,7 +45,9 @@ struct OfflineTtsMatchaModelConfig {
                               const std::string &tokens,
                               const std::string &data_dir,
                               const std::string &dict_dir,
-                              float noise_scale = 1.0, float length_scale = 1)
+                              float noise_scale = 1.0, float length_scale = 1,
+                              int32_t vocoder_chunk_size = 0,
+                              int32_t vocoder_chunk_overlap = 24)
       : acoustic_model(acoustic_model),
         vocoder(vocoder),
         lexicon(lexicon),
@@ -43,7 +55,9 @@ struct OfflineTtsMatchaModelConfig {
         data_dir(data_dir),
         dict_dir(dict_dir),
         noise_scale(noise_scale),
-        length_scale(length_scale) {}
+        length_scale(length_scale),
+        vocoder_chunk_size(vocoder_chunk_size),
+        vocoder_chunk_overlap(vocoder_chunk_overlap) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
@@ -0,0 +1,92 @@
+// sherpa-onnx/csrc/offline-tts-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-tts.h"
+
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <iterator>
+#include <string>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(OfflineTtsVoice, SaveAndLoad) {
+  OfflineTtsVoice voice;
+  voice.tokens = {1, 20, 300};
+  voice.num_frames = 2;
+  voice.feat_dim = 3;
+  voice.features = {0.5, -1, 2, 3.25, 4, -5};
+  voice.rms = 0.125;
+
+  std::string filename = "offline-tts-test-voice.bin";
+  ASSERT_TRUE(voice.Save(filename));
+
+  OfflineTtsVoice loaded;
+  ASSERT_TRUE(loaded.Load(filename));
+
+  EXPECT_EQ(loaded.tokens, voice.tokens);
+  EXPECT_EQ(loaded.features, voice.features);
+  EXPECT_EQ(loaded.num_frames, voice.num_frames);
+  EXPECT_EQ(loaded.feat_dim, voice.feat_dim);
+  EXPECT_EQ(loaded.rms, voice.rms);
+  EXPECT_FALSE(loaded.Empty());
+
+  std::remove(filename.c_str());
+}
+
+TEST(OfflineTtsVoice, LoadInvalidFile) {
+  OfflineTtsVoice voice;
+  EXPECT_FALSE(voice.Load("non-existing-voice.bin"));
+
+  std::string filename = "offline-tts-test-invalid-voice.bin";
+  {
+    std::ofstream os(filename, std::ios::binary);
+    os << "not a voice file";
+  }
+
+  EXPECT_FALSE(voice.Load(filename));
+  EXPECT_TRUE(voice.Empty());
+
+  // a truncated file
+  OfflineTtsVoice v;
+  v.tokens = {1, 2};
+  v.num_frames = 1;
+  v.feat_dim = 2;
+  v.features = {1, 2};
+  ASSERT_TRUE(v.Save(filename));
+
+  std::string content;
+  {
+    std::ifstream is(filename, std::ios::binary);
+    content.assign(std::istreambuf_iterator<char>(is),
+                   std::istreambuf_iterator<char>());
+  }
+  {
+    std::ofstream os(filename, std::ios::binary);
+    os.write(content.data(), content.size() - 1);
+  }
+
+  EXPECT_FALSE(voice.Load(filename));
+  EXPECT_TRUE(voice.Empty());
+
+  // a header claiming more data than the file contains. It must be
+  // rejected without trying to allocate memory for it.
+  {
+    std::ofstream os(filename, std::ios::binary);
+    int32_t header[] = {0x56544f53, 1, 0x7fffffff, 0x7fffffff, 0x7fffffff};
+    float rms = 0;
+    os.write(reinterpret_cast<const char *>(header), sizeof(header));
+    os.write(reinterpret_cast<const char *>(&rms), sizeof(rms));
+  }
+
+  EXPECT_FALSE(voice.Load(filename));
+  EXPECT_TRUE(voice.Empty());
+
+  std::remove(filename.c_str());
+}
+
+}  // namespace sherpa_onnx
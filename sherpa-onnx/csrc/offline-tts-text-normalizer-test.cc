@@ -0,0 +1,146 @@
+// sherpa-onnx/csrc/offline-tts-text-normalizer-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-tts-text-normalizer.h"
+
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+// A byte-level rule that copies its input and replaces the digit 1 with one
+static std::unique_ptr<fst::StdConstFst> BuildRule() {
+  fst::StdVectorFst f;
+  auto s0 = f.AddState();
+  f.SetStart(s0);
+  f.SetFinal(s0, fst::TropicalWeight::One());
+
+  for (int32_t i = 1; i != 256; ++i) {
+    if (i != '1') {
+      f.AddArc(s0, fst::StdArc(i, i, 0, s0));
+    }
+  }
+
+  auto s1 = f.AddState();
+  auto s2 = f.AddState();
+  f.AddArc(s0, fst::StdArc('1', 'o', 0, s1));
+  f.AddArc(s1, fst::StdArc(0, 'n', 0, s2));
+  f.AddArc(s2, fst::StdArc(0, 'e', 0, s0));
+
+  return std::make_unique<fst::StdConstFst>(f);
+}
+
+// A byte-level rule that copies its input and whose only non-identity arc
+// leaving the start state has the given labels
+static std::unique_ptr<fst::StdConstFst> BuildRule(int32_t ilabel,
+                                                   int32_t olabel) {
+  fst::StdVectorFst f;
+  auto s0 = f.AddState();
+  f.SetStart(s0);
+  f.SetFinal(s0, fst::TropicalWeight::One());
+
+  for (int32_t i = 'a'; i <= 'z'; ++i) {
+    f.AddArc(s0, fst::StdArc(i, i, 0, s0));
+  }
+
+  auto s1 = f.AddState();
+  f.AddArc(s0, fst::StdArc(ilabel, olabel, 0, s1));
+  f.AddArc(s1, fst::StdArc(' ', ' ', 0, s0));
+
+  return std::make_unique<fst::StdConstFst>(f);
+}
+
+TEST(OfflineTtsTextNormalizer, SplitSentences) {
+  std::string text = "Hello world. How are you?\n你好。今天几号？Fine";
+  auto sentences = OfflineTtsTextNormalizer::SplitSentences(text);
+
+  std::vector<std::string> expected = {
+      "Hello world. ", "How are you?\n", "你好。", "今天几号？", "Fine"};
+  EXPECT_EQ(sentences, expected);
+
+  // no split inside numbers or abbreviations without spaces
+  EXPECT_EQ(OfflineTtsTextNormalizer::SplitSentences("3.14 and 1,000").size(),
+            1);
+
+  EXPECT_TRUE(OfflineTtsTextNormalizer::SplitSentences("").empty());
+
+  // Abbreviations followed by a space end a sentence, so rules cannot
+  // match across them
+  expected = {"No. ", "5"};
+  EXPECT_EQ(OfflineTtsTextNormalizer::SplitSentences("No. 5"), expected);
+}
+
+TEST(OfflineTtsTextNormalizer, SkipRules) {
+  std::vector<std::unique_ptr<fst::StdConstFst>> rules;
+  rules.push_back(BuildRule());
+  rules.push_back(BuildRule('x', 'y'));
+
+  // A rule that inserts symbols without consuming any input
+  rules.push_back(BuildRule(0, 'y'));
+
+  // A rule that changes an input label that is not a byte
+  rules.push_back(BuildRule(300, 'y'));
+
+  OfflineTtsTextNormalizer tn(std::move(rules));
+  ASSERT_EQ(tn.NumRules(), 4);
+
+  EXPECT_FALSE(tn.AlwaysApplyRule(0));
+  EXPECT_FALSE(tn.ShouldApplyRule(0, "no digits here"));
+  EXPECT_TRUE(tn.ShouldApplyRule(0, "1 apple"));
+
+  // Bytes copied by the rule before the first change are not triggers
+  EXPECT_FALSE(tn.AlwaysApplyRule(1));
+  EXPECT_FALSE(tn.ShouldApplyRule(1, "abc 1"));
+  EXPECT_TRUE(tn.ShouldApplyRule(1, "box"));
+
+  EXPECT_TRUE(tn.AlwaysApplyRule(2));
+  EXPECT_TRUE(tn.ShouldApplyRule(2, ""));
+  EXPECT_TRUE(tn.ShouldApplyRule(2, "abc"));
+
+  EXPECT_TRUE(tn.AlwaysApplyRule(3));
+  EXPECT_TRUE(tn.ShouldApplyRule(3, "abc"));
+}
+
+TEST(OfflineTtsTextNormalizer, Normalize) {
+  std::vector<std::unique_ptr<fst::StdConstFst>> rules;
+  rules.push_back(BuildRule());
+
+  OfflineTtsTextNormalizer tn(std::move(rules));
+  EXPECT_EQ(tn.NumRules(), 1);
+
+  EXPECT_EQ(tn.Normalize("I have 1 apple. You have 1 too."),
+            "I have one apple. You have one too.");
+
+  // Two sentences
+  EXPECT_EQ(tn.CacheSize(), 2);
+
+  // The sentence without the digit is also cached
+  EXPECT_EQ(tn.Normalize("no digits here"), "no digits here");
+  EXPECT_EQ(tn.CacheSize(), 3);
+
+  // A cached sentence is not added again
+  EXPECT_EQ(tn.Normalize("I have 1 apple. "), "I have one apple. ");
+  EXPECT_EQ(tn.CacheSize(), 3);
+}
+
+TEST(OfflineTtsTextNormalizer, CacheCapacity) {
+  std::vector<std::unique_ptr<fst::StdConstFst>> rules;
+  rules.push_back(BuildRule());
+
+  OfflineTtsTextNormalizer tn(std::move(rules), /*cache_capacity*/ 2);
+  tn.Normalize("a1. b1. c1.");
+  EXPECT_EQ(tn.CacheSize(), 2);
+
+  OfflineTtsTextNormalizer empty(
+      std::vector<std::unique_ptr<fst::StdConstFst>>(), 2);
+  EXPECT_TRUE(empty.Empty());
+  EXPECT_EQ(empty.Normalize("1"), "1");
+  EXPECT_EQ(empty.CacheSize(), 0);
+}
+
+}  // namespace sherpa_onnx
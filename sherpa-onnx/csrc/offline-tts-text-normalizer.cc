@@ -0,0 +1,361 @@
+// sherpa-onnx/csrc/offline-tts-text-normalizer.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-tts-text-normalizer.h"
+
+#include <cctype>
+#include <memory>
+#include <string>
+#include <strstream>
+#include <utility>
+#include <vector>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "fst/extensions/far/far.h"
+#include "kaldifst/csrc/kaldi-fst-io.h"
+#include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/text-utils.h"
+
+namespace sherpa_onnx {
+
+template <typename Manager>
+static std::unique_ptr<fst::StdConstFst> ReadRuleFst(Manager *mgr,
+                                                     const std::string &f) {
+  auto buf = ReadFile(mgr, f);
+  std::istrstream is(buf.data(), buf.size());
+
+  auto r = new fst::StdVectorFst;
+  bool binary = true;
+  fst::ReadFstKaldi(is, binary, r);
+
+  // r is released inside CastOrConvertToConstFst()
+  return std::unique_ptr<fst::StdConstFst>(fst::CastOrConvertToConstFst(r));
+}
+
+static std::vector<std::unique_ptr<fst::StdConstFst>> ReadRuleFar(
+    std::unique_ptr<fst::FarReader<fst::StdArc>> reader) {
+  std::vector<std::unique_ptr<fst::StdConstFst>> ans;
+  for (; !reader->Done(); reader->Next()) {
+    ans.emplace_back(fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
+  }
+  return ans;
+}
+
+OfflineTtsTextNormalizer::OfflineTtsTextNormalizer(const std::string &rule_fsts,
+                                                   const std::string &rule_fars,
+                                                   bool debug)
+    : debug_(debug) {
+  if (!rule_fsts.empty()) {
+    std::vector<std::string> files;
+    SplitStringToVector(rule_fsts, ",", false, &files);
+    for (const auto &f : files) {
+      if (debug_) {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
+#else
+        SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
+#endif
+      }
+      AddRule(std::unique_ptr<fst::StdConstFst>(
+          fst::CastOrConvertToConstFst(fst::ReadFstKaldiGeneric(f))));
+    }
+  }
+
+  if (!rule_fars.empty()) {
+    if (debug_) {
+      SHERPA_ONNX_LOGE("Loading FST archives");
+    }
+    std::vector<std::string> files;
+    SplitStringToVector(rule_fars, ",", false, &files);
+
+    for (const auto &f : files) {
+      if (debug_) {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
+#else
+        SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
+#endif
+      }
+      std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
+          fst::FarReader<fst::StdArc>::Open(f));
+      for (auto &r : ReadRuleFar(std::move(reader))) {
+        AddRule(std::move(r));
+      }
+    }
+
+    if (debug_) {
+      SHERPA_ONNX_LOGE("FST archives loaded!");
+    }
+  }
+}
+
+template <typename Manager>
+OfflineTtsTextNormalizer::OfflineTtsTextNormalizer(Manager *mgr,
+                                                   const std::string &rule_fsts,
+                                                   const std::string &rule_fars,
+                                                   bool debug)
+    : debug_(debug) {
+  if (!rule_fsts.empty()) {
+    std::vector<std::string> files;
+    SplitStringToVector(rule_fsts, ",", false, &files);
+    for (const auto &f : files) {
+      if (debug_) {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
+#else
+        SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
+#endif
+      }
+      AddRule(ReadRuleFst(mgr, f));
+    }
+  }
+
+  if (!rule_fars.empty()) {
+    std::vector<std::string> files;
+    SplitStringToVector(rule_fars, ",", false, &files);
+
+    for (const auto &f : files) {
+      if (debug_) {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
+#else
+        SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
+#endif
+      }
+
+      auto buf = ReadFile(mgr, f);
+
+      std::unique_ptr<std::istream> s(
+          new std::istrstream(buf.data(), buf.size()));
+
+      std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
+          fst::FarReader<fst::StdArc>::Open(std::move(s)));
+      for (auto &r : ReadRuleFar(std::move(reader))) {
+        AddRule(std::move(r));
+      }
+    }
+  }
+}
+
+OfflineTtsTextNormalizer::OfflineTtsTextNormalizer(
+    std::vector<std::unique_ptr<fst::StdConstFst>> rules,
+    int32_t cache_capacity, bool debug)
+    : cache_capacity_(cache_capacity), debug_(debug) {
+  for (auto &r : rules) {
+    AddRule(std::move(r));
+  }
+}
+
+void OfflineTtsTextNormalizer::AddRule(std::unique_ptr<fst::StdConstFst> fst) {
+  Rule rule;
+
+  // A path changes the input only if it contains an arc whose input label
+  // differs from its output label. Consider the first such arc of a path.
+  // The arcs before it copy the input, so it leaves a state that is reachable
+  // from the start state via arcs with ilabel == olabel.
+  //
+  // If that arc consumes a byte, the rule can change a sentence only if the
+  // sentence contains the byte. If it consumes nothing, i.e., it inserts
+  // symbols, or consumes a label that is not a byte, we cannot skip the rule.
+  int32_t num_states = fst->NumStates();
+  std::vector<bool> visited(num_states, false);
+  std::vector<int32_t> queue;
+
+  auto start = fst->Start();
+  if (start != fst::kNoStateId) {
+    visited[start] = true;
+    queue.push_back(start);
+  }
+
+  while (!queue.empty()) {
+    auto s = queue.back();
+    queue.pop_back();
+
+    for (fst::ArcIterator<fst::StdConstFst> it(*fst, s); !it.Done();
+         it.Next()) {
+      const auto &arc = it.Value();
+      if (arc.ilabel != arc.olabel) {
+        if (arc.ilabel > 0 && arc.ilabel < 256) {
+          rule.triggers[arc.ilabel] = true;
+        } else {
+          rule.always_apply = true;
+        }
+        continue;
+      }
+
+      if (!visited[arc.nextstate]) {
+        visited[arc.nextstate] = true;
+        queue.push_back(arc.nextstate);
+      }
+    }
+  }
+
+  if (debug_) {
+#if __OHOS__
+    SHERPA_ONNX_LOGE("rule %{public}d: %{public}d trigger labels%{public}s",
+                     static_cast<int32_t>(rules_.size()),
+                     static_cast<int32_t>(rule.triggers.count()),
+                     rule.always_apply ? ", always applied" : "");
+#else
+    SHERPA_ONNX_LOGE("rule %d: %d trigger labels%s",
+                     static_cast<int32_t>(rules_.size()),
+                     static_cast<int32_t>(rule.triggers.count()),
+                     rule.always_apply ? ", always applied" : "");
+#endif
+  }
+
+  rule.tn = std::make_unique<kaldifst::TextNormalizer>(std::move(fst));
+  rules_.push_back(std::move(rule));
+}
+
+bool OfflineTtsTextNormalizer::ShouldApply(const Rule &rule,
+                                           const std::string &text) const {
+  if (rule.always_apply) {
+    return true;
+  }
+
+  // kaldifst::TextNormalizer uses bytes as input labels
+  for (uint8_t c : text) {
+    if (rule.triggers[c]) {
+      return true;
+    }
+  }
+
+  return false;
+}
+
+std::vector<std::string> OfflineTtsTextNormalizer::SplitSentences(
+    const std::string &text) {
+  // A sentence ends after one of the following, together with the spaces
+  // following it
+  static const std::vector<std::string> kCjkPunct = {"。", "！", "？", "；"};
+
+  std::vector<std::string> ans;
+
+  int32_t n = static_cast<int32_t>(text.size());
+  int32_t begin = 0;
+  int32_t i = 0;
+  while (i < n) {
+    int32_t end = -1;
+
+    char c = text[i];
+    if (c == '\n') {
+      end = i + 1;
+    } else if ((c == '.' || c == '!' || c == '?' || c == ';') && i + 1 < n &&
+               std::isspace(static_cast<uint8_t>(text[i + 1]))) {
+      end = i + 1;
+    } else if (static_cast<uint8_t>(c) >= 0x80) {
+      for (const auto &p : kCjkPunct) {
+        if (text.compare(i, p.size(), p) == 0) {
+          end = i + p.size();
+          break;
+        }
+      }
+    }
+
+    if (end == -1) {
+      i += 1;
+      continue;
+    }
+
+    while (end < n && std::isspace(static_cast<uint8_t>(text[end]))) {
+      ++end;
+    }
+
+    ans.push_back(text.substr(begin, end - begin));
+    begin = end;
+    i = end;
+  }
+
+  if (begin < n) {
+    ans.push_back(text.substr(begin));
+  }
+
+  return ans;
+}
+
+std::string OfflineTtsTextNormalizer::NormalizeSentence(
+    const std::string &sentence) const {
+  if (cache_capacity_ > 0) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = index_.find(sentence);
+    if (it != index_.end()) {
+      items_.splice(items_.begin(), items_, it->second);
+      return it->second->second;
+    }
+  }
+
+  std::string text = sentence;
+  for (int32_t i = 0; i != static_cast<int32_t>(rules_.size()); ++i) {
+    const auto &rule = rules_[i];
+    if (!ShouldApply(rule, text)) {
+      continue;
+    }
+
+    text = rule.tn->Normalize(text);
+    if (debug_) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("After rule %{public}d: %{public}s", i, text.c_str());
+#else
+      SHERPA_ONNX_LOGE("After rule %d: %s", i, text.c_str());
+#endif
+    }
+  }
+
+  if (cache_capacity_ > 0) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (!index_.count(sentence)) {
+      if (static_cast<int32_t>(items_.size()) >= cache_capacity_) {
+        index_.erase(items_.back().first);
+        items_.pop_back();
+      }
+
+      items_.emplace_front(sentence, text);
+      index_[sentence] = items_.begin();
+    }
+  }
+
+  return text;
+}
+
+std::string OfflineTtsTextNormalizer::Normalize(const std::string &text) const {
+  if (rules_.empty()) {
+    return text;
+  }
+
+  std::string ans;
+  for (const auto &s : SplitSentences(text)) {
+    ans += NormalizeSentence(s);
+  }
+
+  return ans;
+}
+
+int32_t OfflineTtsTextNormalizer::CacheSize() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return items_.size();
+}
+
+#if __ANDROID_API__ >= 9
+template OfflineTtsTextNormalizer::OfflineTtsTextNormalizer(
+    AAssetManager *mgr, const std::string &rule_fsts,
+    const std::string &rule_fars, bool debug);
+#endif
+
+#if __OHOS__
+template OfflineTtsTextNormalizer::OfflineTtsTextNormalizer(
+    NativeResourceManager *mgr, const std::string &rule_fsts,
+    const std::string &rule_fars, bool debug);
+#endif
+
+}  // namespace sherpa_onnx
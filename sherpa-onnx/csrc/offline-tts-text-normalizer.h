@@ -0,0 +1,118 @@
+// sherpa-onnx/csrc/offline-tts-text-normalizer.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_TEXT_NORMALIZER_H_
+#define SHERPA_ONNX_CSRC_OFFLINE_TTS_TEXT_NORMALIZER_H_
+
+#include <bitset>
+#include <cstdint>
+#include <list>
+#include <memory>
+#include <mutex>  // NOLINT
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "kaldifst/csrc/text-normalizer.h"
+
+namespace sherpa_onnx {
+
+// Applies the rule FSTs given by --tts-rule-fsts and --tts-rule-fars
+// to the input text of TTS models.
+//
+// The text is split into sentences and each sentence is normalized only once;
+// the results are kept in a thread-safe LRU cache since requests often share
+// sentences.
+//
+// Note that rules are applied to each sentence separately, so a rule cannot
+// match across a sentence boundary. See SplitSentences() for how sentences
+// are split. For instance, "No. 5" is split into "No. " and "5", so a rule
+// that rewrites "No. 5" to "number 5" no longer matches; neither does a rule
+// for "St. John" or for "p.m." followed by more text. Rules for such
+// abbreviations have to match the part up to and including the space.
+//
+// A rule is skipped for a sentence if the sentence contains none of the
+// bytes that the rule can rewrite, e.g., a rule for numbers is not applied
+// to a sentence without digits.
+class OfflineTtsTextNormalizer {
+ public:
+  // @param rule_fsts Comma separated list of rule FSTs
+  // @param rule_fars Comma separated list of FST archives. Each FST in an
+  //                  archive is a rule
+  OfflineTtsTextNormalizer(const std::string &rule_fsts,
+                           const std::string &rule_fars, bool debug = false);
+
+  template <typename Manager>
+  OfflineTtsTextNormalizer(Manager *mgr, const std::string &rule_fsts,
+                           const std::string &rule_fars, bool debug = false);
+
+  // Rules are applied in the given order
+  explicit OfflineTtsTextNormalizer(
+      std::vector<std::unique_ptr<fst::StdConstFst>> rules,
+      int32_t cache_capacity = 1024, bool debug = false);
+
+  // Return true if there are no rules
+  bool Empty() const { return rules_.empty(); }
+
+  int32_t NumRules() const { return rules_.size(); }
+
+  // Return the number of cached sentences
+  int32_t CacheSize() const;
+
+  std::string Normalize(const std::string &text) const;
+
+  // Return true if rule i is applied to the given text, i.e., it is not
+  // skipped
+  bool ShouldApplyRule(int32_t i, const std::string &text) const {
+    return ShouldApply(rules_[i], text);
+  }
+
+  // Return true if rule i is applied to every text
+  bool AlwaysApplyRule(int32_t i) const { return rules_[i].always_apply; }
+
+  // Split text into sentences. Concatenating the returned sentences gives
+  // back the input text.
+  //
+  // A sentence ends after a newline, after one of . ! ? ; that is followed
+  // by a space, or after one of 。！？；. Spaces after it belong to the
+  // sentence.
+  static std::vector<std::string> SplitSentences(const std::string &text);
+
+ private:
+  struct Rule {
+    std::unique_ptr<kaldifst::TextNormalizer> tn;
+
+    // triggers[i] is true if an arc with input label i, i.e., byte i,
+    // may change the input
+    std::bitset<256> triggers;
+
+    // True if the rule may insert symbols without consuming any of
+    // the triggers, or may change an input label that is not a byte,
+    // so it cannot be skipped
+    bool always_apply = false;
+  };
+
+  void AddRule(std::unique_ptr<fst::StdConstFst> fst);
+
+  bool ShouldApply(const Rule &rule, const std::string &text) const;
+
+  std::string NormalizeSentence(const std::string &sentence) const;
+
+ private:
+  std::vector<Rule> rules_;
+  int32_t cache_capacity_ = 1024;
+  bool debug_ = false;
+
+  using Item = std::pair<std::string, std::string>;
+
+  // Most recently used items are at the front
+  mutable std::list<Item> items_;
+  mutable std::unordered_map<std::string, std::list<Item>::iterator> index_;
+  mutable std::mutex mutex_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_OFFLINE_TTS_TEXT_NORMALIZER_H_
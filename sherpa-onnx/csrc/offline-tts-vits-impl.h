@@ -4,15 +4,12 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_VITS_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_VITS_IMPL_H_
 
+#include <chrono>  // NOLINT
 #include <memory>
 #include <string>
-#include <strstream>
 #include <utility>
 #include <vector>
 
-#include "fst/extensions/far/far.h"
-#include "kaldifst/csrc/kaldi-fst-io.h"
-#include "kaldifst/csrc/text-normalizer.h"
 #include "sherpa-onnx/csrc/character-lexicon.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/lexicon.h"
@@ -21,6 +18,7 @@
 #include "sherpa-onnx/csrc/offline-tts-character-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts-impl.h"
+#include "sherpa-onnx/csrc/offline-tts-text-normalizer.h"
 #include "sherpa-onnx/csrc/offline-tts-vits-model.h"
 #include "sherpa-onnx/csrc/piper-phonemize-lexicon.h"
 #include "sherpa-onnx/csrc/text-utils.h"
@@ -34,54 +32,8 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
         model_(std::make_unique<OfflineTtsVitsModel>(config.model)) {
     InitFrontend();
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(f));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("Loading FST archives");
-      }
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(f));
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }
-      }
-
-      if (config.model.debug) {
-        SHERPA_ONNX_LOGE("FST archives loaded!");
-      }
-    }
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   template <typename Manager>
@@ -90,55 +42,8 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
         model_(std::make_unique<OfflineTtsVitsModel>(mgr, config.model)) {
     InitFrontend(mgr);
 
-    if (!config.rule_fsts.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fsts, ",", false, &files);
-      tn_list_.reserve(files.size());
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule fst: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule fst: %s", f.c_str());
-#endif
-        }
-        auto buf = ReadFile(mgr, f);
-        std::istrstream is(buf.data(), buf.size());
-        tn_list_.push_back(std::make_unique<kaldifst::TextNormalizer>(is));
-      }
-    }
-
-    if (!config.rule_fars.empty()) {
-      std::vector<std::string> files;
-      SplitStringToVector(config.rule_fars, ",", false, &files);
-      tn_list_.reserve(files.size() + tn_list_.size());
-
-      for (const auto &f : files) {
-        if (config.model.debug) {
-#if __OHOS__
-          SHERPA_ONNX_LOGE("rule far: %{public}s", f.c_str());
-#else
-          SHERPA_ONNX_LOGE("rule far: %s", f.c_str());
-#endif
-        }
-
-        auto buf = ReadFile(mgr, f);
-
-        std::unique_ptr<std::istream> s(
-            new std::istrstream(buf.data(), buf.size()));
-
-        std::unique_ptr<fst::FarReader<fst::StdArc>> reader(
-            fst::FarReader<fst::StdArc>::Open(std::move(s)));
-
-        for (; !reader->Done(); reader->Next()) {
-          std::unique_ptr<fst::StdConstFst> r(
-              fst::CastOrConvertToConstFst(reader->GetFst()->Copy()));
-
-          tn_list_.push_back(
-              std::make_unique<kaldifst::TextNormalizer>(std::move(r)));
-        }  // for (; !reader->Done(); reader->Next())
-      }    // for (const auto &f : files)
-    }      // if (!config.rule_fars.empty())
+    tn_ = std::make_unique<OfflineTtsTextNormalizer>(
+        mgr, config.rule_fsts, config.rule_fars, config.model.debug);
   }
 
   int32_t SampleRate() const override {
@@ -149,6 +54,26 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
     return model_->GetMetaData().num_speakers;
   }
 
+  void Warmup(const std::vector<int32_t> &lengths) const override {
+    const auto &meta_data = model_->GetMetaData();
+
+    for (int32_t n : lengths) {
+      if (n <= 0) {
+        continue;
+      }
+
+      std::vector<std::vector<int64_t>> x = {WarmupTokens(n)};
+
+      // MeloTTS models have an extra input for tones
+      std::vector<std::vector<int64_t>> tones;
+      if (meta_data.is_melo_tts) {
+        tones.emplace_back(n, 0);
+      }
+
+      Process(x, tones, 0, 1.0);
+    }
+  }
+
   GeneratedAudio Generate(
       const std::string &_text, int64_t sid = 0, float speed = 1.0,
       GeneratedAudioCallback callback = nullptr) const override {
@@ -193,22 +118,34 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
 #endif
     }
 
-    if (!tn_list_.empty()) {
-      for (const auto &tn : tn_list_) {
-        text = tn->Normalize(text);
-        if (config_.model.debug) {
+    const auto frontend_begin = std::chrono::steady_clock::now();
+
+    if (!tn_->Empty()) {
+      text = tn_->Normalize(text);
+      if (config_.model.debug) {
 #if __OHOS__
-          SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %{public}s", text.c_str());
 #else
-          SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
+        SHERPA_ONNX_LOGE("After normalizing: %s", text.c_str());
 #endif
-        }
       }
     }
 
     std::vector<TokenIDs> token_ids =
         frontend_->ConvertTextToTokenIds(text, meta_data.voice);
 
+    float frontend_seconds = std::chrono::duration<float>(
+                                 std::chrono::steady_clock::now() -
+                                 frontend_begin)
+                                 .count();
+    if (config_.model.debug) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE("Frontend time: %{public}.3f s", frontend_seconds);
+#else
+      SHERPA_ONNX_LOGE("Frontend time: %.3f s", frontend_seconds);
+#endif
+    }
+
     if (token_ids.empty() ||
         (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
       SHERPA_ONNX_LOGE("Failed to convert %s to token IDs", text.c_str());
@@ -250,6 +187,7 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
       if (callback) {
         callback(ans.samples.data(), ans.samples.size(), 1.0);
       }
+      ans.frontend_seconds = frontend_seconds;
       return ans;
     }
 
@@ -331,6 +269,7 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
       }
     }
 
+    ans.frontend_seconds = frontend_seconds;
     return ans;
   }
 
@@ -481,7 +420,7 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
  private:
   OfflineTtsConfig config_;
   std::unique_ptr<OfflineTtsVitsModel> model_;
-  std::vector<std::unique_ptr<kaldifst::TextNormalizer>> tn_list_;
+  std::unique_ptr<OfflineTtsTextNormalizer> tn_;
   std::unique_ptr<OfflineTtsFrontend> frontend_;
 };
 
@@ -6,10 +6,12 @@
 #include <cctype>
 #include <codecvt>
 #include <fstream>
+#include <iterator>
 #include <locale>
 #include <regex>  // NOLINT
 #include <sstream>
 #include <strstream>
+#include <unordered_set>
 #include <utility>
 
 #if __ANDROID_API__ >= 9
@@ -240,6 +242,58 @@ OfflineTtsZipvoiceFrontend::OfflineTtsZipvoiceFrontend(
   }
 }
 
+// Return true if the part is of type en, zh, pinyin or tag.
+// See ConvertPartsToTokenIds() below.
+static bool IsSpeakable(const std::string &part) {
+  if (part.size() == 1) {
+    return std::isalpha(static_cast<uint8_t>(part[0]));
+  }
+
+  return part[0] == '<' || part[0] == '[' || ContainsCJK(part);
+}
+
+// Split parts into sentences. A sentence ends at . ! ? ; or … unless the
+// next part is a letter or a digit, e.g., 3.5 or www.example.com.
+// A sentence containing nothing to speak, e.g., digits and spaces only,
+// is merged into its neighbor.
+static std::vector<std::vector<std::string>> SplitSentences(
+    std::vector<std::string> parts) {
+  static const std::unordered_set<std::string> kSentenceEnd = {
+      ".", "!", "?", ";", "…"};
+
+  std::vector<std::vector<std::string>> ans;
+  std::vector<std::string> this_sentence;
+  bool speakable = false;
+
+  int32_t num_parts = parts.size();
+  for (int32_t i = 0; i != num_parts; ++i) {
+    bool is_end = kSentenceEnd.count(parts[i]) &&
+                  (i + 1 == num_parts || parts[i + 1].size() != 1 ||
+                   !std::isalnum(static_cast<uint8_t>(parts[i + 1][0])));
+
+    speakable = speakable || IsSpeakable(parts[i]);
+    this_sentence.push_back(std::move(parts[i]));
+
+    if (is_end && speakable) {
+      ans.push_back(std::move(this_sentence));
+      this_sentence.clear();
+      speakable = false;
+    }
+  }
+
+  if (!this_sentence.empty()) {
+    if (!speakable && !ans.empty()) {
+      ans.back().insert(ans.back().end(),
+                        std::make_move_iterator(this_sentence.begin()),
+                        std::make_move_iterator(this_sentence.end()));
+    } else {
+      ans.push_back(std::move(this_sentence));
+    }
+  }
+
+  return ans;
+}
+
 std::vector<TokenIDs> OfflineTtsZipvoiceFrontend::ConvertTextToTokenIds(
     const std::string &_text, const std::string &voice) const {
   std::string text = _text;
@@ -261,6 +315,19 @@ std::vector<TokenIDs> OfflineTtsZipvoiceFrontend::ConvertTextToTokenIds(
     parts.push_back(ToString(i->str()));
   }
 
+  std::vector<TokenIDs> ans;
+  for (const auto &sentence : SplitSentences(std::move(parts))) {
+    std::vector<int64_t> token_ids = ConvertPartsToTokenIds(sentence, voice);
+    if (!token_ids.empty()) {
+      ans.emplace_back(std::move(token_ids));
+    }
+  }
+
+  return ans;
+}
+
+std::vector<int64_t> OfflineTtsZipvoiceFrontend::ConvertPartsToTokenIds(
+    const std::vector<std::string> &parts, const std::string &voice) const {
   // types are en, zh, tag, pinyin, other
   // tag is [...]
   // pinyin is <...>
@@ -289,7 +356,7 @@ std::vector<TokenIDs> OfflineTtsZipvoiceFrontend::ConvertTextToTokenIds(
   oss.str("");
   std::ostringstream debug_oss;
   if (debug_) {
-    debug_oss << "Text : " << _text << ", Parts with types: \n";
+    debug_oss << "Parts with types: \n";
   }
   for (int32_t i = 0; i < types.size(); ++i) {
     if (i == 0) {
@@ -358,9 +425,7 @@ std::vector<TokenIDs> OfflineTtsZipvoiceFrontend::ConvertTextToTokenIds(
     SHERPA_ONNX_LOGE("%s", debug_oss.str().c_str());
   }
 
-  std::vector<TokenIDs> ans;
-  ans.push_back(TokenIDs(std::move(token_ids)));
-  return ans;
+  return token_ids;
 }
 
 #if __ANDROID_API__ >= 9
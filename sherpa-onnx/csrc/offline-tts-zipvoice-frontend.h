@@ -47,6 +47,11 @@ class OfflineTtsZipvoiceFrontend : public OfflineTtsFrontend {
       const std::string &text, const std::string &voice = "") const override;
 
  private:
+  // Convert the parts of a sentence to token IDs. Each part is either
+  // a single character, a tag [...], or a pinyin <...>.
+  std::vector<int64_t> ConvertPartsToTokenIds(
+      const std::vector<std::string> &parts, const std::string &voice) const;
+
   bool debug_ = false;
   std::unordered_map<std::string, int32_t> token2id_;
   const std::unordered_map<std::string, std::string> punct_map_ = {
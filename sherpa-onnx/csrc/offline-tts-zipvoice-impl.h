@@ -47,17 +47,93 @@ class OfflineTtsZipvoiceImpl : public OfflineTtsImpl {
     return model_->GetMetaData().sample_rate;
   }
 
+  void Warmup(const std::vector<int32_t> &lengths) const override {
+    const auto &meta_data = model_->GetMetaData();
+
+    for (int32_t n : lengths) {
+      if (n <= 0) {
+        continue;
+      }
+
+      // A silent prompt of about the same length as the text
+      OfflineTtsVoice voice;
+      voice.tokens = WarmupTokens(n);
+      voice.feat_dim = meta_data.feat_dim;
+      voice.num_frames = 4 * n;
+      voice.features.resize(voice.num_frames * voice.feat_dim);
+      voice.rms = config_.model.zipvoice.target_rms;
+
+      Process(WarmupTokens(n), voice, 1.0, 1);
+    }
+  }
+
   GeneratedAudio Generate(
       const std::string &text, const std::string &prompt_text,
       const std::vector<float> &prompt_samples, int32_t sample_rate,
       float speed, int32_t num_steps,
       GeneratedAudioCallback callback = nullptr) const override {
-    std::vector<TokenIDs> text_token_ids =
-        frontend_->ConvertTextToTokenIds(text);
+    OfflineTtsVoice voice = CreateVoice(prompt_text, prompt_samples.data(),
+                                        prompt_samples.size(), sample_rate);
+    if (voice.Empty()) {
+      return {};
+    }
 
+    return Generate(text, voice, speed, num_steps, std::move(callback));
+  }
+
+  OfflineTtsVoice CreateVoice(const std::string &prompt_text,
+                              const float *prompt_samples, int32_t n,
+                              int32_t sample_rate) const override {
     std::vector<TokenIDs> prompt_token_ids =
         frontend_->ConvertTextToTokenIds(prompt_text);
 
+    if (prompt_token_ids.empty() ||
+        (prompt_token_ids.size() == 1 && prompt_token_ids[0].tokens.empty())) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE(
+          "Failed to convert prompt text '%{public}s' to token IDs",
+          prompt_text.c_str());
+#else
+      SHERPA_ONNX_LOGE("Failed to convert prompt text '%s' to token IDs",
+                       prompt_text.c_str());
+#endif
+      return {};
+    }
+
+    OfflineTtsVoice voice;
+    for (const auto &k : prompt_token_ids) {
+      voice.tokens.insert(voice.tokens.end(), k.tokens.begin(),
+                          k.tokens.end());
+    }
+
+    ComputePromptFeatures(prompt_samples, n, sample_rate, &voice);
+
+    return voice;
+  }
+
+  GeneratedAudio Generate(
+      const std::string &text, const OfflineTtsVoice &voice, float speed,
+      int32_t num_steps,
+      GeneratedAudioCallback callback = nullptr) const override {
+    if (voice.Empty()) {
+      SHERPA_ONNX_LOGE("The given voice is empty");
+      return {};
+    }
+
+    int32_t feat_dim = model_->GetMetaData().feat_dim;
+    if (voice.feat_dim != feat_dim ||
+        static_cast<int64_t>(voice.features.size()) !=
+            static_cast<int64_t>(voice.num_frames) * voice.feat_dim) {
+      SHERPA_ONNX_LOGE(
+          "The given voice is not created by this model. Its feature dim is "
+          "%d, while the model expects %d",
+          voice.feat_dim, feat_dim);
+      return {};
+    }
+
+    std::vector<TokenIDs> text_token_ids =
+        frontend_->ConvertTextToTokenIds(text);
+
     if (text_token_ids.empty() ||
         (text_token_ids.size() == 1 && text_token_ids[0].tokens.empty())) {
 #if __OHOS__
@@ -69,25 +145,60 @@ class OfflineTtsZipvoiceImpl : public OfflineTtsImpl {
       return {};
     }
 
-    if (prompt_token_ids.empty() ||
-        (prompt_token_ids.size() == 1 && prompt_token_ids[0].tokens.empty())) {
+    int32_t num_sentences = static_cast<int32_t>(text_token_ids.size());
+
+    // Sentences are processed in batches of config_.max_num_sentences to
+    // bound the memory of the flow-matching model. Sentences in a batch are
+    // concatenated since the model does not support padding.
+    int32_t batch_size = config_.max_num_sentences;
+    if (batch_size <= 0) {
+      batch_size = num_sentences;
+    }
+
+    int32_t num_batches = (num_sentences + batch_size - 1) / batch_size;
+
+    if (config_.model.debug && num_batches > 1) {
 #if __OHOS__
       SHERPA_ONNX_LOGE(
-          "Failed to convert prompt text '%{public}s' to token IDs",
-          prompt_text.c_str());
+          "Split text into %{public}d batches. batch size: %{public}d. Number "
+          "of sentences: %{public}d",
+          num_batches, batch_size, num_sentences);
 #else
-      SHERPA_ONNX_LOGE("Failed to convert prompt text '%s' to token IDs",
-                       prompt_text.c_str());
+      SHERPA_ONNX_LOGE(
+          "Split text into %d batches. batch size: %d. Number of sentences: "
+          "%d",
+          num_batches, batch_size, num_sentences);
 #endif
-      return {};
     }
 
-    // we assume batch size is 1
-    std::vector<int64_t> tokens = text_token_ids[0].tokens;
-    std::vector<int64_t> prompt_tokens = prompt_token_ids[0].tokens;
+    GeneratedAudio ans;
+    ans.sample_rate = model_->GetMetaData().sample_rate;
+
+    std::vector<int64_t> tokens;
+    int32_t should_continue = 1;
+
+    for (int32_t b = 0; b != num_batches && should_continue; ++b) {
+      tokens.clear();
+      int32_t end = std::min(num_sentences, (b + 1) * batch_size);
+      for (int32_t i = b * batch_size; i != end; ++i) {
+        const auto &t = text_token_ids[i].tokens;
+        tokens.insert(tokens.end(), t.begin(), t.end());
+      }
+
+      auto audio = Process(tokens, voice, speed, num_steps);
+      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
+                         audio.samples.end());
 
-    return Process(tokens, prompt_tokens, prompt_samples, sample_rate, speed,
-                   num_steps);
+      if (callback) {
+        should_continue = callback(audio.samples.data(), audio.samples.size(),
+                                   (b + 1) * 1.0 / num_batches);
+        // Caution(fangjun): audio is freed when the callback returns, so users
+        // should copy the data if they want to access the data after
+        // the callback returns to avoid segmentation fault.
+      }
+    }
+
+    return ans;
   }
 
  private:
@@ -209,63 +320,69 @@ class OfflineTtsZipvoiceImpl : public OfflineTtsImpl {
     }
   }
 
-  GeneratedAudio Process(const std::vector<int64_t> &tokens,
-                         const std::vector<int64_t> &prompt_tokens,
-                         const std::vector<float> &prompt_samples,
-                         int32_t sample_rate, float speed,
-                         int num_steps) const {
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 2> tokens_shape = {1,
-                                           static_cast<int64_t>(tokens.size())};
-    Ort::Value tokens_tensor = Ort::Value::CreateTensor(
-        memory_info, const_cast<int64_t *>(tokens.data()), tokens.size(),
-        tokens_shape.data(), tokens_shape.size());
-
-    std::array<int64_t, 2> prompt_tokens_shape = {
-        1, static_cast<int64_t>(prompt_tokens.size())};
-    Ort::Value prompt_tokens_tensor = Ort::Value::CreateTensor(
-        memory_info, const_cast<int64_t *>(prompt_tokens.data()),
-        prompt_tokens.size(), prompt_tokens_shape.data(),
-        prompt_tokens_shape.size());
-
+  // Compute the features and the RMS of the prompt audio
+  void ComputePromptFeatures(const float *prompt_samples, int32_t n,
+                             int32_t sample_rate,
+                             OfflineTtsVoice *voice) const {
     float target_rms = config_.model.zipvoice.target_rms;
     float feat_scale = config_.model.zipvoice.feat_scale;
 
     // Scale prompt_samples
-    std::vector<float> prompt_samples_scaled = prompt_samples;
-    float prompt_rms = 0.0f;
+    std::vector<float> prompt_samples_scaled(prompt_samples,
+                                             prompt_samples + n);
     double sum_sq = 0.0;
     // Compute RMS of prompt_samples
     for (float s : prompt_samples_scaled) {
       sum_sq += s * s;
     }
-    prompt_rms = std::sqrt(sum_sq / prompt_samples_scaled.size());
-    if (prompt_rms < target_rms && prompt_rms > 0.0f) {
-      float scale = target_rms / static_cast<float>(prompt_rms);
+    voice->rms = std::sqrt(sum_sq / prompt_samples_scaled.size());
+    if (voice->rms < target_rms && voice->rms > 0.0f) {
+      float scale = target_rms / static_cast<float>(voice->rms);
       for (auto &s : prompt_samples_scaled) {
         s *= scale;
       }
     }
 
-    std::vector<float> prompt_features;
     auto res_shape = ComputeMelSpectrogram(prompt_samples_scaled, sample_rate,
-                                           &prompt_features);
+                                           &voice->features);
 
-    int32_t num_frames = res_shape[0];
-    int32_t mel_dim = res_shape[1];
+    voice->num_frames = res_shape[0];
+    voice->feat_dim = res_shape[1];
 
     if (feat_scale != 1.0f) {
-      for (auto &item : prompt_features) {
+      for (auto &item : voice->features) {
         item *= feat_scale;
       }
     }
+  }
+
+  GeneratedAudio Process(const std::vector<int64_t> &tokens,
+                         const OfflineTtsVoice &voice, float speed,
+                         int num_steps) const {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 2> tokens_shape = {1,
+                                           static_cast<int64_t>(tokens.size())};
+    Ort::Value tokens_tensor = Ort::Value::CreateTensor(
+        memory_info, const_cast<int64_t *>(tokens.data()), tokens.size(),
+        tokens_shape.data(), tokens_shape.size());
+
+    // The model does not change its inputs
+    std::array<int64_t, 2> prompt_tokens_shape = {
+        1, static_cast<int64_t>(voice.tokens.size())};
+    Ort::Value prompt_tokens_tensor = Ort::Value::CreateTensor(
+        memory_info, const_cast<int64_t *>(voice.tokens.data()),
+        voice.tokens.size(), prompt_tokens_shape.data(),
+        prompt_tokens_shape.size());
+
+    float target_rms = config_.model.zipvoice.target_rms;
+    float feat_scale = config_.model.zipvoice.feat_scale;
 
-    std::array<int64_t, 3> shape = {1, num_frames, mel_dim};
+    std::array<int64_t, 3> shape = {1, voice.num_frames, voice.feat_dim};
     auto prompt_features_tensor = Ort::Value::CreateTensor(
-        memory_info, prompt_features.data(), prompt_features.size(),
-        shape.data(), shape.size());
+        memory_info, const_cast<float *>(voice.features.data()),
+        voice.features.size(), shape.data(), shape.size());
 
     Ort::Value mel =
         model_->Run(std::move(tokens_tensor), std::move(prompt_tokens_tensor),
@@ -295,8 +412,8 @@ class OfflineTtsZipvoiceImpl : public OfflineTtsImpl {
     ans.samples = vocoder_->Run(std::move(mel_new));
     ans.sample_rate = model_->GetMetaData().sample_rate;
 
-    if (prompt_rms < target_rms && target_rms > 0.0f) {
-      float scale = prompt_rms / target_rms;
+    if (voice.rms < target_rms && target_rms > 0.0f) {
+      float scale = voice.rms / target_rms;
       for (auto &s : ans.samples) {
         s *= scale;
       }
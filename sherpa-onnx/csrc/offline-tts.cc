@@ -5,6 +5,8 @@
 #include "sherpa-onnx/csrc/offline-tts.h"
 
 #include <cmath>
+#include <cstdint>
+#include <fstream>
 #include <string>
 #include <utility>
 #include <vector>
@@ -25,6 +27,106 @@
 
 namespace sherpa_onnx {
 
+// "SOTV" in little endian: Sherpa-Onnx Tts Voice
+static constexpr int32_t kVoiceMagic = 0x56544f53;
+static constexpr int32_t kVoiceVersion = 1;
+
+bool OfflineTtsVoice::Save(const std::string &filename) const {
+  std::ofstream os(filename, std::ios::binary);
+  if (!os) {
+    SHERPA_ONNX_LOGE("Failed to open '%s' for writing", filename.c_str());
+    return false;
+  }
+
+  int32_t num_tokens = tokens.size();
+  int32_t header[] = {kVoiceMagic, kVoiceVersion, num_tokens, num_frames,
+                      feat_dim};
+  os.write(reinterpret_cast<const char *>(header), sizeof(header));
+  os.write(reinterpret_cast<const char *>(&rms), sizeof(rms));
+  os.write(reinterpret_cast<const char *>(tokens.data()),
+           tokens.size() * sizeof(int64_t));
+  os.write(reinterpret_cast<const char *>(features.data()),
+           features.size() * sizeof(float));
+
+  if (!os) {
+    SHERPA_ONNX_LOGE("Failed to write to '%s'", filename.c_str());
+    return false;
+  }
+
+  return true;
+}
+
+bool OfflineTtsVoice::Load(const std::string &filename) {
+  std::ifstream is(filename, std::ios::binary);
+  if (!is) {
+    SHERPA_ONNX_LOGE("Failed to open '%s' for reading", filename.c_str());
+    return false;
+  }
+
+  int32_t header[5] = {0};
+  is.read(reinterpret_cast<char *>(header), sizeof(header));
+  if (!is || header[0] != kVoiceMagic) {
+    SHERPA_ONNX_LOGE("'%s' is not a voice file", filename.c_str());
+    return false;
+  }
+
+  if (header[1] != kVoiceVersion) {
+    SHERPA_ONNX_LOGE("Unsupported version %d of voice file '%s'", header[1],
+                     filename.c_str());
+    return false;
+  }
+
+  int32_t num_tokens = header[2];
+  if (num_tokens < 0 || header[3] < 0 || header[4] < 0) {
+    SHERPA_ONNX_LOGE("Corrupted voice file '%s'", filename.c_str());
+    return false;
+  }
+
+  // Check the size of the file before allocating memory for it, so that
+  // a corrupted header cannot make us allocate a huge buffer
+  is.seekg(0, std::ios::end);
+  int64_t file_bytes = is.tellg();
+  is.seekg(sizeof(header), std::ios::beg);
+
+  // Each value in the header is less than 2^31, so num_features * 4 and
+  // num_tokens * 8 cannot overflow uint64_t. Their sum is checked in two
+  // steps so that it cannot overflow either.
+  uint64_t num_features = static_cast<uint64_t>(header[3]) * header[4];
+  uint64_t token_bytes = static_cast<uint64_t>(num_tokens) * sizeof(int64_t);
+  uint64_t feature_bytes = num_features * sizeof(float);
+  int64_t payload_bytes = file_bytes - static_cast<int64_t>(sizeof(header)) -
+                          static_cast<int64_t>(sizeof(OfflineTtsVoice::rms));
+
+  if (!is || payload_bytes < 0 ||
+      token_bytes > static_cast<uint64_t>(payload_bytes) ||
+      feature_bytes != static_cast<uint64_t>(payload_bytes) - token_bytes) {
+    SHERPA_ONNX_LOGE("Corrupted voice file '%s'", filename.c_str());
+    return false;
+  }
+
+  OfflineTtsVoice voice;
+  voice.num_frames = header[3];
+  voice.feat_dim = header[4];
+  voice.tokens.resize(num_tokens);
+  voice.features.resize(static_cast<int64_t>(voice.num_frames) *
+                        voice.feat_dim);
+
+  is.read(reinterpret_cast<char *>(&voice.rms), sizeof(voice.rms));
+  is.read(reinterpret_cast<char *>(voice.tokens.data()),
+          voice.tokens.size() * sizeof(int64_t));
+  is.read(reinterpret_cast<char *>(voice.features.data()),
+          voice.features.size() * sizeof(float));
+
+  if (!is || is.peek() != std::ifstream::traits_type::eof()) {
+    SHERPA_ONNX_LOGE("Corrupted voice file '%s'", filename.c_str());
+    return false;
+  }
+
+  *this = std::move(voice);
+
+  return true;
+}
+
 struct SilenceInterval {
   int32_t start;
   int32_t end;
@@ -171,29 +273,37 @@ OfflineTts::OfflineTts(Manager *mgr, const OfflineTtsConfig &config)
 
 OfflineTts::~OfflineTts() = default;
 
-GeneratedAudio OfflineTts::Generate(
-    const std::string &text, int64_t sid /*=0*/, float speed /*= 1.0*/,
-    GeneratedAudioCallback callback /*= nullptr*/) const {
-#if !defined(_WIN32)
-  return impl_->Generate(text, sid, speed, std::move(callback));
-#else
+#if defined(_WIN32)
+// Return text in UTF-8. GB2312 encoded text is converted to UTF-8.
+static std::string ConvertToUtf8(const std::string &text) {
   if (IsUtf8(text)) {
-    return impl_->Generate(text, sid, speed, std::move(callback));
-  } else if (IsGB2312(text)) {
-    auto utf8_text = Gb2312ToUtf8(text);
+    return text;
+  }
+
+  if (IsGB2312(text)) {
     static bool printed = false;
     if (!printed) {
-      SHERPA_ONNX_LOGE(
-          "Detected GB2312 encoded string! Converting it to UTF8.");
+      SHERPA_ONNX_LOGE("Detected GB2312 encoded text! Converting it to UTF8.");
       printed = true;
     }
-    return impl_->Generate(utf8_text, sid, speed, std::move(callback));
-  } else {
-    SHERPA_ONNX_LOGE(
-        "Non UTF8 encoded string is received. You would not get expected "
-        "results!");
-    return impl_->Generate(text, sid, speed, std::move(callback));
+    return Gb2312ToUtf8(text);
   }
+
+  SHERPA_ONNX_LOGE(
+      "Non UTF8 encoded string is received. You would not get expected "
+      "results!");
+
+  return text;
+}
+#endif
+
+GeneratedAudio OfflineTts::Generate(
+    const std::string &text, int64_t sid /*=0*/, float speed /*= 1.0*/,
+    GeneratedAudioCallback callback /*= nullptr*/) const {
+#if !defined(_WIN32)
+  return impl_->Generate(text, sid, speed, std::move(callback));
+#else
+  return impl_->Generate(ConvertToUtf8(text), sid, speed, std::move(callback));
 #endif
 }
 
@@ -206,34 +316,32 @@ GeneratedAudio OfflineTts::Generate(
   return impl_->Generate(text, prompt_text, prompt_samples, sample_rate, speed,
                          num_steps, std::move(callback));
 #else
-  static bool printed = false;
-  auto utf8_text = text;
-  if (IsGB2312(text)) {
-    utf8_text = Gb2312ToUtf8(text);
-    if (!printed) {
-      SHERPA_ONNX_LOGE("Detected GB2312 encoded text! Converting it to UTF8.");
-      printed = true;
-    }
-  }
-  auto utf8_prompt_text = prompt_text;
-  if (IsGB2312(prompt_text)) {
-    utf8_prompt_text = Gb2312ToUtf8(prompt_text);
-    if (!printed) {
-      SHERPA_ONNX_LOGE(
-          "Detected GB2312 encoded prompt text! Converting it to UTF8.");
-      printed = true;
-    }
-  }
-  if (IsUtf8(utf8_text) && IsUtf8(utf8_prompt_text)) {
-    return impl_->Generate(utf8_text, utf8_prompt_text, prompt_samples,
-                           sample_rate, speed, num_steps, std::move(callback));
-  } else {
-    SHERPA_ONNX_LOGE(
-        "Non UTF8 encoded string is received. You would not get expected "
-        "results!");
-    return impl_->Generate(utf8_text, utf8_prompt_text, prompt_samples,
-                           sample_rate, speed, num_steps, std::move(callback));
-  }
+  return impl_->Generate(ConvertToUtf8(text), ConvertToUtf8(prompt_text),
+                         prompt_samples, sample_rate, speed, num_steps,
+                         std::move(callback));
+#endif
+}
+
+OfflineTtsVoice OfflineTts::CreateVoice(const std::string &prompt_text,
+                                        const float *prompt_samples, int32_t n,
+                                        int32_t sample_rate) const {
+#if !defined(_WIN32)
+  return impl_->CreateVoice(prompt_text, prompt_samples, n, sample_rate);
+#else
+  return impl_->CreateVoice(ConvertToUtf8(prompt_text), prompt_samples, n,
+                            sample_rate);
+#endif
+}
+
+GeneratedAudio OfflineTts::Generate(
+    const std::string &text, const OfflineTtsVoice &voice,
+    float speed /*=1.0*/, int32_t num_steps /*=4*/,
+    GeneratedAudioCallback callback /*=nullptr*/) const {
+#if !defined(_WIN32)
+  return impl_->Generate(text, voice, speed, num_steps, std::move(callback));
+#else
+  return impl_->Generate(ConvertToUtf8(text), voice, speed, num_steps,
+                         std::move(callback));
 #endif
 }
 
@@ -241,6 +349,11 @@ int32_t OfflineTts::SampleRate() const { return impl_->SampleRate(); }
 
 int32_t OfflineTts::NumSpeakers() const { return impl_->NumSpeakers(); }
 
+void OfflineTts::Warmup(const std::vector<int32_t> &lengths /*= {16, 64}*/)
+    const {
+  impl_->Warmup(lengths);
+}
+
 #if __ANDROID_API__ >= 9
 template OfflineTts::OfflineTts(AAssetManager *mgr,
                                 const OfflineTtsConfig &config);
@@ -57,12 +57,47 @@ struct GeneratedAudio {
   std::vector<float> samples;
   int32_t sample_rate;
 
+  // Time in seconds spent in text normalization and in converting the
+  // text to token IDs
+  float frontend_seconds = 0;
+
   // Silence means pause here.
   // If scale > 1, then it increases the duration of a pause
   // If scale < 1, then it reduces the duration of a pause
   GeneratedAudio ScaleSilence(float scale) const;
 };
 
+// The prompt of a zero-shot TTS model, e.g., ZipVoice, after preprocessing.
+//
+// It is created by OfflineTts::CreateVoice() and can be passed to
+// OfflineTts::Generate() any number of times, so that the prompt text
+// and the prompt audio are processed only once for a cloned voice.
+//
+// A voice depends on the model that creates it, e.g., its tokens.txt and
+// its feature extraction settings. Use it only with the same model.
+struct OfflineTtsVoice {
+  // Token IDs of the prompt text
+  std::vector<int64_t> tokens;
+
+  // Features of the prompt audio of shape (num_frames, feat_dim),
+  // in row major
+  std::vector<float> features;
+  int32_t num_frames = 0;
+  int32_t feat_dim = 0;
+
+  // RMS of the prompt audio. It is used to restore the volume of the
+  // generated audio.
+  float rms = 0;
+
+  bool Empty() const { return tokens.empty() || num_frames == 0; }
+
+  // Save it to a binary file. Return true on success.
+  bool Save(const std::string &filename) const;
+
+  // Load it from a file written by Save(). Return true on success.
+  bool Load(const std::string &filename);
+};
+
 class OfflineTtsImpl;
 
 // If the callback returns 0, then it stops generating
@@ -115,6 +150,25 @@ class OfflineTts {
                           int32_t num_steps = 4,
                           GeneratedAudioCallback callback = nullptr) const;
 
+  // Precompute the prompt for zero-shot TTS so that it can be reused
+  // across calls to Generate().
+  //
+  // @param prompt_text The transcribe of `prompt_samples`.
+  // @param prompt_samples The prompt audio samples (mono PCM floats in [-1,1]).
+  // @param n Number of samples in `prompt_samples`.
+  // @param sample_rate The sample rate of `prompt_samples` in Hz.
+  //
+  // @return Return the voice. It is empty on error.
+  OfflineTtsVoice CreateVoice(const std::string &prompt_text,
+                              const float *prompt_samples, int32_t n,
+                              int32_t sample_rate) const;
+
+  // Same as the above Generate() for zero-shot TTS except that the prompt
+  // is given by a voice returned by CreateVoice().
+  GeneratedAudio Generate(const std::string &text, const OfflineTtsVoice &voice,
+                          float speed = 1.0, int32_t num_steps = 4,
+                          GeneratedAudioCallback callback = nullptr) const;
+
   // Return the sample rate of the generated audio
   int32_t SampleRate() const;
 
@@ -122,6 +176,15 @@ class OfflineTts {
   // If it supports only a single speaker, then it return 0 or 1.
   int32_t NumSpeakers() const;
 
+  // The first call to Generate() is much slower than later calls since
+  // onnxruntime allocates memory and selects kernels lazily. This method runs
+  // the model on dummy inputs so that the cost is paid before the first
+  // request.
+  //
+  // @param lengths Number of tokens of each dummy input. They should cover
+  //                the typical lengths of sentences.
+  void Warmup(const std::vector<int32_t> &lengths = {16, 64}) const;
+
  private:
   std::unique_ptr<OfflineTtsImpl> impl_;
 };
@@ -0,0 +1,352 @@
+// sherpa-onnx/csrc/offline-whisper-beam-search-decoder.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-whisper-beam-search-decoder.h"
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <limits>
+#include <numeric>
+#include <utility>
+#include <vector>
+
+namespace sherpa_onnx {
+
+namespace {
+
+struct Hypothesis {
+  // Predicted tokens, excluding the initial tokens
+  std::vector<int32_t> tokens;
+
+  // Sum of the log-probs of the predicted tokens
+  double log_prob = -std::numeric_limits<double>::infinity();
+
+  bool IsActive() const { return !std::isinf(log_prob); }
+};
+
+struct Candidate {
+  double log_prob;
+  int32_t row;  // index of the hypothesis it extends
+  int32_t token;
+};
+
+}  // namespace
+
+// Repeat each utterance of a tensor of shape (num_layers, N, T, C)
+// beam_size times. The returned tensor has shape
+// (num_layers, N * beam_size, T, C).
+static Ort::Value Tile(OrtAllocator *allocator, const Ort::Value &v,
+                       int32_t beam_size) {
+  auto shape = v.GetTensorTypeAndShapeInfo().GetShape();
+
+  std::array<int64_t, 4> ans_shape{shape[0], shape[1] * beam_size, shape[2],
+                                   shape[3]};
+
+  Ort::Value ans = Ort::Value::CreateTensor<float>(allocator, ans_shape.data(),
+                                                   ans_shape.size());
+
+  int64_t size = shape[2] * shape[3];
+  const float *src = v.GetTensorData<float>();
+  float *dst = ans.GetTensorMutableData<float>();
+
+  for (int64_t i = 0; i != shape[0] * shape[1]; ++i, src += size) {
+    for (int32_t k = 0; k != beam_size; ++k) {
+      dst = std::copy(src, src + size, dst);
+    }
+  }
+
+  return ans;
+}
+
+// Replace row i of a self kv cache of shape (num_layers, R, n_text_ctx, C)
+// with row src[i] for the first num_positions positions.
+static void Reorder(Ort::Value *v, const std::vector<int32_t> &src,
+                    int32_t num_positions, std::vector<float> *buf) {
+  std::vector<int32_t> changed;
+  for (int32_t i = 0; i != static_cast<int32_t>(src.size()); ++i) {
+    if (src[i] != i) {
+      changed.push_back(i);
+    }
+  }
+
+  if (changed.empty()) {
+    return;
+  }
+
+  auto shape = v->GetTensorTypeAndShapeInfo().GetShape();
+  int64_t row_stride = shape[2] * shape[3];
+  int64_t layer_stride = shape[1] * row_stride;
+  int64_t size = num_positions * shape[3];
+
+  buf->resize(changed.size() * size);
+
+  float *p = v->GetTensorMutableData<float>();
+  for (int64_t layer = 0; layer != shape[0]; ++layer, p += layer_stride) {
+    // Copy the sources first since a source row may also be overwritten
+    float *q = buf->data();
+    for (auto i : changed) {
+      const float *start = p + src[i] * row_stride;
+      q = std::copy(start, start + size, q);
+    }
+
+    q = buf->data();
+    for (auto i : changed) {
+      std::copy(q, q + size, p + i * row_stride);
+      q += size;
+    }
+  }
+}
+
+void OfflineWhisperBeamSearchDecoder::SetConfig(
+    const OfflineWhisperModelConfig &config) {
+  config_ = config;
+}
+
+std::vector<OfflineWhisperDecoderResult>
+OfflineWhisperBeamSearchDecoder::Decode(
+    Ort::Value cross_k, Ort::Value cross_v,
+    const std::vector<int32_t> &num_feature_frames) {
+  std::vector<std::vector<int64_t>> initial_tokens =
+      GetInitialTokens(config_, model_, &cross_k, &cross_v);
+
+  int32_t batch_size = initial_tokens.size();
+  int32_t num_initial_tokens = initial_tokens[0].size();
+  int32_t beam_size = beam_size_;
+
+  // hypotheses of utterance n are in rows [n * beam_size, (n+1) * beam_size)
+  int32_t num_rows = batch_size * beam_size;
+
+  cross_k = Tile(model_->Allocator(), cross_k, beam_size);
+  cross_v = Tile(model_->Allocator(), cross_v, beam_size);
+
+  std::array<int64_t, 2> token_shape{num_rows, num_initial_tokens};
+
+  Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+      model_->Allocator(), token_shape.data(), token_shape.size());
+
+  int64_t *p_tokens = tokens.GetTensorMutableData<int64_t>();
+  for (int32_t r = 0; r != num_rows; ++r) {
+    const auto &t = initial_tokens[r / beam_size];
+    p_tokens = std::copy(t.begin(), t.end(), p_tokens);
+  }
+
+  std::array<int64_t, 1> offset_shape{1};
+  Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
+      model_->Allocator(), offset_shape.data(), offset_shape.size());
+  *(offset.GetTensorMutableData<int64_t>()) = 0;
+
+  auto self_kv_cache = model_->GetInitialSelfKVCache(num_rows);
+
+  auto decoder_out = model_->ForwardDecoder(
+      std::move(tokens), std::move(self_kv_cache.first),
+      std::move(self_kv_cache.second), std::move(cross_k), std::move(cross_v),
+      std::move(offset));
+
+  *(std::get<5>(decoder_out).GetTensorMutableData<int64_t>()) =
+      num_initial_tokens;
+
+  int32_t eot = model_->EOT();
+  int32_t n_text_ctx = model_->TextCtx();
+
+  int32_t num_finished_needed = std::max(
+      1, static_cast<int32_t>(std::round(beam_size * config_.patience)));
+
+  std::vector<int32_t> max_num_tokens(batch_size);
+
+  // All hypotheses of an utterance are identical at the beginning, so only
+  // the first one is active.
+  std::vector<Hypothesis> hyps(num_rows);
+  std::vector<std::vector<Hypothesis>> finished(batch_size);
+  std::vector<bool> done(batch_size, false);
+
+  for (int32_t n = 0; n != batch_size; ++n) {
+    hyps[n * beam_size].log_prob = 0;
+
+    // assume at most 6 tokens per second
+    max_num_tokens[n] = num_feature_frames[n] / 100.0 * 6;
+    max_num_tokens[n] = std::min<int32_t>(max_num_tokens[n], n_text_ctx / 2);
+
+    if (max_num_tokens[n] <= 0) {
+      done[n] = true;
+    }
+  }
+
+  std::vector<int32_t> indexes;
+  std::vector<Candidate> candidates;
+  std::vector<float> buf;
+
+  while (std::find(done.begin(), done.end(), false) != done.end()) {
+    const auto &logits = std::get<0>(decoder_out);
+    const float *p_logits = logits.GetTensorData<float>();
+
+    auto logits_shape = logits.GetTensorTypeAndShapeInfo().GetShape();
+    int32_t num_words = logits_shape[1];
+    int32_t vocab_size = logits_shape[2];
+
+    int32_t top_k = std::min(beam_size + 1, vocab_size);
+    indexes.resize(vocab_size);
+
+    // Finished utterances and inactive hypotheses keep their rows and are
+    // fed eot. Their outputs are ignored.
+    std::vector<int32_t> src(num_rows);
+    std::iota(src.begin(), src.end(), 0);
+
+    std::vector<int32_t> next_tokens(num_rows, eot);
+    std::vector<Hypothesis> next_hyps(num_rows);
+
+    for (int32_t n = 0; n != batch_size; ++n) {
+      if (done[n]) {
+        continue;
+      }
+
+      candidates.clear();
+      for (int32_t r = n * beam_size; r != (n + 1) * beam_size; ++r) {
+        if (!hyps[r].IsActive()) {
+          continue;
+        }
+
+        const float *p =
+            p_logits + (r * num_words + num_words - 1) * vocab_size;
+
+        float max_logit = *std::max_element(p, p + vocab_size);
+        double sum = 0;
+        for (int32_t i = 0; i != vocab_size; ++i) {
+          sum += std::exp(p[i] - max_logit);
+        }
+        double log_sum = max_logit + std::log(sum);
+
+        // Ties are broken by the token ID, as in greedy search
+        std::iota(indexes.begin(), indexes.end(), 0);
+        std::partial_sort(indexes.begin(), indexes.begin() + top_k,
+                          indexes.end(), [p](int32_t a, int32_t b) {
+                            return p[a] > p[b] || (p[a] == p[b] && a < b);
+                          });
+
+        for (int32_t i = 0; i != top_k; ++i) {
+          int32_t token = indexes[i];
+          candidates.push_back(
+              {hyps[r].log_prob + p[token] - log_sum, r, token});
+        }
+      }
+
+      std::stable_sort(candidates.begin(), candidates.end(),
+                       [](const Candidate &a, const Candidate &b) {
+                         return a.log_prob > b.log_prob;
+                       });
+
+      int32_t num_active = 0;
+      for (const auto &c : candidates) {
+        if (c.token == eot) {
+          if (static_cast<int32_t>(finished[n].size()) < num_finished_needed) {
+            finished[n].push_back({hyps[c.row].tokens, c.log_prob});
+          }
+          continue;
+        }
+
+        int32_t dst = n * beam_size + num_active;
+        src[dst] = c.row;
+        next_tokens[dst] = c.token;
+
+        next_hyps[dst].tokens = hyps[c.row].tokens;
+        next_hyps[dst].tokens.push_back(c.token);
+        next_hyps[dst].log_prob = c.log_prob;
+
+        if (++num_active == beam_size) {
+          break;
+        }
+      }
+
+      if (static_cast<int32_t>(finished[n].size()) >= num_finished_needed) {
+        done[n] = true;
+      } else if (num_active == 0 ||
+                 static_cast<int32_t>(next_hyps[n * beam_size].tokens.size()) >=
+                     max_num_tokens[n]) {
+        // Reached the max number of tokens. All active hypotheses end here.
+        for (int32_t r = n * beam_size; r != n * beam_size + num_active; ++r) {
+          finished[n].push_back(std::move(next_hyps[r]));
+        }
+        done[n] = true;
+      }
+    }
+
+    if (std::find(done.begin(), done.end(), false) == done.end()) {
+      break;
+    }
+
+    int64_t *p_offset =
+        std::get<5>(decoder_out).GetTensorMutableData<int64_t>();
+
+    Reorder(&std::get<1>(decoder_out), src, *p_offset, &buf);
+    Reorder(&std::get<2>(decoder_out), src, *p_offset, &buf);
+
+    hyps = std::move(next_hyps);
+
+    std::array<int64_t, 2> token_shape{num_rows, 1};
+    Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+        model_->Allocator(), token_shape.data(), token_shape.size());
+    std::copy(next_tokens.begin(), next_tokens.end(),
+              tokens.GetTensorMutableData<int64_t>());
+
+    decoder_out = model_->ForwardDecoder(std::move(tokens),
+                                         std::move(std::get<1>(decoder_out)),
+                                         std::move(std::get<2>(decoder_out)),
+                                         std::move(std::get<3>(decoder_out)),
+                                         std::move(std::get<4>(decoder_out)),
+                                         std::move(std::get<5>(decoder_out)));
+
+    p_offset = std::get<5>(decoder_out).GetTensorMutableData<int64_t>();
+
+    *p_offset += 1;
+    if (*p_offset >= n_text_ctx - 1) {
+      for (int32_t n = 0; n != batch_size; ++n) {
+        if (done[n]) {
+          continue;
+        }
+
+        for (int32_t r = n * beam_size; r != (n + 1) * beam_size; ++r) {
+          if (hyps[r].IsActive()) {
+            finished[n].push_back(std::move(hyps[r]));
+          }
+        }
+      }
+      break;
+    }
+  }
+
+  float length_penalty = config_.length_penalty;
+  auto score = [length_penalty](const Hypothesis &h) {
+    double length = h.tokens.size();
+    if (length_penalty < 0) {
+      return h.log_prob / std::max(length, 1.0);
+    }
+
+    return h.log_prob / std::pow((5 + length) / 6, length_penalty);
+  };
+
+  std::vector<OfflineWhisperDecoderResult> ans(batch_size);
+
+  const auto &id2lang = model_->GetID2Lang();
+  for (int32_t n = 0; n != batch_size; ++n) {
+    if (id2lang.count(initial_tokens[n][1])) {
+      ans[n].lang = id2lang.at(initial_tokens[n][1]);
+    }
+
+    if (finished[n].empty()) {
+      continue;
+    }
+
+    auto best = std::max_element(
+        finished[n].begin(), finished[n].end(),
+        [&score](const Hypothesis &a, const Hypothesis &b) {
+          return score(a) < score(b);
+        });
+
+    ans[n].tokens = std::move(best->tokens);
+  }
+
+  return ans;
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,41 @@
+// sherpa-onnx/csrc/offline-whisper-beam-search-decoder.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_OFFLINE_WHISPER_BEAM_SEARCH_DECODER_H_
+#define SHERPA_ONNX_CSRC_OFFLINE_WHISPER_BEAM_SEARCH_DECODER_H_
+
+#include <vector>
+
+#include "sherpa-onnx/csrc/offline-whisper-decoder.h"
+#include "sherpa-onnx/csrc/offline-whisper-model.h"
+
+namespace sherpa_onnx {
+
+// Beam search for whisper.
+//
+// The cross kv of each utterance is tiled beam_size times once and all
+// hypotheses of all utterances are expanded with a single call to the
+// decoder model per step.
+class OfflineWhisperBeamSearchDecoder : public OfflineWhisperDecoder {
+ public:
+  OfflineWhisperBeamSearchDecoder(const OfflineWhisperModelConfig &config,
+                                  OfflineWhisperModel *model,
+                                  int32_t beam_size)
+      : config_(config), model_(model), beam_size_(beam_size) {}
+
+  std::vector<OfflineWhisperDecoderResult> Decode(
+      Ort::Value cross_k, Ort::Value cross_v,
+      const std::vector<int32_t> &num_feature_frames) override;
+
+  void SetConfig(const OfflineWhisperModelConfig &config) override;
+
+ private:
+  OfflineWhisperModelConfig config_;
+  OfflineWhisperModel *model_;  // not owned
+  int32_t beam_size_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_OFFLINE_WHISPER_BEAM_SEARCH_DECODER_H_
@@ -0,0 +1,66 @@
+// sherpa-onnx/csrc/offline-whisper-decoder.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/offline-whisper-decoder.h"
+
+#include <vector>
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/offline-whisper-model.h"
+
+namespace sherpa_onnx {
+
+std::vector<std::vector<int64_t>> OfflineWhisperDecoder::GetInitialTokens(
+    const OfflineWhisperModelConfig &config, OfflineWhisperModel *model,
+    Ort::Value *cross_k, Ort::Value *cross_v) {
+  int32_t batch_size = cross_k->GetTensorTypeAndShapeInfo().GetShape()[1];
+
+  // For multilingual models, initial_tokens contains [sot, language, task]
+  //   - language is English by default
+  //   - task is transcribe by default
+  //
+  // For non-multilingual models, initial_tokens contains [sot]
+  std::vector<int64_t> initial_tokens = model->GetInitialTokens();
+
+  std::vector<int32_t> lang_ids;
+
+  if (model->IsMultiLingual()) {
+    if (!config.language.empty()) {
+      const auto &lang2id = model->GetLang2ID();
+
+      if (!lang2id.count(config.language)) {
+        SHERPA_ONNX_LOGE("Invalid language: %s", config.language.c_str());
+        exit(-1);
+      }
+
+      int32_t lang_id = lang2id.at(config.language);
+
+      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
+      initial_tokens[1] = lang_id;
+    } else {
+      lang_ids = model->DetectLanguages(*cross_k, *cross_v);
+    }
+
+    if (config.task == "translate") {
+      initial_tokens[2] = model->Translate();
+    } else if (config.task != "transcribe") {
+      // initial_tokens[2] is transcribe by default
+      SHERPA_ONNX_LOGE(
+          "Unsupported task: %s. Valid values are: transcribe, translate.",
+          config.task.c_str());
+    }
+  }
+
+  initial_tokens.push_back(model->NoTimeStampsToken());
+
+  std::vector<std::vector<int64_t>> ans(batch_size, initial_tokens);
+
+  for (int32_t i = 0; i != static_cast<int32_t>(lang_ids.size()); ++i) {
+    ans[i][1] = lang_ids[i];
+  }
+
+  return ans;
+}
+
+}  // namespace sherpa_onnx
@@ -13,6 +13,8 @@
 
 namespace sherpa_onnx {
 
+class OfflineWhisperModel;
+
 struct OfflineWhisperDecoderResult {
   /// The decoded token IDs
   std::vector<int32_t> tokens;
@@ -29,14 +31,31 @@ class OfflineWhisperDecoder {
    *                              (n_text_layer, N, n_audio_ctx, n_text_state).
    * @param n_layer_cross_v       A 4-D tensor of shape
    *                              (n_text_layer, N, n_audio_ctx, n_text_state).
+   * @param num_feature_frames    A vector of size `N`. num_feature_frames[i]
+   *                              is the number of non-padding feature frames
+   *                              of the i-th utterance.
    *
    * @return Return a vector of size `N` containing the decoded results.
    */
   virtual std::vector<OfflineWhisperDecoderResult> Decode(
       Ort::Value n_layer_cross_k, Ort::Value n_layer_cross_v,
-      int32_t num_feature_frames) = 0;
+      const std::vector<int32_t> &num_feature_frames) = 0;
 
   virtual void SetConfig(const OfflineWhisperModelConfig &config) = 0;
+
+ protected:
+  /** Return the initial tokens of each utterance, i.e.,
+   *  [sot, language, task, no_timestamps] for multilingual models and
+   *  [sot, no_timestamps] otherwise.
+   *
+   *  If config.language is empty, the language of each utterance is
+   *  detected with the decoder.
+   *
+   *  All returned vectors have the same length.
+   */
+  static std::vector<std::vector<int64_t>> GetInitialTokens(
+      const OfflineWhisperModelConfig &config, OfflineWhisperModel *model,
+      Ort::Value *cross_k, Ort::Value *cross_v);
 };
 
 }  // namespace sherpa_onnx
@@ -5,9 +5,10 @@
 #include "sherpa-onnx/csrc/offline-whisper-greedy-search-decoder.h"
 
 #include <algorithm>
+#include <array>
 #include <utility>
+#include <vector>
 
-#include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 
 namespace sherpa_onnx {
@@ -18,65 +19,33 @@ void OfflineWhisperGreedySearchDecoder::SetConfig(
 }
 
 std::vector<OfflineWhisperDecoderResult>
-OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
-                                          Ort::Value cross_v,
-                                          int32_t num_feature_frames) {
-  auto memory_info =
-      Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-  // For multilingual models, initial_tokens contains [sot, language, task]
-  //   - language is English by default
-  //   - task is transcribe by default
-  //
-  // For non-multilingual models, initial_tokens contains [sot]
-  std::vector<int64_t> initial_tokens = model_->GetInitialTokens();
-
-  if (model_->IsMultiLingual()) {
-    if (!config_.language.empty()) {
-      const auto &lang2id = model_->GetLang2ID();
-
-      if (!lang2id.count(config_.language)) {
-        SHERPA_ONNX_LOGE("Invalid language: %s", config_.language.c_str());
-        exit(-1);
-      }
+OfflineWhisperGreedySearchDecoder::Decode(
+    Ort::Value cross_k, Ort::Value cross_v,
+    const std::vector<int32_t> &num_feature_frames) {
+  std::vector<std::vector<int64_t>> initial_tokens =
+      GetInitialTokens(config_, model_, &cross_k, &cross_v);
 
-      int32_t lang_id = lang2id.at(config_.language);
+  int32_t batch_size = initial_tokens.size();
+  int32_t num_initial_tokens = initial_tokens[0].size();
 
-      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
-      initial_tokens[1] = lang_id;
-    } else {
-      int32_t lang_id = model_->DetectLanguage(cross_k, cross_v);
+  // All utterances in the batch are decoded in lockstep and share the
+  // offset and the self kv cache.
+  std::array<int64_t, 2> token_shape{batch_size, num_initial_tokens};
 
-      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
-      initial_tokens[1] = lang_id;
-    }
+  Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+      model_->Allocator(), token_shape.data(), token_shape.size());
 
-    if (config_.task == "translate") {
-      initial_tokens[2] = model_->Translate();
-    } else if (config_.task != "transcribe") {
-      // initial_tokens[2] is transcribe by default
-      SHERPA_ONNX_LOGE(
-          "Unsupported task: %s. Valid values are: transcribe, translate.",
-          config_.task.c_str());
-    }
+  int64_t *p_tokens = tokens.GetTensorMutableData<int64_t>();
+  for (const auto &t : initial_tokens) {
+    p_tokens = std::copy(t.begin(), t.end(), p_tokens);
   }
 
-  initial_tokens.push_back(model_->NoTimeStampsToken());
-
-  int32_t batch_size = 1;
-  std::array<int64_t, 2> token_shape{
-      batch_size, static_cast<int64_t>(initial_tokens.size())};
-
-  Ort::Value tokens = Ort::Value::CreateTensor(
-      memory_info, initial_tokens.data(), initial_tokens.size(),
-      token_shape.data(), token_shape.size());
-
   std::array<int64_t, 1> offset_shape{1};
   Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
       model_->Allocator(), offset_shape.data(), offset_shape.size());
   *(offset.GetTensorMutableData<int64_t>()) = 0;
 
-  auto self_kv_cache = model_->GetInitialSelfKVCache();
+  auto self_kv_cache = model_->GetInitialSelfKVCache(batch_size);
 
   auto decoder_out = model_->ForwardDecoder(
       std::move(tokens), std::move(self_kv_cache.first),
@@ -84,7 +53,7 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
       std::move(offset));
 
   *(std::get<5>(decoder_out).GetTensorMutableData<int64_t>()) =
-      initial_tokens.size();
+      num_initial_tokens;
 
   const auto &logits = std::get<0>(decoder_out);
   const float *p_logits = logits.GetTensorData<float>();
@@ -92,32 +61,59 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
   auto logits_shape = logits.GetTensorTypeAndShapeInfo().GetShape();
   int32_t vocab_size = logits_shape[2];
 
-  const float *p_start = p_logits + (logits_shape[1] - 1) * vocab_size;
+  int32_t eot = model_->EOT();
+  int32_t n_text_ctx = model_->TextCtx();
 
-  int32_t max_token_id = static_cast<int32_t>(
-      std::distance(p_start, std::max_element(p_start, p_start + vocab_size)));
+  std::vector<int32_t> max_token_ids(batch_size);
+  std::vector<int32_t> num_possible_tokens(batch_size);
+  std::vector<bool> done(batch_size, false);
 
-  int32_t n_text_ctx = model_->TextCtx();
+  for (int32_t b = 0; b != batch_size; ++b) {
+    const float *p_start =
+        p_logits + (b * logits_shape[1] + logits_shape[1] - 1) * vocab_size;
+
+    max_token_ids[b] = static_cast<int32_t>(std::distance(
+        p_start, std::max_element(p_start, p_start + vocab_size)));
 
-  std::vector<int32_t> predicted_tokens;
+    // assume at most 6 tokens per second
+    num_possible_tokens[b] = num_feature_frames[b] / 100.0 * 6;
+    num_possible_tokens[b] =
+        std::min<int32_t>(num_possible_tokens[b], n_text_ctx / 2);
+  }
 
-  // assume at most 6 tokens per second
-  int32_t num_possible_tokens = num_feature_frames / 100.0 * 6;
-  num_possible_tokens = std::min<int32_t>(num_possible_tokens, n_text_ctx / 2);
+  std::vector<std::vector<int32_t>> predicted_tokens(batch_size);
 
-  for (int32_t i = 0; i < num_possible_tokens; ++i) {
-    if (max_token_id == model_->EOT()) {
-      break;
+  while (true) {
+    int32_t num_active = 0;
+    for (int32_t b = 0; b != batch_size; ++b) {
+      if (done[b]) {
+        continue;
+      }
+
+      if (max_token_ids[b] == eot ||
+          static_cast<int32_t>(predicted_tokens[b].size()) >=
+              num_possible_tokens[b]) {
+        done[b] = true;
+        continue;
+      }
+
+      predicted_tokens[b].push_back(max_token_ids[b]);
+      ++num_active;
     }
 
-    predicted_tokens.push_back(max_token_id);
+    if (num_active == 0) {
+      break;
+    }
 
-    std::array<int64_t, 2> token_shape{1, 1};
+    std::array<int64_t, 2> token_shape{batch_size, 1};
     Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
         model_->Allocator(), token_shape.data(), token_shape.size());
 
+    // Finished utterances are fed with eot and their outputs are ignored
     int64_t *p_tokens = tokens.GetTensorMutableData<int64_t>();
-    p_tokens[0] = max_token_id;
+    for (int32_t b = 0; b != batch_size; ++b) {
+      p_tokens[b] = done[b] ? eot : max_token_ids[b];
+    }
 
     decoder_out = model_->ForwardDecoder(std::move(tokens),
                                          std::move(std::get<1>(decoder_out)),
@@ -137,20 +133,28 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
     const auto &logits = std::get<0>(decoder_out);
     const float *p_logits = logits.GetTensorData<float>();
 
-    max_token_id = static_cast<int64_t>(std::distance(
-        p_logits, std::max_element(p_logits, p_logits + vocab_size)));
+    for (int32_t b = 0; b != batch_size; ++b, p_logits += vocab_size) {
+      if (done[b]) {
+        continue;
+      }
+
+      max_token_ids[b] = static_cast<int32_t>(std::distance(
+          p_logits, std::max_element(p_logits, p_logits + vocab_size)));
+    }
   }
 
-  std::vector<OfflineWhisperDecoderResult> ans(1);
+  std::vector<OfflineWhisperDecoderResult> ans(batch_size);
 
   const auto &id2lang = model_->GetID2Lang();
-  if (id2lang.count(initial_tokens[1])) {
-    ans[0].lang = id2lang.at(initial_tokens[1]);
-  } else {
-    ans[0].lang = "";
-  }
+  for (int32_t b = 0; b != batch_size; ++b) {
+    if (id2lang.count(initial_tokens[b][1])) {
+      ans[b].lang = id2lang.at(initial_tokens[b][1]);
+    } else {
+      ans[b].lang = "";
+    }
 
-  ans[0].tokens = std::move(predicted_tokens);
+    ans[b].tokens = std::move(predicted_tokens[b]);
+  }
 
   return ans;
 }
@@ -39,6 +39,15 @@ void OfflineWhisperModelConfig::Register(ParseOptions *po) {
       "Since we have removed the 30-second constraint, we need to add some "
       "tail padding frames "
       "so that whisper can detect the eot token. Leave it to -1 to use 1000.");
+
+  po->Register("whisper-length-penalty", &length_penalty,
+               "Used only when decoding_method is beam_search. If negative, "
+               "the log-prob of a hypothesis is divided by its length. "
+               "Otherwise, it is divided by ((5 + length) / 6)^length_penalty");
+
+  po->Register("whisper-patience", &patience,
+               "Used only when decoding_method is beam_search. Beam search "
+               "stops once beam_size * patience hypotheses have ended.");
 }
 
 bool OfflineWhisperModelConfig::Validate() const {
@@ -72,6 +81,12 @@ bool OfflineWhisperModelConfig::Validate() const {
     return false;
   }
 
+  if (patience <= 0) {
+    SHERPA_ONNX_LOGE("--whisper-patience should be positive. Given: %.3f",
+                     patience);
+    return false;
+  }
+
   return true;
 }
 
@@ -83,7 +98,9 @@ std::string OfflineWhisperModelConfig::ToString() const {
   os << "decoder=\"" << decoder << "\", ";
   os << "language=\"" << language << "\", ";
   os << "task=\"" << task << "\", ";
-  os << "tail_paddings=" << tail_paddings << ")";
+  os << "tail_paddings=" << tail_paddings << ", ";
+  os << "length_penalty=" << length_penalty << ", ";
+  os << "patience=" << patience << ")";
 
   return os.str();
 }
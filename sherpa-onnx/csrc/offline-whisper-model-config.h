@@ -38,16 +38,33 @@ struct OfflineWhisperModelConfig {
   //   - 300 for multilingual models
   int32_t tail_paddings = -1;
 
+  // The following two options are used only when decoding_method is
+  // beam_search. They have the same meaning as in
+  // https://github.com/openai/whisper/blob/main/whisper/decoding.py
+  //
+  // A hypothesis of length n with log-prob p is scored as
+  //   - p / n, if length_penalty is negative
+  //   - p / ((5 + n) / 6)^length_penalty, otherwise
+  float length_penalty = -1;
+
+  // Beam search stops once round(beam_size * patience) hypotheses
+  // have ended with eot. A value larger than 1 explores more hypotheses
+  // at the cost of more decoding steps.
+  float patience = 1;
+
   OfflineWhisperModelConfig() = default;
   OfflineWhisperModelConfig(const std::string &encoder,
                             const std::string &decoder,
                             const std::string &language,
-                            const std::string &task, int32_t tail_paddings)
+                            const std::string &task, int32_t tail_paddings,
+                            float length_penalty = -1, float patience = 1)
       : encoder(encoder),
         decoder(decoder),
         language(language),
         task(task),
-        tail_paddings(tail_paddings) {}
+        tail_paddings(tail_paddings),
+        length_penalty(length_penalty),
+        patience(patience) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
@@ -128,18 +128,17 @@ class OfflineWhisperModel::Impl {
         std::move(decoder_input[4]), std::move(decoder_input[5])};
   }
 
-  int32_t DetectLanguage(Ort::Value &cross_k,    // NOLINT
-                         Ort::Value &cross_v) {  // NOLINT
-    int64_t token_val = SOT();
-    std::array<int64_t, 2> token_shape{1, 1};
+  std::vector<int32_t> DetectLanguages(Ort::Value &cross_k,    // NOLINT
+                                       Ort::Value &cross_v) {  // NOLINT
+    int32_t batch_size = cross_k.GetTensorTypeAndShapeInfo().GetShape()[1];
 
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+    std::array<int64_t, 2> token_shape{batch_size, 1};
 
-    Ort::Value tokens = Ort::Value::CreateTensor(
-        memory_info, &token_val, 1, token_shape.data(), token_shape.size());
+    Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+        Allocator(), token_shape.data(), token_shape.size());
+    std::fill_n(tokens.GetTensorMutableData<int64_t>(), batch_size, SOT());
 
-    auto self_kv_cache = GetInitialSelfKVCache();
+    auto self_kv_cache = GetInitialSelfKVCache(batch_size);
 
     std::array<int64_t, 1> offset_shape{1};
     Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
@@ -154,32 +153,42 @@ class OfflineWhisperModel::Impl {
     cross_k = std::move(std::get<3>(decoder_out));
     cross_v = std::move(std::get<4>(decoder_out));
 
-    const float *p_logits = std::get<0>(decoder_out).GetTensorData<float>();
+    const auto &logits = std::get<0>(decoder_out);
+    const float *p_logits = logits.GetTensorData<float>();
+    int32_t vocab_size = logits.GetTensorTypeAndShapeInfo().GetShape()[2];
+
     const auto &all_language_ids = GetAllLanguageIDs();
 
-    int32_t lang_id = all_language_ids[0];
-    float this_logit = p_logits[lang_id];
+    std::vector<int32_t> ans(batch_size);
+    for (int32_t b = 0; b != batch_size; ++b, p_logits += vocab_size) {
+      int32_t lang_id = all_language_ids[0];
+      float this_logit = p_logits[lang_id];
 
-    for (int32_t i = 1; i != all_language_ids.size(); ++i) {
-      int32_t id = all_language_ids[i];
-      float p = p_logits[id];
+      for (int32_t i = 1; i != all_language_ids.size(); ++i) {
+        int32_t id = all_language_ids[i];
+        float p = p_logits[id];
 
-      if (p > this_logit) {
-        this_logit = p;
-        lang_id = id;
+        if (p > this_logit) {
+          this_logit = p;
+          lang_id = id;
+        }
       }
-    }
 
-    if (config_.debug) {
-      SHERPA_ONNX_LOGE("Detected language: %s",
-                       GetID2Lang().at(lang_id).c_str());
+      if (config_.debug) {
+        SHERPA_ONNX_LOGE("Detected language: %s",
+                         GetID2Lang().at(lang_id).c_str());
+      }
+
+      ans[b] = lang_id;
     }
 
-    return lang_id;
+    return ans;
   }
 
-  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache() {
-    std::array<int64_t, 4> shape{n_text_layer_, 1, n_text_ctx_, n_text_state_};
+  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache(
+      int32_t batch_size) {
+    std::array<int64_t, 4> shape{n_text_layer_, batch_size, n_text_ctx_,
+                                 n_text_state_};
 
     Ort::Value n_layer_self_k_cache = Ort::Value::CreateTensor<float>(
         Allocator(), shape.data(), shape.size());
@@ -385,12 +394,18 @@ OfflineWhisperModel::ForwardDecoder(Ort::Value tokens,
 
 int32_t OfflineWhisperModel::DetectLanguage(Ort::Value &cross_k,    // NOLINT
                                             Ort::Value &cross_v) {  // NOLINT
-  return impl_->DetectLanguage(cross_k, cross_v);
+  return impl_->DetectLanguages(cross_k, cross_v)[0];
+}
+
+std::vector<int32_t> OfflineWhisperModel::DetectLanguages(
+    Ort::Value &cross_k,    // NOLINT
+    Ort::Value &cross_v) {  // NOLINT
+  return impl_->DetectLanguages(cross_k, cross_v);
 }
 
-std::pair<Ort::Value, Ort::Value> OfflineWhisperModel::GetInitialSelfKVCache()
-    const {
-  return impl_->GetInitialSelfKVCache();
+std::pair<Ort::Value, Ort::Value> OfflineWhisperModel::GetInitialSelfKVCache(
+    int32_t batch_size /*= 1*/) const {
+  return impl_->GetInitialSelfKVCache(batch_size);
 }
 
 OrtAllocator *OfflineWhisperModel::Allocator() const {
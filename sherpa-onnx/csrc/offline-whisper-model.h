@@ -77,13 +77,29 @@ class OfflineWhisperModel {
   int32_t DetectLanguage(Ort::Value &cross_k,   // NOLINT
                          Ort::Value &cross_v);  // NOLINT
 
+  /** Detect the language of each utterance in a batch.
+   *
+   * @param cross_k  A 4-D tensor of shape
+   *                 (n_text_layer, N, n_audio_ctx, n_text_state).
+   * @param cross_v  A 4-D tensor of shape
+   *                 (n_text_layer, N, n_audio_ctx, n_text_state).
+   *
+   * @return Return a vector of size N containing the token ID of the
+   *         detected language of each utterance.
+   */
+  std::vector<int32_t> DetectLanguages(Ort::Value &cross_k,   // NOLINT
+                                       Ort::Value &cross_v);  // NOLINT
+
   /** Return the initial self kv cache in a pair
    *  - n_layer_self_k_cache A 4-D tensor of shape
    *                         (n_text_layer, N, n_audio_ctx, n_text_state).
    *  - n_layer_self_v_cache A 4-D tensor of shape
    *                         (n_text_layer, N, n_audio_ctx, n_text_state).
+   *
+   * where N is batch_size.
    */
-  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache() const;
+  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache(
+      int32_t batch_size = 1) const;
   const std::vector<int64_t> &GetInitialTokens() const;
   const std::vector<int32_t> &GetAllLanguageIDs() const;
   const std::unordered_map<std::string, int32_t> &GetLang2ID() const;
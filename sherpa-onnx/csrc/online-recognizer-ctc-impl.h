@@ -33,6 +33,7 @@ OnlineRecognizerResult ConvertCtc(const OnlineCtcDecoderResult &src,
                                   int32_t frames_since_start) {
   OnlineRecognizerResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
   r.timestamps.reserve(src.tokens.size());
 
   std::string text;
@@ -52,6 +53,7 @@ OnlineRecognizerResult ConvertCtc(const OnlineCtcDecoderResult &src,
     }
 
     r.tokens.push_back(std::move(sym));
+    r.token_ids.push_back(i);
   }
 
   if (sym_table.IsByteBpe()) {
@@ -26,6 +26,7 @@ static OnlineRecognizerResult Convert(const OnlineParaformerDecoderResult &src,
                                       const SymbolTable &sym_table) {
   OnlineRecognizerResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
 
   std::string text;
 
@@ -35,6 +36,7 @@ static OnlineRecognizerResult Convert(const OnlineParaformerDecoderResult &src,
   for (int32_t i = 0; i != src.tokens.size(); ++i) {
     auto sym = sym_table[src.tokens[i]];
     r.tokens.push_back(sym);
+    r.token_ids.push_back(src.tokens[i]);
 
     if ((sym.back() != '@') || (sym.size() > 2 && sym[sym.size() - 2] != '@')) {
       // sym does not end with "@@"
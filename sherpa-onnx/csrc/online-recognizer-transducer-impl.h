@@ -14,6 +14,7 @@
 #include <utility>
 #include <vector>
 
+#include "sherpa-onnx/csrc/context-graph-cache.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-whisper-model.h"
@@ -37,6 +38,7 @@ OnlineRecognizerResult Convert(const OnlineTransducerDecoderResult &src,
                                int32_t segment, int32_t frames_since_start) {
   OnlineRecognizerResult r;
   r.tokens.reserve(src.tokens.size());
+  r.token_ids.reserve(src.tokens.size());
   r.timestamps.reserve(src.tokens.size());
 
   std::string text;
@@ -59,6 +61,7 @@ OnlineRecognizerResult Convert(const OnlineTransducerDecoderResult &src,
     }
 
     r.tokens.push_back(std::move(sym));
+    r.token_ids.push_back(i);
   }
 
   if (sym_table.IsByteBpe()) {
@@ -202,40 +205,16 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
 
   std::unique_ptr<OnlineStream> CreateStream(
       const std::string &hotwords) const override {
-    auto hws = std::regex_replace(hotwords, std::regex("/"), "\n");
-    std::istringstream is(hws);
-    std::vector<std::vector<int32_t>> current;
-    std::vector<float> current_scores;
-    if (!EncodeHotwords(is, config_.model_config.modeling_unit, sym_,
-                        bpe_encoder_.get(), &current, &current_scores)) {
-      SHERPA_ONNX_LOGE("Encode hotwords failed, skipping, hotwords are : %s",
-                       hotwords.c_str());
-    }
-
-    int32_t num_default_hws = hotwords_.size();
-    int32_t num_hws = current.size();
-
-    current.insert(current.end(), hotwords_.begin(), hotwords_.end());
-
-    if (!current_scores.empty() && !boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), boost_scores_.begin(),
-                            boost_scores_.end());
-    } else if (!current_scores.empty() && boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), num_default_hws,
-                            config_.hotwords_score);
-    } else if (current_scores.empty() && !boost_scores_.empty()) {
-      current_scores.insert(current_scores.end(), num_hws,
-                            config_.hotwords_score);
-      current_scores.insert(current_scores.end(), boost_scores_.begin(),
-                            boost_scores_.end());
-    } else {
-      // Do nothing.
+    ContextGraphPtr hotwords_graph = hotwords_graph_cache_.Get(hotwords);
+    if (!hotwords_graph) {
+      hotwords_graph = CompileHotwords(hotwords);
+      if (hotwords_graph) {
+        hotwords_graph_cache_.Put(hotwords, hotwords_graph);
+      }
     }
 
-    auto context_graph = std::make_shared<ContextGraph>(
-        current, config_.hotwords_score, current_scores);
-    auto stream =
-        std::make_unique<OnlineStream>(config_.feat_config, context_graph);
+    auto stream = std::make_unique<OnlineStream>(
+        config_.feat_config, BuildHotwordsGraph(hotwords_graph));
     InitOnlineStream(stream.get());
     return stream;
   }
@@ -435,6 +414,45 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
   }
 
  private:
+  // Return a graph containing only the given hotwords, or nullptr if none
+  // of them can be encoded
+  ContextGraphPtr CompileHotwords(const std::string &hotwords) const {
+    auto hws = std::regex_replace(hotwords, std::regex("/"), "\n");
+    std::istringstream is(hws);
+    std::vector<std::vector<int32_t>> current;
+    std::vector<float> current_scores;
+    if (!EncodeHotwords(is, config_.model_config.modeling_unit, sym_,
+                        bpe_encoder_.get(), &current, &current_scores)) {
+      SHERPA_ONNX_LOGE("Encode hotwords failed, skipping, hotwords are : %s",
+                       hotwords.c_str());
+    }
+
+    if (current.empty()) {
+      return nullptr;
+    }
+
+    return std::make_shared<ContextGraph>(current, config_.hotwords_score,
+                                          current_scores);
+  }
+
+  // The graph contains the given hotwords and the default ones. The default
+  // graph is shared instead of being copied.
+  //
+  // A layered graph creates its states during decoding, so a new one is
+  // created for each stream. It is cheap since the layers are shared.
+  ContextGraphPtr BuildHotwordsGraph(ContextGraphPtr hotwords_graph) const {
+    if (!hotwords_graph) {
+      return hotwords_graph_;
+    }
+
+    if (!hotwords_graph_) {
+      return hotwords_graph;
+    }
+
+    return std::make_shared<ContextGraph>(std::move(hotwords_graph),
+                                          hotwords_graph_);
+  }
+
   void InitHotwords() {
     // each line in hotwords_file contains space-separated words
 
@@ -513,6 +531,9 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
   std::vector<std::vector<int32_t>> hotwords_;
   std::vector<float> boost_scores_;
   ContextGraphPtr hotwords_graph_;
+
+  // graphs for CreateStream(hotwords)
+  mutable ContextGraphCache hotwords_graph_cache_;
   std::unique_ptr<ssentencepiece::Ssentencepiece> bpe_encoder_;
   std::unique_ptr<OnlineTransducerModel> model_;
   std::unique_ptr<OnlineLM> lm_;
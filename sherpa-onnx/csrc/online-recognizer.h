@@ -33,6 +33,9 @@ struct OnlineRecognizerResult {
   /// For instance, for BPE-based models it consists of a list of BPE tokens.
   std::vector<std::string> tokens;
 
+  /// token_ids[i] is the ID of tokens[i] in tokens.txt.
+  std::vector<int32_t> token_ids;
+
   /// timestamps.size() == tokens.size()
   /// timestamps[i] records the time in seconds when tokens[i] is decoded.
   std::vector<float> timestamps;
@@ -0,0 +1,60 @@
+// sherpa-onnx/csrc/online-speaker-diarization-impl.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/online-speaker-diarization-impl.h"
+
+#include <memory>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/online-speaker-diarization-pyannote-impl.h"
+
+namespace sherpa_onnx {
+
+std::unique_ptr<OnlineSpeakerDiarizationImpl>
+OnlineSpeakerDiarizationImpl::Create(
+    const OnlineSpeakerDiarizationConfig &config) {
+  if (!config.segmentation.pyannote.model.empty()) {
+    return std::make_unique<OnlineSpeakerDiarizationPyannoteImpl>(config);
+  }
+
+  SHERPA_ONNX_LOGE("Please specify a speaker segmentation model.");
+
+  return nullptr;
+}
+
+template <typename Manager>
+std::unique_ptr<OnlineSpeakerDiarizationImpl>
+OnlineSpeakerDiarizationImpl::Create(
+    Manager *mgr, const OnlineSpeakerDiarizationConfig &config) {
+  if (!config.segmentation.pyannote.model.empty()) {
+    return std::make_unique<OnlineSpeakerDiarizationPyannoteImpl>(mgr, config);
+  }
+
+  SHERPA_ONNX_LOGE("Please specify a speaker segmentation model.");
+
+  return nullptr;
+}
+
+#if __ANDROID_API__ >= 9
+template std::unique_ptr<OnlineSpeakerDiarizationImpl>
+OnlineSpeakerDiarizationImpl::Create(
+    AAssetManager *mgr, const OnlineSpeakerDiarizationConfig &config);
+#endif
+
+#if __OHOS__
+template std::unique_ptr<OnlineSpeakerDiarizationImpl>
+OnlineSpeakerDiarizationImpl::Create(
+    NativeResourceManager *mgr, const OnlineSpeakerDiarizationConfig &config);
+#endif
+
+}  // namespace sherpa_onnx
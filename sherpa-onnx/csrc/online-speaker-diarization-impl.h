@@ -0,0 +1,37 @@
+// sherpa-onnx/csrc/online-speaker-diarization-impl.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_IMPL_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_IMPL_H_
+
+#include <memory>
+
+#include "sherpa-onnx/csrc/online-speaker-diarization.h"
+
+namespace sherpa_onnx {
+
+class OnlineSpeakerDiarizationImpl {
+ public:
+  static std::unique_ptr<OnlineSpeakerDiarizationImpl> Create(
+      const OnlineSpeakerDiarizationConfig &config);
+
+  template <typename Manager>
+  static std::unique_ptr<OnlineSpeakerDiarizationImpl> Create(
+      Manager *mgr, const OnlineSpeakerDiarizationConfig &config);
+
+  virtual ~OnlineSpeakerDiarizationImpl() = default;
+
+  virtual int32_t SampleRate() const = 0;
+
+  virtual OnlineSpeakerDiarizationResult AcceptWaveform(const float *audio,
+                                                        int32_t n) = 0;
+
+  virtual OnlineSpeakerDiarizationResult Flush() = 0;
+
+  virtual void Reset() = 0;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_IMPL_H_
@@ -0,0 +1,548 @@
+// sherpa-onnx/csrc/online-speaker-diarization-pyannote-impl.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_PYANNOTE_IMPL_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_PYANNOTE_IMPL_H_
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <deque>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "Eigen/Dense"
+#include "sherpa-onnx/csrc/fast-clustering.h"
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/math.h"
+#include "sherpa-onnx/csrc/offline-speaker-segmentation-pyannote-model.h"
+#include "sherpa-onnx/csrc/online-speaker-diarization-impl.h"
+#include "sherpa-onnx/csrc/speaker-embedding-extractor.h"
+
+namespace sherpa_onnx {
+
+// It follows OfflineSpeakerDiarizationPyannoteImpl, except that
+//
+//  (1) windows are processed as soon as they are available
+//  (2) speakers of each window are assigned to the clusters of previous
+//      windows instead of clustering all windows at the end
+//  (3) statistics of a frame are dropped once no later window overlaps it
+class OnlineSpeakerDiarizationPyannoteImpl
+    : public OnlineSpeakerDiarizationImpl {
+ public:
+  using Matrix2D =
+      Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+  using Matrix2DInt32 =
+      Eigen::Matrix<int32_t, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+  explicit OnlineSpeakerDiarizationPyannoteImpl(
+      const OnlineSpeakerDiarizationConfig &config)
+      : config_(config),
+        segmentation_model_(config_.segmentation),
+        embedding_extractor_(config_.embedding),
+        clustering_(config_.clustering) {
+    Init();
+  }
+
+  template <typename Manager>
+  OnlineSpeakerDiarizationPyannoteImpl(
+      Manager *mgr, const OnlineSpeakerDiarizationConfig &config)
+      : config_(config),
+        segmentation_model_(mgr, config_.segmentation),
+        embedding_extractor_(mgr, config_.embedding),
+        clustering_(config_.clustering) {
+    Init();
+  }
+
+  int32_t SampleRate() const override {
+    return segmentation_model_.GetModelMetaData().sample_rate;
+  }
+
+  OnlineSpeakerDiarizationResult AcceptWaveform(const float *audio,
+                                                int32_t n) override {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t window_size = meta_data.window_size;
+    int32_t window_shift = meta_data.window_shift;
+
+    if (n > 0) {
+      buffer_.insert(buffer_.end(), audio, audio + n);
+      num_samples_ += n;
+    }
+
+    // buffer_[0] is the first sample of window num_windows_
+    while (static_cast<int32_t>(buffer_.size()) >= window_size) {
+      ProcessWindow(buffer_.data());
+      buffer_.erase(buffer_.begin(), buffer_.begin() + window_shift);
+    }
+
+    return GetResult();
+  }
+
+  OnlineSpeakerDiarizationResult Flush() override {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t window_size = meta_data.window_size;
+    int32_t window_shift = meta_data.window_shift;
+    int32_t receptive_field_shift = meta_data.receptive_field_shift;
+
+    int64_t num_covered_samples =
+        num_windows_ > 0 ? (num_windows_ - 1) * window_shift + window_size : 0;
+
+    bool has_last_window = num_samples_ > num_covered_samples;
+    if (has_last_window) {
+      // NOTE: the padded samples are zero
+      buffer_.resize(window_size);
+      ProcessWindow(buffer_.data());
+    }
+
+    int64_t num_frames =
+        first_frame_ + static_cast<int64_t>(num_speakers_sum_.size());
+    if (has_last_window) {
+      // Like ComputeSpeakerCount() in the offline version, skip frames
+      // that contain only padded samples
+      num_frames = std::min<int64_t>(num_frames,
+                                     num_samples_ / receptive_field_shift + 1);
+    }
+
+    FinalizeFrames(num_frames);
+    FinishSegments(num_frames - 1, &speakers_, &finalized_);
+
+    OnlineSpeakerDiarizationResult ans = GetResult();
+    ans.provisional.clear();
+
+    Reset();
+
+    return ans;
+  }
+
+  void Reset() override {
+    buffer_.clear();
+    num_samples_ = 0;
+    num_windows_ = 0;
+
+    first_frame_ = 0;
+    speaker_count_.clear();
+    num_speakers_sum_.clear();
+    num_windows_per_frame_.clear();
+
+    speakers_.clear();
+    finalized_.clear();
+
+    clustering_.Reset();
+  }
+
+ private:
+  struct SpeakerState {
+    // Index of the frame where the current active region of this speaker
+    // starts. -1 means the speaker is not active.
+    int64_t start_frame = -1;
+
+    // The last closed segment. It is kept until we know that it cannot be
+    // merged with the next segment of this speaker.
+    std::optional<OfflineSpeakerDiarizationSegment> pending;
+  };
+
+  void Init() {
+    InitPowersetMapping();
+    Reset();
+  }
+
+  // see also
+  // https://github.com/pyannote/pyannote-audio/blob/develop/pyannote/audio/utils/powerset.py#L68
+  void InitPowersetMapping() {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t num_classes = meta_data.num_classes;
+    int32_t powerset_max_classes = meta_data.powerset_max_classes;
+    int32_t num_speakers = meta_data.num_speakers;
+
+    powerset_mapping_ = Matrix2DInt32(num_classes, num_speakers);
+    powerset_mapping_.setZero();
+
+    int32_t k = 1;
+    for (int32_t i = 1; i <= powerset_max_classes; ++i) {
+      if (i == 1) {
+        for (int32_t j = 0; j != num_speakers; ++j, ++k) {
+          powerset_mapping_(k, j) = 1;
+        }
+      } else if (i == 2) {
+        for (int32_t j = 0; j != num_speakers; ++j) {
+          for (int32_t m = j + 1; m < num_speakers; ++m, ++k) {
+            powerset_mapping_(k, j) = 1;
+            powerset_mapping_(k, m) = 1;
+          }
+        }
+      } else {
+#if __OHOS__
+        SHERPA_ONNX_LOGE(
+            "powerset_max_classes = %{public}d is currently not supported!", i);
+#else
+        SHERPA_ONNX_LOGE(
+            "powerset_max_classes = %d is currently not supported!", i);
+#endif
+        SHERPA_ONNX_EXIT(-1);
+      }
+    }
+  }
+
+  // Index of the first frame of the given window
+  int64_t WindowStartFrame(int64_t window_index) const {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    return static_cast<double>(window_index) * meta_data.window_shift /
+               meta_data.receptive_field_shift +
+           0.5;
+  }
+
+  float FrameToSeconds(int64_t frame) const {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    double scale =
+        static_cast<double>(meta_data.receptive_field_shift) /
+        meta_data.sample_rate;
+    double scale_offset =
+        0.5 * meta_data.receptive_field_size / meta_data.sample_rate;
+
+    return frame * scale + scale_offset;
+  }
+
+  // @param p Pointer to window_size samples
+  void ProcessWindow(const float *p) {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t window_size = meta_data.window_size;
+    int32_t sample_rate = meta_data.sample_rate;
+
+    // (num_frames, num_speakers_in_window)
+    Matrix2DInt32 label = ToMultiLabel(ProcessChunk(p));
+    int32_t num_frames = label.rows();
+
+    int64_t start_frame = WindowStartFrame(num_windows_);
+    int64_t end_frame = start_frame + num_frames;
+    while (first_frame_ + static_cast<int64_t>(num_speakers_sum_.size()) <
+           end_frame) {
+      speaker_count_.emplace_back();
+      num_speakers_sum_.push_back(0);
+      num_windows_per_frame_.push_back(0);
+    }
+
+    int64_t offset = start_frame - first_frame_;
+    for (int32_t i = 0; i != num_frames; ++i) {
+      num_speakers_sum_[offset + i] += label.row(i).sum();
+      num_windows_per_frame_[offset + i] += 1;
+    }
+
+    // Embed each speaker of this window using frames without overlap
+    Matrix2DInt32 label_t = ExcludeOverlap(label).transpose();
+    // label_t: (num_speakers_in_window, num_frames)
+
+    auto IsNaNWrapper = [](float f) -> bool { return std::isnan(f); };
+
+    std::vector<int32_t> local_speakers;
+    std::vector<float> embeddings;
+
+    for (int32_t s = 0; s != label_t.rows(); ++s) {
+      auto d = label_t.row(s);
+      if (d.sum() < 10) {
+        // skip segments less than 10 frames
+        continue;
+      }
+
+      auto stream = embedding_extractor_.CreateStream();
+
+      int32_t start_index = -1;
+      for (int32_t k = 0; k <= num_frames; ++k) {
+        bool is_active = k < num_frames && d[k] != 0;
+        if (is_active && start_index == -1) {
+          start_index = k;
+        } else if (!is_active && start_index != -1) {
+          int32_t end_index = std::min(k, num_frames - 1);
+
+          int32_t start_samples =
+              static_cast<float>(start_index) / num_frames * window_size;
+          int32_t end_samples =
+              static_cast<float>(end_index) / num_frames * window_size;
+
+          if (end_samples > start_samples) {
+            stream->AcceptWaveform(sample_rate, p + start_samples,
+                                   end_samples - start_samples);
+          }
+          start_index = -1;
+        }
+      }
+
+      stream->InputFinished();
+      if (!embedding_extractor_.IsReady(stream.get())) {
+        continue;
+      }
+
+      std::vector<float> embedding = embedding_extractor_.Compute(stream.get());
+      if (std::any_of(embedding.begin(), embedding.end(), IsNaNWrapper)) {
+        continue;
+      }
+
+      local_speakers.push_back(s);
+      embeddings.insert(embeddings.end(), embedding.begin(), embedding.end());
+    }
+
+    if (!local_speakers.empty()) {
+      std::vector<int32_t> cluster_labels = clustering_.ClusterIncrementally(
+          embeddings.data(), local_speakers.size(), embedding_extractor_.Dim());
+
+      for (int32_t j = 0; j != static_cast<int32_t>(cluster_labels.size());
+           ++j) {
+        int32_t s = local_speakers[j];
+        int32_t c = cluster_labels[j];
+
+        for (int32_t i = 0; i != num_frames; ++i) {
+          if (label(i, s) == 0) {
+            continue;
+          }
+
+          auto &count = speaker_count_[offset + i];
+          if (static_cast<int32_t>(count.size()) <= c) {
+            count.resize(c + 1);
+          }
+          count[c] += 1;
+        }
+      }
+    }
+
+    num_windows_ += 1;
+
+    // No later window overlaps frames before the start of the next window
+    FinalizeFrames(WindowStartFrame(num_windows_));
+  }
+
+  Matrix2D ProcessChunk(const float *p) const {
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t window_size = meta_data.window_size;
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 3> shape = {1, 1, window_size};
+
+    Ort::Value x =
+        Ort::Value::CreateTensor(memory_info, const_cast<float *>(p),
+                                 window_size, shape.data(), shape.size());
+
+    Ort::Value out = segmentation_model_.Forward(std::move(x));
+    std::vector<int64_t> out_shape = out.GetTensorTypeAndShapeInfo().GetShape();
+    Matrix2D m(out_shape[1], out_shape[2]);
+    std::copy(out.GetTensorData<float>(), out.GetTensorData<float>() + m.size(),
+              &m(0, 0));
+    return m;
+  }
+
+  Matrix2DInt32 ToMultiLabel(const Matrix2D &m) const {
+    int32_t num_rows = m.rows();
+    Matrix2DInt32 ans(num_rows, powerset_mapping_.cols());
+
+    std::ptrdiff_t col_id;
+
+    for (int32_t i = 0; i != num_rows; ++i) {
+      m.row(i).maxCoeff(&col_id);
+      ans.row(i) = powerset_mapping_.row(col_id);
+    }
+
+    return ans;
+  }
+
+  // If there are multiple speakers at a frame, then this frame is excluded.
+  static Matrix2DInt32 ExcludeOverlap(const Matrix2DInt32 &label) {
+    Matrix2DInt32 ans = label;
+
+    for (int32_t i = 0; i != label.rows(); ++i) {
+      if (label.row(i).sum() >= 2) {
+        ans.row(i).setZero();
+      }
+    }
+
+    return ans;
+  }
+
+  // Return a 0-1 vector of size clustering_.NumClusters() for the frame
+  // speaker_count_[index]. See also FinalizeLabels() of the offline version.
+  std::vector<int32_t> GetFrameLabels(int32_t index) const {
+    std::vector<int32_t> ans(clustering_.NumClusters());
+
+    int32_t num_speakers =
+        num_speakers_sum_[index] / (num_windows_per_frame_[index] + 1e-12f) +
+        0.5f;
+
+    const auto &count = speaker_count_[index];
+    num_speakers = std::min<int32_t>(num_speakers, count.size());
+    if (num_speakers <= 0) {
+      return ans;
+    }
+
+    for (int32_t m : TopkIndex(count.data(), count.size(), num_speakers)) {
+      if (count[m] > 0) {
+        ans[m] = 1;
+      }
+    }
+
+    return ans;
+  }
+
+  // Convert frames before end_frame to segments and drop their statistics
+  void FinalizeFrames(int64_t end_frame) {
+    while (first_frame_ < end_frame && !num_speakers_sum_.empty()) {
+      AddFrame(first_frame_, GetFrameLabels(0), &speakers_, &finalized_);
+
+      speaker_count_.pop_front();
+      num_speakers_sum_.pop_front();
+      num_windows_per_frame_.pop_front();
+      first_frame_ += 1;
+    }
+  }
+
+  void AddFrame(int64_t frame, const std::vector<int32_t> &labels,
+                std::vector<SpeakerState> *speakers,
+                std::vector<OfflineSpeakerDiarizationSegment> *out) const {
+    if (speakers->size() < labels.size()) {
+      speakers->resize(labels.size());
+    }
+
+    float t = FrameToSeconds(frame);
+
+    for (int32_t s = 0; s != static_cast<int32_t>(speakers->size()); ++s) {
+      auto &state = (*speakers)[s];
+      bool is_active = s < static_cast<int32_t>(labels.size()) && labels[s];
+
+      if (is_active) {
+        if (state.start_frame == -1) {
+          state.start_frame = frame;
+        }
+        continue;
+      }
+
+      if (state.start_frame != -1) {
+        OfflineSpeakerDiarizationSegment segment(
+            FrameToSeconds(state.start_frame), t, s);
+        AddSegment(segment, &state, out);
+        state.start_frame = -1;
+      }
+
+      // No later segment of this speaker can be merged with it
+      if (state.pending &&
+          state.pending->End() + config_.min_duration_off < t) {
+        EmitSegment(*state.pending, out);
+        state.pending.reset();
+      }
+    }
+  }
+
+  // Close all active regions at last_frame and output all pending segments
+  void FinishSegments(
+      int64_t last_frame, std::vector<SpeakerState> *speakers,
+      std::vector<OfflineSpeakerDiarizationSegment> *out) const {
+    for (int32_t s = 0; s != static_cast<int32_t>(speakers->size()); ++s) {
+      auto &state = (*speakers)[s];
+
+      if (state.start_frame != -1) {
+        float start = FrameToSeconds(state.start_frame);
+        float end = std::max(start, FrameToSeconds(last_frame));
+
+        AddSegment(OfflineSpeakerDiarizationSegment(start, end, s), &state,
+                   out);
+        state.start_frame = -1;
+      }
+
+      if (state.pending) {
+        EmitSegment(*state.pending, out);
+        state.pending.reset();
+      }
+    }
+  }
+
+  // merge segments if the gap between them is less than min_duration_off
+  void AddSegment(const OfflineSpeakerDiarizationSegment &segment,
+                  SpeakerState *state,
+                  std::vector<OfflineSpeakerDiarizationSegment> *out) const {
+    if (state->pending) {
+      auto merged = state->pending->Merge(segment, config_.min_duration_off);
+      if (merged) {
+        state->pending = merged;
+        return;
+      }
+
+      EmitSegment(*state->pending, out);
+    }
+
+    state->pending = segment;
+  }
+
+  void EmitSegment(const OfflineSpeakerDiarizationSegment &segment,
+                   std::vector<OfflineSpeakerDiarizationSegment> *out) const {
+    if (segment.Duration() > config_.min_duration_on) {
+      out->push_back(segment);
+    }
+  }
+
+  OnlineSpeakerDiarizationResult GetResult() {
+    OnlineSpeakerDiarizationResult ans;
+    ans.finalized = std::move(finalized_);
+    finalized_.clear();
+
+    // Segments of frames that are not final are computed on a copy of the
+    // states
+    std::vector<SpeakerState> speakers = speakers_;
+    for (int32_t i = 0; i != static_cast<int32_t>(num_speakers_sum_.size());
+         ++i) {
+      AddFrame(first_frame_ + i, GetFrameLabels(i), &speakers,
+               &ans.provisional);
+    }
+
+    int64_t last_frame =
+        first_frame_ + static_cast<int64_t>(num_speakers_sum_.size()) - 1;
+    FinishSegments(last_frame, &speakers, &ans.provisional);
+
+    auto cmp = [](const OfflineSpeakerDiarizationSegment &a,
+                  const OfflineSpeakerDiarizationSegment &b) {
+      return a.Start() < b.Start();
+    };
+
+    std::sort(ans.finalized.begin(), ans.finalized.end(), cmp);
+    std::sort(ans.provisional.begin(), ans.provisional.end(), cmp);
+
+    return ans;
+  }
+
+ private:
+  OnlineSpeakerDiarizationConfig config_;
+  OfflineSpeakerSegmentationPyannoteModel segmentation_model_;
+  SpeakerEmbeddingExtractor embedding_extractor_;
+  FastClustering clustering_;
+  Matrix2DInt32 powerset_mapping_;
+
+  // Samples starting from the first sample of window num_windows_
+  std::vector<float> buffer_;
+
+  // Number of samples received so far
+  int64_t num_samples_ = 0;
+
+  // Number of windows processed so far
+  int64_t num_windows_ = 0;
+
+  // Index of the first frame that is not final. The following deques
+  // contain statistics for frames starting from first_frame_.
+  int64_t first_frame_ = 0;
+
+  // speaker_count_[i][c] is the number of windows that assign cluster c
+  // to the frame
+  std::deque<std::vector<int32_t>> speaker_count_;
+
+  // Sum of the number of active speakers of the frame over windows
+  std::deque<float> num_speakers_sum_;
+
+  // Number of windows covering the frame
+  std::deque<float> num_windows_per_frame_;
+
+  // States of final frames. speakers_[c] is for cluster c
+  std::vector<SpeakerState> speakers_;
+
+  // Final segments that have not been returned to the user
+  std::vector<OfflineSpeakerDiarizationSegment> finalized_;
+};
+
+}  // namespace sherpa_onnx
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_PYANNOTE_IMPL_H_
@@ -0,0 +1,133 @@
+// sherpa-onnx/csrc/online-speaker-diarization.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/online-speaker-diarization.h"
+
+#include <sstream>
+#include <string>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/online-speaker-diarization-impl.h"
+
+namespace sherpa_onnx {
+
+void OnlineSpeakerDiarizationConfig::Register(ParseOptions *po) {
+  ParseOptions po_segmentation("segmentation", po);
+  segmentation.Register(&po_segmentation);
+
+  ParseOptions po_embedding("embedding", po);
+  embedding.Register(&po_embedding);
+
+  ParseOptions po_clustering("clustering", po);
+  clustering.Register(&po_clustering);
+
+  po->Register("min-duration-on", &min_duration_on,
+               "if a segment is less than this value, then it is discarded. "
+               "Set it to 0 so that no segment is discarded");
+
+  po->Register("min-duration-off", &min_duration_off,
+               "if the gap between to segments of the same speaker is less "
+               "than this value, then these two segments are merged into a "
+               "single segment.");
+}
+
+bool OnlineSpeakerDiarizationConfig::Validate() const {
+  if (!segmentation.Validate()) {
+    return false;
+  }
+
+  if (!embedding.Validate()) {
+    return false;
+  }
+
+  if (!clustering.Validate()) {
+    return false;
+  }
+
+  if (min_duration_on < 0) {
+    SHERPA_ONNX_LOGE("min_duration_on %.3f is negative", min_duration_on);
+    return false;
+  }
+
+  if (min_duration_off < 0) {
+    SHERPA_ONNX_LOGE("min_duration_off %.3f is negative", min_duration_off);
+    return false;
+  }
+
+  return true;
+}
+
+std::string OnlineSpeakerDiarizationConfig::ToString() const {
+  std::ostringstream os;
+
+  os << "OnlineSpeakerDiarizationConfig(";
+  os << "segmentation=" << segmentation.ToString() << ", ";
+  os << "embedding=" << embedding.ToString() << ", ";
+  os << "clustering=" << clustering.ToString() << ", ";
+  os << "min_duration_on=" << min_duration_on << ", ";
+  os << "min_duration_off=" << min_duration_off << ")";
+
+  return os.str();
+}
+
+std::string OnlineSpeakerDiarizationResult::ToString() const {
+  std::ostringstream os;
+
+  for (const auto &s : finalized) {
+    os << s.ToString() << "\n";
+  }
+
+  for (const auto &s : provisional) {
+    os << s.ToString() << " (provisional)\n";
+  }
+
+  return os.str();
+}
+
+OnlineSpeakerDiarization::OnlineSpeakerDiarization(
+    const OnlineSpeakerDiarizationConfig &config)
+    : impl_(OnlineSpeakerDiarizationImpl::Create(config)) {}
+
+template <typename Manager>
+OnlineSpeakerDiarization::OnlineSpeakerDiarization(
+    Manager *mgr, const OnlineSpeakerDiarizationConfig &config)
+    : impl_(OnlineSpeakerDiarizationImpl::Create(mgr, config)) {}
+
+OnlineSpeakerDiarization::~OnlineSpeakerDiarization() = default;
+
+int32_t OnlineSpeakerDiarization::SampleRate() const {
+  return impl_->SampleRate();
+}
+
+OnlineSpeakerDiarizationResult OnlineSpeakerDiarization::AcceptWaveform(
+    const float *audio, int32_t n) {
+  return impl_->AcceptWaveform(audio, n);
+}
+
+OnlineSpeakerDiarizationResult OnlineSpeakerDiarization::Flush() {
+  return impl_->Flush();
+}
+
+void OnlineSpeakerDiarization::Reset() { impl_->Reset(); }
+
+#if __ANDROID_API__ >= 9
+template OnlineSpeakerDiarization::OnlineSpeakerDiarization(
+    AAssetManager *mgr, const OnlineSpeakerDiarizationConfig &config);
+#endif
+
+#if __OHOS__
+template OnlineSpeakerDiarization::OnlineSpeakerDiarization(
+    NativeResourceManager *mgr, const OnlineSpeakerDiarizationConfig &config);
+#endif
+
+}  // namespace sherpa_onnx
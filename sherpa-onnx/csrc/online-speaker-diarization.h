@@ -0,0 +1,119 @@
+// sherpa-onnx/csrc/online-speaker-diarization.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_H_
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "sherpa-onnx/csrc/fast-clustering-config.h"
+#include "sherpa-onnx/csrc/offline-speaker-diarization-result.h"
+#include "sherpa-onnx/csrc/offline-speaker-segmentation-model-config.h"
+#include "sherpa-onnx/csrc/parse-options.h"
+#include "sherpa-onnx/csrc/speaker-embedding-extractor.h"
+
+namespace sherpa_onnx {
+
+struct OnlineSpeakerDiarizationConfig {
+  OfflineSpeakerSegmentationModelConfig segmentation;
+  SpeakerEmbeddingExtractorConfig embedding;
+
+  // Speakers of each window are assigned to the clusters of previous
+  // windows with FastClustering::ClusterIncrementally()
+  FastClusteringConfig clustering;
+
+  // if a segment is less than this value, then it is discarded
+  float min_duration_on = 0.3;  // in seconds
+
+  // if the gap between to segments of the same speaker is less than this value,
+  // then these two segments are merged into a single segment.
+  float min_duration_off = 0.5;  // in seconds
+
+  OnlineSpeakerDiarizationConfig() = default;
+
+  OnlineSpeakerDiarizationConfig(
+      const OfflineSpeakerSegmentationModelConfig &segmentation,
+      const SpeakerEmbeddingExtractorConfig &embedding,
+      const FastClusteringConfig &clustering, float min_duration_on,
+      float min_duration_off)
+      : segmentation(segmentation),
+        embedding(embedding),
+        clustering(clustering),
+        min_duration_on(min_duration_on),
+        min_duration_off(min_duration_off) {}
+
+  void Register(ParseOptions *po);
+  bool Validate() const;
+  std::string ToString() const;
+};
+
+struct OnlineSpeakerDiarizationResult {
+  // Segments that have become final since the last call. They never change
+  // afterwards. Sorted by start time.
+  std::vector<OfflineSpeakerDiarizationSegment> finalized;
+
+  // Segments after the finalized ones. They are computed from the windows
+  // seen so far and may be corrected by later windows, so they replace the
+  // provisional segments returned by the previous call. Sorted by start time.
+  std::vector<OfflineSpeakerDiarizationSegment> provisional;
+
+  std::string ToString() const;
+};
+
+class OnlineSpeakerDiarizationImpl;
+
+// Streaming speaker diarization.
+//
+// Audio is processed with the sliding windows of the segmentation model.
+// Speakers of each window are embedded and assigned to the speakers found
+// so far. A frame is final once no later window overlaps it, so labels are
+// provisional for about one window and then final.
+//
+// Only the last window of audio, the frame statistics of that window and
+// one centroid per speaker are kept, so memory usage does not grow with
+// the length of the session.
+//
+// Create one object per session. It is not thread-safe.
+class OnlineSpeakerDiarization {
+ public:
+  explicit OnlineSpeakerDiarization(
+      const OnlineSpeakerDiarizationConfig &config);
+
+  template <typename Manager>
+  OnlineSpeakerDiarization(Manager *mgr,
+                           const OnlineSpeakerDiarizationConfig &config);
+
+  ~OnlineSpeakerDiarization();
+
+  // Expected sample rate of the input audio samples
+  int32_t SampleRate() const;
+
+  /*
+   * @param audio Audio samples in the range [-1, 1] with SampleRate()
+   * @param n Number of samples. It can be any number.
+   *
+   * Timestamps of the returned segments are relative to the first sample
+   * accepted after construction or the last Flush()/Reset().
+   */
+  OnlineSpeakerDiarizationResult AcceptWaveform(const float *audio,
+                                                int32_t n);
+
+  /*
+   * Process the remaining samples. All segments of the returned result are
+   * final. The object is reset afterwards and can be used for a new session.
+   */
+  OnlineSpeakerDiarizationResult Flush();
+
+  // Discard all buffered samples and all speakers found so far
+  void Reset();
+
+ private:
+  std::unique_ptr<OnlineSpeakerDiarizationImpl> impl_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEAKER_DIARIZATION_H_
@@ -0,0 +1,297 @@
+// sherpa-onnx/csrc/online-speech-denoiser-gtcrn-impl.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <memory>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+#include "kaldi-native-fbank/csrc/feature-window.h"
+#include "kaldi-native-fbank/csrc/rfft.h"
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/offline-speech-denoiser-gtcrn-model.h"
+#include "sherpa-onnx/csrc/online-speech-denoiser-impl.h"
+#include "sherpa-onnx/csrc/online-speech-denoiser.h"
+#include "sherpa-onnx/csrc/resample.h"
+
+namespace sherpa_onnx {
+
+// It computes the STFT frame by frame, runs the stateful GTCRN model on each
+// frame and uses overlap-add to reconstruct the output. Only one STFT window
+// of input and output is buffered.
+//
+// It produces the same output as OfflineSpeechDenoiserGtcrnImpl except for
+// the boundaries of the signal, where zero padding is used instead of
+// reflect padding.
+class OnlineSpeechDenoiserGtcrnImpl : public OnlineSpeechDenoiserImpl {
+ public:
+  explicit OnlineSpeechDenoiserGtcrnImpl(
+      const OnlineSpeechDenoiserConfig &config)
+      : model_(config.model),
+        rfft_(model_.GetMetaData().n_fft),
+        irfft_(model_.GetMetaData().n_fft, true) {
+    Init();
+  }
+
+  template <typename Manager>
+  OnlineSpeechDenoiserGtcrnImpl(Manager *mgr,
+                                const OnlineSpeechDenoiserConfig &config)
+      : model_(mgr, config.model),
+        rfft_(model_.GetMetaData().n_fft),
+        irfft_(model_.GetMetaData().n_fft, true) {
+    Init();
+  }
+
+  DenoisedAudio Run(const float *samples, int32_t n,
+                    int32_t sample_rate) override {
+    const auto &meta = model_.GetMetaData();
+
+    std::vector<float> tmp;
+    if (sample_rate != meta.sample_rate) {
+      if (!resampler_ || resampler_->GetInputSamplingRate() != sample_rate) {
+        SHERPA_ONNX_LOGE(
+            "Creating a resampler:\n"
+            "   in_sample_rate: %d\n"
+            "   output_sample_rate: %d\n",
+            sample_rate, meta.sample_rate);
+
+        float min_freq = std::min<int32_t>(sample_rate, meta.sample_rate);
+        float lowpass_cutoff = 0.99 * 0.5 * min_freq;
+
+        int32_t lowpass_filter_width = 6;
+        resampler_ = std::make_unique<LinearResample>(
+            sample_rate, meta.sample_rate, lowpass_cutoff,
+            lowpass_filter_width);
+      }
+
+      resampler_->Resample(samples, n, false, &tmp);
+      samples = tmp.data();
+      n = tmp.size();
+    }
+
+    AcceptSamples(samples, n);
+
+    DenoisedAudio ans;
+    ans.sample_rate = meta.sample_rate;
+    ProcessBufferedSamples(&ans.samples);
+    return ans;
+  }
+
+  DenoisedAudio Flush() override {
+    const auto &meta = model_.GetMetaData();
+
+    if (resampler_) {
+      std::vector<float> tmp;
+      resampler_->Resample(nullptr, 0, true, &tmp);
+      AcceptSamples(tmp.data(), tmp.size());
+    }
+
+    // padding for the right context, like center=true in torch.stft()
+    input_buffer_.resize(input_buffer_.size() + meta.n_fft / 2);
+
+    DenoisedAudio ans;
+    ans.sample_rate = meta.sample_rate;
+    ProcessBufferedSamples(&ans.samples);
+
+    // Samples in the overlap-add buffer receive no more contributions
+    int64_t num_remaining = num_input_samples_ - num_output_samples_;
+    int32_t n = std::min<int64_t>(meta.n_fft - meta.hop_length,
+                                  std::max<int64_t>(num_remaining, 0));
+    EmitSamples(n, &ans.samples);
+
+    Reset();
+
+    return ans;
+  }
+
+  void Reset() override {
+    const auto &meta = model_.GetMetaData();
+
+    // padding for the left context, like center=true in torch.stft()
+    input_buffer_.assign(meta.n_fft / 2, 0);
+
+    std::fill(ola_buffer_.begin(), ola_buffer_.end(), 0);
+    std::fill(ola_denominator_.begin(), ola_denominator_.end(), 0);
+
+    num_to_skip_ = meta.n_fft / 2;
+    num_input_samples_ = 0;
+    num_output_samples_ = 0;
+
+    states_ = model_.GetInitStates();
+    resampler_.reset();
+  }
+
+  int32_t GetSampleRate() const override {
+    return model_.GetMetaData().sample_rate;
+  }
+
+  int32_t GetFrameShiftInSamples() const override {
+    return model_.GetMetaData().hop_length;
+  }
+
+  int32_t GetLookaheadInSamples() const override {
+    return model_.GetMetaData().n_fft;
+  }
+
+ private:
+  void Init() {
+    const auto &meta = model_.GetMetaData();
+
+    if (meta.window_type == "hann_sqrt") {
+      window_ = knf::GetWindow("hann", meta.window_length);
+      for (auto &w : window_) {
+        w = std::sqrt(w);
+      }
+    } else {
+      window_ = knf::GetWindow(meta.window_type, meta.window_length);
+    }
+
+    if (static_cast<int32_t>(window_.size()) != meta.n_fft) {
+      SHERPA_ONNX_LOGE("window length %d != n_fft %d is not supported",
+                       static_cast<int32_t>(window_.size()), meta.n_fft);
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    ola_buffer_.resize(meta.n_fft);
+    ola_denominator_.resize(meta.n_fft);
+
+    Reset();
+  }
+
+  void AcceptSamples(const float *samples, int32_t n) {
+    input_buffer_.insert(input_buffer_.end(), samples, samples + n);
+    num_input_samples_ += n;
+  }
+
+  void ProcessBufferedSamples(std::vector<float> *out) {
+    const auto &meta = model_.GetMetaData();
+    int32_t n_fft = meta.n_fft;
+    int32_t hop_length = meta.hop_length;
+
+    int32_t start = 0;
+    while (start + n_fft <= static_cast<int32_t>(input_buffer_.size())) {
+      ProcessFrame(input_buffer_.data() + start);
+      EmitSamples(hop_length, out);
+      start += hop_length;
+    }
+
+    input_buffer_.erase(input_buffer_.begin(), input_buffer_.begin() + start);
+  }
+
+  // Run the model on a single frame of n_fft samples and overlap-add
+  // the result into ola_buffer_.
+  void ProcessFrame(const float *p) {
+    const auto &meta = model_.GetMetaData();
+    int32_t n_fft = meta.n_fft;
+    int32_t num_bins = n_fft / 2 + 1;
+
+    std::vector<float> frame(p, p + n_fft);
+    for (int32_t i = 0; i < n_fft; ++i) {
+      frame[i] *= window_[i];
+    }
+
+    // See the comments of knf::Rfft for the layout of frame
+    rfft_.Compute(frame.data());
+
+    std::vector<float> x(num_bins * 2);
+    x[0] = frame[0];
+    x[2 * (num_bins - 1)] = frame[1];
+    for (int32_t i = 1; i < num_bins - 1; ++i) {
+      x[2 * i] = frame[2 * i];
+      x[2 * i + 1] = frame[2 * i + 1];
+    }
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 4> x_shape{1, num_bins, 1, 2};
+    Ort::Value x_tensor = Ort::Value::CreateTensor(
+        memory_info, x.data(), x.size(), x_shape.data(), x_shape.size());
+
+    Ort::Value output{nullptr};
+    OfflineSpeechDenoiserGtcrnModel::States next_states;
+    std::tie(output, next_states) =
+        model_.Run(std::move(x_tensor), std::move(states_));
+    states_ = std::move(next_states);
+
+    const float *y = output.GetTensorData<float>();
+    frame[0] = y[0];
+    frame[1] = y[2 * (num_bins - 1)];
+    for (int32_t i = 1; i < num_bins - 1; ++i) {
+      frame[2 * i] = y[2 * i];
+      frame[2 * i + 1] = y[2 * i + 1];
+    }
+
+    irfft_.Compute(frame.data());
+
+    float scale = 1.0f / n_fft;
+    for (int32_t i = 0; i < n_fft; ++i) {
+      float w = window_[i];
+      ola_buffer_[i] += frame[i] * scale * w;
+      ola_denominator_[i] += w * w;
+    }
+  }
+
+  // Move the first n samples of the overlap-add buffer to out
+  void EmitSamples(int32_t n, std::vector<float> *out) {
+    int32_t n_fft = model_.GetMetaData().n_fft;
+
+    for (int32_t i = 0; i < n; ++i) {
+      if (num_to_skip_ > 0) {
+        --num_to_skip_;
+        continue;
+      }
+
+      float s = ola_buffer_[i];
+      if (ola_denominator_[i]) {
+        s /= ola_denominator_[i];
+      }
+      out->push_back(s);
+      ++num_output_samples_;
+    }
+
+    std::copy(ola_buffer_.begin() + n, ola_buffer_.end(), ola_buffer_.begin());
+    std::fill(ola_buffer_.begin() + n_fft - n, ola_buffer_.end(), 0);
+
+    std::copy(ola_denominator_.begin() + n, ola_denominator_.end(),
+              ola_denominator_.begin());
+    std::fill(ola_denominator_.begin() + n_fft - n, ola_denominator_.end(), 0);
+  }
+
+ private:
+  OfflineSpeechDenoiserGtcrnModel model_;
+  knf::Rfft rfft_;
+  knf::Rfft irfft_;
+
+  std::vector<float> window_;
+
+  OfflineSpeechDenoiserGtcrnModel::States states_;
+
+  // samples that have not been consumed by a full frame yet
+  std::vector<float> input_buffer_;
+
+  // overlap-add buffer of size n_fft
+  std::vector<float> ola_buffer_;
+
+  // sum of squared windows of the overlapping frames, of size n_fft
+  std::vector<float> ola_denominator_;
+
+  // number of output samples to drop due to the left padding
+  int32_t num_to_skip_ = 0;
+
+  int64_t num_input_samples_ = 0;
+  int64_t num_output_samples_ = 0;
+
+  std::unique_ptr<LinearResample> resampler_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
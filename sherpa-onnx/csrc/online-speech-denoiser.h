@@ -0,0 +1,95 @@
+// sherpa-onnx/csrc/online-speech-denoiser.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
+
+#include <memory>
+#include <string>
+
+#include "sherpa-onnx/csrc/offline-speech-denoiser-model-config.h"
+#include "sherpa-onnx/csrc/offline-speech-denoiser.h"
+#include "sherpa-onnx/csrc/parse-options.h"
+
+namespace sherpa_onnx {
+
+struct OnlineSpeechDenoiserConfig {
+  // The streaming denoiser reuses the models of the non-streaming one
+  OfflineSpeechDenoiserModelConfig model;
+
+  OnlineSpeechDenoiserConfig() = default;
+
+  explicit OnlineSpeechDenoiserConfig(
+      const OfflineSpeechDenoiserModelConfig &model)
+      : model(model) {}
+
+  void Register(ParseOptions *po);
+  bool Validate() const;
+
+  std::string ToString() const;
+};
+
+class OnlineSpeechDenoiserImpl;
+
+// Streaming speech denoiser.
+//
+// Each object keeps its own model states and only buffers about one STFT
+// window of audio, so memory usage does not grow with the input length.
+// Create one object per audio stream.
+class OnlineSpeechDenoiser {
+ public:
+  explicit OnlineSpeechDenoiser(const OnlineSpeechDenoiserConfig &config);
+  ~OnlineSpeechDenoiser();
+
+  template <typename Manager>
+  OnlineSpeechDenoiser(Manager *mgr, const OnlineSpeechDenoiserConfig &config);
+
+  /*
+   * @param samples 1-D array of audio samples. Each sample is in the
+   *                range [-1, 1]. It can contain any number of samples.
+   * @param n Number of samples
+   * @param sample_rate Sample rate of the input samples. It must not change
+   *                    until Flush() or Reset() is called.
+   *
+   * @return Return the denoised samples that are ready. The number of
+   *         returned samples is not necessarily equal to n since the model
+   *         needs some lookahead; see GetLookaheadInSamples().
+   */
+  DenoisedAudio Run(const float *samples, int32_t n, int32_t sample_rate);
+
+  /*
+   * Process the remaining buffered samples and return them. It also
+   * resets the internal states so that the object can be used for a new
+   * stream.
+   */
+  DenoisedAudio Flush();
+
+  /*
+   * Discard all buffered samples and reset the model states.
+   */
+  void Reset();
+
+  /*
+   * Return the sample rate of the denoised audio
+   */
+  int32_t GetSampleRate() const;
+
+  /*
+   * Return the number of output samples produced per model invocation
+   */
+  int32_t GetFrameShiftInSamples() const;
+
+  /*
+   * Return an upper bound of the number of input samples (at the model
+   * sample rate) that are buffered before the corresponding output is
+   * returned. It does not include the delay of the resampler.
+   */
+  int32_t GetLookaheadInSamples() const;
+
+ private:
+  std::unique_ptr<OnlineSpeechDenoiserImpl> impl_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
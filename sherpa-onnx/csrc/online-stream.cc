@@ -4,6 +4,7 @@
 #include "sherpa-onnx/csrc/online-stream.h"
 
 #include <memory>
+#include <string>
 #include <utility>
 #include <vector>
 
@@ -23,6 +24,12 @@ class OnlineStream::Impl {
     feat_extractor_.AcceptWaveform(sampling_rate, waveform, n);
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    feat_extractor_.AcceptWaveform(sampling_rate, waveform, n);
+  }
+
   void InputFinished() const {
     std::lock_guard<std::mutex> lock(mutex_);
     feat_extractor_.InputFinished();
@@ -116,6 +123,14 @@ class OnlineStream::Impl {
 
   const ContextGraphPtr &GetContextGraph() const { return context_graph_; }
 
+  void SetContextGraph(ContextGraphPtr context_graph) {
+    context_graph_ = std::move(context_graph);
+  }
+
+  void SetKeywordSetId(const std::string &id) { keyword_set_id_ = id; }
+
+  const std::string &GetKeywordSetId() const { return keyword_set_id_; }
+
   std::vector<float> &GetParaformerFeatCache() {
     return paraformer_feat_cache_;
   }
@@ -145,6 +160,7 @@ class OnlineStream::Impl {
   mutable std::mutex mutex_;
   /// For contextual-biasing
   ContextGraphPtr context_graph_;
+  std::string keyword_set_id_;
   int32_t num_processed_frames_ = 0;  // before subsampling
   int32_t start_frame_index_ = 0;     // never reset
   int32_t segment_ = 0;
@@ -174,6 +190,11 @@ void OnlineStream::AcceptWaveform(int32_t sampling_rate, const float *waveform,
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void OnlineStream::AcceptWaveform(int32_t sampling_rate,
+                                  const int16_t *waveform, int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 void OnlineStream::InputFinished() const { impl_->InputFinished(); }
 
 int32_t OnlineStream::NumFramesReady() const { return impl_->NumFramesReady(); }
@@ -257,6 +278,18 @@ const ContextGraphPtr &OnlineStream::GetContextGraph() const {
   return impl_->GetContextGraph();
 }
 
+void OnlineStream::SetContextGraph(ContextGraphPtr context_graph) {
+  impl_->SetContextGraph(std::move(context_graph));
+}
+
+void OnlineStream::SetKeywordSetId(const std::string &id) {
+  impl_->SetKeywordSetId(id);
+}
+
+const std::string &OnlineStream::GetKeywordSetId() const {
+  return impl_->GetKeywordSetId();
+}
+
 void OnlineStream::SetFasterDecoder(
     std::unique_ptr<kaldi_decoder::FasterDecoder> decoder) {
   impl_->SetFasterDecoder(std::move(decoder));
@@ -6,6 +6,7 @@
 #define SHERPA_ONNX_CSRC_ONLINE_STREAM_H_
 
 #include <memory>
+#include <string>
 #include <vector>
 
 #include "kaldi-decoder/csrc/faster-decoder.h"
@@ -37,6 +38,15 @@ class OnlineStream {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that samples are 16-bit integers in the
+     range [-32768, 32767], e.g., read from a 16-bit wave file or received
+     from a socket. They are converted to float in a single pass with the
+     scale expected by the feature extractor.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /**
    * InputFinished() tells the class you won't be providing any
    * more waveform.  This will help flush out the last frame or two
@@ -101,6 +111,17 @@ class OnlineStream {
    */
   const ContextGraphPtr &GetContextGraph() const;
 
+  /**
+   * Replace the context graph of this stream. Decoding results that refer
+   * to states of the previous graph must be reset by the caller.
+   */
+  void SetContextGraph(ContextGraphPtr context_graph);
+
+  // for keyword spotting with named keyword sets.
+  // It is empty if the stream does not use a keyword set.
+  void SetKeywordSetId(const std::string &id);
+  const std::string &GetKeywordSetId() const;
+
   // for online ctc decoder
   void SetFasterDecoder(std::unique_ptr<kaldi_decoder::FasterDecoder> decoder);
   kaldi_decoder::FasterDecoder *GetFasterDecoder() const;
@@ -0,0 +1,163 @@
+// sherpa-onnx/csrc/phrase-matcher-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/phrase-matcher.h"
+
+#include <chrono>  // NOLINT
+#include <random>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/macros.h"
+
+namespace sherpa_onnx {
+
+static std::vector<std::string> Match(const PhraseMatcher &matcher) {
+  return {matcher.begin(), matcher.end()};
+}
+
+TEST(PhraseTrie, Basic) {
+  PhraseTrie trie({"ab", "abc", "b", "ab"});
+
+  int32_t node = trie.Next(PhraseTrie::kRoot, "a");
+  ASSERT_NE(node, -1);
+  EXPECT_FALSE(trie.IsWord(node));
+
+  node = trie.Next(node, "b");
+  ASSERT_NE(node, -1);
+  EXPECT_TRUE(trie.IsWord(node));
+
+  EXPECT_TRUE(trie.IsWord(trie.Next(PhraseTrie::kRoot, "abc")));
+  EXPECT_TRUE(trie.IsWord(trie.Next(PhraseTrie::kRoot, "b")));
+  EXPECT_EQ(trie.Next(PhraseTrie::kRoot, "abcd"), -1);
+  EXPECT_EQ(trie.Next(PhraseTrie::kRoot, "c"), -1);
+
+  // root, a, ab, abc, b
+  EXPECT_EQ(trie.NumNodes(), 5);
+}
+
+TEST(PhraseMatcher, TrieAndSetGiveTheSameResult) {
+  std::vector<std::string> lexicon = {"中国", "中国人", "人民", "银行",
+                                      "中国人民银行", "hello", "helloworld"};
+  std::unordered_set<std::string> set(lexicon.begin(), lexicon.end());
+  PhraseTrie trie(lexicon);
+
+  std::vector<std::string> words = {"中", "国", "人", "民", "银", "行",
+                                    "，", "hello", "world", "中", "国", "人"};
+
+  auto expected = Match(PhraseMatcher(&set, words));
+  EXPECT_EQ(expected, (std::vector<std::string>{"中国人民银行", "，",
+                                                "helloworld", "中国人"}));
+
+  EXPECT_EQ(Match(PhraseMatcher(&trie, words)), expected);
+
+  // The longest phrase can contain at most 3 words
+  EXPECT_EQ(Match(PhraseMatcher(&trie, words, false, 3)),
+            Match(PhraseMatcher(&set, words, false, 3)));
+
+  std::mt19937 mt(20250101);
+  std::uniform_int_distribution<int32_t> dist(0, words.size() - 1);
+  for (int32_t n = 0; n != 100; ++n) {
+    std::vector<std::string> random_words(n);
+    for (auto &w : random_words) {
+      w = words[dist(mt)];
+    }
+
+    EXPECT_EQ(Match(PhraseMatcher(&trie, random_words)),
+              Match(PhraseMatcher(&set, random_words)));
+  }
+}
+
+TEST(PhraseMatcher, Benchmark) {
+  std::mt19937 mt(20250101);
+
+  // 2000 CJK characters
+  std::vector<std::string> chars;
+  for (char32_t c = 0x4e00; c != 0x4e00 + 2000; ++c) {
+    std::string s;
+    s.push_back(static_cast<char>(0xe0 | (c >> 12)));
+    s.push_back(static_cast<char>(0x80 | ((c >> 6) & 0x3f)));
+    s.push_back(static_cast<char>(0x80 | (c & 0x3f)));
+    chars.push_back(std::move(s));
+  }
+
+  std::uniform_int_distribution<int32_t> char_dist(0, chars.size() - 1);
+  std::uniform_int_distribution<int32_t> len_dist(2, 4);
+
+  std::vector<std::string> lexicon;
+  for (int32_t i = 0; i != 100000; ++i) {
+    std::string w;
+    int32_t len = len_dist(mt);
+    for (int32_t k = 0; k != len; ++k) {
+      w += chars[char_dist(mt)];
+    }
+    lexicon.push_back(std::move(w));
+  }
+
+  // Sentences with 30 characters. Half of them are from the lexicon.
+  std::uniform_int_distribution<int32_t> word_dist(0, lexicon.size() - 1);
+  std::vector<std::vector<std::string>> sentences(1000);
+  for (auto &s : sentences) {
+    while (s.size() < 30) {
+      if (mt() % 2) {
+        s.push_back(chars[char_dist(mt)]);
+      } else {
+        const auto &w = lexicon[word_dist(mt)];
+        for (size_t k = 0; k < w.size(); k += 3) {
+          s.push_back(w.substr(k, 3));
+        }
+      }
+    }
+  }
+
+  auto start = std::chrono::steady_clock::now();
+  std::unordered_set<std::string> set(lexicon.begin(), lexicon.end());
+  auto stop = std::chrono::steady_clock::now();
+  int32_t set_build_us =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start)
+          .count();
+
+  start = std::chrono::steady_clock::now();
+  PhraseTrie trie(lexicon);
+  stop = std::chrono::steady_clock::now();
+  int32_t trie_build_us =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start)
+          .count();
+
+  SHERPA_ONNX_LOGE(
+      "Build with %d words: unordered_set %d us, trie %d us (%d nodes)",
+      static_cast<int32_t>(lexicon.size()), set_build_us, trie_build_us,
+      trie.NumNodes());
+
+  int32_t num_phrases = 0;
+  start = std::chrono::steady_clock::now();
+  for (const auto &s : sentences) {
+    PhraseMatcher matcher(&set, s);
+    num_phrases += matcher.end() - matcher.begin();
+  }
+  stop = std::chrono::steady_clock::now();
+  int32_t set_us =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start)
+          .count();
+
+  int32_t num_phrases_trie = 0;
+  start = std::chrono::steady_clock::now();
+  for (const auto &s : sentences) {
+    PhraseMatcher matcher(&trie, s);
+    num_phrases_trie += matcher.end() - matcher.begin();
+  }
+  stop = std::chrono::steady_clock::now();
+  int32_t trie_us =
+      std::chrono::duration_cast<std::chrono::microseconds>(stop - start)
+          .count();
+
+  EXPECT_EQ(num_phrases, num_phrases_trie);
+
+  SHERPA_ONNX_LOGE("Match %d sentences: unordered_set %d us, trie %d us",
+                   static_cast<int32_t>(sentences.size()), set_us, trie_us);
+}
+
+}  // namespace sherpa_onnx
@@ -5,18 +5,105 @@
 
 #include <algorithm>
 #include <sstream>
+#include <string>
 #include <utility>
+#include <vector>
 
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/text-utils.h"
 
 namespace sherpa_onnx {
+
+PhraseTrie::PhraseTrie(std::vector<std::string> words) {
+  // std::string compares bytes as unsigned char, so words sharing a prefix
+  // are adjacent and the bytes following the prefix are in ascending order
+  std::sort(words.begin(), words.end());
+  words.erase(std::unique(words.begin(), words.end()), words.end());
+
+  // Node i contains words[begin, end), which share a prefix of length depth
+  struct Node {
+    int32_t begin;
+    int32_t end;
+    int32_t depth;
+  };
+
+  std::vector<Node> nodes;
+  nodes.push_back({0, static_cast<int32_t>(words.size()), 0});
+  is_word_.push_back(false);
+
+  // Nodes are numbered in breadth-first order, so the children of a node
+  // have consecutive arc indexes
+  for (int32_t i = 0; i != static_cast<int32_t>(nodes.size()); ++i) {
+    Node node = nodes[i];
+    offsets_.push_back(labels_.size());
+
+    int32_t k = node.begin;
+
+    // Skip the word that ends at this node. It is the first one.
+    while (k < node.end &&
+           static_cast<int32_t>(words[k].size()) == node.depth) {
+      ++k;
+    }
+
+    while (k < node.end) {
+      auto c = static_cast<uint8_t>(words[k][node.depth]);
+      int32_t e = k + 1;
+      while (e < node.end && static_cast<uint8_t>(words[e][node.depth]) == c) {
+        ++e;
+      }
+
+      labels_.push_back(c);
+      targets_.push_back(nodes.size());
+
+      nodes.push_back({k, e, node.depth + 1});
+      is_word_.push_back(static_cast<int32_t>(words[k].size()) ==
+                         node.depth + 1);
+
+      k = e;
+    }
+  }
+
+  offsets_.push_back(labels_.size());
+}
+
+int32_t PhraseTrie::Next(int32_t node, const std::string &s) const {
+  for (char c : s) {
+    auto label = static_cast<uint8_t>(c);
+    auto begin = labels_.begin() + offsets_[node];
+    auto end = labels_.begin() + offsets_[node + 1];
+
+    auto it = std::lower_bound(begin, end, label);
+    if (it == end || *it != label) {
+      return -1;
+    }
+
+    node = targets_[it - labels_.begin()];
+  }
+
+  return node;
+}
+
 class PhraseMatcher::Impl {
  public:
   Impl(const std::unordered_set<std::string> *lexicon,
        const std::vector<std::string> &words, bool debug,
        int32_t max_search_len)
       : lexicon_(lexicon), max_search_len_(max_search_len), debug_(debug) {
+    Init(words);
+  }
+
+  Impl(const PhraseTrie *trie, const std::vector<std::string> &words,
+       bool debug, int32_t max_search_len)
+      : trie_(trie), max_search_len_(max_search_len), debug_(debug) {
+    Init(words);
+  }
+
+  auto begin() const { return phrases_.begin(); }
+
+  auto end() const { return phrases_.end(); }
+
+ private:
+  void Init(const std::vector<std::string> &words) {
     if (max_search_len_ < 1) {
       max_search_len_ = 1;
     }
@@ -28,7 +115,11 @@ class PhraseMatcher::Impl {
 #endif
     }
 
-    Build(words);
+    if (trie_) {
+      BuildWithTrie(words);
+    } else {
+      Build(words);
+    }
 
     if (debug_) {
       std::ostringstream os;
@@ -47,11 +138,6 @@ class PhraseMatcher::Impl {
     }
   }
 
-  auto begin() const { return phrases_.begin(); }
-
-  auto end() const { return phrases_.end(); }
-
- private:
   void Build(const std::vector<std::string> &words) {
     int32_t num_words = static_cast<int32_t>(words.size());
     for (int32_t i = 0; i < num_words;) {
@@ -105,9 +191,49 @@ class PhraseMatcher::Impl {
     }
   }
 
+  void BuildWithTrie(const std::vector<std::string> &words) {
+    int32_t num_words = static_cast<int32_t>(words.size());
+    for (int32_t i = 0; i < num_words;) {
+      int32_t start = i;
+      int32_t last = std::min(i + max_search_len_ - 1, num_words - 1);
+
+      // Find the longest span [start, end] with end > start that is in
+      // the lexicon. If there is none, end is start.
+      int32_t end = start;
+      int32_t node = trie_->Next(PhraseTrie::kRoot, words[start]);
+      for (int32_t k = start + 1; k <= last && node != -1; ++k) {
+        node = trie_->Next(node, words[k]);
+        if (node != -1 && trie_->IsWord(node)) {
+          end = k;
+        }
+      }
+
+      std::string w = words[start];
+      for (int32_t k = start + 1; k <= end; ++k) {
+        w += words[k];
+      }
+
+      if (debug_) {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("%{public}s %{public}d-%{public}d: %{public}s",
+                         end > start ? "matched" : "single word", start, end,
+                         w.c_str());
+#else
+        SHERPA_ONNX_LOGE("%s %d-%d: %s",
+                         end > start ? "matched" : "single word", start, end,
+                         w.c_str());
+#endif
+      }
+
+      i = end + 1;
+      phrases_.push_back(std::move(w));
+    }
+  }
+
  private:
   std::vector<std::string> phrases_;
-  const std::unordered_set<std::string> *lexicon_;
+  const std::unordered_set<std::string> *lexicon_ = nullptr;
+  const PhraseTrie *trie_ = nullptr;
   int32_t max_search_len_;
   bool debug_;
 };
@@ -118,6 +244,12 @@ PhraseMatcher::PhraseMatcher(const std::unordered_set<std::string> *lexicon,
                              int32_t max_search_len /*= 10*/)
     : impl_(std::make_unique<Impl>(lexicon, words, debug, max_search_len)) {}
 
+PhraseMatcher::PhraseMatcher(const PhraseTrie *trie,
+                             const std::vector<std::string> &words,
+                             bool debug /*= false*/,
+                             int32_t max_search_len /*= 10*/)
+    : impl_(std::make_unique<Impl>(trie, words, debug, max_search_len)) {}
+
 PhraseMatcher::~PhraseMatcher() = default;
 
 std::vector<std::string>::const_iterator PhraseMatcher::begin() const {
@@ -12,6 +12,36 @@
 
 namespace sherpa_onnx {
 
+// A byte-level trie of the words in a lexicon, kept in flat arrays.
+//
+// With it, PhraseMatcher finds the longest phrase starting at a word by
+// walking the trie word by word, instead of looking up the concatenation
+// of every candidate span in an unordered_set.
+class PhraseTrie {
+ public:
+  explicit PhraseTrie(std::vector<std::string> words);
+
+  static constexpr int32_t kRoot = 0;
+
+  // Return the node reached from the given node after consuming s.
+  // Return -1 if there is no such node.
+  int32_t Next(int32_t node, const std::string &s) const;
+
+  // Return true if the path from the root to this node is a word
+  bool IsWord(int32_t node) const { return is_word_[node]; }
+
+  int32_t NumNodes() const { return is_word_.size(); }
+
+ private:
+  // The labels of the arcs leaving node i are
+  // labels_[offsets_[i]], ..., labels_[offsets_[i+1] - 1] in ascending order.
+  // targets_ contains the corresponding next nodes.
+  std::vector<int32_t> offsets_;
+  std::vector<uint8_t> labels_;
+  std::vector<int32_t> targets_;
+  std::vector<bool> is_word_;
+};
+
 class PhraseMatcher {
  public:
   PhraseMatcher(const std::unordered_set<std::string>
@@ -19,6 +49,12 @@ class PhraseMatcher {
                                // should live longer than this instance
                 const std::vector<std::string> &words, bool debug = false,
                 int32_t max_search_len = 10);
+
+  // Same as the above one, but it uses a trie of the lexicon, which is
+  // faster. The passed trie should live longer than this instance.
+  PhraseMatcher(const PhraseTrie *trie, const std::vector<std::string> &words,
+                bool debug = false, int32_t max_search_len = 10);
+
   ~PhraseMatcher();
 
   std::vector<std::string>::const_iterator begin() const;
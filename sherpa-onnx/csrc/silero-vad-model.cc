@@ -4,6 +4,8 @@
 
 #include "sherpa-onnx/csrc/silero-vad-model.h"
 
+#include <algorithm>
+#include <array>
 #include <string>
 #include <utility>
 #include <vector>
@@ -180,7 +182,105 @@ class SileroVadModel::Impl {
     config_.silero_vad.threshold = threshold;
   }
 
+  int32_t StateDim() const {
+    return is_v5_ ? kNumLayers * kHiddenDimV5 : 2 * kNumLayers * kHiddenDimV4;
+  }
+
+  void RunBatch(const float *samples, int32_t batch_size, float *states,
+                float *probs) {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    int32_t n = WindowSize();
+    std::array<int64_t, 2> x_shape = {batch_size, n};
+
+    Ort::Value x = Ort::Value::CreateTensor(
+        memory_info, const_cast<float *>(samples), batch_size * n,
+        x_shape.data(), x_shape.size());
+
+    int64_t sr_shape = 1;
+    Ort::Value sr =
+        Ort::Value::CreateTensor(memory_info, &sample_rate_, 1, &sr_shape, 1);
+
+    // Model states use the layout (num_layers, batch_size, hidden_dim),
+    // while the states of a stream are stored in a row of `states`.
+    int32_t hidden_dim = is_v5_ ? kHiddenDimV5 : kHiddenDimV4;
+    int32_t num_tensors = is_v5_ ? 1 : 2;
+    int32_t tensor_size = kNumLayers * batch_size * hidden_dim;
+
+    std::array<int64_t, 3> s_shape = {kNumLayers, batch_size, hidden_dim};
+    std::vector<float> s(num_tensors * tensor_size);
+    GatherStates(states, batch_size, hidden_dim, num_tensors, s.data());
+
+    std::vector<Ort::Value> inputs;
+    inputs.reserve(input_names_.size());
+
+    inputs.push_back(std::move(x));
+    if (is_v5_) {
+      inputs.push_back(Ort::Value::CreateTensor(
+          memory_info, s.data(), tensor_size, s_shape.data(), s_shape.size()));
+      inputs.push_back(std::move(sr));
+    } else {
+      if (input_names_.size() == 4) {
+        inputs.push_back(std::move(sr));
+      }
+
+      for (int32_t t = 0; t != num_tensors; ++t) {
+        inputs.push_back(Ort::Value::CreateTensor(
+            memory_info, s.data() + t * tensor_size, tensor_size,
+            s_shape.data(), s_shape.size()));
+      }
+    }
+
+    auto out =
+        sess_->Run({}, input_names_ptr_.data(), inputs.data(), inputs.size(),
+                   output_names_ptr_.data(), output_names_ptr_.size());
+
+    for (int32_t t = 0; t != num_tensors; ++t) {
+      const float *p = out[1 + t].GetTensorData<float>();
+      std::copy(p, p + tensor_size, s.data() + t * tensor_size);
+    }
+    ScatterStates(s.data(), batch_size, hidden_dim, num_tensors, states);
+
+    const float *p = out[0].GetTensorData<float>();
+    std::copy(p, p + batch_size, probs);
+  }
+
  private:
+  // (batch_size, num_tensors, kNumLayers, hidden_dim)
+  // -> (num_tensors, kNumLayers, batch_size, hidden_dim)
+  static void GatherStates(const float *src, int32_t batch_size,
+                           int32_t hidden_dim, int32_t num_tensors,
+                           float *dst) {
+    int32_t state_dim = num_tensors * kNumLayers * hidden_dim;
+    for (int32_t t = 0; t != num_tensors; ++t) {
+      for (int32_t l = 0; l != kNumLayers; ++l) {
+        for (int32_t b = 0; b != batch_size; ++b) {
+          const float *p =
+              src + b * state_dim + (t * kNumLayers + l) * hidden_dim;
+          std::copy(p, p + hidden_dim, dst);
+          dst += hidden_dim;
+        }
+      }
+    }
+  }
+
+  // The inverse of GatherStates()
+  static void ScatterStates(const float *src, int32_t batch_size,
+                            int32_t hidden_dim, int32_t num_tensors,
+                            float *dst) {
+    int32_t state_dim = num_tensors * kNumLayers * hidden_dim;
+    for (int32_t t = 0; t != num_tensors; ++t) {
+      for (int32_t l = 0; l != kNumLayers; ++l) {
+        for (int32_t b = 0; b != batch_size; ++b) {
+          std::copy(src, src + hidden_dim,
+                    dst + b * state_dim + (t * kNumLayers + l) * hidden_dim);
+          src += hidden_dim;
+        }
+      }
+    }
+  }
+
   void Init(void *model_data, size_t model_data_length) {
     sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
                                            sess_opts_);
@@ -213,6 +313,10 @@ class SileroVadModel::Impl {
     Reset();
   }
 
+  static constexpr int32_t kNumLayers = 2;
+  static constexpr int32_t kHiddenDimV4 = 64;
+  static constexpr int32_t kHiddenDimV5 = 128;
+
   void ResetV5() {
     // 2 - number of LSTM layer
     // 1 - batch size
@@ -500,6 +604,13 @@ float SileroVadModel::Compute(const float *samples, int32_t n) {
   return impl_->Run(samples, n);
 }
 
+int32_t SileroVadModel::StateDim() const { return impl_->StateDim(); }
+
+void SileroVadModel::ComputeBatch(const float *samples, int32_t batch_size,
+                                  float *states, float *probs) {
+  impl_->RunBatch(samples, batch_size, states, probs);
+}
+
 #if __ANDROID_API__ >= 9
 template SileroVadModel::SileroVadModel(AAssetManager *mgr,
                                         const VadModelConfig &config);
@@ -47,6 +47,13 @@ class SileroVadModel : public VadModel {
   void SetMinSilenceDuration(float s) override;
   void SetThreshold(float threshold) override;
 
+  // For silero vad V4, it is 2*2*64 (h and c of 2 LSTM layers).
+  // For silero vad V5, it is 2*128
+  int32_t StateDim() const override;
+
+  void ComputeBatch(const float *samples, int32_t batch_size, float *states,
+                    float *probs) override;
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
@@ -81,6 +81,27 @@ bool SpeakerEmbeddingExtractor::IsReady(OnlineStream *s) const {
   return impl_->IsReady(s);
 }
 
+void SpeakerEmbeddingExtractor::Warmup(
+    const std::vector<float> &lengths /*= {1.0, 5.0}*/) const {
+  // The stream resamples it if the model uses a different sample rate
+  int32_t sample_rate = 16000;
+
+  for (float length : lengths) {
+    std::vector<float> samples(static_cast<int32_t>(length * sample_rate));
+    if (samples.empty()) {
+      continue;
+    }
+
+    auto s = CreateStream();
+    s->AcceptWaveform(sample_rate, samples.data(), samples.size());
+    s->InputFinished();
+
+    if (IsReady(s.get())) {
+      Compute(s.get());
+    }
+  }
+}
+
 std::vector<float> SpeakerEmbeddingExtractor::Compute(OnlineStream *s) const {
   return impl_->Compute(s);
 }
@@ -62,6 +62,13 @@ class SpeakerEmbeddingExtractor {
   // You have to ensure IsReady(s) returns true before you call this method.
   std::vector<float> Compute(OnlineStream *s) const;
 
+  // Compute embeddings of silence so that onnxruntime allocates memory and
+  // selects kernels before the first request.
+  //
+  // @param lengths Duration in seconds of each piece of silence. They should
+  //                cover the typical lengths of the inputs.
+  void Warmup(const std::vector<float> &lengths = {1.0, 5.0}) const;
+
  private:
   std::unique_ptr<SpeakerEmbeddingExtractorImpl> impl_;
 };
@@ -6,6 +6,7 @@
 
 #include <memory>
 #include <string>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -31,6 +32,9 @@ class SpokenLanguageIdentificationImpl {
   virtual std::unique_ptr<OfflineStream> CreateStream() const = 0;
 
   virtual std::string Compute(OfflineStream *s) const = 0;
+
+  virtual std::vector<SpokenLanguageIdentificationResult> ComputeBatch(
+      OfflineStream **ss, int32_t n, int32_t top_k) const = 0;
 };
 
 }  // namespace sherpa_onnx
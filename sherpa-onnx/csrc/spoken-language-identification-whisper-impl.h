@@ -6,7 +6,10 @@
 #define SHERPA_ONNX_CSRC_SPOKEN_LANGUAGE_IDENTIFICATION_WHISPER_IMPL_H_
 
 #include <algorithm>
+#include <array>
+#include <cmath>
 #include <memory>
+#include <numeric>
 #include <string>
 #include <utility>
 #include <vector>
@@ -45,23 +48,39 @@ class SpokenLanguageIdentificationWhisperImpl
   }
 
   std::string Compute(OfflineStream *s) const override {
+    return ComputeBatch(&s, 1, 1)[0].lang;
+  }
+
+  std::vector<SpokenLanguageIdentificationResult> ComputeBatch(
+      OfflineStream **ss, int32_t n, int32_t top_k) const override {
+    std::vector<SpokenLanguageIdentificationResult> ans(n);
+    if (n <= 0) {
+      return ans;
+    }
+
     int32_t max_num_frames = 3000;
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    int32_t feat_dim = s->FeatureDim();
-    std::vector<float> f = s->GetFrames();
-    int32_t num_frames = f.size() / feat_dim;
+    int32_t feat_dim = ss[0]->FeatureDim();
 
-    // we use 50 here so that there will be some zero tail paddings
-    if (num_frames >= max_num_frames - 50) {
-      SHERPA_ONNX_LOGE(
-          "Only waves less than 30 seconds are supported. We process only the "
-          "first 30 seconds and discard the remaining data");
-      num_frames = max_num_frames - 50;
-    }
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
+    int32_t max_frames_in_batch = 0;
+
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = ss[i]->GetFrames();
+      num_frames[i] = features[i].size() / feat_dim;
+
+      // we use 50 here so that there will be some zero tail paddings
+      if (num_frames[i] >= max_num_frames - 50) {
+        SHERPA_ONNX_LOGE(
+            "Only waves less than 30 seconds are supported. We process only "
+            "the first 30 seconds and discard the remaining data");
+        num_frames[i] = max_num_frames - 50;
+      }
 
-    model_->NormalizeFeatures(f.data(), num_frames, feat_dim);
+      model_->NormalizeFeatures(features[i].data(), num_frames[i], feat_dim);
+      max_frames_in_batch = std::max(max_frames_in_batch, num_frames[i]);
+    }
 
     // note that 1000 is an experience-value.
     // You can replace 1000 by other values, say, 100.
@@ -74,32 +93,37 @@ class SpokenLanguageIdentificationWhisperImpl
       tail_padding_frames = config_.whisper.tail_paddings;
     }
 
+    // All streams in a batch are padded to the same number of frames
     int32_t actual_frames =
-        std::min(num_frames + tail_padding_frames, max_num_frames);
+        std::min(max_frames_in_batch + tail_padding_frames, max_num_frames);
 
-    std::array<int64_t, 3> shape{1, actual_frames, feat_dim};
+    std::array<int64_t, 3> shape{n, actual_frames, feat_dim};
 
     Ort::Value mel = Ort::Value::CreateTensor<float>(
         model_->Allocator(), shape.data(), shape.size());
 
     float *p_mel = mel.GetTensorMutableData<float>();
-    std::copy(f.data(), f.data() + num_frames * feat_dim, p_mel);
+    std::fill_n(p_mel, n * actual_frames * feat_dim, 0);
 
-    std::fill_n(p_mel + num_frames * feat_dim,
-                (actual_frames - num_frames) * feat_dim, 0);
+    for (int32_t i = 0; i != n; ++i) {
+      std::copy(features[i].data(),
+                features[i].data() + num_frames[i] * feat_dim,
+                p_mel + i * actual_frames * feat_dim);
+    }
 
     mel = Transpose12(model_->Allocator(), &mel);
 
     try {
       auto cross_kv = model_->ForwardEncoder(std::move(mel));
-      int32_t lang_id = model_->DetectLanguage(cross_kv.first, cross_kv.second);
-      const auto &id2lang = model_->GetID2Lang();
-      if (id2lang.count(lang_id)) {
-        return id2lang.at(lang_id);
-      } else {
-        SHERPA_ONNX_LOGE("Unknown language ID: %d. Return an empty string.",
-                         lang_id);
-        return "";
+      auto logits = RunDecoderOneStep(n, std::move(cross_kv.first),
+                                      std::move(cross_kv.second));
+
+      int32_t vocab_size =
+          logits.GetTensorTypeAndShapeInfo().GetShape().back();
+      const float *p_logits = logits.GetTensorData<float>();
+
+      for (int32_t i = 0; i != n; ++i) {
+        ans[i] = GetTopK(p_logits + i * vocab_size, top_k);
       }
     } catch (const Ort::Exception &ex) {
       SHERPA_ONNX_LOGE(
@@ -107,12 +131,94 @@ class SpokenLanguageIdentificationWhisperImpl
           "input frames: %d, Current tail "
           "paddings: %d. If you see a lot of such exceptions, please consider "
           "using a larger --whisper-tail-paddings",
-          ex.what(), num_frames, tail_padding_frames);
-      return "";
+          ex.what(), max_frames_in_batch, tail_padding_frames);
     }
+
+    return ans;
   }
 
  private:
+  // Run the decoder with the SOT token for a batch of n streams.
+  // Return the logits of shape (n, 1, vocab_size)
+  Ort::Value RunDecoderOneStep(int32_t n, Ort::Value cross_k,
+                               Ort::Value cross_v) const {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::vector<int64_t> tokens(n, model_->SOT());
+    std::array<int64_t, 2> token_shape{n, 1};
+
+    Ort::Value tokens_tensor =
+        Ort::Value::CreateTensor(memory_info, tokens.data(), tokens.size(),
+                                 token_shape.data(), token_shape.size());
+
+    auto self_kv_cache = model_->GetInitialSelfKVCache(n);
+
+    // The offset is shared by all streams in the batch
+    std::array<int64_t, 1> offset_shape{1};
+    Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
+        model_->Allocator(), offset_shape.data(), offset_shape.size());
+    *(offset.GetTensorMutableData<int64_t>()) = 0;
+
+    auto decoder_out = model_->ForwardDecoder(
+        std::move(tokens_tensor), std::move(self_kv_cache.first),
+        std::move(self_kv_cache.second), std::move(cross_k),
+        std::move(cross_v), std::move(offset));
+
+    return std::move(std::get<0>(decoder_out));
+  }
+
+  // Compute the softmax over language tokens and return the top_k entries
+  SpokenLanguageIdentificationResult GetTopK(const float *p_logits,
+                                             int32_t top_k) const {
+    const auto &all_language_ids = model_->GetAllLanguageIDs();
+    const auto &id2lang = model_->GetID2Lang();
+
+    int32_t num_languages = all_language_ids.size();
+
+    float max_logit = p_logits[all_language_ids[0]];
+    for (auto id : all_language_ids) {
+      max_logit = std::max(max_logit, p_logits[id]);
+    }
+
+    std::vector<float> probs(num_languages);
+    float sum = 0;
+    for (int32_t i = 0; i != num_languages; ++i) {
+      probs[i] = std::exp(p_logits[all_language_ids[i]] - max_logit);
+      sum += probs[i];
+    }
+
+    std::vector<int32_t> indexes(num_languages);
+    std::iota(indexes.begin(), indexes.end(), 0);
+
+    top_k = std::max(1, std::min(top_k, num_languages));
+    std::partial_sort(
+        indexes.begin(), indexes.begin() + top_k, indexes.end(),
+        [&probs](int32_t a, int32_t b) { return probs[a] > probs[b]; });
+
+    SpokenLanguageIdentificationResult ans;
+    for (int32_t i = 0; i != top_k; ++i) {
+      int32_t lang_id = all_language_ids[indexes[i]];
+      if (!id2lang.count(lang_id)) {
+        SHERPA_ONNX_LOGE("Unknown language ID: %d. Skip it.", lang_id);
+        continue;
+      }
+
+      ans.langs.push_back(id2lang.at(lang_id));
+      ans.probs.push_back(probs[indexes[i]] / sum);
+    }
+
+    if (!ans.langs.empty()) {
+      ans.lang = ans.langs[0];
+    }
+
+    if (config_.debug) {
+      SHERPA_ONNX_LOGE("%s", ans.ToString().c_str());
+    }
+
+    return ans;
+  }
+
   void Check() const {
     if (!model_->IsMultiLingual()) {
       SHERPA_ONNX_LOGE(
@@ -4,7 +4,9 @@
 
 #include "sherpa-onnx/csrc/spoken-language-identification.h"
 
+#include <sstream>
 #include <string>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -106,6 +108,31 @@ std::string SpokenLanguageIdentificationConfig::ToString() const {
   return os.str();
 }
 
+std::string SpokenLanguageIdentificationResult::ToString() const {
+  std::ostringstream os;
+
+  os << "SpokenLanguageIdentificationResult(";
+  os << "lang=\"" << lang << "\", ";
+
+  os << "langs=[";
+  std::string sep;
+  for (const auto &s : langs) {
+    os << sep << "\"" << s << "\"";
+    sep = ", ";
+  }
+  os << "], ";
+
+  os << "probs=[";
+  sep = "";
+  for (auto p : probs) {
+    os << sep << p;
+    sep = ", ";
+  }
+  os << "])";
+
+  return os.str();
+}
+
 SpokenLanguageIdentification::SpokenLanguageIdentification(
     const SpokenLanguageIdentificationConfig &config)
     : impl_(SpokenLanguageIdentificationImpl::Create(config)) {}
@@ -127,4 +154,10 @@ std::string SpokenLanguageIdentification::Compute(OfflineStream *s) const {
   return impl_->Compute(s);
 }
 
+std::vector<SpokenLanguageIdentificationResult>
+SpokenLanguageIdentification::ComputeBatch(OfflineStream **ss, int32_t n,
+                                           int32_t top_k /*= 1*/) const {
+  return impl_->ComputeBatch(ss, n, top_k);
+}
+
 }  // namespace sherpa_onnx
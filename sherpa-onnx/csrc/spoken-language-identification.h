@@ -6,6 +6,7 @@
 
 #include <memory>
 #include <string>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -68,6 +69,18 @@ struct SpokenLanguageIdentificationConfig {
   std::string ToString() const;
 };
 
+struct SpokenLanguageIdentificationResult {
+  // The most likely language, e.g., en, zh, de. It is empty on errors.
+  std::string lang;
+
+  // Top-k languages and their probabilities, sorted in descending order
+  // of probabilities. langs[0] == lang
+  std::vector<std::string> langs;
+  std::vector<float> probs;
+
+  std::string ToString() const;
+};
+
 class SpokenLanguageIdentificationImpl;
 
 class SpokenLanguageIdentification {
@@ -90,6 +103,18 @@ class SpokenLanguageIdentification {
   // Note: en is for English, zh is for Chinese, de is for German, etc.
   std::string Compute(OfflineStream *s) const;
 
+  /* Identify the languages of several streams with a single batched run of
+   * the encoder and the decoder.
+   *
+   * @param ss Pointer to an array of streams.
+   * @param n  Number of streams in ss.
+   * @param top_k Number of languages to return for each stream.
+   *
+   * @return Return a vector of size n. The i-th entry is for ss[i].
+   */
+  std::vector<SpokenLanguageIdentificationResult> ComputeBatch(
+      OfflineStream **ss, int32_t n, int32_t top_k = 1) const;
+
  private:
   std::unique_ptr<SpokenLanguageIdentificationImpl> impl_;
 };
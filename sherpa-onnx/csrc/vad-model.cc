@@ -53,6 +53,12 @@ std::unique_ptr<VadModel> VadModel::Create(const VadModelConfig &config) {
   return nullptr;
 }
 
+void VadModel::ComputeBatch(const float * /*samples*/, int32_t /*batch_size*/,
+                            float * /*states*/, float * /*probs*/) {
+  SHERPA_ONNX_LOGE("This vad model does not support batched computation");
+  SHERPA_ONNX_EXIT(-1);
+}
+
 template <typename Manager>
 std::unique_ptr<VadModel> VadModel::Create(Manager *mgr,
                                            const VadModelConfig &config) {
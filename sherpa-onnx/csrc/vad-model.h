@@ -42,6 +42,27 @@ class VadModel {
   virtual int32_t MinSpeechDurationSamples() const = 0;
   virtual void SetMinSilenceDuration(float s) = 0;
   virtual void SetThreshold(float threshold) = 0;
+
+  // Number of floats in the model states of a single stream. It returns 0
+  // if the model does not support ComputeBatch().
+  virtual int32_t StateDim() const { return 0; }
+
+  /**
+   * Run the model on one window of several independent streams with a
+   * single invocation. It does not use or change the internal states of
+   * this object.
+   *
+   * @param samples Pointer to a 2-d array of shape
+   *                (batch_size, WindowSize()).
+   * @param batch_size Number of streams.
+   * @param states Pointer to a 2-d array of shape (batch_size, StateDim())
+   *               containing the model states of each stream. Use zeros
+   *               for a new stream. It is updated in-place.
+   * @param probs Pointer to a 1-d array of shape (batch_size,). On return,
+   *              it contains the speech probability of each stream.
+   */
+  virtual void ComputeBatch(const float *samples, int32_t batch_size,
+                            float *states, float *probs);
 };
 
 }  // namespace sherpa_onnx
@@ -0,0 +1,104 @@
+// sherpa-onnx/csrc/vocoder-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/vocoder.h"
+
+#include <array>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+namespace {
+
+// Sample j of frame t is the value of frame t in the first mel bin.
+// If drop_last_frame is true, it returns (n - 1) * hop_length samples for
+// n frames like vocos with center=True.
+class FakeVocoder : public Vocoder {
+ public:
+  FakeVocoder(int32_t hop_length, bool drop_last_frame, bool known_hop_length)
+      : hop_length_(hop_length),
+        drop_last_frame_(drop_last_frame),
+        known_hop_length_(known_hop_length) {}
+
+  std::vector<float> Run(Ort::Value mel) const override {
+    std::vector<int64_t> shape = mel.GetTensorTypeAndShapeInfo().GetShape();
+    int32_t num_frames = shape[2];
+    const float *p = mel.GetTensorData<float>();
+
+    int32_t n = drop_last_frame_ ? num_frames - 1 : num_frames;
+
+    std::vector<float> ans;
+    for (int32_t t = 0; t < n; ++t) {
+      ans.insert(ans.end(), hop_length_, p[t]);
+    }
+    return ans;
+  }
+
+  int32_t HopLength() const override {
+    return known_hop_length_ ? hop_length_ : 0;
+  }
+
+ private:
+  int32_t hop_length_;
+  bool drop_last_frame_;
+  bool known_hop_length_;
+};
+
+Ort::Value CreateMel(int32_t feat_dim, int32_t num_frames) {
+  Ort::AllocatorWithDefaultOptions allocator;
+  std::array<int64_t, 3> shape = {1, feat_dim, num_frames};
+  Ort::Value mel =
+      Ort::Value::CreateTensor<float>(allocator, shape.data(), shape.size());
+
+  float *p = mel.GetTensorMutableData<float>();
+  for (int32_t d = 0; d != feat_dim; ++d) {
+    for (int32_t t = 0; t != num_frames; ++t) {
+      p[d * num_frames + t] = t + d * 1000;
+    }
+  }
+  return mel;
+}
+
+void TestChunked(bool drop_last_frame, bool known_hop_length) {
+  int32_t hop_length = 4;
+  int32_t feat_dim = 2;
+  int32_t num_frames = 17;
+
+  FakeVocoder vocoder(hop_length, drop_last_frame, known_hop_length);
+  std::vector<float> expected = vocoder.Run(CreateMel(feat_dim, num_frames));
+
+  for (int32_t chunk_size : {1, 3, 5, 16}) {
+    for (int32_t overlap : {0, 1, 2, 24}) {
+      int32_t num_callback_samples = 0;
+      std::vector<float> samples = vocoder.RunInChunks(
+          CreateMel(feat_dim, num_frames), chunk_size, overlap,
+          [&num_callback_samples](const float *, int32_t n, float) {
+            num_callback_samples += n;
+            return 1;
+          });
+
+      EXPECT_EQ(samples.size(), expected.size())
+          << "chunk_size: " << chunk_size << ", overlap: " << overlap;
+      EXPECT_EQ(samples, expected)
+          << "chunk_size: " << chunk_size << ", overlap: " << overlap;
+      EXPECT_EQ(num_callback_samples, expected.size());
+    }
+  }
+}
+
+}  // namespace
+
+TEST(Vocoder, RunInChunks) { TestChunked(false, true); }
+
+TEST(Vocoder, RunInChunksUnknownHopLength) { TestChunked(false, false); }
+
+TEST(Vocoder, RunInChunksDropLastFrame) { TestChunked(true, true); }
+
+TEST(Vocoder, RunInChunksDropLastFrameUnknownHopLength) {
+  TestChunked(true, false);
+}
+
+}  // namespace sherpa_onnx
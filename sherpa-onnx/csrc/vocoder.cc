@@ -4,6 +4,11 @@
 
 #include "sherpa-onnx/csrc/vocoder.h"
 
+#include <algorithm>
+#include <array>
+#include <utility>
+#include <vector>
+
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
 #include "android/asset_manager_jni.h"
@@ -73,6 +78,82 @@ static ModelType GetModelType(char *model_data, size_t model_data_length,
   }
 }
 
+std::vector<float> Vocoder::RunInChunks(Ort::Value mel, int32_t chunk_size,
+                                        int32_t overlap,
+                                        const VocoderCallback &callback) const {
+  std::vector<int64_t> shape = mel.GetTensorTypeAndShapeInfo().GetShape();
+  int32_t feat_dim = shape[1];
+  int32_t num_frames = shape[2];
+
+  if (chunk_size <= 0 || num_frames <= chunk_size) {
+    std::vector<float> samples = Run(std::move(mel));
+    if (callback) {
+      callback(samples.data(), samples.size(), 1.0);
+    }
+    return samples;
+  }
+
+  // A vocoder may return (n - 1) * hop_length samples for n frames, e.g.,
+  // vocos with center=True. Without a right context frame, the samples of
+  // the last frame of each chunk would be lost.
+  overlap = std::max(overlap, 1);
+
+  Ort::AllocatorWithDefaultOptions allocator;
+  const float *p = mel.GetTensorData<float>();
+
+  // Return frames [left, right) of the mel
+  auto slice = [&](int32_t left, int32_t right) {
+    int32_t n = right - left;
+    std::array<int64_t, 3> chunk_shape = {1, feat_dim, n};
+    Ort::Value chunk = Ort::Value::CreateTensor<float>(
+        allocator, chunk_shape.data(), chunk_shape.size());
+
+    float *dst = chunk.GetTensorMutableData<float>();
+    for (int32_t d = 0; d != feat_dim; ++d) {
+      const float *src = p + d * num_frames;
+      std::copy(src + left, src + right, dst + d * n);
+    }
+    return chunk;
+  };
+
+  int32_t hop_length = HopLength();
+
+  std::vector<float> ans;
+  for (int32_t start = 0; start < num_frames; start += chunk_size) {
+    int32_t end = std::min(start + chunk_size, num_frames);
+    int32_t left = std::max(start - overlap, 0);
+    int32_t right = std::min(end + overlap, num_frames);
+
+    std::vector<float> samples = Run(slice(left, right));
+
+    if (hop_length == 0) {
+      // The vocoder returns either n or n - 1 frames of audio for n frames,
+      // so samples.size() / n is wrong for the latter. Vocoding one frame
+      // less gives exactly one hop less audio in both cases.
+      // Note that right - 1 > left since chunk_size and overlap are >= 1.
+      hop_length = static_cast<int32_t>(samples.size()) -
+                   static_cast<int32_t>(Run(slice(left, right - 1)).size());
+    }
+
+    // Sample i of this chunk corresponds to sample (left * hop_length + i)
+    // of the whole audio
+    int32_t num_samples = samples.size();
+    int32_t b = std::min((start - left) * hop_length, num_samples);
+    int32_t e = (end == num_frames)
+                    ? num_samples
+                    : std::min((end - left) * hop_length, num_samples);
+
+    ans.insert(ans.end(), samples.begin() + b, samples.begin() + e);
+
+    if (callback &&
+        !callback(samples.data() + b, e - b, end * 1.0 / num_frames)) {
+      break;
+    }
+  }
+
+  return ans;
+}
+
 std::unique_ptr<Vocoder> Vocoder::Create(const OfflineTtsModelConfig &config) {
   std::vector<char> buffer;
   if (!config.matcha.vocoder.empty()) {
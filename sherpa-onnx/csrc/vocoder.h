@@ -5,6 +5,7 @@
 #ifndef SHERPA_ONNX_CSRC_VOCODER_H_
 #define SHERPA_ONNX_CSRC_VOCODER_H_
 
+#include <functional>
 #include <memory>
 #include <string>
 #include <vector>
@@ -14,6 +15,11 @@
 
 namespace sherpa_onnx {
 
+// If the callback returns 0, then it stops processing
+// if the callback returns 1, then it keeps processing
+using VocoderCallback = std::function<int32_t(
+    const float * /*samples*/, int32_t /*n*/, float /*progress*/)>;
+
 class Vocoder {
  public:
   virtual ~Vocoder() = default;
@@ -28,6 +34,38 @@ class Vocoder {
    *  @return Return a float32 vector containing audio samples..
    */
   virtual std::vector<float> Run(Ort::Value mel) const = 0;
+
+  /** Run the vocoder on chunks of the mel so that audio of the first chunk
+   *  is available before the whole mel is vocoded.
+   *
+   *  Each chunk is given to the vocoder together with up to `overlap` frames
+   *  of context on each side. The audio of the context frames is discarded,
+   *  so that there are no artifacts at chunk boundaries as long as `overlap`
+   *  covers the receptive field of the vocoder.
+   *
+   *  @param mel A float32 tensor of shape (1, feat_dim, num_frames).
+   *  @param chunk_size Number of frames per chunk. If it is not positive,
+   *                    the whole mel is processed as a single chunk.
+   *  @param overlap Number of context frames on each side of a chunk.
+   *                 Values less than 1 are treated as 1, since some
+   *                 vocoders return only (n - 1) * hop_length samples
+   *                 for n frames.
+   *  @param callback If not empty, it is called with the audio samples of
+   *                  each chunk and the fraction of frames processed so far.
+   *                  If it returns 0, the remaining chunks are skipped.
+   *                  The samples are invalidated once it returns.
+   *
+   *  @return Return audio samples of all processed chunks.
+   */
+  std::vector<float> RunInChunks(
+      Ort::Value mel, int32_t chunk_size, int32_t overlap,
+      const VocoderCallback &callback = nullptr) const;
+
+  /** Number of audio samples per mel frame. Return 0 if it is unknown, in
+   *  which case RunInChunks() infers it by vocoding the first chunk once
+   *  more without its last frame.
+   */
+  virtual int32_t HopLength() const { return 0; }
 };
 
 }  // namespace sherpa_onnx
@@ -121,6 +121,8 @@ class VocosVocoder::Impl {
     return istft.Compute(stft_result);
   }
 
+  int32_t HopLength() const { return meta_.hop_length; }
+
  private:
   void Init(void *model_data, size_t model_data_length) {
     sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
@@ -201,6 +203,8 @@ std::vector<float> VocosVocoder::Run(Ort::Value mel) const {
   return impl_->Run(std::move(mel));
 }
 
+int32_t VocosVocoder::HopLength() const { return impl_->HopLength(); }
+
 #if __ANDROID_API__ >= 9
 template VocosVocoder::VocosVocoder(AAssetManager *mgr,
                                     const OfflineTtsModelConfig &config);
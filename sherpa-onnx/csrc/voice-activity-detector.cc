@@ -7,6 +7,7 @@
 #include <algorithm>
 #include <queue>
 #include <utility>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -186,6 +187,39 @@ class VoiceActivityDetector::Impl {
 
   const VadModelConfig &GetConfig() const { return config_; }
 
+  void Warmup(const std::vector<int32_t> &batch_sizes,
+              const std::vector<float> &lengths) {
+    int32_t window_size = model_->WindowSize();
+    int32_t window_shift = model_->WindowShift();
+
+    std::vector<float> samples(window_size);
+
+    for (float length : lengths) {
+      int32_t num_windows = length * config_.sample_rate / window_shift;
+      for (int32_t i = 0; i < num_windows; ++i) {
+        model_->Compute(samples.data(), window_size);
+      }
+    }
+
+    model_->Reset();
+
+    int32_t state_dim = model_->StateDim();
+    if (state_dim == 0) {
+      return;
+    }
+
+    for (int32_t batch_size : batch_sizes) {
+      if (batch_size <= 0) {
+        continue;
+      }
+
+      std::vector<float> x(batch_size * window_size);
+      std::vector<float> states(batch_size * state_dim);
+      std::vector<float> probs(batch_size);
+      model_->ComputeBatch(x.data(), batch_size, states.data(), probs.data());
+    }
+  }
+
  private:
   void Init() {
     if (!config_.silero_vad.model.empty()) {
@@ -260,6 +294,12 @@ const VadModelConfig &VoiceActivityDetector::GetConfig() const {
   return impl_->GetConfig();
 }
 
+void VoiceActivityDetector::Warmup(
+    const std::vector<int32_t> &batch_sizes /*= {1}*/,
+    const std::vector<float> &lengths /*= {1.0}*/) {
+  impl_->Warmup(batch_sizes, lengths);
+}
+
 float VoiceActivityDetector::Compute(const float *samples, int32_t n) {
   return impl_->Compute(samples, n);
 }
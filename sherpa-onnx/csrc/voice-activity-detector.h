@@ -53,6 +53,17 @@ class VoiceActivityDetector {
 
   const VadModelConfig &GetConfig() const;
 
+  // Run the model on silence so that onnxruntime allocates memory and
+  // selects kernels before the first request. It resets the model states,
+  // so call it before feeding any audio.
+  //
+  // @param batch_sizes Batch sizes for models that can process several
+  //                    streams together, see VadModel::ComputeBatch().
+  //                    They are ignored for other models.
+  // @param lengths Duration in seconds of the audio of a single stream
+  void Warmup(const std::vector<int32_t> &batch_sizes = {1},
+              const std::vector<float> &lengths = {1.0});
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
@@ -52,7 +52,34 @@ void PybindFastClustering(py::module *m) {
             py::gil_scoped_release release;
             return self.Cluster(p, num_rows, num_cols);
           },
-          py::arg("features"));
+          py::arg("features"))
+      .def(
+          "cluster_incrementally",
+          [](PyClass &self,
+             py::array_t<float> features) -> std::vector<int32_t> {
+            if (!(features.flags() & py::array::c_style)) {
+              throw py::value_error(
+                  "input features should be contiguous. Please use "
+                  "np.ascontiguousarray(features)");
+            }
+
+            int num_dim = features.ndim();
+            if (num_dim != 2) {
+              std::ostringstream os;
+              os << "Expect an array of 2 dimensions. Given dim: " << num_dim
+                 << "\n";
+              throw py::value_error(os.str());
+            }
+
+            int32_t num_rows = features.shape(0);
+            int32_t num_cols = features.shape(1);
+            float *p = features.mutable_data();
+            py::gil_scoped_release release;
+            return self.ClusterIncrementally(p, num_rows, num_cols);
+          },
+          py::arg("features"))
+      .def("reset", &PyClass::Reset)
+      .def_property_readonly("num_clusters", &PyClass::NumClusters);
 }
 
 }  // namespace sherpa_onnx
@@ -65,6 +65,14 @@ void PybindKeywordSpotter(py::module *m) {
             return self.CreateStream(keywords);
           },
           py::arg("keywords"), py::call_guard<py::gil_scoped_release>())
+      .def("add_keyword_set", &PyClass::AddKeywordSet, py::arg("id"),
+           py::arg("keywords"), py::call_guard<py::gil_scoped_release>())
+      .def("remove_keyword_set", &PyClass::RemoveKeywordSet, py::arg("id"),
+           py::call_guard<py::gil_scoped_release>())
+      .def_property_readonly("keyword_set_ids", &PyClass::GetKeywordSetIds)
+      .def("create_stream_with_keyword_set",
+           &PyClass::CreateStreamWithKeywordSet, py::arg("id"),
+           py::call_guard<py::gil_scoped_release>())
       .def("is_ready", &PyClass::IsReady,
            py::call_guard<py::gil_scoped_release>())
       .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>())
@@ -0,0 +1,74 @@
+// sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.h"
+
+#include <string>
+#include <vector>
+
+#include "sherpa-onnx/csrc/multi-stream-voice-activity-detector.h"
+
+namespace sherpa_onnx {
+
+static void PybindVadEvent(py::module *m) {
+  using PyClass = VadEvent;
+  py::class_<PyClass>(*m, "VadEvent")
+      .def_property_readonly("stream_id",
+                             [](const PyClass &self) { return self.stream_id; })
+      .def_property_readonly("is_start",
+                             [](const PyClass &self) { return self.is_start; })
+      .def_property_readonly("segment",
+                             [](const PyClass &self) { return self.segment; })
+      .def("__str__", [](const PyClass &self) {
+        return "VadEvent(stream_id=" + std::to_string(self.stream_id) +
+               ", is_start=" + (self.is_start ? "True" : "False") +
+               ", start=" + std::to_string(self.segment.start) +
+               ", num_samples=" +
+               std::to_string(self.segment.samples.size()) + ")";
+      });
+}
+
+void PybindMultiStreamVoiceActivityDetector(py::module *m) {
+  PybindVadEvent(m);
+
+  using PyClass = MultiStreamVoiceActivityDetector;
+  py::class_<PyClass>(*m, "MultiStreamVoiceActivityDetector",
+                      R"(
+Voice activity detection for many streams with a single model.
+
+1. Use create_stream() to add a stream. It returns the id of the stream.
+2. accept_waveform() only buffers the samples. compute() runs one batched
+   model invocation for all streams that have a complete window, repeatedly,
+   and returns a list of VadEvent.
+3. Each stream gives the same segments as a VoiceActivityDetector that is
+   fed one window at a time.
+      )")
+      .def(py::init<const VadModelConfig &, float>(), py::arg("config"),
+           py::arg("buffer_size_in_seconds") = 30,
+           py::call_guard<py::gil_scoped_release>())
+      .def("create_stream", &PyClass::CreateStream,
+           py::call_guard<py::gil_scoped_release>())
+      .def("remove_stream", &PyClass::RemoveStream, py::arg("stream_id"),
+           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "accept_waveform",
+          [](PyClass &self, int32_t stream_id,
+             const std::vector<float> &samples) {
+            self.AcceptWaveform(stream_id, samples.data(), samples.size());
+          },
+          py::arg("stream_id"), py::arg("samples"),
+          py::call_guard<py::gil_scoped_release>())
+      .def("flush", &PyClass::Flush, py::arg("stream_id"),
+           py::call_guard<py::gil_scoped_release>())
+      .def("reset", &PyClass::Reset, py::arg("stream_id"),
+           py::call_guard<py::gil_scoped_release>())
+      .def("compute", &PyClass::Compute,
+           py::call_guard<py::gil_scoped_release>())
+      .def("is_speech_detected", &PyClass::IsSpeechDetected,
+           py::arg("stream_id"), py::call_guard<py::gil_scoped_release>())
+      .def_property_readonly("num_streams", &PyClass::NumStreams)
+      .def_property_readonly("config", &PyClass::GetConfig);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,16 @@
+// sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+#define SHERPA_ONNX_PYTHON_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+void PybindMultiStreamVoiceActivityDetector(py::module *m);
+
+}
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
@@ -5,6 +5,7 @@
 #include "sherpa-onnx/python/csrc/offline-punctuation.h"
 
 #include <string>
+#include <vector>
 
 #include "sherpa-onnx/csrc/offline-punctuation.h"
 
@@ -45,6 +46,9 @@ void PybindOfflinePunctuation(py::module *m) {
       .def(py::init<const OfflinePunctuationConfig &>(), py::arg("config"),
            py::call_guard<py::gil_scoped_release>())
       .def("add_punctuation", &PyClass::AddPunctuation, py::arg("text"),
+           py::call_guard<py::gil_scoped_release>())
+      .def("warmup", &PyClass::Warmup,
+           py::arg("lengths") = std::vector<int32_t>{10, 50},
            py::call_guard<py::gil_scoped_release>());
 }
 
@@ -8,6 +8,7 @@
 #include <vector>
 
 #include "sherpa-onnx/csrc/offline-recognizer.h"
+#include "sherpa-onnx/python/csrc/result-arrays.h"
 
 namespace sherpa_onnx {
 
@@ -43,6 +44,65 @@ static void PybindOfflineRecognizerConfig(py::module *m) {
       .def("__str__", &PyClass::ToString);
 }
 
+constexpr const char *kGetResultsUsage = R"(
+Get the results of a list of decoded streams at once in a columnar layout.
+
+It returns a dict:
+
+  - texts: list of str, the text of each stream
+  - langs: list of str, the language of each stream. Empty if the model
+    does not detect it.
+  - offsets: int64 array of shape (num_streams + 1,). Values of stream i
+    are in [offsets[i], offsets[i+1]) of the following token-level arrays
+  - token_ids: int32 array
+  - timestamps: float32 array. NaN for streams without timestamps.
+  - durations: float32 array. NaN for streams without durations.
+  - word_offsets: int64 array of shape (num_streams + 1,) for words
+  - words: int32 array
+
+Use numpy.split(token_ids, offsets[1:-1]) to get the arrays of each stream.
+)";
+
+static py::dict GetResults(const std::vector<OfflineStream *> &ss) {
+  std::vector<OfflineRecognitionResult> results;
+  results.reserve(ss.size());
+  for (const auto *s : ss) {
+    results.push_back(s->GetResult());
+  }
+
+  using Result = OfflineRecognitionResult;
+
+  py::list texts;
+  py::list langs;
+  for (const auto &r : results) {
+    texts.append(py::reinterpret_steal<py::str>(
+        PyUnicode_DecodeUTF8(r.text.c_str(), r.text.size(), "ignore")));
+    langs.append(r.lang);
+  }
+
+  py::array_t<int64_t> offsets;
+  py::array_t<int32_t> token_ids =
+      Concatenate(results, &Result::token_ids, &offsets);
+
+  py::array_t<int64_t> word_offsets;
+  py::array_t<int32_t> words = Concatenate(results, &Result::words,
+                                           &word_offsets);
+
+  py::dict ans;
+  ans["texts"] = texts;
+  ans["langs"] = langs;
+  ans["offsets"] = offsets;
+  ans["token_ids"] = token_ids;
+  ans["timestamps"] =
+      ConcatenateTokenAligned(results, &Result::timestamps, offsets);
+  ans["durations"] =
+      ConcatenateTokenAligned(results, &Result::durations, offsets);
+  ans["word_offsets"] = word_offsets;
+  ans["words"] = words;
+
+  return ans;
+}
+
 void PybindOfflineRecognizer(py::module *m) {
   PybindOfflineRecognizerConfig(m);
 
@@ -64,12 +124,23 @@ void PybindOfflineRecognizer(py::module *m) {
            py::call_guard<py::gil_scoped_release>())
       .def("set_config", &PyClass::SetConfig, py::arg("config"),
            py::call_guard<py::gil_scoped_release>())
+      .def("warmup", &PyClass::Warmup,
+           py::arg("batch_sizes") = std::vector<int32_t>{1},
+           py::arg("lengths") = std::vector<float>{1.0, 5.0},
+           py::call_guard<py::gil_scoped_release>())
       .def(
           "decode_streams",
           [](const PyClass &self, std::vector<OfflineStream *> ss) {
             self.DecodeStreams(ss.data(), ss.size());
           },
-          py::arg("ss"), py::call_guard<py::gil_scoped_release>());
+          py::arg("ss"), py::call_guard<py::gil_scoped_release>())
+      .def(
+          "get_results",
+          [](const PyClass & /*self*/,
+             const std::vector<OfflineStream *> &ss) {
+            return GetResults(ss);
+          },
+          py::arg("ss"), kGetResultsUsage);
 }
 
 }  // namespace sherpa_onnx
@@ -5,8 +5,10 @@
 #include "sherpa-onnx/csrc/offline-source-separation.h"
 
 #include <algorithm>
+#include <sstream>
 #include <string>
 
+#include "sherpa-onnx/csrc/offline-source-separation-chunker.h"
 #include "sherpa-onnx/python/csrc/offline-source-separation-model-config.h"
 #include "sherpa-onnx/python/csrc/offline-source-separation.h"
 
@@ -66,6 +68,93 @@ static void PybindOfflineSourceSeparationOutput(py::module *m) {
                              [](const PyClass &self) { return self.stems; });
 }
 
+static OfflineSourceSeparationInput ToInput(int32_t sample_rate,
+                                            const py::array_t<float> &samples,
+                                            int32_t min_num_samples = 10) {
+  if (!(samples.flags() & py::array::c_style)) {
+    throw py::value_error(
+        "input samples should be contiguous. Please use "
+        "np.ascontiguousarray(samples)");
+  }
+
+  int num_dim = samples.ndim();
+  if (samples.ndim() != 2) {
+    std::ostringstream os;
+    os << "Expect an array of 2 dimensions [num_channels x "
+          "num_samples]. "
+          "Given dim: "
+       << num_dim << "\n";
+    throw py::value_error(os.str());
+  }
+
+  // if num_samples is less than 10, it is very likely the user
+  // has swapped num_channels and num_samples.
+  if (samples.shape(1) < min_num_samples) {
+    std::ostringstream os;
+    os << "Expect an array of 2 dimensions [num_channels x "
+          "num_samples]. "
+          "Given ["
+       << samples.shape(0) << " x " << samples.shape(1) << "]"
+       << "\n";
+    throw py::value_error(os.str());
+  }
+
+  int32_t num_channels = samples.shape(0);
+  int32_t num_samples = samples.shape(1);
+  const float *p = samples.data();
+
+  OfflineSourceSeparationInput input;
+
+  input.samples.data.resize(num_channels);
+  input.sample_rate = sample_rate;
+
+  for (int32_t i = 0; i != num_channels; ++i) {
+    input.samples.data[i] = {p + i * num_samples, p + (i + 1) * num_samples};
+  }
+
+  return input;
+}
+
+static void PybindOfflineSourceSeparationChunkConfig(py::module *m) {
+  using PyClass = OfflineSourceSeparationChunkConfig;
+  py::class_<PyClass>(*m, "OfflineSourceSeparationChunkConfig")
+      .def(py::init<float, float, int32_t>(), py::arg("chunk_duration") = 30,
+           py::arg("crossfade_duration") = 1,
+           py::arg("num_parallel_chunks") = 1)
+      .def_readwrite("chunk_duration", &PyClass::chunk_duration)
+      .def_readwrite("crossfade_duration", &PyClass::crossfade_duration)
+      .def_readwrite("num_parallel_chunks", &PyClass::num_parallel_chunks)
+      .def("validate", &PyClass::Validate)
+      .def("__str__", &PyClass::ToString);
+}
+
+static void PybindOfflineSourceSeparationChunker(py::module *m) {
+  PybindOfflineSourceSeparationChunkConfig(m);
+
+  using PyClass = OfflineSourceSeparationChunker;
+  py::class_<PyClass>(*m, "OfflineSourceSeparationChunker")
+      .def(py::init<const OfflineSourceSeparation *,
+                    const OfflineSourceSeparationChunkConfig &>(),
+           py::arg("separation"),
+           py::arg("config") = OfflineSourceSeparationChunkConfig{},
+           py::keep_alive<1, 2>())
+      .def(
+          "accept_waveform",
+          [](PyClass &self, int32_t sample_rate,
+             const py::array_t<float> &samples) {
+            auto input = ToInput(sample_rate, samples, 1);
+
+            pybind11::gil_scoped_release release;
+
+            return self.AcceptWaveform(input);
+          },
+          py::arg("sample_rate"), py::arg("samples"),
+          "samples is of shape (num_channels, num-samples) with dtype "
+          "np.float32")
+      .def("flush", &PyClass::Flush, py::call_guard<py::gil_scoped_release>())
+      .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>());
+}
+
 void PybindOfflineSourceSeparation(py::module *m) {
   PybindOfflineSourceSeparationConfig(m);
   PybindOfflineSourceSeparationOutput(m);
@@ -80,47 +169,7 @@ void PybindOfflineSourceSeparation(py::module *m) {
           "process",
           [](const PyClass &self, int32_t sample_rate,
              const py::array_t<float> &samples) {
-            if (!(samples.flags() & py::array::c_style)) {
-              throw py::value_error(
-                  "input samples should be contiguous. Please use "
-                  "np.ascontiguousarray(samples)");
-            }
-
-            int num_dim = samples.ndim();
-            if (samples.ndim() != 2) {
-              std::ostringstream os;
-              os << "Expect an array of 2 dimensions [num_channels x "
-                    "num_samples]. "
-                    "Given dim: "
-                 << num_dim << "\n";
-              throw py::value_error(os.str());
-            }
-
-            // if num_samples is less than 10, it is very likely the user
-            // has swapped num_channels and num_samples.
-            if (samples.shape(1) < 10) {
-              std::ostringstream os;
-              os << "Expect an array of 2 dimensions [num_channels x "
-                    "num_samples]. "
-                    "Given ["
-                 << samples.shape(0) << " x " << samples.shape(1) << "]"
-                 << "\n";
-              throw py::value_error(os.str());
-            }
-
-            int32_t num_channels = samples.shape(0);
-            int32_t num_samples = samples.shape(1);
-            const float *p = samples.data();
-
-            OfflineSourceSeparationInput input;
-
-            input.samples.data.resize(num_channels);
-            input.sample_rate = sample_rate;
-
-            for (int32_t i = 0; i != num_channels; ++i) {
-              input.samples.data[i] = {p + i * num_samples,
-                                       p + (i + 1) * num_samples};
-            }
+            auto input = ToInput(sample_rate, samples);
 
             pybind11::gil_scoped_release release;
 
@@ -128,7 +177,11 @@ void PybindOfflineSourceSeparation(py::module *m) {
           },
           py::arg("sample_rate"), py::arg("samples"),
           "samples is of shape (num_channels, num-samples) with dtype "
-          "np.float32");
+          "np.float32")
+      .def_property_readonly("sample_rate", &PyClass::GetOutputSampleRate)
+      .def_property_readonly("num_stems", &PyClass::GetNumberOfStems);
+
+  PybindOfflineSourceSeparationChunker(m);
 }
 
 }  // namespace sherpa_onnx
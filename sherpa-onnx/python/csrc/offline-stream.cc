@@ -4,12 +4,22 @@
 
 #include "sherpa-onnx/python/csrc/offline-stream.h"
 
+#include <string>
 #include <vector>
 
 #include "sherpa-onnx/csrc/offline-stream.h"
+#include "sherpa-onnx/python/csrc/result-arrays.h"
 
 namespace sherpa_onnx {
 
+// Without it, a 2-D array would be flattened silently
+static void CheckWaveformDim(const py::array &waveform) {
+  if (waveform.ndim() != 1) {
+    throw py::value_error("Expect a 1-D array for waveform. Given dim: " +
+                          std::to_string(waveform.ndim()));
+  }
+}
+
 constexpr const char *kAcceptWaveformUsage = R"(
 Process audio samples.
 
@@ -19,7 +29,20 @@ Args:
     expected by the model, we will do resampling inside.
   waveform:
     A 1-D float32 tensor containing audio samples. It must be normalized
-    to the range [-1, 1].
+    to the range [-1, 1]. A C-contiguous float32 numpy array is used
+    without a copy. It can also be a 1-D int16 numpy array, e.g., read from
+    a 16-bit wave file, which is scaled inside without an extra copy in
+    Python.
+)";
+
+constexpr const char *kOfflineResultToNumpyUsage = R"(
+Return a dict of numpy arrays:
+
+  - token_ids: int32, token IDs in tokens.txt
+  - timestamps: float32, start time in seconds of each token. It is empty if
+    the model does not support timestamps.
+  - durations: float32, duration in seconds of each token (TDT models only)
+  - words: int32
 )";
 
 static void PybindOfflineRecognitionResult(py::module *m) {  // NOLINT
@@ -45,7 +68,21 @@ static void PybindOfflineRecognitionResult(py::module *m) {  // NOLINT
       .def_property_readonly("timestamps",
         [](const PyClass &self) { return self.timestamps; })
       .def_property_readonly("durations",
-        [](const PyClass &self) { return self.durations; });
+        [](const PyClass &self) { return self.durations; })
+      .def_property_readonly(
+          "token_ids",
+          [](const PyClass &self) { return ToNumpy(self.token_ids); })
+      .def(
+          "to_numpy",
+          [](const PyClass &self) {
+            py::dict ans;
+            ans["token_ids"] = ToNumpy(self.token_ids);
+            ans["timestamps"] = ToNumpy(self.timestamps);
+            ans["durations"] = ToNumpy(self.durations);
+            ans["words"] = ToNumpy(self.words);
+            return ans;
+          },
+          kOfflineResultToNumpyUsage);
 }
 
 void PybindOfflineStream(py::module *m) {
@@ -53,13 +90,44 @@ void PybindOfflineStream(py::module *m) {
 
   using PyClass = OfflineStream;
   py::class_<PyClass>(*m, "OfflineStream")
+      .def(
+          "accept_waveform",
+          [](PyClass &self, float sample_rate,
+             py::array_t<float, py::array::c_style> waveform) {
+            CheckWaveformDim(waveform);
+
+            // waveform is kept alive by the caller, so there is no need to
+            // copy it
+            const float *p = waveform.data();
+            int32_t n = waveform.size();
+
+            py::gil_scoped_release release;
+            self.AcceptWaveform(sample_rate, p, n);
+          },
+          py::arg("sample_rate"), py::arg("waveform").noconvert(),
+          kAcceptWaveformUsage)
+      .def(
+          "accept_waveform",
+          [](PyClass &self, float sample_rate, py::array_t<int16_t> waveform) {
+            CheckWaveformDim(waveform);
+
+            // It copies only if waveform is not contiguous
+            auto w = py::array_t<int16_t, py::array::c_style>::ensure(waveform);
+            const int16_t *p = w.data();
+            int32_t n = w.size();
+
+            py::gil_scoped_release release;
+            self.AcceptWaveform(sample_rate, p, n);
+          },
+          py::arg("sample_rate"), py::arg("waveform").noconvert())
+      // For lists and arrays of other dtypes
       .def(
           "accept_waveform",
           [](PyClass &self, float sample_rate,
              const std::vector<float> &waveform) {
             self.AcceptWaveform(sample_rate, waveform.data(), waveform.size());
           },
-          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage,
+          py::arg("sample_rate"), py::arg("waveform"),
           py::call_guard<py::gil_scoped_release>())
       .def_property_readonly("result", &PyClass::GetResult);
 }
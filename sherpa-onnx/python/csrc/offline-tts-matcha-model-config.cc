@@ -17,11 +17,13 @@ void PybindOfflineTtsMatchaModelConfig(py::module *m) {
       .def(py::init<>())
       .def(py::init<const std::string &, const std::string &,
                     const std::string &, const std::string &,
-                    const std::string &, const std::string &, float, float>(),
+                    const std::string &, const std::string &, float, float,
+                    int32_t, int32_t>(),
            py::arg("acoustic_model"), py::arg("vocoder"),
            py::arg("lexicon") = "", py::arg("tokens"), py::arg("data_dir") = "",
            py::arg("dict_dir") = "", py::arg("noise_scale") = 1.0,
-           py::arg("length_scale") = 1.0)
+           py::arg("length_scale") = 1.0, py::arg("vocoder_chunk_size") = 0,
+           py::arg("vocoder_chunk_overlap") = 24)
       .def_readwrite("acoustic_model", &PyClass::acoustic_model)
       .def_readwrite("vocoder", &PyClass::vocoder)
       .def_readwrite("lexicon", &PyClass::lexicon)
@@ -30,6 +32,8 @@ void PybindOfflineTtsMatchaModelConfig(py::module *m) {
       .def_readwrite("dict_dir", &PyClass::dict_dir)
       .def_readwrite("noise_scale", &PyClass::noise_scale)
       .def_readwrite("length_scale", &PyClass::length_scale)
+      .def_readwrite("vocoder_chunk_size", &PyClass::vocoder_chunk_size)
+      .def_readwrite("vocoder_chunk_overlap", &PyClass::vocoder_chunk_overlap)
       .def("__str__", &PyClass::ToString)
       .def("validate", &PyClass::Validate);
 }
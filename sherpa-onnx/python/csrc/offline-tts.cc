@@ -4,6 +4,7 @@
 #include "sherpa-onnx/python/csrc/offline-tts.h"
 
 #include <algorithm>
+#include <sstream>
 #include <string>
 #include <vector>
 
@@ -18,6 +19,7 @@ static void PybindGeneratedAudio(py::module *m) {
       .def(py::init<>())
       .def_readwrite("samples", &PyClass::samples)
       .def_readwrite("sample_rate", &PyClass::sample_rate)
+      .def_readwrite("frontend_seconds", &PyClass::frontend_seconds)
       .def("__str__", [](PyClass &self) {
         std::ostringstream os;
         os << "GeneratedAudio(sample_rate=" << self.sample_rate << ", ";
@@ -26,6 +28,50 @@ static void PybindGeneratedAudio(py::module *m) {
       });
 }
 
+static void PybindOfflineTtsVoice(py::module *m) {
+  using PyClass = OfflineTtsVoice;
+  py::class_<PyClass>(*m, "OfflineTtsVoice")
+      .def(py::init<>())
+      .def_property_readonly(
+          "tokens",
+          [](const PyClass &self) {
+            return py::array_t<int64_t>(self.tokens.size(),
+                                        self.tokens.data());
+          })
+      .def_property_readonly(
+          "num_frames", [](const PyClass &self) { return self.num_frames; })
+      .def_property_readonly("feat_dim",
+                             [](const PyClass &self) { return self.feat_dim; })
+      .def_property_readonly("rms",
+                             [](const PyClass &self) { return self.rms; })
+      .def_property_readonly("empty", &PyClass::Empty)
+      .def(
+          "save",
+          [](const PyClass &self, const std::string &filename) {
+            if (!self.Save(filename)) {
+              throw py::value_error("Failed to save the voice to " + filename);
+            }
+          },
+          py::arg("filename"), py::call_guard<py::gil_scoped_release>())
+      .def_static(
+          "load",
+          [](const std::string &filename) {
+            PyClass voice;
+            if (!voice.Load(filename)) {
+              throw py::value_error("Failed to load a voice from " + filename);
+            }
+            return voice;
+          },
+          py::arg("filename"))
+      .def("__str__", [](const PyClass &self) {
+        std::ostringstream os;
+        os << "OfflineTtsVoice(num_tokens=" << self.tokens.size() << ", ";
+        os << "num_frames=" << self.num_frames << ", ";
+        os << "feat_dim=" << self.feat_dim << ")";
+        return os.str();
+      });
+}
+
 static void PybindOfflineTtsConfig(py::module *m) {
   PybindOfflineTtsModelConfig(m);
 
@@ -49,6 +95,7 @@ static void PybindOfflineTtsConfig(py::module *m) {
 void PybindOfflineTts(py::module *m) {
   PybindOfflineTtsConfig(m);
   PybindGeneratedAudio(m);
+  PybindOfflineTtsVoice(m);
 
   using PyClass = OfflineTts;
   py::class_<PyClass>(*m, "OfflineTts")
@@ -120,7 +167,61 @@ void PybindOfflineTts(py::module *m) {
           py::arg("text"), py::arg("prompt_text"), py::arg("prompt_samples"),
           py::arg("sample_rate"), py::arg("speed") = 1.0,
           py::arg("num_steps") = 4, py::arg("callback") = py::none(),
-          py::call_guard<py::gil_scoped_release>());
+          py::call_guard<py::gil_scoped_release>())
+      .def(
+          "generate",
+          [](const PyClass &self, const std::string &text,
+             const OfflineTtsVoice &voice, float speed, int32_t num_steps,
+             std::function<int32_t(py::array_t<float>, float)> callback)
+              -> GeneratedAudio {
+            if (!callback) {
+              return self.Generate(text, voice, speed, num_steps);
+            }
+
+            std::function<int32_t(const float *, int32_t, float)>
+                callback_wrapper = [callback](const float *samples, int32_t n,
+                                              float progress) {
+                  // CAUTION(fangjun): we have to copy samples since it is
+                  // freed once the call back returns.
+
+                  pybind11::gil_scoped_acquire acquire;
+
+                  pybind11::array_t<float> array(n);
+                  py::buffer_info buf = array.request();
+                  auto p = static_cast<float *>(buf.ptr);
+                  std::copy(samples, samples + n, p);
+                  return callback(array, progress);
+                };
+
+            return self.Generate(text, voice, speed, num_steps,
+                                 callback_wrapper);
+          },
+          py::arg("text"), py::arg("voice"), py::arg("speed") = 1.0,
+          py::arg("num_steps") = 4, py::arg("callback") = py::none(),
+          py::call_guard<py::gil_scoped_release>())
+      .def(
+          "create_voice",
+          [](const PyClass &self, const std::string &prompt_text,
+             py::array_t<float, py::array::c_style | py::array::forcecast>
+                 prompt_samples,
+             int32_t sample_rate) -> OfflineTtsVoice {
+            if (prompt_samples.ndim() != 1) {
+              throw py::value_error(
+                  "Expect a 1-d array for prompt_samples. Given " +
+                  std::to_string(prompt_samples.ndim()) + "-d");
+            }
+
+            const float *p = prompt_samples.data();
+            int32_t n = prompt_samples.size();
+
+            py::gil_scoped_release release;
+            return self.CreateVoice(prompt_text, p, n, sample_rate);
+          },
+          py::arg("prompt_text"), py::arg("prompt_samples"),
+          py::arg("sample_rate"))
+      .def("warmup", &PyClass::Warmup,
+           py::arg("lengths") = std::vector<int32_t>{16, 64},
+           py::call_guard<py::gil_scoped_release>());
 }
 
 }  // namespace sherpa_onnx
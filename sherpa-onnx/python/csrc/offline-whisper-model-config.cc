@@ -15,14 +15,18 @@ void PybindOfflineWhisperModelConfig(py::module *m) {
   using PyClass = OfflineWhisperModelConfig;
   py::class_<PyClass>(*m, "OfflineWhisperModelConfig")
       .def(py::init<const std::string &, const std::string &,
-                    const std::string &, const std::string &, int32_t>(),
+                    const std::string &, const std::string &, int32_t, float,
+                    float>(),
            py::arg("encoder"), py::arg("decoder"), py::arg("language"),
-           py::arg("task"), py::arg("tail_paddings") = -1)
+           py::arg("task"), py::arg("tail_paddings") = -1,
+           py::arg("length_penalty") = -1, py::arg("patience") = 1)
       .def_readwrite("encoder", &PyClass::encoder)
       .def_readwrite("decoder", &PyClass::decoder)
       .def_readwrite("language", &PyClass::language)
       .def_readwrite("task", &PyClass::task)
       .def_readwrite("tail_paddings", &PyClass::tail_paddings)
+      .def_readwrite("length_penalty", &PyClass::length_penalty)
+      .def_readwrite("patience", &PyClass::patience)
       .def("__str__", &PyClass::ToString);
 }
 
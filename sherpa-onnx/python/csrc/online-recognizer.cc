@@ -8,9 +8,102 @@
 #include <vector>
 
 #include "sherpa-onnx/csrc/online-recognizer.h"
+#include "sherpa-onnx/python/csrc/result-arrays.h"
 
 namespace sherpa_onnx {
 
+constexpr const char *kOnlineResultToNumpyUsage = R"(
+Return a dict of numpy arrays:
+
+  - token_ids: int32, token IDs in tokens.txt
+  - timestamps: float32, time in seconds of each token
+  - ys_probs: float32, log-prob of each token from the ASR model
+  - lm_probs: float32, log-prob of each token from the language model
+  - context_scores: float32, score of each token from hotwords
+  - words: int32
+
+ys_probs, lm_probs and context_scores are empty if the decoding method does
+not provide them.
+)";
+
+constexpr const char *kGetResultsUsage = R"(
+Get the results of a list of streams at once in a columnar layout.
+
+It returns a dict:
+
+  - texts: list of str, the text of each stream
+  - segments: int32 array of shape (num_streams,)
+  - start_times: float32 array of shape (num_streams,)
+  - is_final: bool array of shape (num_streams,)
+  - offsets: int64 array of shape (num_streams + 1,). Values of stream i
+    are in [offsets[i], offsets[i+1]) of the following token-level arrays
+  - token_ids: int32 array
+  - timestamps, ys_probs, lm_probs, context_scores: float32 arrays. They
+    are NaN for streams that do not provide them.
+  - word_offsets: int64 array of shape (num_streams + 1,) for words
+  - words: int32 array
+
+Use numpy.split(token_ids, offsets[1:-1]) to get the arrays of each stream.
+)";
+
+static py::dict GetResults(const OnlineRecognizer &recognizer,
+                           const std::vector<OnlineStream *> &ss) {
+  std::vector<OnlineRecognizerResult> results;
+  results.reserve(ss.size());
+  {
+    py::gil_scoped_release release;
+    for (auto *s : ss) {
+      results.push_back(recognizer.GetResult(s));
+    }
+  }
+
+  using Result = OnlineRecognizerResult;
+
+  int32_t n = results.size();
+
+  py::list texts;
+  py::array_t<int32_t> segments(n);
+  py::array_t<float> start_times(n);
+  py::array_t<bool> is_final(n);
+
+  for (int32_t i = 0; i != n; ++i) {
+    const auto &r = results[i];
+    texts.append(py::reinterpret_steal<py::str>(
+        PyUnicode_DecodeUTF8(r.text.c_str(), r.text.size(), "ignore")));
+    segments.mutable_data()[i] = r.segment;
+    start_times.mutable_data()[i] = r.start_time;
+    is_final.mutable_data()[i] = r.is_final;
+  }
+
+  py::array_t<int64_t> offsets;
+  py::array_t<int32_t> token_ids =
+      Concatenate(results, &Result::token_ids, &offsets);
+
+  py::array_t<int64_t> word_offsets;
+  py::array_t<int32_t> words = Concatenate(results, &Result::words,
+                                           &word_offsets);
+
+  py::dict ans;
+  ans["texts"] = texts;
+  ans["segments"] = segments;
+  ans["start_times"] = start_times;
+  ans["is_final"] = is_final;
+  ans["offsets"] = offsets;
+  ans["token_ids"] = token_ids;
+  ans["timestamps"] =
+      ConcatenateTokenAligned(results, &Result::timestamps, offsets);
+  ans["ys_probs"] =
+      ConcatenateTokenAligned(results, &Result::ys_probs, offsets);
+  ans["lm_probs"] =
+      ConcatenateTokenAligned(results, &Result::lm_probs, offsets);
+  ans["context_scores"] =
+      ConcatenateTokenAligned(results, &Result::context_scores, offsets);
+  ans["word_offsets"] = word_offsets;
+  ans["words"] = words;
+
+  return ans;
+}
+
 static void PybindOnlineRecognizerResult(py::module *m) {
   using PyClass = OnlineRecognizerResult;
   py::class_<PyClass>(*m, "OnlineRecognizerResult")
@@ -45,6 +138,22 @@ static void PybindOnlineRecognizerResult(py::module *m) {
           [](PyClass &self) -> std::vector<int32_t> { return self.words; })
       .def_property_readonly(
           "is_final", [](PyClass &self) -> bool { return self.is_final; })
+      .def_property_readonly(
+          "token_ids",
+          [](PyClass &self) { return ToNumpy(self.token_ids); })
+      .def(
+          "to_numpy",
+          [](PyClass &self) {
+            py::dict ans;
+            ans["token_ids"] = ToNumpy(self.token_ids);
+            ans["timestamps"] = ToNumpy(self.timestamps);
+            ans["ys_probs"] = ToNumpy(self.ys_probs);
+            ans["lm_probs"] = ToNumpy(self.lm_probs);
+            ans["context_scores"] = ToNumpy(self.context_scores);
+            ans["words"] = ToNumpy(self.words);
+            return ans;
+          },
+          kOnlineResultToNumpyUsage)
       .def("__str__", &PyClass::AsJsonString,
            py::call_guard<py::gil_scoped_release>())
       .def("as_json_string", &PyClass::AsJsonString,
@@ -119,6 +228,12 @@ void PybindOnlineRecognizer(py::module *m) {
           py::arg("ss"), py::call_guard<py::gil_scoped_release>())
       .def("get_result", &PyClass::GetResult, py::arg("s"),
            py::call_guard<py::gil_scoped_release>())
+      .def(
+          "get_results",
+          [](const PyClass &self, const std::vector<OnlineStream *> &ss) {
+            return GetResults(self, ss);
+          },
+          py::arg("ss"), kGetResultsUsage)
       .def("is_endpoint", &PyClass::IsEndpoint, py::arg("s"),
            py::call_guard<py::gil_scoped_release>())
       .def("reset", &PyClass::Reset, py::arg("s"),
@@ -0,0 +1,57 @@
+// sherpa-onnx/python/csrc/online-speaker-diarization.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/online-speaker-diarization.h"
+
+#include <vector>
+
+#include "sherpa-onnx/csrc/online-speaker-diarization.h"
+
+namespace sherpa_onnx {
+
+static void PybindOnlineSpeakerDiarizationConfig(py::module *m) {
+  using PyClass = OnlineSpeakerDiarizationConfig;
+  py::class_<PyClass>(*m, "OnlineSpeakerDiarizationConfig")
+      .def(py::init<const OfflineSpeakerSegmentationModelConfig &,
+                    const SpeakerEmbeddingExtractorConfig &,
+                    const FastClusteringConfig &, float, float>(),
+           py::arg("segmentation"), py::arg("embedding"), py::arg("clustering"),
+           py::arg("min_duration_on") = 0.3, py::arg("min_duration_off") = 0.5)
+      .def_readwrite("segmentation", &PyClass::segmentation)
+      .def_readwrite("embedding", &PyClass::embedding)
+      .def_readwrite("clustering", &PyClass::clustering)
+      .def_readwrite("min_duration_on", &PyClass::min_duration_on)
+      .def_readwrite("min_duration_off", &PyClass::min_duration_off)
+      .def("__str__", &PyClass::ToString)
+      .def("validate", &PyClass::Validate);
+}
+
+static void PybindOnlineSpeakerDiarizationResult(py::module *m) {
+  using PyClass = OnlineSpeakerDiarizationResult;
+  py::class_<PyClass>(*m, "OnlineSpeakerDiarizationResult")
+      .def_readonly("finalized", &PyClass::finalized)
+      .def_readonly("provisional", &PyClass::provisional)
+      .def("__str__", &PyClass::ToString);
+}
+
+void PybindOnlineSpeakerDiarization(py::module *m) {
+  PybindOnlineSpeakerDiarizationConfig(m);
+  PybindOnlineSpeakerDiarizationResult(m);
+
+  using PyClass = OnlineSpeakerDiarization;
+  py::class_<PyClass>(*m, "OnlineSpeakerDiarization")
+      .def(py::init<const OnlineSpeakerDiarizationConfig &>(),
+           py::arg("config"), py::call_guard<py::gil_scoped_release>())
+      .def_property_readonly("sample_rate", &PyClass::SampleRate)
+      .def(
+          "accept_waveform",
+          [](PyClass &self, const std::vector<float> &samples) {
+            return self.AcceptWaveform(samples.data(), samples.size());
+          },
+          py::arg("samples"), py::call_guard<py::gil_scoped_release>())
+      .def("flush", &PyClass::Flush, py::call_guard<py::gil_scoped_release>())
+      .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>());
+}
+
+}  // namespace sherpa_onnx
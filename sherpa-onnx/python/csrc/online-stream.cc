@@ -4,12 +4,21 @@
 
 #include "sherpa-onnx/python/csrc/online-stream.h"
 
+#include <string>
 #include <vector>
 
 #include "sherpa-onnx/csrc/online-stream.h"
 
 namespace sherpa_onnx {
 
+// Without it, a 2-D array would be flattened silently
+static void CheckWaveformDim(const py::array &waveform) {
+  if (waveform.ndim() != 1) {
+    throw py::value_error("Expect a 1-D array for waveform. Given dim: " +
+                          std::to_string(waveform.ndim()));
+  }
+}
+
 constexpr const char *kAcceptWaveformUsage = R"(
 Process audio samples.
 
@@ -19,7 +28,10 @@ Args:
     expected by the model, we will do resampling inside.
   waveform:
     A 1-D float32 tensor containing audio samples. It must be normalized
-    to the range [-1, 1].
+    to the range [-1, 1]. A C-contiguous float32 numpy array is used
+    without a copy. It can also be a 1-D int16 numpy array, e.g., read from
+    a 16-bit wave file, which is scaled inside without an extra copy in
+    Python.
 )";
 
 
@@ -42,13 +54,44 @@ Return:
 void PybindOnlineStream(py::module *m) {
   using PyClass = OnlineStream;
   py::class_<PyClass>(*m, "OnlineStream")
+      .def(
+          "accept_waveform",
+          [](PyClass &self, float sample_rate,
+             py::array_t<float, py::array::c_style> waveform) {
+            CheckWaveformDim(waveform);
+
+            // waveform is kept alive by the caller, so there is no need to
+            // copy it
+            const float *p = waveform.data();
+            int32_t n = waveform.size();
+
+            py::gil_scoped_release release;
+            self.AcceptWaveform(sample_rate, p, n);
+          },
+          py::arg("sample_rate"), py::arg("waveform").noconvert(),
+          kAcceptWaveformUsage)
+      .def(
+          "accept_waveform",
+          [](PyClass &self, float sample_rate, py::array_t<int16_t> waveform) {
+            CheckWaveformDim(waveform);
+
+            // It copies only if waveform is not contiguous
+            auto w = py::array_t<int16_t, py::array::c_style>::ensure(waveform);
+            const int16_t *p = w.data();
+            int32_t n = w.size();
+
+            py::gil_scoped_release release;
+            self.AcceptWaveform(sample_rate, p, n);
+          },
+          py::arg("sample_rate"), py::arg("waveform").noconvert())
+      // For lists and arrays of other dtypes
       .def(
           "accept_waveform",
           [](PyClass &self, float sample_rate,
              const std::vector<float> &waveform) {
             self.AcceptWaveform(sample_rate, waveform.data(), waveform.size());
           },
-          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage,
+          py::arg("sample_rate"), py::arg("waveform"),
           py::call_guard<py::gil_scoped_release>())
       .def("input_finished", &PyClass::InputFinished,
            py::call_guard<py::gil_scoped_release>())
@@ -0,0 +1,84 @@
+// sherpa-onnx/python/csrc/result-arrays.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_RESULT_ARRAYS_H_
+#define SHERPA_ONNX_PYTHON_CSRC_RESULT_ARRAYS_H_
+
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <vector>
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+// Helpers to return fields of recognition results as numpy arrays with a
+// single memcpy instead of building a Python list element by element.
+
+template <typename T>
+py::array_t<T> ToNumpy(const std::vector<T> &v) {
+  py::array_t<T> ans(v.size());
+  std::copy(v.begin(), v.end(), ans.mutable_data());
+  return ans;
+}
+
+// Concatenate a field of a batch of results into a 1-D array.
+//
+// @param results The results of a batch of streams.
+// @param field Pointer to the field, e.g., &OfflineRecognitionResult::words
+// @param offsets On return, the values of results[i] are in
+//                ans[offsets[i]:offsets[i+1]]. Its size is results.size()+1.
+template <typename Result, typename T>
+py::array_t<T> Concatenate(const std::vector<Result> &results,
+                           std::vector<T> Result::*field,
+                           py::array_t<int64_t> *offsets) {
+  *offsets = py::array_t<int64_t>(results.size() + 1);
+  int64_t *p = offsets->mutable_data();
+
+  p[0] = 0;
+  for (size_t i = 0; i != results.size(); ++i) {
+    p[i + 1] = p[i] + (results[i].*field).size();
+  }
+
+  py::array_t<T> ans(p[results.size()]);
+  T *q = ans.mutable_data();
+  for (const auto &r : results) {
+    q = std::copy((r.*field).begin(), (r.*field).end(), q);
+  }
+
+  return ans;
+}
+
+// Concatenate a field that has one value per token, e.g., timestamps.
+//
+// The returned array has the same layout as the token IDs given by
+// Concatenate(results, &Result::token_ids, &offsets). Results that do not
+// provide the field are filled with NaN.
+template <typename Result>
+py::array_t<float> ConcatenateTokenAligned(
+    const std::vector<Result> &results, std::vector<float> Result::*field,
+    const py::array_t<int64_t> &offsets) {
+  const int64_t *p = offsets.data();
+  py::array_t<float> ans(p[results.size()]);
+  float *q = ans.mutable_data();
+
+  for (size_t i = 0; i != results.size(); ++i) {
+    const auto &v = results[i].*field;
+    int64_t n = p[i + 1] - p[i];
+
+    if (static_cast<int64_t>(v.size()) == n) {
+      std::copy(v.begin(), v.end(), q + p[i]);
+    } else {
+      std::fill(q + p[i], q + p[i + 1],
+                std::numeric_limits<float>::quiet_NaN());
+    }
+  }
+
+  return ans;
+}
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_RESULT_ARRAYS_H_
@@ -12,6 +12,7 @@
 #include "sherpa-onnx/python/csrc/features.h"
 #include "sherpa-onnx/python/csrc/homophone-replacer.h"
 #include "sherpa-onnx/python/csrc/keyword-spotter.h"
+#include "sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.h"
 #include "sherpa-onnx/python/csrc/offline-ctc-fst-decoder-config.h"
 #include "sherpa-onnx/python/csrc/offline-lm-config.h"
 #include "sherpa-onnx/python/csrc/offline-model-config.h"
@@ -25,6 +26,7 @@
 #include "sherpa-onnx/python/csrc/online-model-config.h"
 #include "sherpa-onnx/python/csrc/online-punctuation.h"
 #include "sherpa-onnx/python/csrc/online-recognizer.h"
+#include "sherpa-onnx/python/csrc/online-speech-denoiser.h"
 #include "sherpa-onnx/python/csrc/online-stream.h"
 #include "sherpa-onnx/python/csrc/speaker-embedding-extractor.h"
 #include "sherpa-onnx/python/csrc/speaker-embedding-manager.h"
@@ -43,6 +45,7 @@
 #include "sherpa-onnx/python/csrc/fast-clustering.h"
 #include "sherpa-onnx/python/csrc/offline-speaker-diarization-result.h"
 #include "sherpa-onnx/python/csrc/offline-speaker-diarization.h"
+#include "sherpa-onnx/python/csrc/online-speaker-diarization.h"
 #endif
 
 namespace sherpa_onnx {
@@ -76,6 +79,7 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
   PybindVadModel(&m);
   PybindCircularBuffer(&m);
   PybindVoiceActivityDetector(&m);
+  PybindMultiStreamVoiceActivityDetector(&m);
 
 #if SHERPA_ONNX_ENABLE_TTS == 1
   PybindOfflineTts(&m);
@@ -100,6 +104,7 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
   PybindFastClustering(&m);
   PybindOfflineSpeakerDiarizationResult(&m);
   PybindOfflineSpeakerDiarization(&m);
+  PybindOnlineSpeakerDiarization(&m);
 #else
   /* Define "empty" diarization symbols */
   m.attr("FastClusteringConfig") = py::none();
@@ -110,10 +115,14 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
   m.attr("OfflineSpeakerSegmentationModelConfig") = py::none();
   m.attr("OfflineSpeakerDiarizationConfig") = py::none();
   m.attr("OfflineSpeakerDiarization") = py::none();
+  m.attr("OnlineSpeakerDiarizationConfig") = py::none();
+  m.attr("OnlineSpeakerDiarizationResult") = py::none();
+  m.attr("OnlineSpeakerDiarization") = py::none();
 #endif
 
   PybindAlsa(&m);
   PybindOfflineSpeechDenoiser(&m);
+  PybindOnlineSpeechDenoiser(&m);
   PybindOfflineSourceSeparation(&m);
   PybindVersion(&m);
 }
@@ -5,6 +5,7 @@
 #include "sherpa-onnx/python/csrc/speaker-embedding-extractor.h"
 
 #include <string>
+#include <vector>
 
 #include "sherpa-onnx/csrc/speaker-embedding-extractor.h"
 
@@ -38,6 +39,9 @@ void PybindSpeakerEmbeddingExtractor(py::module *m) {
       .def("compute", &PyClass::Compute,
            py::call_guard<py::gil_scoped_release>())
       .def("is_ready", &PyClass::IsReady,
+           py::call_guard<py::gil_scoped_release>())
+      .def("warmup", &PyClass::Warmup,
+           py::arg("lengths") = std::vector<float>{1.0, 5.0},
            py::call_guard<py::gil_scoped_release>());
 }
 
@@ -5,6 +5,7 @@
 #include "sherpa-onnx/python/csrc/spoken-language-identification.h"
 
 #include <string>
+#include <vector>
 
 #include "sherpa-onnx/csrc/spoken-language-identification.h"
 
@@ -44,8 +45,22 @@ static void PybindSpokenLanguageIdentificationConfig(py::module *m) {
       .def("__str__", &PyClass::ToString);
 }
 
+static void PybindSpokenLanguageIdentificationResult(py::module *m) {
+  using PyClass = SpokenLanguageIdentificationResult;
+
+  py::class_<PyClass>(*m, "SpokenLanguageIdentificationResult")
+      .def_property_readonly("lang",
+                             [](const PyClass &self) { return self.lang; })
+      .def_property_readonly("langs",
+                             [](const PyClass &self) { return self.langs; })
+      .def_property_readonly("probs",
+                             [](const PyClass &self) { return self.probs; })
+      .def("__str__", &PyClass::ToString);
+}
+
 void PybindSpokenLanguageIdentification(py::module *m) {
   PybindSpokenLanguageIdentificationConfig(m);
+  PybindSpokenLanguageIdentificationResult(m);
 
   using PyClass = SpokenLanguageIdentification;
   py::class_<PyClass>(*m, "SpokenLanguageIdentification")
@@ -54,7 +69,15 @@ void PybindSpokenLanguageIdentification(py::module *m) {
       .def("create_stream", &PyClass::CreateStream,
            py::call_guard<py::gil_scoped_release>())
       .def("compute", &PyClass::Compute, py::arg("s"),
-           py::call_guard<py::gil_scoped_release>());
+           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "compute_batch",
+          [](const PyClass &self, std::vector<OfflineStream *> ss,
+             int32_t top_k) {
+            return self.ComputeBatch(ss.data(), ss.size(), top_k);
+          },
+          py::arg("ss"), py::arg("top_k") = 1,
+          py::call_guard<py::gil_scoped_release>());
 }
 
 }  // namespace sherpa_onnx
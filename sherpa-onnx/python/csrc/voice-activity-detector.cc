@@ -49,6 +49,10 @@ void PybindVoiceActivityDetector(py::module *m) {
            py::call_guard<py::gil_scoped_release>())
       .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>())
       .def("flush", &PyClass::Flush, py::call_guard<py::gil_scoped_release>())
+      .def("warmup", &PyClass::Warmup,
+           py::arg("batch_sizes") = std::vector<int32_t>{1},
+           py::arg("lengths") = std::vector<float>{1.0},
+           py::call_guard<py::gil_scoped_release>())
       .def_property_readonly("front", &PyClass::Front)
       .def_property_readonly("current_segment", &PyClass::CurrentSpeechSegment);
 }
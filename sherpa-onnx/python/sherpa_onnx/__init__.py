@@ -1,83 +1,246 @@
-from sherpa_onnx.lib._sherpa_onnx import (
-    Alsa,
-    AudioEvent,
-    AudioTagging,
-    AudioTaggingConfig,
-    AudioTaggingModelConfig,
-    CircularBuffer,
-    DenoisedAudio,
-    FastClustering,
-    FastClusteringConfig,
-    FeatureExtractorConfig,
-    HomophoneReplacerConfig,
-    OfflineCanaryModelConfig,
-    OfflineCtcFstDecoderConfig,
-    OfflineDolphinModelConfig,
-    OfflineFireRedAsrModelConfig,
-    OfflineLMConfig,
-    OfflineModelConfig,
-    OfflineMoonshineModelConfig,
-    OfflineNemoEncDecCtcModelConfig,
-    OfflineParaformerModelConfig,
-    OfflinePunctuation,
-    OfflinePunctuationConfig,
-    OfflinePunctuationModelConfig,
-    OfflineRecognizerConfig,
-    OfflineSenseVoiceModelConfig,
-    OfflineSourceSeparation,
-    OfflineSourceSeparationConfig,
-    OfflineSourceSeparationModelConfig,
-    OfflineSourceSeparationSpleeterModelConfig,
-    OfflineSourceSeparationUvrModelConfig,
-    OfflineSpeakerDiarization,
-    OfflineSpeakerDiarizationConfig,
-    OfflineSpeakerDiarizationResult,
-    OfflineSpeakerDiarizationSegment,
-    OfflineSpeakerSegmentationModelConfig,
-    OfflineSpeakerSegmentationPyannoteModelConfig,
-    OfflineSpeechDenoiser,
-    OfflineSpeechDenoiserConfig,
-    OfflineSpeechDenoiserGtcrnModelConfig,
-    OfflineSpeechDenoiserModelConfig,
-    OfflineStream,
-    OfflineTdnnModelConfig,
-    OfflineTransducerModelConfig,
-    OfflineTts,
-    OfflineTtsConfig,
-    OfflineTtsKittenModelConfig,
-    OfflineTtsKokoroModelConfig,
-    OfflineTtsMatchaModelConfig,
-    OfflineTtsModelConfig,
-    OfflineTtsVitsModelConfig,
-    OfflineTtsZipvoiceModelConfig,
-    OfflineWenetCtcModelConfig,
-    OfflineWhisperModelConfig,
-    OfflineZipformerAudioTaggingModelConfig,
-    OfflineZipformerCtcModelConfig,
-    OnlinePunctuation,
-    OnlinePunctuationConfig,
-    OnlinePunctuationModelConfig,
-    OnlineStream,
-    SileroVadModelConfig,
-    SpeakerEmbeddingExtractor,
-    SpeakerEmbeddingExtractorConfig,
-    SpeakerEmbeddingManager,
-    SpeechSegment,
-    SpokenLanguageIdentification,
-    SpokenLanguageIdentificationConfig,
-    SpokenLanguageIdentificationWhisperConfig,
-    TenVadModelConfig,
-    VadModel,
-    VadModelConfig,
-    VoiceActivityDetector,
-    git_date,
-    git_sha1,
-    version,
-    write_wave,
+"""
+The attributes of this package are loaded lazily on first access (PEP 562),
+so that ``import sherpa_onnx`` is cheap. The C extension is loaded when the
+first binding is accessed and Python wrappers such as OfflineRecognizer are
+imported when they are first accessed.
+
+The time spent in loading them is recorded, see startup_report().
+"""
+
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+from .startup import measure, reset_startup_report, startup_report
+
+# Names exported from the C extension sherpa_onnx.lib._sherpa_onnx
+_BINDINGS = (
+    "Alsa",
+    "AudioEvent",
+    "AudioTagging",
+    "AudioTaggingConfig",
+    "AudioTaggingModelConfig",
+    "CircularBuffer",
+    "DenoisedAudio",
+    "FastClustering",
+    "FastClusteringConfig",
+    "FeatureExtractorConfig",
+    "HomophoneReplacerConfig",
+    "MultiStreamVoiceActivityDetector",
+    "OfflineCanaryModelConfig",
+    "OfflineCtcFstDecoderConfig",
+    "OfflineDolphinModelConfig",
+    "OfflineFireRedAsrModelConfig",
+    "OfflineLMConfig",
+    "OfflineModelConfig",
+    "OfflineMoonshineModelConfig",
+    "OfflineNemoEncDecCtcModelConfig",
+    "OfflineParaformerModelConfig",
+    "OfflinePunctuation",
+    "OfflinePunctuationConfig",
+    "OfflinePunctuationModelConfig",
+    "OfflineRecognizerConfig",
+    "OfflineSenseVoiceModelConfig",
+    "OfflineSourceSeparation",
+    "OfflineSourceSeparationChunkConfig",
+    "OfflineSourceSeparationChunker",
+    "OfflineSourceSeparationConfig",
+    "OfflineSourceSeparationModelConfig",
+    "OfflineSourceSeparationSpleeterModelConfig",
+    "OfflineSourceSeparationUvrModelConfig",
+    "OfflineSpeakerDiarization",
+    "OfflineSpeakerDiarizationConfig",
+    "OfflineSpeakerDiarizationResult",
+    "OfflineSpeakerDiarizationSegment",
+    "OfflineSpeakerSegmentationModelConfig",
+    "OfflineSpeakerSegmentationPyannoteModelConfig",
+    "OfflineSpeechDenoiser",
+    "OfflineSpeechDenoiserConfig",
+    "OfflineSpeechDenoiserGtcrnModelConfig",
+    "OfflineSpeechDenoiserModelConfig",
+    "OfflineStream",
+    "OfflineTdnnModelConfig",
+    "OfflineTransducerModelConfig",
+    "OfflineTts",
+    "OfflineTtsConfig",
+    "OfflineTtsKittenModelConfig",
+    "OfflineTtsKokoroModelConfig",
+    "OfflineTtsMatchaModelConfig",
+    "OfflineTtsModelConfig",
+    "OfflineTtsVitsModelConfig",
+    "OfflineTtsVoice",
+    "OfflineTtsZipvoiceModelConfig",
+    "OfflineWenetCtcModelConfig",
+    "OfflineWhisperModelConfig",
+    "OfflineZipformerAudioTaggingModelConfig",
+    "OfflineZipformerCtcModelConfig",
+    "OnlinePunctuation",
+    "OnlinePunctuationConfig",
+    "OnlinePunctuationModelConfig",
+    "OnlineSpeakerDiarization",
+    "OnlineSpeakerDiarizationConfig",
+    "OnlineSpeakerDiarizationResult",
+    "OnlineSpeechDenoiser",
+    "OnlineSpeechDenoiserConfig",
+    "OnlineStream",
+    "SileroVadModelConfig",
+    "SpeakerEmbeddingExtractor",
+    "SpeakerEmbeddingExtractorConfig",
+    "SpeakerEmbeddingManager",
+    "SpeechSegment",
+    "SpokenLanguageIdentification",
+    "SpokenLanguageIdentificationConfig",
+    "SpokenLanguageIdentificationResult",
+    "SpokenLanguageIdentificationWhisperConfig",
+    "TenVadModelConfig",
+    "VadEvent",
+    "VadModel",
+    "VadModelConfig",
+    "VoiceActivityDetector",
+    "git_date",
+    "git_sha1",
+    "version",
+    "write_wave",
 )
 
-from .display import Display
-from .keyword_spotter import KeywordSpotter
-from .offline_recognizer import OfflineRecognizer
-from .online_recognizer import OnlineRecognizer
-from .utils import text2token
+# Names exported from Python modules of this package
+_SUBMODULE_ATTRS = {
+    "Display": "display",
+    "KeywordSpotter": "keyword_spotter",
+    "OfflineRecognizer": "offline_recognizer",
+    "OnlineRecognizer": "online_recognizer",
+    "text2token": "utils",
+}
+
+__all__ = sorted(
+    list(_BINDINGS)
+    + list(_SUBMODULE_ATTRS)
+    + ["measure", "reset_startup_report", "startup_report"]
+)
+
+
+def _import(name: str, component: str):
+    if name in sys.modules:
+        return sys.modules[name]
+
+    with measure(component, "import"):
+        return importlib.import_module(name)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULE_ATTRS:
+        # The Python modules import the C extension. Load it first so that
+        # its time is recorded separately.
+        _import("sherpa_onnx.lib._sherpa_onnx", "_sherpa_onnx")
+        module = _import(f"{__name__}.{_SUBMODULE_ATTRS[name]}", name)
+    elif name in _BINDINGS:
+        module = _import("sherpa_onnx.lib._sherpa_onnx", "_sherpa_onnx")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(module, name)
+
+    # Cache it so that __getattr__ is not called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
+
+
+if TYPE_CHECKING:
+    from sherpa_onnx.lib._sherpa_onnx import (
+        Alsa,
+        AudioEvent,
+        AudioTagging,
+        AudioTaggingConfig,
+        AudioTaggingModelConfig,
+        CircularBuffer,
+        DenoisedAudio,
+        FastClustering,
+        FastClusteringConfig,
+        FeatureExtractorConfig,
+        HomophoneReplacerConfig,
+        MultiStreamVoiceActivityDetector,
+        OfflineCanaryModelConfig,
+        OfflineCtcFstDecoderConfig,
+        OfflineDolphinModelConfig,
+        OfflineFireRedAsrModelConfig,
+        OfflineLMConfig,
+        OfflineModelConfig,
+        OfflineMoonshineModelConfig,
+        OfflineNemoEncDecCtcModelConfig,
+        OfflineParaformerModelConfig,
+        OfflinePunctuation,
+        OfflinePunctuationConfig,
+        OfflinePunctuationModelConfig,
+        OfflineRecognizerConfig,
+        OfflineSenseVoiceModelConfig,
+        OfflineSourceSeparation,
+        OfflineSourceSeparationChunkConfig,
+        OfflineSourceSeparationChunker,
+        OfflineSourceSeparationConfig,
+        OfflineSourceSeparationModelConfig,
+        OfflineSourceSeparationSpleeterModelConfig,
+        OfflineSourceSeparationUvrModelConfig,
+        OfflineSpeakerDiarization,
+        OfflineSpeakerDiarizationConfig,
+        OfflineSpeakerDiarizationResult,
+        OfflineSpeakerDiarizationSegment,
+        OfflineSpeakerSegmentationModelConfig,
+        OfflineSpeakerSegmentationPyannoteModelConfig,
+        OfflineSpeechDenoiser,
+        OfflineSpeechDenoiserConfig,
+        OfflineSpeechDenoiserGtcrnModelConfig,
+        OfflineSpeechDenoiserModelConfig,
+        OfflineStream,
+        OfflineTdnnModelConfig,
+        OfflineTransducerModelConfig,
+        OfflineTts,
+        OfflineTtsConfig,
+        OfflineTtsKittenModelConfig,
+        OfflineTtsKokoroModelConfig,
+        OfflineTtsMatchaModelConfig,
+        OfflineTtsModelConfig,
+        OfflineTtsVitsModelConfig,
+        OfflineTtsVoice,
+        OfflineTtsZipvoiceModelConfig,
+        OfflineWenetCtcModelConfig,
+        OfflineWhisperModelConfig,
+        OfflineZipformerAudioTaggingModelConfig,
+        OfflineZipformerCtcModelConfig,
+        OnlinePunctuation,
+        OnlinePunctuationConfig,
+        OnlinePunctuationModelConfig,
+        OnlineSpeakerDiarization,
+        OnlineSpeakerDiarizationConfig,
+        OnlineSpeakerDiarizationResult,
+        OnlineSpeechDenoiser,
+        OnlineSpeechDenoiserConfig,
+        OnlineStream,
+        SileroVadModelConfig,
+        SpeakerEmbeddingExtractor,
+        SpeakerEmbeddingExtractorConfig,
+        SpeakerEmbeddingManager,
+        SpeechSegment,
+        SpokenLanguageIdentification,
+        SpokenLanguageIdentificationConfig,
+        SpokenLanguageIdentificationResult,
+        SpokenLanguageIdentificationWhisperConfig,
+        TenVadModelConfig,
+        VadEvent,
+        VadModel,
+        VadModelConfig,
+        VoiceActivityDetector,
+        git_date,
+        git_sha1,
+        version,
+        write_wave,
+    )
+
+    from .display import Display
+    from .keyword_spotter import KeywordSpotter
+    from .offline_recognizer import OfflineRecognizer
+    from .online_recognizer import OnlineRecognizer
+    from .utils import text2token
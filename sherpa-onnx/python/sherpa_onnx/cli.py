@@ -1,6 +1,16 @@
 # Copyright (c)  2023  Xiaomi Corporation
 
+import json
 import logging
+import os
+import queue
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
 try:
     import click
 except ImportError:
@@ -10,7 +20,9 @@ except ImportError:
     raise
 
 from pathlib import Path
-from sherpa_onnx import text2token
+
+import numpy as np
+from sherpa_onnx import OfflineRecognizer, text2token
 
 
 @click.group()
@@ -107,3 +119,585 @@ def encode_text(
         for i, txt in enumerate(encoded_texts):
             txt += extra_info[i]
             f.write(" ".join(txt) + "\n")
+
+
+def _read_manifests(manifests: Tuple[str, ...]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (utterance_id, path) pairs. Each line of a manifest is one of
+
+      - a path, which is also used as the utterance id
+      - an utterance id followed by a path, as in a kaldi wav.scp
+      - a JSON object with a path in "audio_filepath", "path" or "wav" and
+        an optional "id"
+    """
+    for manifest in manifests:
+        with open(manifest, encoding="utf8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                if line.startswith("{"):
+                    d = json.loads(line)
+                    path = d.get("audio_filepath") or d.get("path") or d["wav"]
+                    yield str(d.get("id", path)), path
+                    continue
+
+                fields = line.split(maxsplit=1)
+                if len(fields) == 1:
+                    yield fields[0], fields[0]
+                else:
+                    yield fields[0], fields[1]
+
+
+def _read_finished(output: Path, retry_errors: bool) -> Set[str]:
+    """
+    Return the ids of the utterances in an existing output file.
+
+    An incomplete last line left by an interrupted run is removed.
+    """
+    finished = set()
+    if not output.is_file():
+        return finished
+
+    size = 0
+    with open(output, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                r = json.loads(line)
+            except ValueError:
+                break
+
+            size += len(line)
+            if not (retry_errors and "error" in r):
+                finished.add(r["id"])
+
+    if size != output.stat().st_size:
+        logging.warning(f"Remove incomplete results at the end of {output}")
+        with open(output, "r+b") as f:
+            f.truncate(size)
+
+    return finished
+
+
+def _read_audio(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Return a 1-D float32 array of the first channel in the range [-1, 1]
+    and the sample rate. soundfile is used if installed; otherwise only
+    16-bit wave files are supported.
+    """
+    try:
+        import soundfile as sf
+    except ImportError:
+        sf = None
+
+    if sf is not None:
+        samples, sample_rate = sf.read(path, always_2d=True, dtype="float32")
+        return np.ascontiguousarray(samples[:, 0]), sample_rate
+
+    with wave.open(path) as f:
+        assert f.getsampwidth() == 2, (
+            f"{path}: only 16-bit wave files are supported without soundfile"
+        )
+        num_channels = f.getnchannels()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        samples = samples[::num_channels].astype(np.float32) / 32768
+        return samples, f.getframerate()
+
+
+class _ThroughputReport(object):
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.start = time.time()
+        self.last_report = self.start
+        self.num_files = 0
+        self.num_errors = 0
+        self.audio_duration = 0.0
+
+    def update(self, record: Dict):
+        if "error" in record:
+            self.num_errors += 1
+        else:
+            self.num_files += 1
+            self.audio_duration += record["duration"]
+
+        now = time.time()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.log()
+
+    def log(self):
+        elapsed = max(time.time() - self.start, 1e-6)
+        rtf = elapsed / self.audio_duration if self.audio_duration else 0
+        logging.info(
+            f"files: {self.num_files}, errors: {self.num_errors}, "
+            f"audio: {self.audio_duration / 3600:.3f} h, "
+            f"elapsed: {elapsed:.1f} s, "
+            f"files/s: {self.num_files / elapsed:.2f}, RTF: {rtf:.4f}"
+        )
+
+
+def _make_batches(
+    items: List[Dict], max_batch_size: int, max_batch_duration: float
+) -> List[List[Dict]]:
+    """
+    Group items of similar durations so that little padding is needed.
+    A batch has at most max_batch_size items and the duration of its longest
+    item times its size does not exceed max_batch_duration.
+    """
+    items = sorted(items, key=lambda x: x["duration"], reverse=True)
+
+    batches = []
+    batch = []
+    for item in items:
+        # items are sorted, so batch[0] is the longest one
+        longest = batch[0]["duration"] if batch else item["duration"]
+        if batch and (
+            len(batch) >= max_batch_size
+            or longest * (len(batch) + 1) > max_batch_duration
+        ):
+            batches.append(batch)
+            batch = []
+        batch.append(item)
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def _schedule(
+    entries: Iterator[Tuple[str, str]],
+    create_stream,
+    batch_queue: queue.Queue,
+    result_queue: queue.Queue,
+    num_loaders: int,
+    sort_buffer_size: int,
+    max_batch_size: int,
+    max_batch_duration: float,
+    num_workers: int,
+):
+    """
+    Read audio files with a pool of loaders, which also compute features,
+    sort them by duration in chunks of sort_buffer_size files and put batches
+    into batch_queue. Files that cannot be read go to result_queue directly.
+    """
+
+    def load(utt_id: str, path: str) -> Dict:
+        try:
+            samples, sample_rate = _read_audio(path)
+            stream = create_stream()
+            stream.accept_waveform(sample_rate, samples)
+            return {
+                "id": utt_id,
+                "path": path,
+                "duration": samples.shape[0] / sample_rate,
+                "stream": stream,
+            }
+        except Exception as e:
+            return {"id": utt_id, "path": path, "error": str(e)}
+
+    buffer = []
+
+    def add(item: Dict):
+        if "error" in item:
+            result_queue.put(item)
+            return
+
+        buffer.append(item)
+        if len(buffer) >= sort_buffer_size:
+            flush()
+
+    def flush():
+        for batch in _make_batches(buffer, max_batch_size, max_batch_duration):
+            batch_queue.put(batch)
+        buffer.clear()
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_loaders) as pool:
+            pending = deque()
+            for utt_id, path in entries:
+                pending.append(pool.submit(load, utt_id, path))
+                if len(pending) >= 2 * sort_buffer_size:
+                    add(pending.popleft().result())
+
+            while pending:
+                add(pending.popleft().result())
+
+        flush()
+    except Exception:
+        logging.exception("Failed to read the manifests")
+    finally:
+        # Tell the workers to stop
+        for _ in range(num_workers):
+            batch_queue.put(None)
+
+
+def _decode(
+    recognizer: OfflineRecognizer,
+    batch_queue: queue.Queue,
+    result_queue: queue.Queue,
+    output_timestamps: bool,
+):
+    try:
+        while True:
+            batch = batch_queue.get()
+            if batch is None:
+                break
+
+            try:
+                recognizer.decode_streams([item["stream"] for item in batch])
+            except Exception as e:
+                for item in batch:
+                    result_queue.put(_make_error_record(item, e))
+                continue
+
+            for item in batch:
+                try:
+                    record = _make_record(item, output_timestamps)
+                except Exception as e:
+                    record = _make_error_record(item, e)
+                result_queue.put(record)
+    finally:
+        # decode_files() waits for one sentinel per worker
+        result_queue.put(None)
+
+
+def _make_error_record(item: Dict, e: Exception) -> Dict:
+    return {"id": item["id"], "path": item["path"], "error": str(e)}
+
+
+def _make_record(item: Dict, output_timestamps: bool) -> Dict:
+    result = item["stream"].result
+    record = {
+        "id": item["id"],
+        "path": item["path"],
+        "duration": round(item["duration"], 3),
+        "text": result.text,
+    }
+    if result.lang:
+        record["lang"] = result.lang
+    if output_timestamps:
+        record["tokens"] = list(result.tokens)
+        record["timestamps"] = [round(t, 3) for t in result.timestamps]
+    return record
+
+
+def _create_recognizer(
+    tokens: str,
+    encoder: Optional[str],
+    decoder: Optional[str],
+    joiner: Optional[str],
+    paraformer: Optional[str],
+    sense_voice: Optional[str],
+    nemo_ctc: Optional[str],
+    zipformer_ctc: Optional[str],
+    whisper_language: str,
+    decoding_method: str,
+    num_threads: int,
+    provider: str,
+) -> OfflineRecognizer:
+    if encoder and joiner:
+        return OfflineRecognizer.from_transducer(
+            encoder=encoder,
+            decoder=decoder,
+            joiner=joiner,
+            tokens=tokens,
+            num_threads=num_threads,
+            decoding_method=decoding_method,
+            provider=provider,
+        )
+    elif encoder:
+        return OfflineRecognizer.from_whisper(
+            encoder=encoder,
+            decoder=decoder,
+            tokens=tokens,
+            language=whisper_language,
+            num_threads=num_threads,
+            decoding_method=decoding_method,
+            provider=provider,
+        )
+    elif paraformer:
+        return OfflineRecognizer.from_paraformer(
+            paraformer=paraformer,
+            tokens=tokens,
+            num_threads=num_threads,
+            decoding_method=decoding_method,
+            provider=provider,
+        )
+    elif sense_voice:
+        return OfflineRecognizer.from_sense_voice(
+            model=sense_voice,
+            tokens=tokens,
+            num_threads=num_threads,
+            use_itn=True,
+            provider=provider,
+        )
+    elif nemo_ctc:
+        return OfflineRecognizer.from_nemo_ctc(
+            model=nemo_ctc,
+            tokens=tokens,
+            num_threads=num_threads,
+            decoding_method=decoding_method,
+            provider=provider,
+        )
+    elif zipformer_ctc:
+        return OfflineRecognizer.from_zipformer_ctc(
+            model=zipformer_ctc,
+            tokens=tokens,
+            num_threads=num_threads,
+            decoding_method=decoding_method,
+            provider=provider,
+        )
+
+    raise click.UsageError(
+        "Please specify a model: --encoder/--decoder/--joiner for transducer, "
+        "--encoder/--decoder for whisper, --paraformer, --sense-voice, "
+        "--nemo-ctc or --zipformer-ctc"
+    )
+
+
+@cli.command(name="decode-files")
+@click.argument(
+    "manifests",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Path to the output JSONL file. If it exists, files in it are skipped "
+    "and new results are appended.",
+)
+@click.option("--tokens", type=str, required=True, help="Path to tokens.txt")
+@click.option("--encoder", type=str, help="Encoder of a transducer or whisper model")
+@click.option("--decoder", type=str, help="Decoder of a transducer or whisper model")
+@click.option("--joiner", type=str, help="Joiner of a transducer model")
+@click.option("--paraformer", type=str, help="Path to a paraformer model")
+@click.option("--sense-voice", type=str, help="Path to a SenseVoice model")
+@click.option("--nemo-ctc", type=str, help="Path to a NeMo CTC model")
+@click.option("--zipformer-ctc", type=str, help="Path to a zipformer CTC model")
+@click.option(
+    "--whisper-language",
+    type=str,
+    default="",
+    help="Language for whisper models. Empty to detect it",
+)
+@click.option(
+    "--decoding-method",
+    type=str,
+    default="greedy_search",
+    help="greedy_search or modified_beam_search",
+)
+@click.option("--provider", type=str, default="cpu", help="cpu, cuda or coreml")
+@click.option(
+    "--num-workers",
+    type=int,
+    default=2,
+    help="Number of recognizers decoding batches in parallel",
+)
+@click.option(
+    "--num-threads",
+    type=int,
+    default=1,
+    help="Number of threads of each recognizer",
+)
+@click.option(
+    "--num-loaders",
+    type=int,
+    default=4,
+    help="Number of threads reading audio and computing features",
+)
+@click.option(
+    "--max-batch-size",
+    type=int,
+    default=32,
+    help="Max number of files in a batch",
+)
+@click.option(
+    "--max-batch-duration",
+    type=float,
+    default=600,
+    help="Max padded duration in seconds of a batch, i.e., its size times its "
+    "longest file",
+)
+@click.option(
+    "--sort-buffer-size",
+    type=int,
+    default=256,
+    help="Files are sorted by duration in groups of this size before batching",
+)
+@click.option(
+    "--checkpoint-interval",
+    type=float,
+    default=30,
+    help="Sync the output file to disk every this many seconds",
+)
+@click.option(
+    "--report-interval",
+    type=float,
+    default=60,
+    help="Log the throughput every this many seconds",
+)
+@click.option(
+    "--retry-errors",
+    is_flag=True,
+    help="Decode again the files that failed in a previous run",
+)
+@click.option(
+    "--output-timestamps",
+    is_flag=True,
+    help="Also write tokens and their timestamps",
+)
+def decode_files(
+    manifests: Tuple[str, ...],
+    output: str,
+    tokens: str,
+    encoder: Optional[str],
+    decoder: Optional[str],
+    joiner: Optional[str],
+    paraformer: Optional[str],
+    sense_voice: Optional[str],
+    nemo_ctc: Optional[str],
+    zipformer_ctc: Optional[str],
+    whisper_language: str,
+    decoding_method: str,
+    provider: str,
+    num_workers: int,
+    num_threads: int,
+    num_loaders: int,
+    max_batch_size: int,
+    max_batch_duration: float,
+    sort_buffer_size: int,
+    checkpoint_interval: float,
+    report_interval: float,
+    retry_errors: bool,
+    output_timestamps: bool,
+):
+    """
+    Decode the audio files listed in MANIFESTS with a non-streaming model
+    and write one JSON object per file to the output.
+
+    Each line of a manifest is a path, "utt_id path" as in a kaldi wav.scp,
+    or a JSON object with "audio_filepath" (or "path") and "id".
+
+    Audio files are read by --num-loaders threads, grouped into batches of
+    similar durations and decoded by --num-workers recognizers in parallel.
+    Results are appended to the output as soon as a batch is decoded, so an
+    interrupted run can be resumed by running the same command again. Files
+    that cannot be decoded are written with an "error" field; use
+    --retry-errors to decode them again in the next run. In that case,
+    the last line of a file id in the output is its final result.
+
+    example:
+
+    sherpa-onnx-cli decode-files \\
+      --tokens ./sherpa-onnx-paraformer-zh-2023-09-14/tokens.txt \\
+      --paraformer ./sherpa-onnx-paraformer-zh-2023-09-14/model.int8.onnx \\
+      --num-workers 4 \\
+      --output results.jsonl \\
+      wav.scp
+    """
+    kwargs = dict(
+        tokens=tokens,
+        encoder=encoder,
+        decoder=decoder,
+        joiner=joiner,
+        paraformer=paraformer,
+        sense_voice=sense_voice,
+        nemo_ctc=nemo_ctc,
+        zipformer_ctc=zipformer_ctc,
+        whisper_language=whisper_language,
+        decoding_method=decoding_method,
+        num_threads=num_threads,
+        provider=provider,
+    )
+    recognizers = [_create_recognizer(**kwargs) for _ in range(num_workers)]
+
+    output = Path(output)
+    finished = _read_finished(output, retry_errors)
+    if finished:
+        logging.info(f"Skip {len(finished)} files found in {output}")
+
+    def entries():
+        seen = set()
+        for utt_id, path in _read_manifests(manifests):
+            if utt_id in finished or utt_id in seen:
+                continue
+            seen.add(utt_id)
+            yield utt_id, path
+
+    # Bound the number of batches in memory
+    batch_queue = queue.Queue(maxsize=2 * num_workers)
+    result_queue = queue.Queue()
+
+    # Streams do not depend on the recognizer that creates them
+    scheduler = threading.Thread(
+        target=_schedule,
+        kwargs=dict(
+            entries=entries(),
+            create_stream=recognizers[0].create_stream,
+            batch_queue=batch_queue,
+            result_queue=result_queue,
+            num_loaders=num_loaders,
+            sort_buffer_size=sort_buffer_size,
+            max_batch_size=max_batch_size,
+            max_batch_duration=max_batch_duration,
+            num_workers=num_workers,
+        ),
+        daemon=True,
+    )
+    workers = [
+        threading.Thread(
+            target=_decode,
+            args=(r, batch_queue, result_queue, output_timestamps),
+            daemon=True,
+        )
+        for r in recognizers
+    ]
+
+    scheduler.start()
+    for w in workers:
+        w.start()
+
+    report = _ThroughputReport(report_interval)
+    last_sync = time.time()
+
+    with open(output, "a", encoding="utf8") as f:
+        num_running = num_workers
+        while num_running > 0:
+            record = result_queue.get()
+            if record is None:
+                num_running -= 1
+                continue
+
+            if "error" in record:
+                logging.warning(
+                    f"Failed to decode {record['path']}: {record['error']}"
+                )
+
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            report.update(record)
+
+            if result_queue.empty():
+                f.flush()
+
+            if time.time() - last_sync >= checkpoint_interval:
+                f.flush()
+                os.fsync(f.fileno())
+                last_sync = time.time()
+
+        # Errors of the loaders are put into result_queue before the
+        # workers exit, so there is nothing left in it
+        f.flush()
+        os.fsync(f.fileno())
+
+    scheduler.join()
+    for w in workers:
+        w.join()
+
+    report.log()
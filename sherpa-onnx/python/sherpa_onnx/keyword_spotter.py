@@ -1,7 +1,7 @@
 # Copyright (c)  2023  Xiaomi Corporation
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from sherpa_onnx.lib._sherpa_onnx import (
     FeatureExtractorConfig,
@@ -13,6 +13,7 @@ from sherpa_onnx.lib._sherpa_onnx import (
 )
 
 from sherpa_onnx.lib._sherpa_onnx import KeywordSpotter as _KeywordSpotter
+from sherpa_onnx.startup import measure
 
 
 def _assert_file_exists(f: str):
@@ -27,6 +28,9 @@ class KeywordSpotter(object):
      - https://github.com/k2-fsa/sherpa-onnx/blob/master/python-api-examples/keyword-spotter-from-microphone.py
     """
 
+    # True after the first call to decode_stream() or decode_streams()
+    _decoded = False
+
     def __init__(
         self,
         tokens: str,
@@ -129,22 +133,92 @@ class KeywordSpotter(object):
             keywords_threshold=keywords_threshold,
             keywords_file=keywords_file,
         )
-        self.keyword_spotter = _KeywordSpotter(keywords_spotter_config)
+        with measure("KeywordSpotter", "model_load"):
+            self.keyword_spotter = _KeywordSpotter(keywords_spotter_config)
 
     def reset_stream(self, s: OnlineStream):
         self.keyword_spotter.reset(s)
 
-    def create_stream(self, keywords: Optional[str] = None):
+    def create_stream(
+        self,
+        keywords: Optional[str] = None,
+        keyword_set: Optional[str] = None,
+    ):
+        """Create a stream for keyword spotting.
+
+        Args:
+          keywords:
+            If not None, the stream uses these keywords in addition to the
+            ones from ``keywords_file``. Keywords are separated by ``/``.
+          keyword_set:
+            If not None, the stream uses the keyword set with this id. See
+            :meth:`add_keyword_set`. It cannot be used together with
+            ``keywords``.
+        """
+        if keyword_set is not None:
+            assert keywords is None, "Please specify either keywords or keyword_set"
+            s = self.keyword_spotter.create_stream_with_keyword_set(keyword_set)
+            if s is None:
+                raise ValueError(f"Unknown keyword set: {keyword_set}")
+            return s
+
         if keywords is None:
             return self.keyword_spotter.create_stream()
         else:
             return self.keyword_spotter.create_stream(keywords)
 
+    def add_keyword_set(self, set_id: str, keywords: Union[str, List[str]]):
+        """Add a named keyword set or replace an existing one.
+
+        The keywords are compiled once and shared by all streams created
+        with ``create_stream(keyword_set=set_id)``. Streams of a replaced set
+        switch to the new keywords before their next decoding step. The model
+        is not reloaded.
+
+        Args:
+          set_id:
+            Id of the keyword set.
+          keywords:
+            Either a string with keywords separated by ``/`` or a list of
+            keywords, in the same format as lines of ``keywords_file``.
+        """
+        if not isinstance(keywords, str):
+            keywords = "/".join(keywords)
+
+        if not self.keyword_spotter.add_keyword_set(set_id, keywords):
+            raise ValueError(f"Failed to encode keywords for {set_id}: {keywords}")
+
+    def remove_keyword_set(self, set_id: str) -> bool:
+        """Remove a keyword set. Streams still using it keep its last keywords.
+
+        Returns:
+          Return False if there is no keyword set with the given id.
+        """
+        return self.keyword_spotter.remove_keyword_set(set_id)
+
+    @property
+    def keyword_set_ids(self) -> List[str]:
+        return self.keyword_spotter.keyword_set_ids
+
     def decode_stream(self, s: OnlineStream):
-        self.keyword_spotter.decode_stream(s)
+        if self._decoded:
+            self.keyword_spotter.decode_stream(s)
+            return
+
+        # The first call is much slower than later calls
+        with measure("KeywordSpotter", "warmup"):
+            self.keyword_spotter.decode_stream(s)
+        self._decoded = True
 
     def decode_streams(self, ss: List[OnlineStream]):
-        self.keyword_spotter.decode_streams(ss)
+        if self._decoded:
+            self.keyword_spotter.decode_streams(ss)
+            return
+
+        # The first call is much slower than later calls
+        with measure("KeywordSpotter", "warmup"):
+            self.keyword_spotter.decode_streams(ss)
+        self._decoded = True
 
     def is_ready(self, s: OnlineStream) -> bool:
         return self.keyword_spotter.is_ready(s)
@@ -27,6 +27,7 @@ from sherpa_onnx.lib._sherpa_onnx import (
     OfflineWhisperModelConfig,
     OfflineZipformerCtcModelConfig,
 )
+from sherpa_onnx.startup import measure
 
 
 def _assert_file_exists(f: str):
@@ -41,6 +42,9 @@ class OfflineRecognizer(object):
      - https://github.com/k2-fsa/sherpa-onnx/blob/master/python-api-examples/offline-decode-files.py
     """
 
+    # True after the first call to decode_stream() or decode_streams()
+    _decoded = False
+
     @classmethod
     def from_transducer(
         cls,
@@ -200,7 +204,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -290,7 +295,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -371,7 +377,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -451,7 +458,8 @@ class OfflineRecognizer(object):
                 dict_dir=hr_dict_dir, lexicon=hr_lexicon, rule_fsts=hr_rule_fsts
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -531,7 +539,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -612,7 +621,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -694,7 +704,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -790,7 +801,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -812,6 +824,9 @@ class OfflineRecognizer(object):
         hr_dict_dir: str = "",
         hr_rule_fsts: str = "",
         hr_lexicon: str = "",
+        max_active_paths: int = 4,
+        length_penalty: float = -1,
+        patience: float = 1,
     ):
         """
         Please refer to
@@ -843,7 +858,7 @@ class OfflineRecognizer(object):
           num_threads:
             Number of threads for neural network computation.
           decoding_method:
-            Valid values: greedy_search.
+            Valid values: greedy_search, beam_search.
           debug:
             True to show debug messages.
           provider:
@@ -854,6 +869,15 @@ class OfflineRecognizer(object):
           rule_fars:
             If not empty, it specifies fst archives for inverse text normalization.
             If there are multiple archives, they are separated by a comma.
+          max_active_paths:
+            The beam size. Used only when decoding_method is beam_search.
+          length_penalty:
+            Used only when decoding_method is beam_search. If negative, the
+            log-prob of a hypothesis is divided by its length. Otherwise, it
+            is divided by ``((5 + length) / 6) ** length_penalty``.
+          patience:
+            Used only when decoding_method is beam_search. Beam search stops
+            once ``max_active_paths * patience`` hypotheses have ended.
         """
         self = cls.__new__(cls)
         model_config = OfflineModelConfig(
@@ -863,6 +887,8 @@ class OfflineRecognizer(object):
                 language=language,
                 task=task,
                 tail_paddings=tail_paddings,
+                length_penalty=length_penalty,
+                patience=patience,
             ),
             tokens=tokens,
             num_threads=num_threads,
@@ -880,6 +906,7 @@ class OfflineRecognizer(object):
             feat_config=feat_config,
             model_config=model_config,
             decoding_method=decoding_method,
+            max_active_paths=max_active_paths,
             rule_fsts=rule_fsts,
             rule_fars=rule_fars,
             hr=HomophoneReplacerConfig(
@@ -888,7 +915,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -968,7 +996,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -1057,7 +1086,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -1138,7 +1168,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -1220,7 +1251,8 @@ class OfflineRecognizer(object):
                 rule_fsts=hr_rule_fsts,
             ),
         )
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OfflineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -1231,7 +1263,48 @@ class OfflineRecognizer(object):
             return self.recognizer.create_stream(hotwords)
 
     def decode_stream(self, s: OfflineStream):
-        self.recognizer.decode_stream(s)
+        if self._decoded:
+            self.recognizer.decode_stream(s)
+            return
+
+        # The first call is much slower than later calls
+        with measure("OfflineRecognizer", "warmup"):
+            self.recognizer.decode_stream(s)
+        self._decoded = True
 
     def decode_streams(self, ss: List[OfflineStream]):
-        self.recognizer.decode_streams(ss)
+        if self._decoded:
+            self.recognizer.decode_streams(ss)
+            return
+
+        # The first call is much slower than later calls
+        with measure("OfflineRecognizer", "warmup"):
+            self.recognizer.decode_streams(ss)
+        self._decoded = True
+
+    def warmup(
+        self,
+        batch_sizes: List[int] = (1,),
+        lengths: List[float] = (1.0, 5.0),
+    ):
+        """Decode batches of dummy audio so that the first real request
+        is not slowed down by the lazy initialization of onnxruntime.
+
+        Args:
+          batch_sizes:
+            Number of streams to decode together.
+          lengths:
+            Duration in seconds of the audio of each stream.
+        """
+        with measure("OfflineRecognizer", "warmup"):
+            self.recognizer.warmup(batch_sizes=batch_sizes, lengths=lengths)
+        self._decoded = True
+
+    def get_results(self, ss: List[OfflineStream]) -> dict:
+        """Return the results of a list of decoded streams as numpy arrays.
+
+        The values of ss[i] are in token_ids[offsets[i]:offsets[i+1]]
+        and timestamps[offsets[i]:offsets[i+1]]. Please see the help
+        of the C++ binding for all fields.
+        """
+        return self.recognizer.get_results(ss)
@@ -25,6 +25,7 @@ from sherpa_onnx.lib._sherpa_onnx import (
     ProviderConfig,
     TensorrtConfig,
 )
+from sherpa_onnx.startup import measure
 
 
 def _assert_file_exists(f: str):
@@ -39,6 +40,9 @@ class OnlineRecognizer(object):
      - https://github.com/k2-fsa/sherpa-onnx/blob/master/python-api-examples/online-decode-files.py
     """
 
+    # True after the first call to decode_stream() or decode_streams()
+    _decoded = False
+
     @classmethod
     def from_transducer(
         cls,
@@ -331,7 +335,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -462,7 +467,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -599,7 +605,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -725,7 +732,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -851,7 +859,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -984,7 +993,8 @@ class OnlineRecognizer(object):
             ),
         )
 
-        self.recognizer = _Recognizer(recognizer_config)
+        with measure("OnlineRecognizer", "model_load"):
+            self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
@@ -995,10 +1005,24 @@ class OnlineRecognizer(object):
             return self.recognizer.create_stream(hotwords)
 
     def decode_stream(self, s: OnlineStream):
-        self.recognizer.decode_stream(s)
+        if self._decoded:
+            self.recognizer.decode_stream(s)
+            return
+
+        # The first call is much slower than later calls
+        with measure("OnlineRecognizer", "warmup"):
+            self.recognizer.decode_stream(s)
+        self._decoded = True
 
     def decode_streams(self, ss: List[OnlineStream]):
-        self.recognizer.decode_streams(ss)
+        if self._decoded:
+            self.recognizer.decode_streams(ss)
+            return
+
+        # The first call is much slower than later calls
+        with measure("OnlineRecognizer", "warmup"):
+            self.recognizer.decode_streams(ss)
+        self._decoded = True
 
     def is_ready(self, s: OnlineStream) -> bool:
         return self.recognizer.is_ready(s)
@@ -1009,6 +1033,15 @@ class OnlineRecognizer(object):
     def get_result(self, s: OnlineStream) -> str:
         return self.recognizer.get_result(s).text.strip()
 
+    def get_results(self, ss: List[OnlineStream]) -> dict:
+        """Return the current results of a list of streams as numpy arrays.
+
+        The values of ss[i] are in token_ids[offsets[i]:offsets[i+1]]
+        and timestamps[offsets[i]:offsets[i+1]]. Please see the help
+        of the C++ binding for all fields.
+        """
+        return self.recognizer.get_results(ss)
+
     def get_result_as_json_string(self, s: OnlineStream) -> str:
         return self.recognizer.get_result(s).as_json_string()
 
@@ -0,0 +1,103 @@
+# Copyright (c)  2025  Xiaomi Corporation
+"""
+Record where the startup time of a process goes.
+
+The following phases are recorded automatically:
+
+  - import: loading the C extension and the Python modules of this package.
+    Since they are loaded lazily on first use, see __init__.py, only the
+    parts that are actually used show up.
+  - model_load: constructing OfflineRecognizer, OnlineRecognizer and
+    KeywordSpotter
+  - warmup: OfflineRecognizer.warmup() or the first call to decode_stream()
+    or decode_streams() of the above classes, which is usually much slower
+    than later calls because onnxruntime allocates memory and selects kernels
+    lazily
+
+Other phases, e.g., loading a TTS model and its lexicon, can be recorded
+with measure():
+
+    with sherpa_onnx.measure("tts", "model_load"):
+        tts = sherpa_onnx.OfflineTts(config)
+
+    with sherpa_onnx.measure("tts", "warmup"):
+        tts.warmup()
+
+    print(sherpa_onnx.startup_report())
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+_lock = threading.Lock()
+
+# _timings[component][phase] is the total time in seconds
+_timings: Dict[str, Dict[str, float]] = {}
+
+
+def record(component: str, phase: str, seconds: float):
+    """Add seconds to the given phase of the given component."""
+    with _lock:
+        phases = _timings.setdefault(component, {})
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def measure(component: str, phase: str):
+    """Record the time spent in the with block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(component, phase, time.perf_counter() - start)
+
+
+class StartupReport(dict):
+    """A dict mapping component -> phase -> seconds.
+
+    str() of it is a table for humans.
+    """
+
+    def total(self) -> float:
+        return sum(sum(phases.values()) for phases in self.values())
+
+    def __str__(self) -> str:
+        phases = []
+        for p in self.values():
+            for name in p:
+                if name not in phases:
+                    phases.append(name)
+
+        width = max([len("component")] + [len(c) for c in self])
+        header = f"{'component':<{width}}" + "".join(f" {p:>12}" for p in phases)
+        lines = [header, "-" * len(header)]
+        for component, p in self.items():
+            line = f"{component:<{width}}"
+            for name in phases:
+                if name in p:
+                    line += f" {p[name] * 1000:>10.1f}ms"
+                else:
+                    line += f" {'-':>12}"
+            lines.append(line)
+        lines.append("-" * len(header))
+        lines.append(f"total: {self.total() * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+def startup_report() -> StartupReport:
+    """Return the time spent so far in each phase of each component.
+
+    Components are in the order they are first recorded.
+    """
+    with _lock:
+        return StartupReport(
+            {component: dict(phases) for component, phases in _timings.items()}
+        )
+
+
+def reset_startup_report():
+    """Clear all recorded timings."""
+    with _lock:
+        _timings.clear()
@@ -0,0 +1,164 @@
+# sherpa-onnx/python/tests/test_cli.py
+#
+# Copyright (c)  2025  Xiaomi Corporation
+#
+# To run this single test, use
+#
+#  ctest --verbose -R  test_cli_py
+
+import json
+import queue
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from sherpa_onnx.cli import _decode, _make_batches, _read_finished, _schedule
+
+
+def _write_wave(path: Path, num_samples: int, sample_rate: int = 16000):
+    samples = (np.arange(num_samples) % 100).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+
+
+class _FakeStream(object):
+    def __init__(self):
+        self.num_samples = 0
+
+    def accept_waveform(self, sample_rate, samples):
+        self.num_samples += samples.shape[0]
+
+
+class TestCli(unittest.TestCase):
+    def test_read_finished(self):
+        with tempfile.TemporaryDirectory() as d:
+            output = Path(d) / "results.jsonl"
+            self.assertEqual(_read_finished(output, retry_errors=False), set())
+
+            lines = [
+                json.dumps({"id": "a", "text": "hello"}),
+                json.dumps({"id": "b", "error": "failed"}),
+                json.dumps({"id": "c", "text": "world"}),
+            ]
+            complete = "".join(line + "\n" for line in lines)
+
+            # The last line was cut by an interrupted run
+            output.write_text(complete + '{"id": "d", "te')
+
+            finished = _read_finished(output, retry_errors=False)
+            self.assertEqual(finished, {"a", "b", "c"})
+            self.assertEqual(output.read_text(), complete)
+
+            finished = _read_finished(output, retry_errors=True)
+            self.assertEqual(finished, {"a", "c"})
+            self.assertEqual(output.read_text(), complete)
+
+    def test_make_batches(self):
+        durations = [1, 8, 2, 7, 3, 3, 9, 0.5]
+        items = [
+            {"id": str(i), "duration": d} for i, d in enumerate(durations)
+        ]
+
+        batches = _make_batches(items, max_batch_size=3, max_batch_duration=20)
+
+        ids = sorted(item["id"] for batch in batches for item in batch)
+        self.assertEqual(ids, sorted(item["id"] for item in items))
+
+        for batch in batches:
+            self.assertLessEqual(len(batch), 3)
+            longest = max(item["duration"] for item in batch)
+            self.assertEqual(batch[0]["duration"], longest)
+            self.assertLessEqual(longest * len(batch), 20)
+
+        # Items are grouped by duration
+        self.assertEqual([item["duration"] for item in batches[0]], [9, 8])
+
+        # An item longer than max_batch_duration is a batch of its own
+        batches = _make_batches(items, max_batch_size=3, max_batch_duration=5)
+        self.assertEqual([len(b) for b in batches[:3]], [1, 1, 1])
+
+        self.assertEqual(_make_batches([], 3, 20), [])
+
+    def test_schedule(self):
+        with tempfile.TemporaryDirectory() as d:
+            entries = []
+            for i, n in enumerate([16000, 8000, 32000, 4000]):
+                path = Path(d) / f"{i}.wav"
+                _write_wave(path, n)
+                entries.append((str(i), str(path)))
+            entries.append(("missing", str(Path(d) / "missing.wav")))
+
+            batch_queue = queue.Queue()
+            result_queue = queue.Queue()
+            num_workers = 2
+            _schedule(
+                iter(entries),
+                _FakeStream,
+                batch_queue,
+                result_queue,
+                num_loaders=2,
+                sort_buffer_size=2,
+                max_batch_size=2,
+                max_batch_duration=100,
+                num_workers=num_workers,
+            )
+
+            items = []
+            num_sentinels = 0
+            while not batch_queue.empty():
+                batch = batch_queue.get()
+                if batch is None:
+                    num_sentinels += 1
+                else:
+                    self.assertLessEqual(len(batch), 2)
+                    items.extend(batch)
+
+            self.assertEqual(num_sentinels, num_workers)
+            ids = sorted(item["id"] for item in items)
+            self.assertEqual(ids, ["0", "1", "2", "3"])
+            for item in items:
+                self.assertEqual(
+                    item["stream"].num_samples, int(item["duration"] * 16000)
+                )
+
+            errors = [result_queue.get() for _ in range(result_queue.qsize())]
+            self.assertEqual([e["id"] for e in errors], ["missing"])
+            self.assertIn("error", errors[0])
+
+    def test_decode_bad_result(self):
+        class Recognizer(object):
+            def decode_streams(self, streams):
+                pass
+
+        class BadStream(object):
+            @property
+            def result(self):
+                raise RuntimeError("bad result")
+
+        batch_queue = queue.Queue()
+        item = {"id": "a", "path": "a.wav", "duration": 1.0}
+        item["stream"] = BadStream()
+        batch_queue.put([item])
+        batch_queue.put(None)
+
+        result_queue = queue.Queue()
+        _decode(
+            Recognizer(), batch_queue, result_queue, output_timestamps=False
+        )
+
+        record = result_queue.get_nowait()
+        self.assertEqual(record["id"], "a")
+        self.assertEqual(record["error"], "bad result")
+
+        # The sentinel is sent even if a record cannot be created
+        self.assertIsNone(result_queue.get_nowait())
+
+
+if __name__ == "__main__":
+    unittest.main()
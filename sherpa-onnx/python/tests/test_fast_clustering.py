@@ -82,6 +82,36 @@ class TestFastClustering(unittest.TestCase):
         expected = [0, 1, 2, 2, 1, 0, 3, 2, 3]
         assert labels == expected, (labels, expected)
 
+    def test_cluster_incrementally(self):
+        config = sherpa_onnx.FastClusteringConfig(threshold=0.2)
+        clustering = sherpa_onnx.FastClustering(config)
+        features = np.array(
+            [
+                [0.2, 0.3],  # cluster 0
+                [0.3, -0.4],  # cluster 1
+                [-0.1, -0.2],  # cluster 2
+                [-0.3, -0.5],  # cluster 2
+                [0.1, -0.2],  # cluster 1
+                [0.1, 0.2],  # cluster 0
+                [-0.8, 1.9],  # cluster 3
+                [-0.4, -0.6],  # cluster 2
+                [-0.7, 0.9],  # cluster 3
+            ],
+            dtype=np.float32,
+        )
+
+        # Labels are consistent across windows
+        labels = clustering.cluster_incrementally(features[:5])
+        assert labels == [0, 1, 2, 2, 1], labels
+        assert clustering.num_clusters == 3
+
+        labels = clustering.cluster_incrementally(features[5:])
+        assert labels == [0, 3, 2, 3], labels
+        assert clustering.num_clusters == 4
+
+        clustering.reset()
+        assert clustering.num_clusters == 0
+
     def test_cluster_speaker_embeddings(self):
         d = Path("/tmp/test-cluster")
 
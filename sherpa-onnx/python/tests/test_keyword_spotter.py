@@ -108,6 +108,79 @@ class TestKeywordSpotter(unittest.TestCase):
                 print(f"{wave_filename}\n{result[0:-1]}")
                 print("-" * 10)
 
+    def test_keyword_sets(self):
+        model_dir = f"{d}/sherpa-onnx-kws-zipformer-gigaspeech-3.3M-2024-01-01"
+        encoder = f"{model_dir}/encoder-epoch-12-avg-2-chunk-16-left-64.int8.onnx"
+        decoder = f"{model_dir}/decoder-epoch-12-avg-2-chunk-16-left-64.onnx"
+        joiner = f"{model_dir}/joiner-epoch-12-avg-2-chunk-16-left-64.int8.onnx"
+        tokens = f"{model_dir}/tokens.txt"
+        keywords_file = f"{model_dir}/test_wavs/test_keywords.txt"
+        wave0 = f"{model_dir}/test_wavs/0.wav"
+
+        if not Path(encoder).is_file():
+            print("skipping test_keyword_sets()")
+            return
+
+        keyword_spotter = sherpa_onnx.KeywordSpotter(
+            encoder=encoder,
+            decoder=decoder,
+            joiner=joiner,
+            tokens=tokens,
+            num_threads=1,
+            keywords_file=keywords_file,
+            provider="cpu",
+        )
+
+        with open(keywords_file, encoding="utf-8") as f:
+            keywords = [line.strip() for line in f if line.strip()]
+
+        # set "a" contains all keywords and set "b" contains none of them
+        keyword_spotter.add_keyword_set("a", keywords)
+        keyword_spotter.add_keyword_set("b", "▁ZZZ")
+        self.assertEqual(keyword_spotter.keyword_set_ids, ["a", "b"])
+
+        def run(set_ids):
+            streams = []
+            for set_id in set_ids:
+                s = keyword_spotter.create_stream(keyword_set=set_id)
+                samples, sample_rate = read_wave(wave0)
+                s.accept_waveform(sample_rate, samples)
+                tail_paddings = np.zeros(int(0.2 * sample_rate), dtype=np.float32)
+                s.accept_waveform(sample_rate, tail_paddings)
+                s.input_finished()
+                streams.append(s)
+
+            results = [[] for _ in streams]
+            while True:
+                ready_list = []
+                for i, s in enumerate(streams):
+                    if keyword_spotter.is_ready(s):
+                        ready_list.append(s)
+                    r = keyword_spotter.get_result(s)
+                    if r:
+                        results[i].append(r)
+                        keyword_spotter.reset_stream(s)
+
+                if len(ready_list) == 0:
+                    break
+                # streams of both sets are decoded in a single batch
+                keyword_spotter.decode_streams(ready_list)
+            return results
+
+        expected = run(["a"])[0]
+        results = run(["a", "b"])
+        self.assertEqual(results[0], expected)
+        self.assertEqual(results[1], [])
+
+        # replace set "b" without reloading the model
+        keyword_spotter.add_keyword_set("b", keywords)
+        self.assertEqual(run(["b"])[0], expected)
+
+        self.assertTrue(keyword_spotter.remove_keyword_set("b"))
+        self.assertFalse(keyword_spotter.remove_keyword_set("b"))
+        with self.assertRaises(ValueError):
+            keyword_spotter.create_stream(keyword_set="b")
+
     def test_zipformer_transducer_cn(self):
         for use_int8 in [True, False]:
             if use_int8:
@@ -306,6 +306,89 @@ class TestOfflineRecognizer(unittest.TestCase):
                 print(s1.result.text)
                 print(s2.result.text)
 
+    def test_int16_samples(self):
+        # The transducer model uses normalized samples, while the paraformer
+        # model does not
+        models = [
+            (
+                "transducer",
+                f"{d}/sherpa-onnx-zipformer-en-2023-04-01",
+                lambda m: sherpa_onnx.OfflineRecognizer.from_transducer(
+                    encoder=f"{m}/encoder-epoch-99-avg-1.int8.onnx",
+                    decoder=f"{m}/decoder-epoch-99-avg-1.onnx",
+                    joiner=f"{m}/joiner-epoch-99-avg-1.int8.onnx",
+                    tokens=f"{m}/tokens.txt",
+                    num_threads=1,
+                    provider="cpu",
+                ),
+            ),
+            (
+                "paraformer",
+                f"{d}/sherpa-onnx-paraformer-zh-2023-09-14",
+                lambda m: sherpa_onnx.OfflineRecognizer.from_paraformer(
+                    paraformer=f"{m}/model.int8.onnx",
+                    tokens=f"{m}/tokens.txt",
+                    num_threads=1,
+                    provider="cpu",
+                ),
+            ),
+        ]
+
+        for name, m, create in models:
+            if not Path(f"{m}/tokens.txt").is_file():
+                print(f"skipping test_int16_samples() for {name}")
+                continue
+
+            recognizer = create(m)
+            samples, sample_rate = read_wave(f"{m}/test_wavs/0.wav")
+            samples_int16 = np.round(samples * 32768).astype(np.int16)
+
+            s0 = recognizer.create_stream()
+            s0.accept_waveform(sample_rate, samples)
+
+            s1 = recognizer.create_stream()
+            s1.accept_waveform(sample_rate, samples_int16)
+
+            recognizer.decode_streams([s0, s1])
+            self.assertEqual(s0.result.text, s1.result.text)
+            self.assertEqual(s0.result.timestamps, s1.result.timestamps)
+            print(s1.result.text)
+
+            s = recognizer.create_stream()
+            with self.assertRaises(ValueError):
+                s.accept_waveform(sample_rate, samples.reshape(1, -1))
+            with self.assertRaises(ValueError):
+                s.accept_waveform(sample_rate, samples_int16.reshape(1, -1))
+
+    def test_warmup(self):
+        model = f"{d}/sherpa-onnx-paraformer-zh-2023-09-14/model.int8.onnx"
+        tokens = f"{d}/sherpa-onnx-paraformer-zh-2023-09-14/tokens.txt"
+        wave0 = f"{d}/sherpa-onnx-paraformer-zh-2023-09-14/test_wavs/0.wav"
+
+        if not Path(model).is_file():
+            print("skipping test_warmup()")
+            return
+
+        recognizer = sherpa_onnx.OfflineRecognizer.from_paraformer(
+            paraformer=model,
+            tokens=tokens,
+            num_threads=1,
+            provider="cpu",
+        )
+
+        sherpa_onnx.reset_startup_report()
+        recognizer.warmup(batch_sizes=[1, 2], lengths=[1.0, 3.0])
+        self.assertIn("warmup", sherpa_onnx.startup_report()["OfflineRecognizer"])
+
+        # Decoding after warmup is not recorded as warmup
+        sherpa_onnx.reset_startup_report()
+        s = recognizer.create_stream()
+        samples, sample_rate = read_wave(wave0)
+        s.accept_waveform(sample_rate, samples)
+        recognizer.decode_stream(s)
+        self.assertNotIn("OfflineRecognizer", sherpa_onnx.startup_report())
+        print(s.result.text)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+# sherpa-onnx/python/tests/test_startup.py
+#
+# Copyright (c)  2025  Xiaomi Corporation
+#
+# To run this single test, use
+#
+#  ctest --verbose -R  test_startup_py
+
+import subprocess
+import sys
+import time
+import unittest
+
+import sherpa_onnx
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_import(self):
+        # Use a new process since sherpa_onnx is already imported in this one
+        code = "\n".join(
+            [
+                "import sys",
+                "import sherpa_onnx",
+                "assert 'sherpa_onnx.lib._sherpa_onnx' not in sys.modules",
+                "assert 'sherpa_onnx.offline_recognizer' not in sys.modules",
+                "sherpa_onnx.OfflineRecognizer",
+                "assert 'sherpa_onnx.lib._sherpa_onnx' in sys.modules",
+                "assert 'sherpa_onnx.online_recognizer' not in sys.modules",
+                "report = sherpa_onnx.startup_report()",
+                "assert 'import' in report['_sherpa_onnx'], report",
+                "assert 'import' in report['OfflineRecognizer'], report",
+            ]
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_attributes(self):
+        for name in sherpa_onnx.__all__:
+            assert getattr(sherpa_onnx, name) is not None, name
+
+        with self.assertRaises(AttributeError):
+            sherpa_onnx.not_existing_attribute
+
+    def test_measure(self):
+        sherpa_onnx.reset_startup_report()
+        with sherpa_onnx.measure("test", "model_load"):
+            time.sleep(0.01)
+
+        with sherpa_onnx.measure("test", "model_load"):
+            time.sleep(0.01)
+
+        report = sherpa_onnx.startup_report()
+        assert report["test"]["model_load"] >= 0.02, report
+        assert report.total() >= 0.02, report
+        print(report)
+
+        sherpa_onnx.reset_startup_report()
+        assert len(sherpa_onnx.startup_report()) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
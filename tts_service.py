@@ -15,7 +15,10 @@ import numpy as np
 import os
 import time
 import uuid
+import json
+import ctypes
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 import threading
@@ -35,6 +38,14 @@ CORS(app)  # 允许跨域
 MODEL_DIR = os.getenv('MODEL_DIR', '/app/models/vits-melo-tts-zh_en')
 NUM_THREADS = int(os.getenv('NUM_THREADS', '4'))
 MAX_TEXT_LENGTH = int(os.getenv('MAX_TEXT_LENGTH', '500'))
+# 多模型配置文件（JSON），不存在时只加载 MODEL_DIR 中的模型
+MODELS_CONFIG = os.getenv('MODELS_CONFIG', '/app/models.json')
+# 已加载模型的内存预算（MB），为空时使用配置文件中的值，0 表示不限制
+MODEL_MEMORY_BUDGET_MB = os.getenv('MODEL_MEMORY_BUDGET_MB', '')
+# 启动时预热的模型（逗号分隔），为空时使用配置文件中的 prewarm
+PREWARM_MODELS = os.getenv('PREWARM_MODELS', '')
+# 预热时使用的输入长度（token 数，逗号分隔），应覆盖常见的句子长度
+WARMUP_LENGTHS = [int(n) for n in os.getenv('WARMUP_LENGTHS', '16,64,128').split(',') if n]
 OUTPUT_DIR = '/app/output'
 LOG_DIR = '/app/logs'
 
@@ -42,10 +53,6 @@ LOG_DIR = '/app/logs'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# 全局 TTS 对象（单例）
-_tts_instance = None
-_tts_lock = threading.Lock()
-
 def apply_volume_gain(samples, volume=1.0):
     """
     应用音量增益
@@ -71,90 +78,478 @@ def apply_volume_gain(samples, volume=1.0):
     
     return audio_array
 
-def get_tts():
-    """获取或创建 TTS 实例（线程安全）"""
-    global _tts_instance
-    
-    if _tts_instance is None:
-        with _tts_lock:
-            if _tts_instance is None:
-                logger.info("Initializing TTS model...")
-                
-                model_file = os.path.join(MODEL_DIR, "model.onnx")
-                lexicon_file = os.path.join(MODEL_DIR, "lexicon.txt")
-                tokens_file = os.path.join(MODEL_DIR, "tokens.txt")
-                dict_dir = os.path.join(MODEL_DIR, "dict")
-                
-                # 检查必要文件
-                for file_path, name in [
-                    (model_file, "model.onnx"),
-                    (lexicon_file, "lexicon.txt"),
-                    (tokens_file, "tokens.txt"),
-                    (dict_dir, "dict directory"),
-                ]:
-                    if not os.path.exists(file_path):
-                        raise FileNotFoundError(f"Missing {name}: {file_path}")
-                
-                # 配置规则文件
-                rule_fsts = []
-                for fst_name in ["phone.fst", "date.fst", "number.fst"]:
-                    fst_path = os.path.join(MODEL_DIR, fst_name)
-                    if os.path.exists(fst_path):
-                        rule_fsts.append(fst_path)
-                
-                rule_fsts_str = ",".join(rule_fsts)
-                
-                # 创建配置
-                config = sherpa_onnx.OfflineTtsConfig(
-                    model=sherpa_onnx.OfflineTtsModelConfig(
-                        vits=sherpa_onnx.OfflineTtsVitsModelConfig(
-                            model=model_file,
-                            lexicon=lexicon_file,
-                            tokens=tokens_file,
-                            dict_dir=dict_dir,
-                        ),
-                        num_threads=NUM_THREADS,
-                        provider="cpu",
-                    ),
-                    rule_fsts=rule_fsts_str,
+# ---------------------------------------------------------------------------
+# 多模型注册表
+#
+# 模型列表来自 MODELS_CONFIG 指向的 JSON 文件，例如:
+#
+# {
+#     "default": "vits-melo-tts-zh_en",
+#     "memory_budget_mb": 3000,
+#     "models": [
+#         {
+#             "name": "vits-melo-tts-zh_en",
+#             "type": "vits",
+#             "dir": "/app/models/vits-melo-tts-zh_en",
+#             "model": "model.onnx",
+#             "lexicon": "lexicon.txt",
+#             "tokens": "tokens.txt",
+#             "dict_dir": "dict",
+#             "rule_fsts": ["phone.fst", "date.fst", "number.fst"],
+#             "prewarm": true
+#         },
+#         {
+#             "name": "kokoro-en",
+#             "type": "kokoro",
+#             "dir": "/app/models/kokoro-en-v0_19",
+#             "model": "model.onnx",
+#             "voices": "voices.bin",
+#             "tokens": "tokens.txt",
+#             "data_dir": "espeak-ng-data",
+#             "warmup_lengths": [16, 64, 256]
+#         }
+#     ]
+# }
+#
+# type 可以是 vits / matcha / kokoro / kitten / zipvoice，其余字段直接传给对应的
+# sherpa_onnx.OfflineTts*ModelConfig，路径字段相对于 dir。zipvoice 模型还需要
+# prompt_wav 和 prompt_text 作为参考音色。
+#
+# 模型在第一次请求时加载；已加载模型的常驻内存超过 memory_budget_mb 时，按最近
+# 最少使用的顺序卸载其它模型。配置文件不存在时只使用 MODEL_DIR 中的 vits-melo 模型。
+# ---------------------------------------------------------------------------
+
+# 路径字段，相对路径相对于模型的 dir
+_PATH_KEYS = {
+    'model', 'lexicon', 'tokens', 'data_dir', 'dict_dir', 'voices',
+    'acoustic_model', 'vocoder', 'text_model', 'flow_matching_model',
+    'pinyin_dict', 'prompt_wav',
+}
+
+# 由服务自己使用、不传给模型配置类的字段
+_SERVICE_KEYS = {
+    'name', 'type', 'dir', 'prewarm', 'rule_fsts', 'rule_fars', 'num_threads',
+    'prompt_wav', 'prompt_text', 'num_steps', 'warmup_lengths', 'languages',
+}
+
+_MODEL_CONFIG_CLASSES = {
+    'vits': 'OfflineTtsVitsModelConfig',
+    'matcha': 'OfflineTtsMatchaModelConfig',
+    'kokoro': 'OfflineTtsKokoroModelConfig',
+    'kitten': 'OfflineTtsKittenModelConfig',
+    'zipvoice': 'OfflineTtsZipvoiceModelConfig',
+}
+
+
+def _resolve_path(model_dir, path):
+    if not path or not model_dir or os.path.isabs(path):
+        return path
+    return os.path.join(model_dir, path)
+
+
+def _current_rss_mb():
+    """当前进程的常驻内存（MB），无法获取时返回 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _release_memory():
+    """卸载模型后把空闲内存还给操作系统（仅 glibc）"""
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def build_tts_config(spec):
+    """根据模型描述创建 sherpa_onnx.OfflineTtsConfig"""
+    model_type = spec['type']
+    model_dir = spec.get('dir', '')
+
+    kwargs = {}
+    for key, value in spec.items():
+        if key in _SERVICE_KEYS:
+            continue
+        if key in _PATH_KEYS:
+            value = _resolve_path(model_dir, value)
+            # 检查必要文件
+            if value and not os.path.exists(value):
+                raise FileNotFoundError(f"Missing {key}: {value}")
+        kwargs[key] = value
+
+    config_class = getattr(sherpa_onnx, _MODEL_CONFIG_CLASSES[model_type])
+    model_config = sherpa_onnx.OfflineTtsModelConfig(
+        num_threads=spec.get('num_threads', NUM_THREADS),
+        provider="cpu",
+        **{model_type: config_class(**kwargs)},
+    )
+
+    rule_fsts = [_resolve_path(model_dir, f) for f in spec.get('rule_fsts', [])]
+    rule_fars = [_resolve_path(model_dir, f) for f in spec.get('rule_fars', [])]
+
+    config = sherpa_onnx.OfflineTtsConfig(
+        model=model_config,
+        rule_fsts=",".join(f for f in rule_fsts if os.path.exists(f)),
+        rule_fars=",".join(f for f in rule_fars if os.path.exists(f)),
+    )
+
+    if not config.validate():
+        raise ValueError(f"TTS config validation failed for {spec['name']}")
+
+    return config
+
+
+def default_model_specs():
+    """未提供 MODELS_CONFIG 时使用 MODEL_DIR 中的 vits-melo 模型"""
+    return [{
+        'name': os.path.basename(MODEL_DIR.rstrip('/')) or 'default',
+        'type': 'vits',
+        'dir': MODEL_DIR,
+        'model': 'model.onnx',
+        'lexicon': 'lexicon.txt',
+        'tokens': 'tokens.txt',
+        'dict_dir': 'dict',
+        'rule_fsts': ['phone.fst', 'date.fst', 'number.fst'],
+        'languages': ['zh', 'en'],
+        'prewarm': True,
+    }]
+
+
+def load_model_specs():
+    """
+    读取模型列表
+
+    Returns:
+        (specs, default_model, memory_budget_mb)
+    """
+    if MODELS_CONFIG and os.path.exists(MODELS_CONFIG):
+        with open(MODELS_CONFIG, encoding='utf-8') as f:
+            cfg = json.load(f)
+        specs = cfg['models']
+        default_model = cfg.get('default')
+        memory_budget_mb = float(cfg.get('memory_budget_mb', 0))
+    else:
+        specs = default_model_specs()
+        default_model = None
+        memory_budget_mb = 0
+
+    if not specs:
+        raise ValueError("No TTS models are configured")
+
+    names = set()
+    for spec in specs:
+        if spec.get('type') not in _MODEL_CONFIG_CLASSES:
+            raise ValueError(
+                f"Unsupported model type '{spec.get('type')}' for {spec.get('name')}. "
+                f"Supported: {sorted(_MODEL_CONFIG_CLASSES)}"
+            )
+        if spec['name'] in names:
+            raise ValueError(f"Duplicate model name: {spec['name']}")
+        names.add(spec['name'])
+
+    # 环境变量优先
+    if MODEL_MEMORY_BUDGET_MB:
+        memory_budget_mb = float(MODEL_MEMORY_BUDGET_MB)
+
+    if PREWARM_MODELS:
+        prewarm = {name.strip() for name in PREWARM_MODELS.split(',')}
+        for spec in specs:
+            spec['prewarm'] = spec['name'] in prewarm
+
+    return specs, default_model or specs[0]['name'], memory_budget_mb
+
+
+class ModelEntry:
+    """注册表中的一个模型及其运行统计"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec['name']
+        self.tts = None
+        self.voice = None  # zipvoice 的参考音色
+        self.load_time = 0.0
+        self.resident_mb = 0.0
+        self.num_loads = 0
+        self.num_evictions = 0
+        self.num_requests = 0
+        self.last_used = None
+
+    @property
+    def loaded(self):
+        return self.tts is not None
+
+    def estimate_mb(self):
+        """加载前估计常驻内存：优先使用上次实测值，否则用模型文件大小"""
+        if self.resident_mb > 0:
+            return self.resident_mb
+
+        total = 0
+        model_dir = self.spec.get('dir', '')
+        for key in _PATH_KEYS:
+            path = _resolve_path(model_dir, self.spec.get(key))
+            if path and os.path.isfile(path):
+                total += os.path.getsize(path)
+        return total / (1024 * 1024)
+
+    def info(self):
+        return {
+            'name': self.name,
+            'type': self.spec['type'],
+            'languages': self.spec.get('languages'),
+            'loaded': self.loaded,
+            'prewarm': bool(self.spec.get('prewarm', False)),
+            'resident_mb': round(self.resident_mb, 1),
+            'load_time': round(self.load_time, 2),
+            'loads': self.num_loads,
+            'evictions': self.num_evictions,
+            'requests': self.num_requests,
+            'last_used': (
+                datetime.fromtimestamp(self.last_used).isoformat()
+                if self.last_used else None
+            ),
+        }
+
+
+class ModelRegistry:
+    """
+    按需加载 TTS 模型，并在超出内存预算时按 LRU 卸载（线程安全）
+    """
+
+    def __init__(self, specs, default_model, memory_budget_mb=0):
+        self.default_model = default_model
+        self.memory_budget_mb = memory_budget_mb  # 0 表示不限制
+
+        self._entries = {spec['name']: ModelEntry(spec) for spec in specs}
+        if default_model not in self._entries:
+            raise ValueError(f"Unknown default model: {default_model}")
+
+        # 已加载的模型，最近使用的在末尾
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        # 加载串行进行，这样 RSS 的增量才能归属到单个模型
+        self._load_lock = threading.Lock()
+
+    def names(self):
+        return list(self._entries)
+
+    def has_model(self, name):
+        return name in self._entries
+
+    def resident_mb(self):
+        with self._lock:
+            return sum(self._entries[name].resident_mb for name in self._lru)
+
+    def loaded_models(self):
+        """已加载的模型名，最近使用的在末尾；不会触发加载"""
+        with self._lock:
+            return list(self._lru)
+
+    def info(self):
+        with self._lock:
+            models = [entry.info() for entry in self._entries.values()]
+            resident = sum(self._entries[name].resident_mb for name in self._lru)
+        return {
+            'default': self.default_model,
+            'memory_budget_mb': self.memory_budget_mb,
+            'resident_mb': round(resident, 1),
+            'process_rss_mb': round(_current_rss_mb() or 0, 1),
+            'models': models,
+        }
+
+    def acquire(self, name=None, count_request=True):
+        """
+        返回已加载的模型，必要时先加载
+
+        返回的是 ModelEntry 中对象的引用，调用方在使用期间即使模型被卸载也不受影响。
+
+        Returns:
+            (entry, tts, voice)
+        """
+        entry = self._entries.get(name or self.default_model)
+        if entry is None:
+            raise KeyError(name)
+
+        with self._lock:
+            if entry.loaded:
+                return self._touch(entry, count_request)
+
+        with self._load_lock:
+            with self._lock:
+                if entry.loaded:
+                    return self._touch(entry, count_request)
+
+            self._evict_for(entry, entry.estimate_mb())
+            self._load(entry)
+
+            with self._lock:
+                result = self._touch(entry, count_request)
+
+            # 按实测内存再检查一次
+            self._evict_for(entry, 0)
+            return result
+
+    def generate(self, text, name=None, sid=0, speed=1.0):
+        entry, tts, voice = self.acquire(name)
+        if voice is not None:
+            return tts.generate(
+                text, voice, speed=speed, num_steps=entry.spec.get('num_steps', 4)
+            )
+        return tts.generate(text, sid=sid, speed=speed)
+
+    def prewarm(self):
+        """加载并预热 prewarm 为 true 的模型"""
+        for entry in self._entries.values():
+            if not entry.spec.get('prewarm', False):
+                continue
+            self.acquire(entry.name, count_request=False)
+
+    def _touch(self, entry, count_request):
+        # 调用时必须持有 self._lock
+        self._lru[entry.name] = None
+        self._lru.move_to_end(entry.name)
+        if count_request:
+            entry.num_requests += 1
+        entry.last_used = time.time()
+        return entry, entry.tts, entry.voice
+
+    def _evict_for(self, entry, extra_mb):
+        """卸载最近最少使用的模型，直到 entry 能放进内存预算"""
+        if self.memory_budget_mb <= 0:
+            return
+
+        evicted = []
+        with self._lock:
+            for name in list(self._lru):
+                resident = sum(self._entries[n].resident_mb for n in self._lru)
+                if resident + extra_mb <= self.memory_budget_mb:
+                    break
+                if name == entry.name:
+                    continue
+
+                victim = self._entries[name]
+                victim.tts = None
+                victim.voice = None
+                victim.num_evictions += 1
+                del self._lru[name]
+                evicted.append(victim)
+
+        if evicted:
+            _release_memory()
+            for victim in evicted:
+                logger.info(
+                    f"Evicted TTS model {victim.name} "
+                    f"({victim.resident_mb:.1f} MB) to load {entry.name}"
                 )
-                
-                if not config.validate():
-                    raise ValueError("TTS config validation failed")
-                
-                start = time.time()
-                _tts_instance = sherpa_onnx.OfflineTts(config)
-                elapsed = time.time() - start
-                
-                logger.info(f"TTS model initialized successfully ({elapsed:.2f}s)")
-    
-    return _tts_instance
+
+        resident = self.resident_mb()
+        if resident + extra_mb > self.memory_budget_mb:
+            logger.warning(
+                f"Memory budget exceeded: {resident + extra_mb:.1f} MB > "
+                f"{self.memory_budget_mb:.1f} MB"
+            )
+
+    def _load(self, entry):
+        # 调用时必须持有 self._load_lock
+        spec = entry.spec
+        logger.info(f"Initializing TTS model {entry.name} ({spec['type']})...")
+
+        config = build_tts_config(spec)
+
+        rss_before = _current_rss_mb()
+        start = time.time()
+
+        tts = sherpa_onnx.OfflineTts(config)
+
+        voice = None
+        if spec['type'] == 'zipvoice':
+            prompt_wav = _resolve_path(spec.get('dir', ''), spec['prompt_wav'])
+            samples, sample_rate = sf.read(prompt_wav, dtype='float32', always_2d=True)
+            voice = tts.create_voice(spec['prompt_text'], samples[:, 0], sample_rate)
+
+        # 第一次推理时 onnxruntime 才分配内存、选择算子实现，预热后第一个请求不再变慢。
+        # 预热计入加载时间和常驻内存
+        tts.warmup(lengths=spec.get('warmup_lengths', WARMUP_LENGTHS))
+
+        elapsed = time.time() - start
+        rss_after = _current_rss_mb()
+
+        if rss_before is not None and rss_after is not None:
+            resident_mb = max(rss_after - rss_before, 0.0)
+        else:
+            resident_mb = entry.estimate_mb()
+
+        with self._lock:
+            entry.tts = tts
+            entry.voice = voice
+            entry.load_time = elapsed
+            entry.resident_mb = resident_mb
+            entry.num_loads += 1
+
+        logger.info(
+            f"TTS model {entry.name} initialized successfully "
+            f"({elapsed:.2f}s, {resident_mb:.1f} MB)"
+        )
+
+
+registry = ModelRegistry(*load_model_specs())
+
+# 启动预热完成后才对外报告就绪
+_ready = threading.Event()
+
+
+def start_prewarm():
+    """在后台线程中预热模型，完成后将服务标记为就绪"""
+    def prewarm():
+        try:
+            start = time.time()
+            registry.prewarm()
+            _ready.set()
+            logger.info(
+                f"Models prewarmed successfully "
+                f"({time.time() - start:.2f}s, {registry.resident_mb():.1f} MB)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to prewarm models: {e}", exc_info=True)
+            # 与之前启动时加载失败的行为一致：直接退出，由容器重启
+            os._exit(1)
+
+    thread = threading.Thread(target=prewarm, daemon=True)
+    thread.start()
+    return thread
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """健康检查接口"""
-    try:
-        tts = get_tts()
-        return jsonify({
-            'status': 'healthy',
-            'model': 'vits-melo-tts-zh_en',
-            'timestamp': datetime.now().isoformat()
-        }), 200
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+    """健康检查接口，模型预热完成前返回 503"""
+    if not _ready.is_set():
+        # 预热失败时进程会直接退出，所以这里只可能是仍在预热
         return jsonify({
-            'status': 'unhealthy',
-            'error': str(e),
+            'status': 'warming_up',
             'timestamp': datetime.now().isoformat()
         }), 503
+    
+    # 只报告注册表的状态，不加载任何模型，避免被卸载的默认模型
+    # 因健康检查而反复加载
+    return jsonify({
+        'status': 'healthy',
+        'model': registry.default_model,
+        'loaded_models': registry.loaded_models(),
+        'resident_mb': round(registry.resident_mb(), 1),
+        'memory_budget_mb': registry.memory_budget_mb,
+        'timestamp': datetime.now().isoformat()
+    }), 200
 
 @app.route('/api/info', methods=['GET'])
 def get_info():
     """获取服务信息"""
     return jsonify({
         'service': 'Sherpa-ONNX TTS',
-        'model': 'vits-melo-tts-zh_en',
-        'version': '1.1.0',
+        'model': registry.default_model,
+        'version': '1.2.0',
+        'ready': _ready.is_set(),
         'capabilities': {
             'languages': ['zh', 'en'],
             'mixed_language': True,
@@ -163,6 +558,7 @@ def get_info():
             'volume_range': [0.5, 3.0],
             'default_volume': 1.5,
         },
+        'models': registry.info(),
         'endpoints': {
             '/health': 'GET - Health check',
             '/api/info': 'GET - Service information',
@@ -179,6 +575,8 @@ def text_to_speech():
     请求体（JSON）:
     {
         "text": "要转换的文本",
+        "model": "vits-melo-tts-zh_en",  # 可选，模型名称，默认使用默认模型
+        "sid": 0,  # 可选，说话人 ID
         "speed": 1.0,  # 可选，语速 0.5-2.0
         "volume": 1.5,  # 可选，音量倍数 0.5-3.0，默认 1.5
         "format": "wav"  # 可选，输出格式（目前仅支持 wav）
@@ -187,6 +585,7 @@ def text_to_speech():
     响应（JSON）:
     {
         "success": true,
+        "model": "vits-melo-tts-zh_en",
         "file_id": "uuid",
         "filename": "output.wav",
         "duration": 3.45,
@@ -205,12 +604,20 @@ def text_to_speech():
         text = data['text'].strip()
         speed = float(data.get('speed', 1.0))
         volume = float(data.get('volume', 1.5))  # 默认 1.5 倍音量
+        model_name = data.get('model') or registry.default_model
+        sid = int(data.get('sid', 0))
         output_format = data.get('format', 'wav').lower()
         
         # 验证参数
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
+        if not registry.has_model(model_name):
+            return jsonify({
+                'error': f'Unknown model: {model_name}',
+                'models': registry.names(),
+            }), 400
+        
         if len(text) > MAX_TEXT_LENGTH:
             return jsonify({
                 'error': f'Text too long (max {MAX_TEXT_LENGTH} characters)'
@@ -226,12 +633,13 @@ def text_to_speech():
             return jsonify({'error': 'Only WAV format is supported'}), 400
         
         # 生成语音
-        logger.info(f"Generating TTS for text: {text[:50]}... (speed={speed}, volume={volume})")
-        
-        tts = get_tts()
+        logger.info(
+            f"Generating TTS for text: {text[:50]}... "
+            f"(model={model_name}, sid={sid}, speed={speed}, volume={volume})"
+        )
         
         start = time.time()
-        audio = tts.generate(text, sid=0, speed=speed)
+        audio = registry.generate(text, model_name, sid=sid, speed=speed)
         generation_time = time.time() - start
         
         if len(audio.samples) == 0:
@@ -257,8 +665,10 @@ def text_to_speech():
         
         logger.info(
             f"TTS generated successfully: "
+            f"model={model_name}, "
             f"duration={duration:.2f}s, "
             f"gen_time={generation_time:.2f}s, "
+            f"frontend_time={audio.frontend_seconds:.3f}s, "
             f"RTF={rtf:.3f}, "
             f"volume={volume}x"
         )
@@ -266,12 +676,14 @@ def text_to_speech():
         # 返回结果
         return jsonify({
             'success': True,
+            'model': model_name,
             'file_id': file_id,
             'filename': filename,
             'duration': round(duration, 2),
             'sample_rate': audio.sample_rate,
             'text_length': len(text),
             'generation_time': round(generation_time, 2),
+            'frontend_time': round(audio.frontend_seconds, 3),  # 文本正则化与分词耗时
             'rtf': round(rtf, 3),
             'volume': volume,
             'file_size': file_size,
@@ -294,6 +706,8 @@ def text_to_speech_stream():
     请求体（JSON）:
     {
         "text": "要转换的文本",
+        "model": "vits-melo-tts-zh_en",  # 可选
+        "sid": 0,  # 可选
         "speed": 1.0,
         "volume": 1.5  # 可选，音量倍数 0.5-3.0，默认 1.5
     }
@@ -308,20 +722,30 @@ def text_to_speech_stream():
         text = data['text'].strip()
         speed = float(data.get('speed', 1.0))
         volume = float(data.get('volume', 1.5))  # 默认 1.5 倍音量
+        model_name = data.get('model') or registry.default_model
+        sid = int(data.get('sid', 0))
         
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
+        if not registry.has_model(model_name):
+            return jsonify({
+                'error': f'Unknown model: {model_name}',
+                'models': registry.names(),
+            }), 400
+        
         if len(text) > MAX_TEXT_LENGTH:
             return jsonify({
                 'error': f'Text too long (max {MAX_TEXT_LENGTH} characters)'
             }), 400
         
         # 生成语音
-        logger.info(f"Stream TTS: {text[:50]}... (speed={speed}, volume={volume})")
+        logger.info(
+            f"Stream TTS: {text[:50]}... "
+            f"(model={model_name}, sid={sid}, speed={speed}, volume={volume})"
+        )
         
-        tts = get_tts()
-        audio = tts.generate(text, sid=0, speed=speed)
+        audio = registry.generate(text, model_name, sid=sid, speed=speed)
         
         if len(audio.samples) == 0:
             return jsonify({'error': 'Failed to generate audio'}), 500
@@ -377,7 +801,8 @@ def index():
     <head><title>Sherpa-ONNX TTS Service</title></head>
     <body>
         <h1>Sherpa-ONNX TTS Service</h1>
-        <p>Model: vits-melo-tts-zh_en (Chinese + English)</p>
+        <p>Default model: {default_model}</p>
+        <p>Models: {models}</p>
         <h2>API Endpoints:</h2>
         <ul>
             <li>GET /health - Health check</li>
@@ -390,11 +815,12 @@ def index():
         <pre>
 curl -X POST http://localhost:5000/api/tts \\
   -H "Content-Type: application/json" \\
-  -d '{"text": "你好世界", "speed": 1.0}'
+  -d '{{"text": "你好世界", "speed": 1.0}}'
         </pre>
     </body>
     </html>
-    """
+    """.format(default_model=registry.default_model,
+               models=', '.join(registry.names()))
 
 def cleanup_old_files():
     """清理旧的音频文件（保留最近1小时）"""
@@ -425,18 +851,20 @@ if __name__ == '__main__':
     logger.info("=" * 70)
     logger.info("Starting Sherpa-ONNX TTS Service")
     logger.info("=" * 70)
-    logger.info(f"Model directory: {MODEL_DIR}")
+    if MODELS_CONFIG and os.path.exists(MODELS_CONFIG):
+        logger.info(f"Models config: {MODELS_CONFIG}")
+    else:
+        logger.info(f"Model directory: {MODEL_DIR}")
+    logger.info(f"Models: {', '.join(registry.names())} (default: {registry.default_model})")
+    logger.info(f"Memory budget: {registry.memory_budget_mb or 'unlimited'} MB")
     logger.info(f"Number of threads: {NUM_THREADS}")
     logger.info(f"Max text length: {MAX_TEXT_LENGTH}")
     logger.info(f"Output directory: {OUTPUT_DIR}")
     
-    # 预加载模型
-    try:
-        get_tts()
-        logger.info("Model preloaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to preload model: {e}")
-        exit(1)
+    logger.info(f"Warmup lengths: {WARMUP_LENGTHS}")
+    
+    # 后台预热模型，完成前 /health 返回 503
+    start_prewarm()
     
     # 启动清理线程
     start_cleanup_thread()